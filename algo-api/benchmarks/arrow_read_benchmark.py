@@ -0,0 +1,99 @@
+"""
+Compare cold and warm reads of memory mapped Arrow files against the Parquet layouts.
+
+Generates a synthetic daily tree (or copies an existing one with --data-dir) and builds Parquet
+year files and Arrow files from it. "Cold" evicts the files from the OS page cache (where
+posix_fadvise is available) and drops the process-wide Arrow mappings before each read; "warm"
+repeats the read in the same process, as successive backtests of a server do.
+
+    python benchmarks/arrow_read_benchmark.py --years 2 --timeframe 1min
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from parquet_read_benchmark import CANDLES_PER_DAY, INSTRUMENT_KEY, generate_daily_tree
+
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.infrastructure.arrow_dataset import convert_parquet_dataset
+from algo.infrastructure.arrow_historical_data_repository import ArrowHistoricalDataRepository
+from algo.infrastructure.parquet_dataset import migrate_daily_files
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+
+
+def evict_from_page_cache(directory: str) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for root, _, files in os.walk(directory):
+        for name in files:
+            fd = os.open(os.path.join(root, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def time_reads(create_repository, directory, instrument, start, end, timeframe, repeat):
+    cold, warm = [], []
+    candles = 0
+    for _ in range(repeat):
+        evict_from_page_cache(directory)
+        ArrowHistoricalDataRepository.clear_cache()
+        begin = time.perf_counter()
+        candles = len(create_repository().get_historical_data(instrument, start, end, timeframe))
+        cold.append(time.perf_counter() - begin)
+        begin = time.perf_counter()
+        create_repository().get_historical_data(instrument, start, end, timeframe)
+        warm.append(time.perf_counter() - begin)
+    return min(cold), min(warm), candles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", help="Existing daily tree to benchmark instead of synthetic data")
+    parser.add_argument("--instrument-key", default=INSTRUMENT_KEY)
+    parser.add_argument("--timeframe", default="15min", choices=sorted(CANDLES_PER_DAY))
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = date(start.year + args.years, start.month, start.day) - timedelta(days=1)
+    timeframe = Timeframe(args.timeframe)
+    instrument = Instrument(Exchange.NSE, Type.INDEX, args.instrument_key)
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        daily_dir = os.path.join(work_dir, "daily")
+        if args.data_dir:
+            shutil.copytree(args.data_dir, daily_dir)
+        else:
+            generate_daily_tree(daily_dir, args.timeframe, start, end)
+        year_dir = os.path.join(work_dir, "year")
+        shutil.copytree(daily_dir, year_dir)
+        migrate_daily_files(year_dir, [args.timeframe], remove_daily_files=True)
+        arrow_dir = os.path.join(work_dir, "arrow")
+        shutil.copytree(year_dir, arrow_dir)
+        convert_parquet_dataset(arrow_dir, [args.timeframe])
+
+        layouts = {
+            "parquet daily": (daily_dir, lambda: ParquetHistoricalDataRepository(daily_dir)),
+            "parquet year": (year_dir, lambda: ParquetHistoricalDataRepository(year_dir)),
+            "arrow mmap": (arrow_dir, lambda: ArrowHistoricalDataRepository(arrow_dir)),
+        }
+        print(f"{args.timeframe} candles from {start} to {end}")
+        print(f"{'layout':<14} {'candles':>8} {'cold':>10} {'warm':>10}")
+        for name, (directory, create_repository) in layouts.items():
+            cold, warm, candles = time_reads(create_repository, directory, instrument, start, end, timeframe, args.repeat)
+            print(f"{name:<14} {candles:>8} {cold * 1000:>8.1f}ms {warm * 1000:>8.2f}ms")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare ParquetHistoricalDataRepository reads from daily files against year files.
+
+Generates a synthetic daily tree (or copies an existing one with --data-dir), migrates a copy
+of it to year files and times reading the same ranges from both.
+
+    python benchmarks/parquet_read_benchmark.py --years 2 --timeframe 1min
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.infrastructure.parquet_dataset import get_daily_file_path, migrate_daily_files
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+
+INSTRUMENT_KEY = "NSE_INDEX|Nifty 50"
+# (candles per trading day, minutes per candle)
+CANDLES_PER_DAY = {"1min": (375, 1), "5min": (75, 5), "15min": (25, 15), "30min": (13, 30), "60min": (7, 60)}
+
+
+def generate_daily_tree(base_dir: str, timeframe: str, start: date, end: date) -> int:
+    count, minutes = CANDLES_PER_DAY[timeframe]
+    rng = np.random.default_rng(0)
+    files = 0
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            first = pd.Timestamp(datetime(day.year, day.month, day.day, 9, 15), tz="+05:30")
+            close = 20000 + rng.standard_normal(count).cumsum()
+            df = pd.DataFrame({
+                "timestamp": first + pd.to_timedelta(np.arange(count) * minutes, unit="min"),
+                "open": close, "high": close + 5, "low": close - 5, "close": close,
+                "volume": rng.integers(1000, 5000, count), "oi": np.zeros(count, dtype=np.int64),
+            })
+            path = get_daily_file_path(base_dir, timeframe, INSTRUMENT_KEY, day)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_parquet(path, index=False)
+            files += 1
+        day += timedelta(days=1)
+    return files
+
+
+def time_read(repository, instrument, start, end, timeframe, repeat):
+    timings = []
+    candles = 0
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        candles = len(repository.get_historical_data(instrument, start, end, timeframe))
+        timings.append(time.perf_counter() - begin)
+    return min(timings), candles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", help="Existing daily tree to benchmark instead of synthetic data")
+    parser.add_argument("--instrument-key", default=INSTRUMENT_KEY)
+    parser.add_argument("--timeframe", default="15min", choices=sorted(CANDLES_PER_DAY))
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = date(start.year + args.years, start.month, start.day) - timedelta(days=1)
+    timeframe = Timeframe(args.timeframe)
+    instrument = Instrument(Exchange.NSE, Type.INDEX, args.instrument_key)
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        daily_dir = os.path.join(work_dir, "daily")
+        if args.data_dir:
+            shutil.copytree(args.data_dir, daily_dir)
+        else:
+            files = generate_daily_tree(daily_dir, args.timeframe, start, end)
+            print(f"Generated {files} daily files")
+        year_dir = os.path.join(work_dir, "year")
+        shutil.copytree(daily_dir, year_dir)
+        migrate_daily_files(year_dir, [args.timeframe], remove_daily_files=True)
+
+        ranges = {
+            "full range": (start, end),
+            "one month": (start, min(end, start + timedelta(days=30))),
+            "one week": (start, min(end, start + timedelta(days=6))),
+        }
+        print(f"{'range':<12} {'candles':>8} {'daily files':>12} {'year files':>12} {'speedup':>8}")
+        for name, (range_start, range_end) in ranges.items():
+            daily_time, candles = time_read(ParquetHistoricalDataRepository(daily_dir), instrument,
+                                            range_start, range_end, timeframe, args.repeat)
+            year_time, year_candles = time_read(ParquetHistoricalDataRepository(year_dir), instrument,
+                                                range_start, range_end, timeframe, args.repeat)
+            assert candles == year_candles, "Layouts returned different candles"
+            print(f"{name:<12} {candles:>8} {daily_time * 1000:>10.1f}ms {year_time * 1000:>10.1f}ms "
+                  f"{daily_time / year_time:>7.1f}x")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure ServiceRegistry lookups from many threads against a registry that locks every read.
+
+"locked" is the previous read path: every get_service acquires the registry lock. Its lookup
+rate is measured with a plain lock, and a second run with a counting lock reports how many
+acquisitions found the lock held by another thread. "snapshot" is ServiceRegistry, whose reads
+take no lock. Each thread looks the TradingWindowService up as often as a backtest does when
+every candle produces a signal.
+
+    python benchmarks/service_registry_benchmark.py --threads 1 4 8 --calls 200000
+"""
+import argparse
+import threading
+import time
+
+from algo.domain.service_registry import ServiceRegistry
+from algo.domain.trading.trading_window_service import TradingWindowService
+
+
+class CountingLock:
+    """A lock that counts the acquisitions that had to wait."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.contended = 0
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            self._lock.acquire()
+            self.contended += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+class LockedRegistry:
+    def __init__(self, services, lock):
+        self._services = dict(services)
+        self._service_lock = lock
+
+    def get_service(self, service_type):
+        with self._service_lock:
+            if service_type in self._services:
+                return self._services[service_type]
+            raise ValueError(f"Service type {service_type.__name__} is not registered")
+
+
+def run_threads(get_service, threads: int, calls: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(calls):
+            get_service(TradingWindowService)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    begin = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--calls", type=int, default=200_000, help="Lookups per thread")
+    args = parser.parse_args()
+
+    service = TradingWindowService([])
+    registry = ServiceRegistry()
+    registry.register_instance(TradingWindowService, service)
+
+    print(f"{'threads':>7} {'registry':<9} {'lookups/s':>12} {'contended':>10}")
+    for threads in args.threads:
+        elapsed = run_threads(LockedRegistry({TradingWindowService: service}, threading.Lock()).get_service,
+                              threads, args.calls)
+        counting_lock = CountingLock()
+        run_threads(LockedRegistry({TradingWindowService: service}, counting_lock).get_service, threads, args.calls)
+        print(f"{threads:>7} {'locked':<9} {threads * args.calls / elapsed:>12,.0f} {counting_lock.contended:>10,}")
+        elapsed = run_threads(registry.get_service, threads, args.calls)
+        print(f"{threads:>7} {'snapshot':<9} {threads * args.calls / elapsed:>12,.0f} {0:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from algo.application.run_backtest_usecase import RunBacktestInput
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestJobStatus(Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class BacktestJob:
+    """State of one asynchronous backtest: status, candle progress and the final result."""
+
+    def __init__(self, job_id: str, input_data: RunBacktestInput):
+        self.job_id = job_id
+        self.input_data = input_data
+        self.status = BacktestJobStatus.QUEUED
+        self.candles_processed = 0
+        self.total_candles = 0
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def update_progress(self, candles_processed: int, total_candles: int) -> None:
+        with self._lock:
+            self.candles_processed = candles_processed
+            self.total_candles = total_candles
+
+    def is_finished(self) -> bool:
+        return self.status in (BacktestJobStatus.COMPLETED, BacktestJobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            processed, total = self.candles_processed, self.total_candles
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "strategy_name": self.input_data.strategy_name,
+            "start_date": self.input_data.start_date,
+            "end_date": self.input_data.end_date,
+            "progress": {
+                "candles_processed": processed,
+                "total_candles": total,
+                "percentage": round(100.0 * processed / total, 2) if total else 0.0,
+            },
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class BacktestJobQueue:
+    """
+    Runs backtests in the background on a bounded pool of worker threads.
+
+    At most ``max_concurrent_jobs`` backtests run at once; further submissions wait in the
+    executor's queue. Finished jobs are kept in memory for retrieval, oldest evicted first once
+    more than ``max_retained_jobs`` have finished.
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 2, max_retained_jobs: int = 1000):
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1")
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_retained_jobs = max_retained_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix="backtest-job")
+        self._jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, input_data: RunBacktestInput,
+               run: Callable[[RunBacktestInput, Callable[[int, int], None], str], dict]) -> BacktestJob:
+        """
+        Enqueue a backtest.
+
+        Args:
+            input_data: Strategy name and date range of the backtest
+            run: Callable executing the backtest with (input, progress callback, job id) and
+                returning the report dict, e.g. RunBacktestUseCase.execute
+
+        Returns:
+            BacktestJob: The queued job
+        """
+        job = BacktestJob(str(uuid.uuid4()), input_data)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished_jobs()
+        self._executor.submit(self._run_job, job, run)
+        logger.info(f"Queued backtest job {job.job_id} for {input_data.strategy_name}")
+        return job
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run_job(self, job: BacktestJob, run: Callable) -> None:
+        job.status = BacktestJobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            job.result = run(job.input_data, job.update_progress, job.job_id)
+            job.status = BacktestJobStatus.COMPLETED
+        except Exception as e:
+            logger.exception(f"Backtest job {job.job_id} failed")
+            job.error = str(e)
+            job.status = BacktestJobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _evict_finished_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished()]
+        for job_id in finished[:max(0, len(finished) - self.max_retained_jobs)]:
+            del self._jobs[job_id]
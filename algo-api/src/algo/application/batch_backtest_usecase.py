@@ -0,0 +1,181 @@
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from algo.application.run_backtest_usecase import BackTestReportDTO, RunBacktestInput, parse_backtest_dates
+from algo.domain.backtest.engine import BacktestEngine
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.preloaded_historical_data_repository import PreloadedHistoricalDataRepository
+from algo.domain.strategy.tradable_instrument_repository import TradableInstrumentRepository
+from algo.domain.strategy_repository import StrategyRepository
+from algo.domain.timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+
+class RunBatchBacktestInput:
+    def __init__(self, jobs: List[RunBacktestInput]):
+        self.jobs = jobs
+
+
+@dataclass(frozen=True)
+class BatchBacktestJob:
+    """One (strategy, date range) backtest plus the data range its worker should preload."""
+    index: int
+    strategy_name: str
+    start_date: date
+    end_date: date
+    data_start_date: date
+    data_end_date: date
+
+
+# Per-process state of a batch worker, set up once by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(historical_data_repository_factory: Callable[[], HistoricalDataRepository],
+                 tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                 strategy_repository_factory: Callable[[], StrategyRepository],
+                 worker_setup: Optional[Callable[[], None]] = None) -> None:
+    if worker_setup is not None:
+        worker_setup()
+    _worker_state.clear()
+    _worker_state["historical_data_repository"] = historical_data_repository_factory()
+    _worker_state["tradable_instrument_repository_factory"] = tradable_instrument_repository_factory
+    _worker_state["strategy_repository"] = strategy_repository_factory()
+    _worker_state["datasets"] = {}
+
+
+def _get_preloaded_data(instrument, timeframe: Timeframe, start_date: date, end_date: date) -> HistoricalData:
+    """Load the data range once per worker and reuse it for every job on the same instrument."""
+    key = (instrument.instrument_key, timeframe.value, start_date, end_date)
+    datasets = _worker_state["datasets"]
+    if key not in datasets:
+        datasets[key] = _worker_state["historical_data_repository"].get_historical_data(
+            instrument, start_date, end_date, timeframe
+        )
+    return datasets[key]
+
+
+def _run_batch_job(job: BatchBacktestJob, vectorized: bool) -> Tuple[int, Dict[str, Any]]:
+    try:
+        strategy = _worker_state["strategy_repository"].get_strategy(job.strategy_name)
+        instrument = strategy.get_instrument()
+        timeframe = Timeframe(strategy.get_timeframe())
+        historical_data = _get_preloaded_data(instrument, timeframe, job.data_start_date, job.data_end_date)
+        repository = PreloadedHistoricalDataRepository(
+            _worker_state["historical_data_repository"],
+            instrument,
+            timeframe,
+            historical_data,
+            job.data_start_date,
+            job.data_end_date
+        )
+        engine = BacktestEngine(repository, _worker_state["tradable_instrument_repository_factory"]())
+        report = engine.start(strategy, job.start_date, job.end_date, vectorized=vectorized)
+        return job.index, {"report": BackTestReportDTO(report).to_dict()}
+    except Exception as e:
+        logger.exception(f"Batch backtest job failed for {job.strategy_name}")
+        return job.index, {"error": str(e)}
+
+
+class RunBatchBacktestUseCase:
+    """
+    Runs several (strategy, date range) backtests in parallel on a process pool.
+
+    Jobs on the same instrument and timeframe are given the union of their data ranges, so each
+    worker process loads that range once and serves every such job from it.
+    """
+
+    def __init__(self, strategy_repository: StrategyRepository,
+                 historical_data_repository_factory: Callable[[], HistoricalDataRepository],
+                 tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                 strategy_repository_factory: Callable[[], StrategyRepository],
+                 max_workers: Optional[int] = None,
+                 worker_setup: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            strategy_repository: Repository used to validate jobs and plan data ranges
+            historical_data_repository_factory: Picklable callable creating a repository in each worker
+            tradable_instrument_repository_factory: Picklable callable creating a fresh repository per job
+            strategy_repository_factory: Picklable callable creating a strategy repository in each worker
+            max_workers: Maximum number of worker processes (defaults to the number of CPUs)
+            worker_setup: Optional picklable callable run once in each worker before the repositories are created
+        """
+        self.strategy_repository = strategy_repository
+        self.historical_data_repository_factory = historical_data_repository_factory
+        self.tradable_instrument_repository_factory = tradable_instrument_repository_factory
+        self.strategy_repository_factory = strategy_repository_factory
+        self.max_workers = max_workers
+        self.worker_setup = worker_setup
+
+    def execute(self, input_data: RunBatchBacktestInput, vectorized: bool = False) -> dict:
+        if not input_data.jobs:
+            raise ValueError('At least one backtest job is required')
+        jobs = self._plan_jobs(input_data.jobs)
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(jobs))
+        logger.info(f"Running {len(jobs)} batch backtest jobs on {workers} worker processes")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        with self._create_executor(workers) as executor:
+            futures = [executor.submit(_run_batch_job, job, vectorized) for job in jobs]
+            for future in futures:
+                index, result = future.result()
+                results[index] = result
+
+        return self._aggregate(jobs, results)
+
+    def _create_executor(self, workers: int) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.historical_data_repository_factory,
+                self.tradable_instrument_repository_factory,
+                self.strategy_repository_factory,
+                self.worker_setup,
+            ),
+        )
+
+    def _plan_jobs(self, inputs: List[RunBacktestInput]) -> List[BatchBacktestJob]:
+        """Validate the inputs and give jobs sharing an instrument and timeframe a common data range."""
+        planned = []
+        data_ranges: Dict[tuple, Tuple[date, date]] = {}
+        for job_input in inputs:
+            start, end = parse_backtest_dates(job_input)
+            strategy = self.strategy_repository.get_strategy(job_input.strategy_name)
+            key = (strategy.get_instrument().instrument_key, Timeframe(strategy.get_timeframe()).value)
+            data_start = strategy.get_required_history_start_date(start)
+            current = data_ranges.get(key)
+            data_ranges[key] = (min(current[0], data_start), max(current[1], end)) if current else (data_start, end)
+            planned.append((job_input.strategy_name, start, end, key))
+
+        return [
+            BatchBacktestJob(index, name, start, end, *data_ranges[key])
+            for index, (name, start, end, key) in enumerate(planned)
+        ]
+
+    @staticmethod
+    def _aggregate(jobs: List[BatchBacktestJob], results: List[Dict[str, Any]]) -> dict:
+        entries = []
+        for job, result in zip(jobs, results):
+            entry = {
+                "strategy_name": job.strategy_name,
+                "start_date": job.start_date.isoformat(),
+                "end_date": job.end_date.isoformat(),
+            }
+            entry.update(result)
+            entries.append(entry)
+        failed = sum(1 for entry in entries if "error" in entry)
+        return {
+            "summary": {
+                "total_jobs": len(entries),
+                "succeeded": len(entries) - failed,
+                "failed": failed,
+            },
+            "results": entries,
+        }
@@ -0,0 +1,320 @@
+import copy
+import itertools
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from algo.application.run_backtest_usecase import RunBacktestInput, parse_backtest_dates
+from algo.domain.backtest.backtest import BackTest
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.shared_historical_data_repository import SharedHistoricalDataRepository
+from algo.domain.indicators.cache import IndicatorCache
+from algo.domain.strategy.strategy import Strategy
+from algo.domain.strategy.tradable_instrument_repository import TradableInstrumentRepository
+from algo.domain.strategy_repository import StrategyRepository
+from algo.domain.timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+MAX_VARIANTS = 100000
+
+# Summary metrics a sweep can be ranked by
+RANKING_METRICS = (
+    "total_pnl_points",
+    "total_pnl_percentage",
+    "winning_trades_count",
+    "losing_trades_count",
+    "total_trades_count",
+    "winning_streak",
+    "losing_streak",
+    "max_gain",
+    "max_loss",
+    "win_rate",
+)
+
+# Metrics where lower is better; every other metric is ranked highest first
+ASCENDING_METRICS = {"losing_trades_count", "losing_streak"}
+
+
+class ParameterRange:
+    """
+    Values to try for one parameter of a strategy JSON.
+
+    The path is dot separated with list indices as numbers, e.g.
+    ``entry_rules.conditions.0.right.params.period``.
+    """
+
+    def __init__(self, path: str, values: List[Any]):
+        if not path:
+            raise ValueError("Parameter path is required")
+        if not values:
+            raise ValueError(f"No values given for parameter {path}")
+        self.path = path
+        self.values = list(values)
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "ParameterRange":
+        """
+        Build a range from ``{"path": ..., "values": [...]}`` or from
+        ``{"path": ..., "start": ..., "stop": ..., "step": ...}`` (stop inclusive).
+        """
+        path = data.get("path")
+        if data.get("values") is not None:
+            return ParameterRange(path, data["values"])
+        try:
+            start, stop, step = data["start"], data["stop"], data.get("step", 1)
+        except KeyError:
+            raise ValueError(f"Parameter {path} needs either values or start and stop")
+        if step <= 0:
+            raise ValueError(f"Parameter {path} step must be positive")
+        # Values are start + i * step, so float steps do not accumulate rounding errors
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        if count > MAX_VARIANTS:
+            raise ValueError(f"Parameter {path} has {count} values, the maximum is {MAX_VARIANTS}")
+        if all(isinstance(bound, int) for bound in (start, stop, step)):
+            values = [start + i * step for i in range(count)]
+        else:
+            values = [round(start + i * step, 10) for i in range(count)]
+        return ParameterRange(path, values)
+
+
+def set_parameter(json_data: Dict[str, Any], path: str, value: Any) -> None:
+    """
+    Set the value at a dot separated path of a strategy JSON in place.
+
+    Raises:
+        ValueError: If the path does not exist in the JSON
+    """
+    keys = path.split(".")
+    node = json_data
+    try:
+        for key in keys[:-1]:
+            node = node[int(key)] if isinstance(node, list) else node[key]
+        last = keys[-1]
+        if isinstance(node, list):
+            node[int(last)] = value
+        elif last in node:
+            node[last] = value
+        else:
+            raise KeyError(last)
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise ValueError(f"Invalid parameter path: {path}")
+
+
+def build_variant(json_data: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a strategy JSON with the given parameter values set.
+
+    Raises:
+        ValueError: If a parameter path does not exist in the JSON
+    """
+    variant = copy.deepcopy(json_data)
+    for path, value in parameters.items():
+        set_parameter(variant, path, value)
+    return variant
+
+
+def expand_parameters(parameter_ranges: List[ParameterRange]) -> List[Dict[str, Any]]:
+    """
+    Expand parameter ranges into the grid of all parameter combinations.
+
+    Returns:
+        List of {path: value} dicts, one per combination
+    """
+    total = 1
+    for parameter_range in parameter_ranges:
+        total *= len(parameter_range.values)
+    if total > MAX_VARIANTS:
+        raise ValueError(f"Parameter grid has {total} variants, the maximum is {MAX_VARIANTS}")
+
+    paths = [parameter_range.path for parameter_range in parameter_ranges]
+    return [
+        dict(zip(paths, combination))
+        for combination in itertools.product(*(parameter_range.values for parameter_range in parameter_ranges))
+    ]
+
+
+def expand_variants(json_data: Dict[str, Any], parameter_ranges: List[ParameterRange]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Expand a strategy JSON into the grid of all parameter combinations.
+
+    Returns:
+        List of (parameters, strategy JSON) pairs, one per combination
+    """
+    return [(parameters, build_variant(json_data, parameters)) for parameters in expand_parameters(parameter_ranges)]
+
+
+class RunParameterSweepInput:
+    def __init__(self, strategy_name: str, start_date: str, end_date: str, parameters: List[Dict[str, Any]],
+                 rank_by: str = "total_pnl_points", top: Optional[int] = None):
+        self.strategy_name = strategy_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.parameters = parameters
+        self.rank_by = rank_by
+        self.top = top
+
+
+# Per-process state of a sweep worker, set up once by _init_sweep_worker
+_sweep_state: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(strategy_factory: Callable[[Dict[str, Any]], Strategy], json_data: Dict[str, Any],
+                       historical_data: HistoricalData, start_date: date, end_date: date, vectorized: bool,
+                       historical_data_repository_factory: Optional[Callable[[], HistoricalDataRepository]],
+                       tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                       worker_setup: Optional[Callable[[], None]] = None) -> None:
+    if worker_setup is not None:
+        worker_setup()
+    _sweep_state.clear()
+    _sweep_state.update(
+        strategy_factory=strategy_factory,
+        json_data=json_data,
+        historical_data=historical_data,
+        start_date=start_date,
+        end_date=end_date,
+        vectorized=vectorized,
+        delegate=historical_data_repository_factory() if historical_data_repository_factory else None,
+        tradable_instrument_repository_factory=tradable_instrument_repository_factory,
+        # One cache per worker, shared by every variant it runs
+        indicator_cache=IndicatorCache(max_entries=16384),
+    )
+
+
+def _run_variant(variant: Tuple[int, Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    index, parameters = variant
+    try:
+        strategy = _sweep_state["strategy_factory"](build_variant(_sweep_state["json_data"], parameters))
+        repository = SharedHistoricalDataRepository(
+            _sweep_state["delegate"],
+            strategy.get_instrument(),
+            Timeframe(strategy.get_timeframe()),
+            _sweep_state["historical_data"],
+        )
+        backtest = BackTest(
+            strategy=strategy,
+            historical_data_repository=repository,
+            tradable_instrument_repository=_sweep_state["tradable_instrument_repository_factory"](),
+            start_date=_sweep_state["start_date"],
+            end_date=_sweep_state["end_date"],
+            indicator_cache=_sweep_state["indicator_cache"],
+        )
+        report = backtest.run(vectorized=_sweep_state["vectorized"])
+        return index, {"metrics": report.get_summary_metrics()}
+    except Exception as e:
+        logger.exception(f"Parameter sweep variant {index} failed")
+        return index, {"error": str(e)}
+
+
+class RunParameterSweepUseCase:
+    """
+    Backtests every combination of a set of strategy parameter ranges and ranks the results.
+
+    The strategy's data is loaded once, covering the longest lookback of any variant, and shipped
+    to each worker process once. Workers receive only the strategy JSON and each variant's
+    parameter values, and build the variant strategies themselves. Each worker keeps one
+    indicator cache for all the variants it runs, so indicators a variant shares with others are
+    computed once per worker.
+    """
+
+    def __init__(self, strategy_repository: StrategyRepository,
+                 strategy_factory: Callable[[Dict[str, Any]], Strategy],
+                 historical_data_repository: HistoricalDataRepository,
+                 tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                 historical_data_repository_factory: Optional[Callable[[], HistoricalDataRepository]] = None,
+                 max_workers: Optional[int] = None,
+                 worker_setup: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            strategy_repository: Repository of the strategy being swept; its strategies must expose
+                their definition through get_json_data()
+            strategy_factory: Picklable callable building a strategy from a JSON definition, e.g. JsonStrategy
+            historical_data_repository: Repository the shared dataset is loaded from
+            tradable_instrument_repository_factory: Picklable callable creating a fresh repository per variant
+            historical_data_repository_factory: Optional picklable callable creating, in each worker, a
+                repository for other instruments (e.g. the traded options of the position)
+            max_workers: Maximum number of worker processes (defaults to the number of CPUs)
+            worker_setup: Optional picklable callable run once in each worker
+        """
+        self.strategy_repository = strategy_repository
+        self.strategy_factory = strategy_factory
+        self.historical_data_repository = historical_data_repository
+        self.tradable_instrument_repository_factory = tradable_instrument_repository_factory
+        self.historical_data_repository_factory = historical_data_repository_factory
+        self.max_workers = max_workers
+        self.worker_setup = worker_setup
+
+    def execute(self, input_data: RunParameterSweepInput, vectorized: bool = True) -> dict:
+        start, end = parse_backtest_dates(
+            RunBacktestInput(input_data.strategy_name, input_data.start_date, input_data.end_date)
+        )
+        if not input_data.parameters:
+            raise ValueError('At least one parameter range is required')
+        if input_data.rank_by not in RANKING_METRICS:
+            raise ValueError(f"rank_by must be one of {', '.join(RANKING_METRICS)}")
+        top = input_data.top
+        if top is not None and (isinstance(top, bool) or not isinstance(top, int) or top < 1):
+            raise ValueError("top must be a positive integer")
+
+        strategy = self.strategy_repository.get_strategy(input_data.strategy_name)
+        if not hasattr(strategy, "get_json_data"):
+            raise ValueError(f"{input_data.strategy_name} is not a JSON strategy")
+        parameter_ranges = [ParameterRange.from_dict(parameter) for parameter in input_data.parameters]
+        variants = expand_parameters(parameter_ranges)
+        json_data = strategy.get_json_data()
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(variants))
+        chunksize = max(1, len(variants) // (workers * 4))
+
+        # Load once, far enough back for the variant with the longest lookback; each variant
+        # strategy is built only for the lookback and dropped right after
+        data_start = min(
+            self.strategy_factory(build_variant(json_data, parameters)).get_required_history_start_date(start)
+            for parameters in variants
+        )
+        historical_data = self.historical_data_repository.get_historical_data(
+            strategy.get_instrument(), data_start, end, Timeframe(strategy.get_timeframe())
+        )
+
+        logger.info(f"Running parameter sweep of {len(variants)} variants on {workers} worker processes")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(variants)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sweep_worker,
+            initargs=(self.strategy_factory, json_data, historical_data, start, end, vectorized,
+                      self.historical_data_repository_factory, self.tradable_instrument_repository_factory,
+                      self.worker_setup),
+        ) as executor:
+            for index, result in executor.map(_run_variant, list(enumerate(variants)), chunksize=chunksize):
+                results[index] = result
+
+        return self._rank(input_data, variants, results)
+
+    @staticmethod
+    def _rank(input_data: RunParameterSweepInput, parameters: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> dict:
+        rows = []
+        errors = []
+        for variant_parameters, result in zip(parameters, results):
+            if "error" in result:
+                errors.append({"parameters": variant_parameters, "error": result["error"]})
+            else:
+                rows.append({"parameters": variant_parameters, **result["metrics"]})
+        rows.sort(key=lambda row: row[input_data.rank_by], reverse=input_data.rank_by not in ASCENDING_METRICS)
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        if input_data.top:
+            rows = rows[:input_data.top]
+        return {
+            "strategy_name": input_data.strategy_name,
+            "start_date": input_data.start_date,
+            "end_date": input_data.end_date,
+            "rank_by": input_data.rank_by,
+            "total_variants": len(parameters),
+            "failed_variants": len(errors),
+            "results": rows,
+            "errors": errors,
+        }
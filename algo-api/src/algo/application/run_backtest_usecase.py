@@ -2,11 +2,13 @@ from algo.application.strategy_usecases import InstrumentDTO
 from algo.application.util import fmt_currency, fmt_datetime, fmt_percent
 from algo.domain.backtest.engine import BacktestEngine
 from datetime import date
+from typing import Callable, Optional, Tuple
 from algo.domain.strategy.tradable_instrument import Position, TradableInstrument
 from algo.domain.strategy_repository import StrategyRepository
 from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
 from algo.domain.strategy.tradable_instrument_repository import TradableInstrumentRepository
 from algo.domain.backtest.report import BackTestReport
+from algo.domain.backtest.report_repository import BacktestReportRepository
 
 class RunBacktestInput:
     def __init__(self, strategy_name: str, start_date: str, end_date: str):
@@ -91,26 +93,56 @@ class BackTestReportDTO:
             "tradable": self.tradable.to_dict(),
         }
 
+def parse_backtest_dates(input_data: RunBacktestInput) -> Tuple[date, date]:
+    """
+    Validate a backtest input and parse its date range.
+
+    Raises:
+        ValueError: If a field is missing, a date is malformed or the range is inverted
+    """
+    # Validate input fields
+    if not input_data.strategy_name or not input_data.start_date or not input_data.end_date:
+        raise ValueError('Missing required fields: strategy_name, start_date, end_date')
+    # Validate date formats
+    try:
+        start = date.fromisoformat(input_data.start_date)
+    except Exception:
+        raise ValueError('Invalid start_date format, must be YYYY-MM-DD')
+    try:
+        end = date.fromisoformat(input_data.end_date)
+    except Exception:
+        raise ValueError('Invalid end_date format, must be YYYY-MM-DD')
+    if start > end:
+        raise ValueError('start_date cannot be later than end_date')
+    return start, end
+
 class RunBacktestUseCase:
-    def __init__(self, historical_data_repository: HistoricalDataRepository, tradable_instrument_repository: TradableInstrumentRepository, strategy_repository: StrategyRepository):
+    def __init__(self, historical_data_repository: HistoricalDataRepository, tradable_instrument_repository: TradableInstrumentRepository, strategy_repository: StrategyRepository,
+                 report_repository: Optional[BacktestReportRepository] = None):
         self.engine = BacktestEngine(historical_data_repository, tradable_instrument_repository)
         self.strategy_repository = strategy_repository
+        self.report_repository = report_repository
+
+    def execute(self, input_data: 'RunBacktestInput', progress_callback: Optional[Callable[[int, int], None]] = None,
+                report_id: Optional[str] = None) -> dict:
+        """
+        Run the backtest and return the report as a dict.
+
+        Args:
+            input_data: Strategy name and date range
+            progress_callback: Called with (candles processed, total candles) while the backtest runs
+            report_id: Id under which the report is persisted when a report repository is configured
 
-    def execute(self, input_data: 'RunBacktestInput') -> dict:
-        # Validate input fields
-        if not input_data.strategy_name or not input_data.start_date or not input_data.end_date:
-            raise ValueError('Missing required fields: strategy_name, start_date, end_date')
-        # Validate date formats
-        try:
-            start = date.fromisoformat(input_data.start_date)
-        except Exception:
-            raise ValueError('Invalid start_date format, must be YYYY-MM-DD')
-        try:
-            end = date.fromisoformat(input_data.end_date)
-        except Exception:
-            raise ValueError('Invalid end_date format, must be YYYY-MM-DD')
-        if start > end:
-            raise ValueError('start_date cannot be later than end_date')
+        Returns:
+            dict: The BackTestReportDTO of the run
+        """
+        start, end = parse_backtest_dates(input_data)
         strategy = self.strategy_repository.get_strategy(input_data.strategy_name)
-        report = self.engine.start(strategy, start, end)
-        return BackTestReportDTO(report).to_dict()
+        if progress_callback is not None:
+            report = self.engine.start(strategy, start, end, progress_callback=progress_callback)
+        else:
+            report = self.engine.start(strategy, start, end)
+        result = BackTestReportDTO(report).to_dict()
+        if self.report_repository is not None:
+            self.report_repository.save(report, report_id, result)
+        return result
@@ -0,0 +1,55 @@
+from typing import Callable, Optional
+
+from algo.application.run_backtest_usecase import RunBacktestInput, parse_backtest_dates
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.walk_forward import WalkForwardRunner, build_folds
+from algo.domain.strategy.tradable_instrument_repository import TradableInstrumentRepository
+from algo.domain.strategy_repository import StrategyRepository
+
+
+class RunWalkForwardInput:
+    def __init__(self, strategy_name: str, start_date: str, end_date: str, in_sample_days: int,
+                 out_of_sample_days: int, step_days: Optional[int] = None):
+        self.strategy_name = strategy_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.in_sample_days = in_sample_days
+        self.out_of_sample_days = out_of_sample_days
+        self.step_days = step_days
+
+
+class RunWalkForwardUseCase:
+    def __init__(self, strategy_repository: StrategyRepository,
+                 historical_data_repository: HistoricalDataRepository,
+                 tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                 historical_data_repository_factory: Optional[Callable[[], HistoricalDataRepository]] = None,
+                 max_workers: Optional[int] = None,
+                 worker_setup: Optional[Callable[[], None]] = None):
+        self.strategy_repository = strategy_repository
+        self.runner = WalkForwardRunner(
+            historical_data_repository,
+            tradable_instrument_repository_factory,
+            historical_data_repository_factory=historical_data_repository_factory,
+            max_workers=max_workers,
+            worker_setup=worker_setup
+        )
+
+    def execute(self, input_data: RunWalkForwardInput, vectorized: bool = True) -> dict:
+        start, end = parse_backtest_dates(
+            RunBacktestInput(input_data.strategy_name, input_data.start_date, input_data.end_date)
+        )
+        try:
+            in_sample_days = int(input_data.in_sample_days or 0)
+            out_of_sample_days = int(input_data.out_of_sample_days)
+            step_days = int(input_data.step_days) if input_data.step_days else None
+        except (TypeError, ValueError):
+            raise ValueError('in_sample_days, out_of_sample_days and step_days must be integers')
+        folds = build_folds(start, end, in_sample_days, out_of_sample_days, step_days)
+        strategy = self.strategy_repository.get_strategy(input_data.strategy_name)
+        result = self.runner.run(strategy, folds, vectorized=vectorized)
+        return {
+            "strategy_name": input_data.strategy_name,
+            "start_date": input_data.start_date,
+            "end_date": input_data.end_date,
+            **result,
+        }
@@ -1,8 +1,14 @@
 import logging
 import time
 from datetime import date
+from typing import Callable, Optional
+import numpy as np
+import pandas as pd
+from algo.domain.backtest.historical_data import HistoricalData
 from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
-from algo.domain.strategy.strategy import Strategy
+from algo.domain.backtest.preloaded_historical_data_repository import PreloadedHistoricalDataRepository
+from algo.domain.strategy.strategy import Strategy, RuleSet
+from algo.domain.indicators.cache import IndicatorCache
 from algo.domain.backtest.report import BackTestReport
 from algo.domain.strategy.strategy_evaluator import StrategyEvaluator
 from algo.domain.backtest.backtest_trade_executor import BackTestTradeExecutor
@@ -15,17 +21,37 @@ logger = logging.getLogger(__name__)
 class BackTest:
 
     def __init__(self, strategy: Strategy, historical_data_repository: HistoricalDataRepository, 
-                 tradable_instrument_repository: TradableInstrumentRepository, start_date: date, end_date: date):
+                 tradable_instrument_repository: TradableInstrumentRepository, start_date: date, end_date: date,
+                 indicator_cache: Optional[IndicatorCache] = None):
         self.strategy = strategy
         self.historical_data_repository = historical_data_repository
         self.tradable_instrument_repository = tradable_instrument_repository
         self.start_date = start_date
         self.end_date = end_date
+        # Pass a shared cache to reuse indicator values across backtests of the same dataset
+        self.indicator_cache = indicator_cache if indicator_cache is not None else IndicatorCache()
 
-    def run(self) -> BackTestReport:
+    # Number of progress updates reported over a run
+    PROGRESS_STEPS = 100
+
+    def run(self, vectorized: bool = False,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> BackTestReport:
         """
         Run the backtest using StrategyEvaluator and BackTestTradeExecutor.
         
+        Args:
+            vectorized: When True, every entry/exit rule is evaluated once over the whole
+                extended range as NumPy series instead of once per candle on its lookback
+                window. Trade signals, stop losses and trade execution are computed from the
+                rule outcomes the same way in both modes, so the report matches the per-candle
+                run exactly when the rule outcomes match. They always match for rules on price
+                and number. Recursive indicators (EMA, RSI, ATR, ADX, +DI, -DI) are seeded from
+                the start of the extended range instead of the start of each candle's lookback
+                window, so their values, and the trades of rules using them, can differ while
+                the indicator is still converging.
+            progress_callback: Called with (candles processed, total candles in the backtest
+                range) periodically during the candle loop and once when it finishes
+        
         Returns:
             BackTestReport: The backtest results
         """
@@ -37,21 +63,6 @@ class BackTest:
             tradable_instrument
         )
         
-        # Initialize components
-        strategy_evaluator = StrategyEvaluator(
-            self.strategy, 
-            self.historical_data_repository, 
-            self.tradable_instrument_repository
-        )
-        
-        trade_executor = BackTestTradeExecutor(
-            self.tradable_instrument_repository,
-            self.historical_data_repository,
-            self.strategy
-        )
-        
-
-        
         # Get historical data for the underlying instrument over the entire backtest period
         underlying_instrument = self.strategy.get_instrument()
         timeframe = Timeframe(self.strategy.get_timeframe())
@@ -65,34 +76,85 @@ class BackTest:
             timeframe
         )
         
+        # Serve per-candle history windows and execution candles from the loaded data
+        preloaded_repository = PreloadedHistoricalDataRepository(
+            self.historical_data_repository,
+            underlying_instrument,
+            timeframe,
+            historical_data,
+            extended_start_date,
+            self.end_date
+        )
+        
+        # Initialize components
+        strategy_evaluator = StrategyEvaluator(
+            self.strategy, 
+            preloaded_repository, 
+            self.tradable_instrument_repository
+        )
+        
+        trade_executor = BackTestTradeExecutor(
+            self.tradable_instrument_repository,
+            preloaded_repository,
+            self.strategy
+        )
+        
         # Process each candle in the historical data
-        logger.debug(f"BackTest.run: Starting candle processing (total candles: {len(historical_data.data)})")
+        logger.debug(f"BackTest.run: Starting candle processing (total candles: {len(historical_data)}, vectorized: {vectorized})")
         loop_start = time.perf_counter()
         candles_processed = 0
+        total_candles = self._count_candles_in_range(historical_data) if progress_callback else 0
+        progress_interval = max(1, total_candles // self.PROGRESS_STEPS)
+        if progress_callback:
+            progress_callback(0, total_candles)
+        
+        # Indicator values are memoized for the run so entry and exit rules share them
+        with self.indicator_cache.activate():
+            if vectorized:
+                entry_signals, exit_signals = self._compute_rule_series(historical_data)
         
-        for i, candle in enumerate(historical_data.data):
-            candle_date = candle['timestamp'].date()
+            # Candles before the start date are only history; jump straight to the first one in range
+            first_index = self._first_candle_index(historical_data)
+            candles = historical_data[first_index:] if first_index else historical_data
+            for i, candle in enumerate(candles, start=first_index):
+                candle_date = candle['timestamp'].date()
             
-            # Skip candles before the backtest start date
-            if candle_date < self.start_date:
-                continue
+                # Skip candles before the backtest start date
+                if candle_date < self.start_date:
+                    continue
                 
-            # Skip candles after the backtest end date
-            if candle_date > self.end_date:
-                break
+                # Skip candles after the backtest end date
+                if candle_date > self.end_date:
+                    break
             
-            candles_processed += 1
+                candles_processed += 1
             
-            # Evaluate strategy to generate trade signals
-            trade_signals = strategy_evaluator.evaluate(candle)
+                # Evaluate strategy to generate trade signals
+                if vectorized:
+                    trade_signals = strategy_evaluator.evaluate_precomputed(
+                        candle, bool(entry_signals[i]), bool(exit_signals[i])
+                    )
+                else:
+                    trade_signals = strategy_evaluator.evaluate(candle)
             
             
-            # Execute each trade signal
-            for trade_signal in trade_signals:
-                trade_executor.execute(trade_signal)
+                # Execute each trade signal
+                for trade_signal in trade_signals:
+                    trade_executor.execute(trade_signal)
+            
+                if progress_callback and candles_processed % progress_interval == 0:
+                    progress_callback(candles_processed, total_candles)
+        
+        if progress_callback:
+            progress_callback(candles_processed, total_candles)
         
         loop_elapsed = time.perf_counter() - loop_start
         logger.debug(f"BackTest.run: Candle processing completed in {loop_elapsed:.3f}s (candles processed: {candles_processed})")
+        logger.debug(f"BackTest.run: Indicator cache stats: {self.indicator_cache.get_stats()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for label, rules in (("entry", self.strategy.get_entry_rules()), ("exit", self.strategy.get_exit_rules())):
+                if isinstance(rules, RuleSet):
+                    logger.debug(f"BackTest.run: {label} condition evaluations: {rules.get_evaluation_counts()}")
         
         # Get the final state of the tradable instrument (it should exist since we created it at the start)
         tradables = self.tradable_instrument_repository.get_tradable_instruments(self.strategy.get_name())
@@ -105,3 +167,48 @@ class BackTest:
             start_date=self.start_date, 
             end_date=self.end_date
         )
+
+    def _compute_rule_series(self, historical_data: HistoricalData):
+        """
+        Evaluate the entry and exit rule sets over all candles in one pass.
+        
+        Args:
+            historical_data: The extended-range candles loaded for the backtest
+            
+        Returns:
+            tuple: (entry_signals, exit_signals) boolean arrays aligned with the candles
+        """
+        if len(historical_data) == 0:
+            return [], []
+        
+        series_start = time.perf_counter()
+        entry_signals = self.strategy.entry_signal_series(historical_data)
+        exit_signals = self.strategy.exit_signal_series(historical_data)
+        logger.debug(f"BackTest.run: Rule series computed in {time.perf_counter() - series_start:.3f}s")
+        return entry_signals, exit_signals
+
+    def _count_candles_in_range(self, historical_data: HistoricalData) -> int:
+        """Count the candles dated within [start_date, end_date], i.e. the ones the run processes."""
+        timestamps = historical_data.timestamps
+        if timestamps is None or len(timestamps) == 0:
+            return 0
+        start, end = self._range_bounds(timestamps)
+        return int(np.count_nonzero((timestamps >= start) & (timestamps < end)))
+
+    def _first_candle_index(self, historical_data: HistoricalData) -> int:
+        """Position of the first candle on or after start_date when the candles are sorted, else 0."""
+        if not isinstance(historical_data, HistoricalData) or len(historical_data) == 0:
+            return 0
+        timestamps = historical_data.timestamps
+        if timestamps is None or not timestamps.is_monotonic_increasing:
+            return 0
+        start, _ = self._range_bounds(timestamps)
+        return int(timestamps.searchsorted(start, side="left"))
+
+    def _range_bounds(self, timestamps: pd.DatetimeIndex):
+        """[start, end) timestamps of the backtest dates in the timezone of the candles."""
+        start = pd.Timestamp(self.start_date)
+        end = pd.Timestamp(self.end_date) + pd.Timedelta(days=1)
+        if timestamps.tz is not None:
+            start, end = start.tz_localize(timestamps.tz), end.tz_localize(timestamps.tz)
+        return start, end
@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Callable, Optional
 from dotenv import load_dotenv
 
 from algo.domain.strategy.strategy import Strategy
@@ -9,15 +10,20 @@ from algo.domain.timeframe import Timeframe
 from algo.domain.backtest.report import BackTestReport
 from algo.domain.backtest.backtest import BackTest
 from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.cache import IndicatorCache
 
 
 class BacktestEngine:
     def __init__(self, historical_data_repository: HistoricalDataRepository, 
-                 tradable_instrument_repository: TradableInstrumentRepository):
+                 tradable_instrument_repository: TradableInstrumentRepository,
+                 indicator_cache: Optional[IndicatorCache] = None):
         self.historical_data_repository = historical_data_repository
         self.tradable_instrument_repository = tradable_instrument_repository
+        # Shared by every backtest started on this engine when set
+        self.indicator_cache = indicator_cache
 
-    def start(self, strategy: Strategy, start_date: date, end_date: date) -> BackTestReport:
+    def start(self, strategy: Strategy, start_date: date, end_date: date, vectorized: bool = False,
+              progress_callback: Optional[Callable[[int, int], None]] = None) -> BackTestReport:
         """
         Start backtest using the enhanced BackTest class with StrategyEvaluator and BackTestTradeExecutor.
         
@@ -25,17 +31,21 @@ class BacktestEngine:
             strategy: The trading strategy to backtest
             start_date: Start date for the backtest period
             end_date: End date for the backtest period
+            vectorized: Evaluate strategy rules over the whole series at once (see BackTest.run)
+            progress_callback: Called with (candles processed, total candles) while the backtest runs
             
         Returns:
             BackTestReport: The backtest results
         """
+        options = {"indicator_cache": self.indicator_cache} if self.indicator_cache is not None else {}
         backtest = BackTest(
             strategy=strategy,
             historical_data_repository=self.historical_data_repository,
             tradable_instrument_repository=self.tradable_instrument_repository,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            **options
         )
 
-        report = backtest.run()
+        report = backtest.run(vectorized=vectorized, progress_callback=progress_callback)
         return report
\ No newline at end of file
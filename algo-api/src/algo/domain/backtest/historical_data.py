@@ -1,57 +1,407 @@
-from typing import List, Dict, Any, Optional
+import uuid
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterator, Union
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+
+def _new_dataset_id() -> str:
+    """
+    Random id of a loaded dataset. Datasets are pickled into worker processes, so ids must not
+    repeat across processes, as a per-process counter would.
+    """
+    return uuid.uuid4().hex
+
+
 class HistoricalData:
-    def __init__(self, data: List[Dict[str, Any]]):
-        self.data = data
+    """
+    Candle series stored column-wise.
 
-    def getCandleBy(self, timestamp: str):
-        for candle in self.data:
-            # Support both string and datetime in data
-            candle_ts = candle.get("timestamp")
-            if isinstance(candle_ts, str):
-                if candle_ts == timestamp:
-                    return candle
+    Each column (open, high, low, close, volume, oi, ...) is a contiguous NumPy array and
+    timestamps are kept in a pandas DatetimeIndex, so slicing a range returns a view that
+    shares memory with the parent instead of copying candles. Instances built from the legacy
+    list-of-dicts representation keep that list and hand out the original dicts, while
+    instances built from columns only materialize per-candle dicts when a caller iterates.
+
+    When the timestamps are sorted, range filters are resolved with a binary search and return
+    views, and exact-timestamp lookups go through a hash index that is built once per dataset
+    and shared by every view taken from it.
+    """
+
+    _ITER_CHUNK_SIZE = 4096
+
+    def __init__(self, data: Optional[List[Dict[str, Any]]] = None):
+        records = data if data is not None else []
+        self._records: Optional[List[Dict[str, Any]]] = records
+        self._offset = 0
+        self._length = len(records)
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._timestamps: Optional[pd.DatetimeIndex] = None
+        self._materialized: Optional[List[Dict[str, Any]]] = None
+        self._root: "HistoricalData" = self
+        self._dataset_id = _new_dataset_id()
+        self._sorted: Optional[bool] = None
+        self._timestamp_index: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "HistoricalData":
+        """
+        Build historical data directly from column arrays.
+
+        Args:
+            columns: Mapping of column name to array-like values. The optional 'timestamp'
+                column is converted to a DatetimeIndex (timezone information is preserved).
+
+        Returns:
+            HistoricalData: Columnar historical data without per-candle dicts
+        """
+        arrays = {name: np.asarray(values) for name, values in columns.items() if name != "timestamp"}
+        timestamps = None
+        if "timestamp" in columns:
+            timestamps = pd.DatetimeIndex(columns["timestamp"])
+
+        lengths = {len(values) for values in arrays.values()}
+        if timestamps is not None:
+            lengths.add(len(timestamps))
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got lengths {sorted(lengths)}")
+
+        instance = cls.__new__(cls)
+        instance._records = None
+        instance._offset = 0
+        instance._length = lengths.pop() if lengths else 0
+        instance._columns = arrays
+        instance._timestamps = timestamps
+        instance._materialized = None
+        instance._root = instance
+        instance._dataset_id = _new_dataset_id()
+        instance._sorted = None
+        instance._timestamp_index = None
+        return instance
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "HistoricalData":
+        """
+        Build historical data from a DataFrame without going through per-row dicts.
+
+        Args:
+            df: DataFrame with one row per candle
+
+        Returns:
+            HistoricalData: Columnar historical data
+        """
+        columns = {}
+        for name in df.columns:
+            if name == "timestamp":
+                columns[name] = pd.to_datetime(df[name])
+            else:
+                columns[name] = df[name].to_numpy()
+        instance = cls.from_columns(columns)
+        instance._length = len(df)
+        return instance
+
+    @classmethod
+    def of(cls, historical_data: Union["HistoricalData", pd.DataFrame, List[Dict[str, Any]]]) -> "HistoricalData":
+        """
+        Return the given candles as HistoricalData, converting DataFrames and lists if needed.
+        """
+        if isinstance(historical_data, HistoricalData):
+            return historical_data
+        if isinstance(historical_data, pd.DataFrame):
+            return cls.from_dataframe(historical_data)
+        return cls(list(historical_data))
+
+    @classmethod
+    def concat(cls, parts: List["HistoricalData"]) -> "HistoricalData":
+        """
+        Join consecutive series column by column, without sorting.
+
+        Args:
+            parts: Series in chronological order that do not overlap; columns missing from any
+                part are dropped
+
+        Returns:
+            HistoricalData: The joined candles (the part itself when only one is non-empty)
+        """
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls([])
+        if len(parts) == 1:
+            return parts[0]
+        names = [name for name in parts[0].column_names if all(part.has_column(name) for part in parts)]
+        columns: Dict[str, Any] = {}
+        for name in names:
+            if name == "timestamp":
+                # Parts loaded separately may carry equal offsets as different tz objects
+                first = parts[0].timestamps
+                columns[name] = first.append([
+                    part.timestamps.tz_convert(first.tz) if first.tz is not None else part.timestamps
+                    for part in parts[1:]
+                ])
             else:
-                # Assume datetime, compare isoformat
-                if hasattr(candle_ts, 'isoformat') and candle_ts.isoformat() == timestamp:
-                    return candle
+                columns[name] = np.concatenate([part.column(name) for part in parts])
+        return cls.from_columns(columns)
+
+    @property
+    def data(self) -> List[Dict[str, Any]]:
+        """
+        The candles as a list of dicts, for callers that still expect the legacy representation.
+        """
+        if self._records is not None:
+            if self._offset == 0 and self._length == len(self._records):
+                return self._records
+            return self._records[self._offset:self._offset + self._length]
+        if self._materialized is None:
+            self._materialized = list(self._iter_columns())
+        return self._materialized
+
+    @property
+    def identity(self) -> tuple:
+        """
+        (dataset id, offset, length) of this series. Views over the same candles of the same
+        loaded dataset share an identity, so it can key caches of derived values.
+        """
+        return (self._root._dataset_id, self._offset, self._length)
+
+    @property
+    def timestamps(self) -> Optional[pd.DatetimeIndex]:
+        self._ensure_columns()
+        return self._timestamps
+
+    @property
+    def column_names(self) -> List[str]:
+        self._ensure_columns()
+        names = list(self._columns.keys())
+        if self._timestamps is not None:
+            names.insert(0, "timestamp")
+        return names
+
+    def has_column(self, name: str) -> bool:
+        return name in self.column_names
+
+    def column(self, name: str) -> Union[np.ndarray, pd.DatetimeIndex]:
+        """
+        Return a column without copying it.
+
+        Args:
+            name: Column name, e.g. 'close' or 'timestamp'
+
+        Returns:
+            The column array ('timestamp' is returned as a DatetimeIndex)
+
+        Raises:
+            KeyError: If the column does not exist
+        """
+        self._ensure_columns()
+        if name == "timestamp" and self._timestamps is not None:
+            return self._timestamps
+        if name not in self._columns:
+            raise KeyError(name)
+        return self._columns[name]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the candles as a DataFrame built from the column arrays."""
+        self._ensure_columns()
+        frame = pd.DataFrame(self._columns, copy=False)
+        if self._timestamps is not None:
+            frame.insert(0, "timestamp", self._timestamps)
+        return frame
+
+    def getCandleBy(self, timestamp: str):
+        """
+        Return the candle whose timestamp matches the given ISO timestamp, or None.
+
+        The lookup uses a hash index keyed by timestamp that is built once for the whole
+        dataset, so each call costs O(1) regardless of how many candles are loaded.
+        """
+        if self._length == 0:
+            return None
+        try:
+            key = pd.Timestamp(timestamp).value
+        except (ValueError, TypeError):
+            return None
+
+        position = self._root._get_timestamp_index().get(key)
+        if position is None:
+            return None
+        index = position - self._offset
+        if not 0 <= index < self._length:
+            return None
+
+        candle = self[index]
+        # The index matches instants; keep the original exact string comparison semantics
+        candle_ts = candle.get("timestamp")
+        if isinstance(candle_ts, str):
+            return candle if candle_ts == timestamp else None
+        if hasattr(candle_ts, 'isoformat') and candle_ts.isoformat() == timestamp:
+            return candle
         return None
 
-    def filter(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    def filter(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "HistoricalData":
         """
         Filter historical data by timestamp range.
-        
+
         Args:
             start: Start datetime (inclusive). If None, no start filtering is applied.
             end: End datetime (inclusive). If None, no end filtering is applied.
-            
+
         Returns:
-            List[Dict[str, Any]]: Filtered list of candle data
+            HistoricalData: Filtered candles; a view sharing memory with this instance
+            whenever the matching candles are contiguous
         """
         if start is None and end is None:
-            return self.data
-        
-        filtered_data = []
-        for candle in self.data:
-            candle_timestamp = candle.get("timestamp")
-            
-            # Skip if timestamp is missing
-            if candle_timestamp is None:
-                continue
-                
-            # Apply filtering logic
-            if start is None:
-                # Only end filtering
-                if candle_timestamp <= end:
-                    filtered_data.append(candle)
-            elif end is None:
-                # Only start filtering
-                if candle_timestamp >= start:
-                    filtered_data.append(candle)
-            else:
-                # Both start and end filtering
-                if start <= candle_timestamp <= end:
-                    filtered_data.append(candle)
-                    
-        return filtered_data
+            return self
+
+        timestamps = self.timestamps
+        if timestamps is None:
+            # No candle carries a timestamp
+            return self._slice(0, 0)
+
+        if self._root._is_sorted():
+            left = timestamps.searchsorted(start, side="left") if start is not None else 0
+            right = timestamps.searchsorted(end, side="right") if end is not None else self._length
+            return self._slice(left, max(left, right))
+
+        # Unsorted data or data with missing timestamps
+        mask = np.ones(self._length, dtype=bool)
+        if start is not None:
+            mask &= np.asarray(timestamps >= start)
+        if end is not None:
+            mask &= np.asarray(timestamps <= end)
+
+        indices = np.flatnonzero(mask)
+        if indices.size == 0:
+            return self._slice(0, 0)
+        first, last = int(indices[0]), int(indices[-1])
+        if last - first + 1 == indices.size:
+            return self._slice(first, last + 1)
+        return self._take(indices)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._records is not None:
+            return islice(self._records, self._offset, self._offset + self._length)
+        if self._materialized is not None:
+            return iter(self._materialized)
+        return self._iter_columns()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return self._take(np.arange(start, stop, step))
+            return self._slice(start, max(start, stop))
+        index = int(key)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("historical data index out of range")
+        if self._records is not None:
+            return self._records[self._offset + index]
+        return self._row(index)
+
+    def __eq__(self, other):
+        if isinstance(other, HistoricalData):
+            return len(self) == len(other) and list(self) == list(other)
+        if isinstance(other, list):
+            return len(self) == len(other) and list(self) == other
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"HistoricalData(candles={self._length}, columns={self.column_names})"
+
+    def _ensure_columns(self) -> None:
+        if self._columns is not None:
+            return
+        # Legacy list-of-dicts instances: build the columns once
+        frame = pd.DataFrame(self.data)
+        self._columns = {
+            name: frame[name].to_numpy() for name in frame.columns if name != "timestamp"
+        }
+        self._timestamps = None
+        if "timestamp" in frame.columns:
+            self._timestamps = pd.DatetimeIndex(pd.to_datetime(frame["timestamp"], errors="coerce"))
+
+    def _is_sorted(self) -> bool:
+        if self._sorted is None:
+            self._ensure_columns()
+            self._sorted = self._timestamps is not None and self._timestamps.is_monotonic_increasing
+        return self._sorted
+
+    def _get_timestamp_index(self) -> Dict[int, int]:
+        """Map each timestamp (as int64 nanoseconds) to the position of its first candle."""
+        if self._timestamp_index is None:
+            self._ensure_columns()
+            index: Dict[int, int] = {}
+            if self._timestamps is not None:
+                valid = ~self._timestamps.isna()
+                for position, key in zip(np.flatnonzero(valid).tolist(), self._timestamps.asi8[valid].tolist()):
+                    index.setdefault(key, self._offset + position)
+            self._timestamp_index = index
+        return self._timestamp_index
+
+    def _slice(self, start: int, stop: int) -> "HistoricalData":
+        """Return a view over candles [start, stop) sharing this instance's arrays."""
+        self._ensure_columns()
+        view = HistoricalData.__new__(HistoricalData)
+        view._records = self._records
+        view._offset = self._offset + start
+        view._length = stop - start
+        view._materialized = None
+        view._root = self._root
+        view._sorted = None
+        view._timestamp_index = None
+        view._columns = {name: values[start:stop] for name, values in self._columns.items()}
+        view._timestamps = self._timestamps[start:stop] if self._timestamps is not None else None
+        return view
+
+    def _take(self, indices: np.ndarray) -> "HistoricalData":
+        """Return a compacted copy holding only the candles at the given positions."""
+        self._ensure_columns()
+        taken = HistoricalData.__new__(HistoricalData)
+        taken._records = None
+        if self._records is not None:
+            taken._records = [self._records[self._offset + int(i)] for i in indices]
+        taken._offset = 0
+        taken._length = len(indices)
+        taken._materialized = None
+        taken._root = taken
+        taken._dataset_id = _new_dataset_id()
+        taken._sorted = None
+        taken._timestamp_index = None
+        taken._columns = {name: values[indices] for name, values in self._columns.items()}
+        taken._timestamps = self._timestamps[indices] if self._timestamps is not None else None
+        return taken
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        row = {}
+        if self._timestamps is not None:
+            row["timestamp"] = self._timestamps[index]
+        for name, values in self._columns.items():
+            value = values[index]
+            row[name] = value.item() if isinstance(value, np.generic) else value
+        return row
+
+    def _iter_columns(self) -> Iterator[Dict[str, Any]]:
+        names = list(self._columns.keys())
+        for chunk_start in range(0, self._length, self._ITER_CHUNK_SIZE):
+            chunk_stop = min(chunk_start + self._ITER_CHUNK_SIZE, self._length)
+            values = [self._columns[name][chunk_start:chunk_stop].tolist() for name in names]
+            timestamps = None
+            if self._timestamps is not None:
+                timestamps = list(self._timestamps[chunk_start:chunk_stop])
+            for offset in range(chunk_stop - chunk_start):
+                row = {}
+                if timestamps is not None:
+                    row["timestamp"] = timestamps[offset]
+                for name, column in zip(names, values):
+                    row[name] = column[offset]
+                yield row
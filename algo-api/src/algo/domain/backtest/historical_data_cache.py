@@ -0,0 +1,276 @@
+"""
+Process-wide cache of loaded historical data.
+
+Backtests of the same instrument and timeframe keep asking for overlapping date ranges, and every
+request used to load them again from Parquet files or the broker API. The cache keeps one loaded
+range per (source, instrument, timeframe), serves any sub-range as a view of it, bounds its memory
+by a byte budget with LRU eviction, and lets concurrent requests for the same data share one load.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import pytz
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+CacheKey = Tuple[str, str, str]
+
+
+def _today() -> date:
+    """Current date at the exchange."""
+    return datetime.now(pytz.timezone("Asia/Kolkata")).date()
+
+
+class _CacheEntry:
+    def __init__(self, start_date: date, end_date: date, data: HistoricalData, size: int):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.data = data
+        self.size = size
+
+    def covers(self, start_date: date, end_date: date) -> bool:
+        return self.start_date <= start_date and end_date <= self.end_date
+
+
+class _PendingLoad:
+    """A load in progress that other threads asking for the same key can wait on."""
+
+    def __init__(self, start_date: date, end_date: date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.done = threading.Event()
+        self.data: Optional[HistoricalData] = None
+
+    def covers(self, start_date: date, end_date: date) -> bool:
+        return self.start_date <= start_date and end_date <= self.end_date
+
+
+def estimate_size(data: HistoricalData) -> int:
+    """Bytes held by the column arrays of the data."""
+    return sum(data.column(name).nbytes for name in data.column_names)
+
+
+def subset(data: HistoricalData, start_date: date, end_date: date) -> HistoricalData:
+    """
+    The candles of data from start_date to end_date (inclusive), as a view where possible.
+    """
+    timestamps = data.timestamps
+    if timestamps is None or len(data) == 0:
+        return data
+    start = pd.Timestamp(start_date, tz=timestamps.tz)
+    end = pd.Timestamp(end_date + timedelta(days=1), tz=timestamps.tz) - pd.Timedelta(1, "ns")
+    return data.filter(start, end)
+
+
+class HistoricalDataCache:
+    """
+    Thread-safe, byte-bounded LRU cache of loaded historical data.
+
+    One entry is kept per key, covering a contiguous date range. A request inside the range is a
+    hit and gets a zero-copy view; a request overlapping or adjacent to it loads only the missing
+    days before and after the range and joins them to the entry, and any other request replaces
+    the entry. Only days before the current exchange date are cached, since later candles may
+    still be added to the source, and empty loads are not cached at all, so that data
+    downloaded after the first request is seen by the next one. Entries are stored column-wise and
+    evicted least recently used first once their total size exceeds ``max_bytes``; data larger
+    than the whole budget is returned without being cached. Concurrent misses for the same key
+    wait for the load already in flight instead of starting another one.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._pending: Dict[CacheKey, _PendingLoad] = {}
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.in_flight_waits = 0
+        self.uncacheable = 0
+
+    def get_or_load(self, key: CacheKey, start_date: date, end_date: date,
+                    load: Callable[[date, date], HistoricalData]) -> HistoricalData:
+        """
+        Return the candles of key from start_date to end_date, loading them on a miss.
+
+        Args:
+            key: (source, instrument key, timeframe) identifying the series
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            load: Callable loading the candles of a date range from the source
+
+        Returns:
+            HistoricalData: The requested range
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.covers(start_date, end_date):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return subset(entry.data, start_date, end_date)
+                pending = self._pending.get(key)
+                if pending is None:
+                    if entry is not None and not self._touches(entry, start_date, end_date):
+                        entry = None
+                    load_start = min(start_date, entry.start_date) if entry else start_date
+                    load_end = max(end_date, entry.end_date) if entry else end_date
+                    pending = _PendingLoad(load_start, load_end)
+                    self._pending[key] = pending
+                    self.misses += 1
+                    break
+                self.in_flight_waits += 1
+
+            pending.done.wait()
+            if pending.data is not None and pending.covers(start_date, end_date):
+                with self._lock:
+                    self.hits += 1
+                return subset(pending.data, start_date, end_date)
+            # The load failed or was for another range: check the cache again
+
+        try:
+            if entry is None:
+                data = self._to_columns(load(pending.start_date, pending.end_date))
+            else:
+                data = self._extend(entry, pending.start_date, pending.end_date, load)
+            pending.data = data
+            cache_end = min(pending.end_date, _today() - timedelta(days=1))
+            if len(data) > 0 and pending.start_date <= cache_end:
+                cached = data if cache_end == pending.end_date else subset(data, pending.start_date, cache_end)
+                self._store(key, _CacheEntry(pending.start_date, cache_end, cached, estimate_size(cached)))
+            else:
+                logger.debug(f"Not caching historical data for {key} from {pending.start_date} to {pending.end_date}")
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+        return subset(data, start_date, end_date)
+
+    @staticmethod
+    def _touches(entry: _CacheEntry, start_date: date, end_date: date) -> bool:
+        return start_date <= entry.end_date + timedelta(days=1) and entry.start_date <= end_date + timedelta(days=1)
+
+    def _extend(self, entry: _CacheEntry, start_date: date, end_date: date,
+                load: Callable[[date, date], HistoricalData]) -> HistoricalData:
+        parts = []
+        if start_date < entry.start_date:
+            before = entry.start_date - timedelta(days=1)
+            parts.append(subset(self._to_columns(load(start_date, before)), start_date, before))
+        parts.append(entry.data)
+        if end_date > entry.end_date:
+            after = entry.end_date + timedelta(days=1)
+            parts.append(subset(self._to_columns(load(after, end_date)), after, end_date))
+        return self._to_columns(HistoricalData.concat(parts))
+
+    @staticmethod
+    def _to_columns(data: HistoricalData) -> HistoricalData:
+        # Cached data is kept column-wise only: no per-candle dicts, and a size that can be measured
+        if len(data) == 0:
+            return data
+        return HistoricalData.from_columns({name: data.column(name) for name in data.column_names})
+
+    def _store(self, key: CacheKey, entry: _CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            if entry.size > self.max_bytes:
+                self.uncacheable += 1
+                logger.warning(f"Historical data for {key} ({entry.size} bytes) exceeds the cache budget of {self.max_bytes} bytes")
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+                logger.debug(f"Evicted historical data for {evicted_key} ({evicted.size} bytes)")
+
+    def invalidate(self, key: CacheKey) -> bool:
+        """Drop the entry of a key. Returns True if there was one."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._size -= entry.size
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.in_flight_waits = 0
+            self.uncacheable = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current memory use."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "in_flight_waits": self.in_flight_waits,
+                "uncacheable": self.uncacheable,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "loads_in_flight": len(self._pending),
+            }
+
+    def get_entries(self) -> Dict[str, Any]:
+        """Return the cached ranges, least recently used first."""
+        with self._lock:
+            return {"cached_data": [
+                {
+                    "source": source,
+                    "instrument_key": instrument_key,
+                    "timeframe": timeframe,
+                    "start_date": entry.start_date.isoformat(),
+                    "end_date": entry.end_date.isoformat(),
+                    "record_count": len(entry.data),
+                    "bytes": entry.size,
+                }
+                for (source, instrument_key, timeframe), entry in self._entries.items()
+            ]}
+
+
+class CachingHistoricalDataRepository(HistoricalDataRepository):
+    """Serves a repository's historical data through a shared HistoricalDataCache."""
+
+    def __init__(self, delegate: HistoricalDataRepository, cache: HistoricalDataCache, source: Optional[str] = None):
+        """
+        Args:
+            delegate: Repository the data is loaded from on a miss
+            cache: The shared cache
+            source: Name of the data source in cache keys; repositories reading different data
+                must use different names (defaults to the delegate's class name)
+        """
+        self.delegate = delegate
+        self.cache = cache
+        self.source = source or type(delegate).__name__
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        key = (self.source, instrument.instrument_key, timeframe.value)
+        return self.cache.get_or_load(
+            key, start_date, end_date,
+            lambda load_start, load_end: self.delegate.get_historical_data(instrument, load_start, load_end, timeframe)
+        )
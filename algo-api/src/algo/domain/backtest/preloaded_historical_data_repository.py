@@ -0,0 +1,59 @@
+from datetime import date, datetime, time
+from typing import Union
+
+import pandas as pd
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.timeframe import Timeframe
+
+
+class PreloadedHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Serves windows of a dataset that has already been loaded for a backtest.
+
+    Requests for the preloaded instrument and timeframe that fall inside the loaded date range
+    are answered with binary-search views over the loaded HistoricalData, so the per-candle
+    lookups made by StrategyEvaluator and BackTestTradeExecutor do not touch the underlying
+    repository again. Any other request is delegated.
+    """
+
+    def __init__(self, delegate: HistoricalDataRepository, instrument: Instrument, timeframe: Timeframe,
+                 historical_data: HistoricalData, start_date: Union[date, datetime], end_date: Union[date, datetime]):
+        self.delegate = delegate
+        self.instrument = instrument
+        self.timeframe = Timeframe(timeframe)
+        self.historical_data = historical_data
+        self.start_date = self._as_date(start_date)
+        self.end_date = self._as_date(end_date)
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        start_date = self._as_date(start_date)
+        end_date = self._as_date(end_date)
+        if not self._covers(instrument, start_date, end_date, timeframe):
+            return self.delegate.get_historical_data(instrument, start_date, end_date, timeframe)
+
+        timestamps = self.historical_data.timestamps
+        tz = timestamps.tz if timestamps is not None else None
+        return self.historical_data.filter(
+            start=self._localize(datetime.combine(start_date, time.min), tz),
+            end=self._localize(datetime.combine(end_date, time.max), tz),
+        )
+
+    def _covers(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> bool:
+        return (
+            instrument.instrument_key == self.instrument.instrument_key
+            and Timeframe(timeframe) == self.timeframe
+            and self.start_date <= start_date
+            and end_date <= self.end_date
+        )
+
+    @staticmethod
+    def _localize(value: datetime, tz) -> pd.Timestamp:
+        timestamp = pd.Timestamp(value)
+        return timestamp.tz_localize(tz) if tz is not None else timestamp
+
+    @staticmethod
+    def _as_date(value: Union[date, datetime]) -> date:
+        return value.date() if isinstance(value, datetime) else value
@@ -34,6 +34,22 @@ class BackTestReport:
             }
         }
 
+    def get_summary_metrics(self) -> dict:
+        """Return the numeric summary metrics of the report, including the win rate."""
+        total_trades = self.total_trades_count()
+        return {
+            "total_pnl_points": self.total_pnl_points(),
+            "total_pnl_percentage": self.total_pnl_percentage(),
+            "winning_trades_count": self.winning_trades_count(),
+            "losing_trades_count": self.losing_trades_count(),
+            "total_trades_count": total_trades,
+            "winning_streak": self.winning_streak(),
+            "losing_streak": self.losing_streak(),
+            "max_gain": self.max_gain(),
+            "max_loss": self.max_loss(),
+            "win_rate": self.winning_trades_count() / total_trades if total_trades else 0.0,
+        }
+
     def __repr__(self):
         return self.to_dict().__repr__()
     
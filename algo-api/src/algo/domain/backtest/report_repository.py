@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
 from algo.domain.backtest.report import BackTestReport
 
 
 class BacktestReportRepository(ABC):
 
     @abstractmethod
-    def save(self, report: BackTestReport) -> None:
+    def save(self, report: BackTestReport, report_id: Optional[str] = None,
+             result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Persist a report.
+
+        Args:
+            report: The backtest report
+            report_id: Id the report can be found under, e.g. the id of the job that produced it
+            result: The response the report was returned as, kept so find() can return it unchanged
+        """
         pass
+
+    def find(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the persisted report saved under report_id, with its "result" if one was saved,
+        or None if there is none.
+        This default implementation persists nothing that can be read back.
+        """
+        return None
@@ -0,0 +1,185 @@
+"""
+Derive coarser candles from 1-minute base data.
+
+Only 1-minute candles need to be downloaded and stored: 5, 15, 30 and 60-minute and daily
+candles are aggregated from them column-wise with NumPy (first open, highest high, lowest low,
+last close, summed volume, last open interest), one pass over the arrays per column. Intraday
+buckets start at the session open of each day as configured in the TradingWindowService (09:15
+for NSE), so a 60-minute series has candles at 09:15, 10:15, ... like the broker's, and never
+span two days. Daily candles are stamped at midnight, like the broker's daily candles.
+"""
+import logging
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_cache import HistoricalDataCache
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_calendar import TradingCalendar
+from algo.domain.trading.trading_window_service import TradingWindowService
+
+logger = logging.getLogger(__name__)
+
+BASE_TIMEFRAME = Timeframe.ONE_MINUTE
+
+BUCKET_MINUTES: Dict[Timeframe, int] = {
+    Timeframe.FIVE_MINUTES: 5,
+    Timeframe.FIFTEEN_MINUTES: 15,
+    Timeframe.THIRTY_MINUTES: 30,
+    Timeframe.SIXTY_MINUTES: 60,
+}
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+
+# Reduction per column; other columns keep the value of the last candle of the bucket
+_FIRST = {"open"}
+_MAX = {"high"}
+_MIN = {"low"}
+_SUM = {"volume"}
+
+
+def can_resample(timeframe: Timeframe) -> bool:
+    """Whether the timeframe can be derived from 1-minute candles."""
+    return timeframe in BUCKET_MINUTES or timeframe == Timeframe.ONE_DAY
+
+
+def resample(data: HistoricalData, timeframe: Timeframe, calendar: Optional[TradingCalendar] = None) -> HistoricalData:
+    """
+    Aggregate 1-minute candles into candles of a coarser timeframe.
+
+    Args:
+        data: 1-minute candles with timestamps
+        timeframe: Target timeframe (see can_resample)
+        calendar: Trading calendar of the instrument; intraday buckets of days without a
+            session in it, or of all days without a calendar, start at their first candle
+
+    Returns:
+        HistoricalData: The aggregated candles, each stamped with the start of its bucket
+    """
+    timeframe = Timeframe(timeframe)
+    if not can_resample(timeframe):
+        raise ValueError(f"Cannot resample to {timeframe.value}")
+    timestamps = data.timestamps
+    if timestamps is None or len(data) == 0:
+        return data
+
+    # Wall-clock nanoseconds, so that days and session times are local to the exchange
+    local = timestamps.tz_localize(None) if timestamps.tz is not None else timestamps
+    ns = local.asi8
+    order = None
+    if not local.is_monotonic_increasing:
+        order = np.argsort(ns, kind="stable")
+        ns = ns[order]
+
+    days = ns // _NS_PER_DAY
+    if timeframe == Timeframe.ONE_DAY:
+        bucket_starts = days * _NS_PER_DAY
+    else:
+        bucket_starts = _intraday_bucket_starts(ns, days, BUCKET_MINUTES[timeframe], calendar)
+
+    starts = np.flatnonzero(np.r_[True, bucket_starts[1:] != bucket_starts[:-1]])
+    ends = np.r_[starts[1:], len(ns)] - 1
+
+    bucket_index = pd.DatetimeIndex(bucket_starts[starts].astype("datetime64[ns]"))
+    if timestamps.tz is not None:
+        bucket_index = bucket_index.tz_localize(timestamps.tz)
+    columns: Dict[str, object] = {"timestamp": bucket_index}
+    for name in data.column_names:
+        if name == "timestamp":
+            continue
+        values = np.asarray(data.column(name))
+        if order is not None:
+            values = values[order]
+        columns[name] = _reduce(name, values, starts, ends)
+    return HistoricalData.from_columns(columns)
+
+
+def _intraday_bucket_starts(ns: np.ndarray, days: np.ndarray, minutes: int,
+                            calendar: Optional[TradingCalendar]) -> np.ndarray:
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    minute_of_day = (ns - days * _NS_PER_DAY) // _NS_PER_MINUTE
+
+    # Session open per day, in minutes after midnight; the first candle where it is unknown
+    first_minute = np.full(len(unique_days), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_minute, day_index, minute_of_day)
+    open_minute = first_minute
+    if calendar is not None:
+        try:
+            session_minute = calendar.session_open_minutes(unique_days)
+            open_minute = np.where(session_minute >= 0, session_minute, first_minute)
+        except ValueError as e:
+            # No trading window configuration for a year of the data
+            logger.debug(f"Aligning buckets to the first candle of each day: {e}")
+
+    day_open = open_minute[day_index]
+    bucket_minute = day_open + np.floor_divide(minute_of_day - day_open, minutes) * minutes
+    return days * _NS_PER_DAY + bucket_minute * _NS_PER_MINUTE
+
+
+def _reduce(name: str, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    if values.dtype == object:
+        # Columns with missing values (e.g. oi of an index) are not reduced arithmetically
+        return values[starts] if name in _FIRST else values[ends]
+    if name in _FIRST:
+        return values[starts]
+    if name in _MAX:
+        return np.maximum.reduceat(values, starts)
+    if name in _MIN:
+        return np.minimum.reduceat(values, starts)
+    if name in _SUM:
+        return np.add.reduceat(values, starts)
+    return values[ends]
+
+
+class ResamplingHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Serves coarser timeframes by resampling the delegate's 1-minute candles.
+
+    Requests for 5, 15, 30 and 60-minute and daily candles load the 1-minute candles of the
+    range from the delegate and aggregate them (see resample); other timeframes go to the
+    delegate as they are. With a cache, derived series are kept in it under their own source
+    name, so each is aggregated once and later ranges only aggregate the days they add.
+    """
+
+    def __init__(self, delegate: HistoricalDataRepository,
+                 trading_window_service: Optional[TradingWindowService] = None,
+                 cache: Optional[HistoricalDataCache] = None, source: Optional[str] = None):
+        """
+        Args:
+            delegate: Repository serving the 1-minute candles
+            trading_window_service: Session open times; without it, buckets start at the first
+                candle of each day
+            cache: Cache for the derived series (optional)
+            source: Name of the base data source in cache keys (defaults to the delegate's
+                class name)
+        """
+        self.delegate = delegate
+        self.trading_window_service = trading_window_service
+        self.cache = cache
+        self.source = f"{source or type(delegate).__name__}:resampled"
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        timeframe = Timeframe(timeframe)
+        if not can_resample(timeframe):
+            return self.delegate.get_historical_data(instrument, start_date, end_date, timeframe)
+        if self.cache is None:
+            return self._load(instrument, start_date, end_date, timeframe)
+        key = (self.source, instrument.instrument_key, timeframe.value)
+        return self.cache.get_or_load(
+            key, start_date, end_date,
+            lambda load_start, load_end: self._load(instrument, load_start, load_end, timeframe)
+        )
+
+    def _load(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        base = self.delegate.get_historical_data(instrument, start_date, end_date, BASE_TIMEFRAME)
+        logger.debug(f"Resampling {len(base)} {BASE_TIMEFRAME.value} candles of {instrument.instrument_key} to {timeframe.value}")
+        calendar = None
+        if self.trading_window_service is not None and instrument.type is not None:
+            calendar = self.trading_window_service.get_trading_calendar(instrument.exchange, instrument.type)
+        return resample(HistoricalData.of(base), timeframe, calendar)
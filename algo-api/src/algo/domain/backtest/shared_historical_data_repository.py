@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Optional
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.timeframe import Timeframe
+
+
+class SharedHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Serves one already loaded dataset for every request on its instrument and timeframe.
+
+    Backtests that run over parts of the dataset (parameter sweep variants, walk-forward folds)
+    all receive the same HistoricalData, so indicator series are computed over the whole loaded
+    range, warm up continuously, and are cache hits for every backtest after the first. The
+    candles before a backtest's own start date only add warm-up history. Requests for other
+    instruments or timeframes go to the delegate.
+    """
+
+    def __init__(self, delegate: Optional[HistoricalDataRepository], instrument: Instrument,
+                 timeframe: Timeframe, historical_data: HistoricalData):
+        self.delegate = delegate
+        self.instrument = instrument
+        self.timeframe = Timeframe(timeframe)
+        self.historical_data = historical_data
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        if instrument.instrument_key == self.instrument.instrument_key and Timeframe(timeframe) == self.timeframe:
+            return self.historical_data
+        if self.delegate is None:
+            raise ValueError(f"No historical data available for {instrument.instrument_key}")
+        return self.delegate.get_historical_data(instrument, start_date, end_date, timeframe)
@@ -0,0 +1,219 @@
+import logging
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from algo.domain.backtest.engine import BacktestEngine
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.shared_historical_data_repository import SharedHistoricalDataRepository
+from algo.domain.indicators.cache import IndicatorCache
+from algo.domain.strategy.strategy import Strategy
+from algo.domain.strategy.tradable_instrument_repository import TradableInstrumentRepository
+from algo.domain.timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WalkForwardFold:
+    """In-sample and out-of-sample date ranges of one fold (in-sample is None when not used)."""
+    index: int
+    in_sample_start: Optional[date]
+    in_sample_end: Optional[date]
+    out_of_sample_start: date
+    out_of_sample_end: date
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fold": self.index,
+            "in_sample_start": self.in_sample_start.isoformat() if self.in_sample_start else None,
+            "in_sample_end": self.in_sample_end.isoformat() if self.in_sample_end else None,
+            "out_of_sample_start": self.out_of_sample_start.isoformat(),
+            "out_of_sample_end": self.out_of_sample_end.isoformat(),
+        }
+
+
+def build_folds(start_date: date, end_date: date, in_sample_days: int, out_of_sample_days: int,
+                step_days: Optional[int] = None) -> List[WalkForwardFold]:
+    """
+    Split [start_date, end_date] into rolling walk-forward folds.
+
+    Each fold has ``in_sample_days`` of in-sample period followed by ``out_of_sample_days`` of
+    out-of-sample period; consecutive folds start ``step_days`` apart (default: the out-of-sample
+    length, so out-of-sample periods tile the range). The last out-of-sample period is clipped to
+    end_date.
+
+    Raises:
+        ValueError: If the lengths are invalid or the range is too short for one fold
+    """
+    if in_sample_days < 0 or out_of_sample_days <= 0:
+        raise ValueError("in_sample_days must be >= 0 and out_of_sample_days must be > 0")
+    step_days = step_days or out_of_sample_days
+    if step_days <= 0:
+        raise ValueError("step_days must be > 0")
+
+    folds = []
+    fold_start = start_date
+    while True:
+        out_of_sample_start = fold_start + timedelta(days=in_sample_days)
+        if out_of_sample_start > end_date:
+            break
+        out_of_sample_end = min(out_of_sample_start + timedelta(days=out_of_sample_days - 1), end_date)
+        folds.append(WalkForwardFold(
+            index=len(folds),
+            in_sample_start=fold_start if in_sample_days else None,
+            in_sample_end=out_of_sample_start - timedelta(days=1) if in_sample_days else None,
+            out_of_sample_start=out_of_sample_start,
+            out_of_sample_end=out_of_sample_end,
+        ))
+        fold_start += timedelta(days=step_days)
+    if not folds:
+        raise ValueError("Date range is too short for a single walk-forward fold")
+    return folds
+
+
+# Per-process state of a walk-forward worker, set up once by _init_fold_worker
+_fold_state: Dict[str, Any] = {}
+
+
+def _init_fold_worker(strategy: Strategy, historical_data: HistoricalData, vectorized: bool,
+                      historical_data_repository_factory: Optional[Callable[[], HistoricalDataRepository]],
+                      tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                      worker_setup: Optional[Callable[[], None]] = None) -> None:
+    if worker_setup is not None:
+        worker_setup()
+    _fold_state.clear()
+    _fold_state.update(
+        strategy=strategy,
+        vectorized=vectorized,
+        repository=SharedHistoricalDataRepository(
+            historical_data_repository_factory() if historical_data_repository_factory else None,
+            strategy.get_instrument(),
+            Timeframe(strategy.get_timeframe()),
+            historical_data,
+        ),
+        tradable_instrument_repository_factory=tradable_instrument_repository_factory,
+        # Indicator series over the shared dataset are computed once per worker for all its folds
+        indicator_cache=IndicatorCache(),
+    )
+
+
+def _run_period(start_date: date, end_date: date) -> Dict[str, Any]:
+    engine = BacktestEngine(
+        _fold_state["repository"],
+        _fold_state["tradable_instrument_repository_factory"](),
+        indicator_cache=_fold_state["indicator_cache"],
+    )
+    report = engine.start(_fold_state["strategy"], start_date, end_date, vectorized=_fold_state["vectorized"])
+    return report.get_summary_metrics()
+
+
+def _run_fold(fold: WalkForwardFold) -> Tuple[int, Dict[str, Any]]:
+    try:
+        result: Dict[str, Any] = {}
+        if fold.in_sample_start is not None:
+            result["in_sample"] = _run_period(fold.in_sample_start, fold.in_sample_end)
+        result["out_of_sample"] = _run_period(fold.out_of_sample_start, fold.out_of_sample_end)
+        return fold.index, result
+    except Exception as e:
+        logger.exception(f"Walk-forward fold {fold.index} failed")
+        return fold.index, {"error": str(e)}
+
+
+class WalkForwardRunner:
+    """
+    Runs a strategy over rolling in-sample/out-of-sample folds on top of BacktestEngine.
+
+    The data for the whole range, plus the strategy's lookback before the first fold, is loaded
+    once. Every fold backtests against that same dataset: the candle loop starts at the fold's
+    first candle through a zero-copy view and indicator series are evaluated over the entire
+    loaded range, so warm-up is continuous across fold boundaries instead of restarting from a
+    fresh lookback per fold. Folds run in parallel on a process pool.
+    """
+
+    def __init__(self, historical_data_repository: HistoricalDataRepository,
+                 tradable_instrument_repository_factory: Callable[[], TradableInstrumentRepository],
+                 historical_data_repository_factory: Optional[Callable[[], HistoricalDataRepository]] = None,
+                 max_workers: Optional[int] = None,
+                 worker_setup: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            historical_data_repository: Repository the full range is loaded from
+            tradable_instrument_repository_factory: Picklable callable creating a fresh repository per backtest
+            historical_data_repository_factory: Optional picklable callable creating, in each worker, a
+                repository for other instruments (e.g. the traded options of the position)
+            max_workers: Maximum number of worker processes (defaults to the number of CPUs)
+            worker_setup: Optional picklable callable run once in each worker
+        """
+        self.historical_data_repository = historical_data_repository
+        self.tradable_instrument_repository_factory = tradable_instrument_repository_factory
+        self.historical_data_repository_factory = historical_data_repository_factory
+        self.max_workers = max_workers
+        self.worker_setup = worker_setup
+
+    def run(self, strategy: Strategy, folds: List[WalkForwardFold], vectorized: bool = True) -> Dict[str, Any]:
+        """
+        Backtest the strategy on every fold.
+
+        Args:
+            strategy: The strategy to validate (must be picklable)
+            folds: Folds as returned by build_folds
+            vectorized: Evaluate rules over whole series (see BackTest.run)
+
+        Returns:
+            dict: Per-fold metrics and aggregate out-of-sample metrics
+        """
+        if not folds:
+            raise ValueError("At least one walk-forward fold is required")
+        first_start = min(fold.in_sample_start or fold.out_of_sample_start for fold in folds)
+        last_end = max(fold.out_of_sample_end for fold in folds)
+        historical_data = self.historical_data_repository.get_historical_data(
+            strategy.get_instrument(),
+            strategy.get_required_history_start_date(first_start),
+            last_end,
+            Timeframe(strategy.get_timeframe())
+        )
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(folds))
+        logger.info(f"Running {len(folds)} walk-forward folds on {workers} worker processes")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(folds)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_fold_worker,
+            initargs=(strategy, historical_data, vectorized, self.historical_data_repository_factory,
+                      self.tradable_instrument_repository_factory, self.worker_setup),
+        ) as executor:
+            for index, result in executor.map(_run_fold, folds):
+                results[index] = result
+
+        fold_rows = [{**fold.to_dict(), **result} for fold, result in zip(folds, results)]
+        return {
+            "folds": fold_rows,
+            "aggregate": self._aggregate(results),
+        }
+
+    @staticmethod
+    def _aggregate(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        completed = [result for result in results if "error" not in result]
+        out_of_sample = [result["out_of_sample"] for result in completed]
+        pnl = [metrics["total_pnl_points"] for metrics in out_of_sample]
+        total_trades = sum(metrics["total_trades_count"] for metrics in out_of_sample)
+        winning_trades = sum(metrics["winning_trades_count"] for metrics in out_of_sample)
+        aggregate = {
+            "total_folds": len(results),
+            "failed_folds": len(results) - len(completed),
+            "profitable_folds": sum(1 for value in pnl if value > 0),
+            "out_of_sample_total_pnl_points": sum(pnl),
+            "out_of_sample_mean_pnl_points": statistics.fmean(pnl) if pnl else 0.0,
+            "out_of_sample_pnl_points_stdev": statistics.stdev(pnl) if len(pnl) > 1 else 0.0,
+            "out_of_sample_total_trades_count": total_trades,
+            "out_of_sample_win_rate": winning_trades / total_trades if total_trades else 0.0,
+        }
+        in_sample = [result["in_sample"]["total_pnl_points"] for result in completed if "in_sample" in result]
+        if in_sample:
+            aggregate["in_sample_total_pnl_points"] = sum(in_sample)
+        return aggregate
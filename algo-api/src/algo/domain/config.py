@@ -14,6 +14,7 @@ def get_value(value: str, env_var: str, default: str) -> str:
 
 class HistoricalDataBackend(Enum):
     PARQUET_FILES = "PARQUET_FILES"
+    ARROW_FILES = "ARROW_FILES"
     UPSTOX_API = "UPSTOX_API"
 
 
@@ -57,6 +58,11 @@ class BacktestEngineConfig:
         reports_dir: str,
         parquet_files_base_dir: str,
         strategy_json_config_dir: str,
+        max_concurrent_jobs: str = "",
+        historical_data_cache_max_mb: str = "",
+        upstox_disk_cache_dir: str = "",
+        resample_from_one_minute: str = "",
+        max_worker_processes: str = "",
     ):
         backend = get_value(
             historical_data_backend,
@@ -78,6 +84,31 @@ class BacktestEngineConfig:
             strategy_json_config_dir, "BACKTEST_ENGINE.STRATEGY_JSON_CONFIG_DIR", os.getcwd()
         )
 
+        # Number of asynchronous backtest jobs allowed to run at the same time
+        self.max_concurrent_jobs = int(get_value(
+            max_concurrent_jobs, "BACKTEST_ENGINE.MAX_CONCURRENT_JOBS", "2"
+        ))
+
+        # Memory budget of the process-wide historical data cache
+        self.historical_data_cache_max_mb = int(get_value(
+            historical_data_cache_max_mb, "BACKTEST_ENGINE.HISTORICAL_DATA_CACHE_MAX_MB", "512"
+        ))
+
+        # Parquet tree the UPSTOX_API backend saves fetched candles to; empty disables it
+        self.upstox_disk_cache_dir = get_value(
+            upstox_disk_cache_dir, "BACKTEST_ENGINE.UPSTOX_DISK_CACHE_DIR", ""
+        )
+
+        # Derive 5min to 1d candles from stored 1min candles instead of loading them
+        self.resample_from_one_minute = str(get_value(
+            resample_from_one_minute, "BACKTEST_ENGINE.RESAMPLE_FROM_ONE_MINUTE", "false"
+        )).lower() in ("true", "1", "yes")
+
+        # Upper bound of the worker processes one batch, sweep or walk-forward request may start
+        self.max_worker_processes = int(get_value(
+            max_worker_processes, "BACKTEST_ENGINE.MAX_WORKER_PROCESSES", str(os.cpu_count() or 1)
+        ))
+
 
 class Config:
     def __init__(self, backtest_engine: BacktestEngineConfig, broker_api: dict, trading_window_config: TradingWindowConfig, instrument_mapping_config: InstrumentMappingConfig, logging_config: dict = None):
@@ -95,6 +126,11 @@ class Config:
             reports_dir=be.get("reports_dir", ""),
             parquet_files_base_dir=be.get("parquet_files_base_dir", ""),
             strategy_json_config_dir=be.get("strategy_json_config_dir", ""),
+            max_concurrent_jobs=be.get("max_concurrent_jobs", ""),
+            historical_data_cache_max_mb=be.get("historical_data_cache_max_mb", ""),
+            upstox_disk_cache_dir=be.get("upstox_disk_cache_dir", ""),
+            resample_from_one_minute=be.get("resample_from_one_minute", ""),
+            max_worker_processes=be.get("max_worker_processes", ""),
         )
         broker_api = config_dict.get("broker_api", {})
         broker_api_config = BrokerAPIConfig(
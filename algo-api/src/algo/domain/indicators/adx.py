@@ -1,26 +1,70 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, is_zero, WilderDirectionalMovement, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("adx")
-def indicator_adx(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate ADX value using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("adx")
+def indicator_adx_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full ADX series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in adx indicator")
     
     period = params.get("period", 14)  # Default ADX period = 14
 
     # TA-Lib expects NumPy arrays
-    adx_series = talib.ADX(
-        historical_data["high"].astype(float).values,
-        historical_data["low"].astype(float).values,
-        historical_data["close"].astype(float).values,
+    return talib.ADX(
+        np.asarray(historical_data.column("high"), dtype=float),
+        np.asarray(historical_data.column("low"), dtype=float),
+        np.asarray(historical_data.column("close"), dtype=float),
         timeperiod=period
     )
 
+@register_indicator("adx", cost=5)
+def indicator_adx(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate ADX value using TA-Lib."""
+    adx_series = indicator_adx_series(historical_data, params)
     return float(adx_series[-1])  # last ADX value
+
+@register_incremental_indicator("adx")
+class IncrementalAdx(IncrementalIndicator):
+    """ADX: average of the first `period` DX values, then Wilder smoothing, one candle at a time."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 14)
+        self._movement = WilderDirectionalMovement(self.period)
+        self._dx_count = 0
+        self._dx_sum = 0.0
+
+    def update(self, candle: Any) -> float:
+        ready = self._movement.update(
+            candle_value(candle, "high"), candle_value(candle, "low"), candle_value(candle, "close")
+        )
+        if not ready:
+            return self._value
+
+        dx = self._directional_index()
+        self._dx_count += 1
+        if self._dx_count < self.period:
+            self._dx_sum += dx if dx is not None else 0.0
+        elif self._dx_count == self.period:
+            self._value = (self._dx_sum + (dx if dx is not None else 0.0)) / self.period
+        elif dx is not None:
+            # TA-Lib keeps the previous ADX when DX is undefined
+            self._value = (self._value * (self.period - 1) + dx) / self.period
+        return self._value
+
+    def _directional_index(self):
+        if is_zero(self._movement.true_range):
+            return None
+        plus_di = self._movement.plus_di()
+        minus_di = self._movement.minus_di()
+        total = plus_di + minus_di
+        if is_zero(total):
+            return None
+        return 100.0 * abs(minus_di - plus_di) / total
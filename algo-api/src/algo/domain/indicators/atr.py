@@ -1,31 +1,67 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("atr")
-def indicator_atr(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate ATR (Average True Range) using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("atr")
+def indicator_atr_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full ATR (Average True Range) series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in atr indicator")
     
     period = params.get("period", 14)
 
     # Ensure required columns exist
     for col in ["high", "low", "close"]:
-        if col not in historical_data.columns:
+        if not historical_data.has_column(col):
             raise ValueError(f"Missing required column '{col}' in historical_data")
 
     # TA-Lib expects NumPy arrays
-    atr_series = talib.ATR(
-        historical_data["high"].astype(float).values,
-        historical_data["low"].astype(float).values,
-        historical_data["close"].astype(float).values,
+    return talib.ATR(
+        np.asarray(historical_data.column("high"), dtype=float),
+        np.asarray(historical_data.column("low"), dtype=float),
+        np.asarray(historical_data.column("close"), dtype=float),
         timeperiod=period
     )
 
+@register_indicator("atr", cost=3)
+def indicator_atr(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate ATR (Average True Range) using TA-Lib."""
+    atr_series = indicator_atr_series(historical_data, params)
     return float(atr_series[-1])  # last ATR value
+
+@register_incremental_indicator("atr")
+class IncrementalAtr(IncrementalIndicator):
+    """ATR: SMA of the first `period` true ranges, then Wilder smoothing, one candle at a time."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 14)
+        self._prev_close = None
+        self._ranges = 0
+        self._range_sum = 0.0
+
+    def update(self, candle: Any) -> float:
+        high = candle_value(candle, "high")
+        low = candle_value(candle, "low")
+        close = candle_value(candle, "close")
+        if self._prev_close is None:
+            self._prev_close = close
+            return self._value
+
+        true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._ranges += 1
+
+        if self._ranges < self.period:
+            self._range_sum += true_range
+        elif self._ranges == self.period:
+            self._value = (self._range_sum + true_range) / self.period
+        else:
+            self._value = (self._value * (self.period - 1) + true_range) / self.period
+        return self._value
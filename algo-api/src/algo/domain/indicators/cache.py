@@ -0,0 +1,114 @@
+"""
+Memoization of indicator results within a backtest run.
+
+Strategies routinely evaluate the same expression several times per candle: the entry and exit
+rule sets of ``bullish_nifty.json`` both compute ema(20), ema(50), ema(200), rsi(14), adx(14),
+plus_di(14) and minus_di(14). The cache keys each result by indicator name, normalized params
+and the identity of the candle window it was computed on, so every duplicate is computed once.
+"""
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from algo.domain.backtest.historical_data import HistoricalData
+
+_active_cache: ContextVar[Optional["IndicatorCache"]] = ContextVar("active_indicator_cache", default=None)
+
+
+def normalize_params(params: Any) -> Any:
+    """Turn indicator params into a hashable value that does not depend on key order."""
+    if isinstance(params, Mapping):
+        return tuple(sorted((str(key), normalize_params(value)) for key, value in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(normalize_params(value) for value in params)
+    try:
+        hash(params)
+    except TypeError:
+        return repr(params)
+    return params
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator values keyed by (name, params, series identity).
+
+    Only HistoricalData inputs are cached since their identity is stable across views of the
+    same loaded dataset; plain lists and DataFrames are computed directly.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def current() -> Optional["IndicatorCache"]:
+        """Return the cache activated for the current run, if any."""
+        return _active_cache.get()
+
+    @contextmanager
+    def activate(self) -> Iterator["IndicatorCache"]:
+        """Make this cache the one used by Expression evaluation in the current context."""
+        token = _active_cache.set(self)
+        try:
+            yield self
+        finally:
+            _active_cache.reset(token)
+
+    def get_or_compute(self, name: str, params: Dict[str, Any], historical_data: Any,
+                       compute: Callable[[], Any], kind: str = "value") -> Any:
+        """
+        Return the cached result for the indicator on the given candles, computing it on a miss.
+
+        Args:
+            name: Indicator name (case-insensitive)
+            params: Indicator params
+            historical_data: The candles the indicator is evaluated on
+            compute: Callable producing the result on a miss
+            kind: Distinguishes scalar values from whole-series results
+
+        Returns:
+            The indicator result
+        """
+        if not isinstance(historical_data, HistoricalData):
+            return compute()
+
+        key = (kind, name.lower(), normalize_params(params), historical_data.identity)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of cached entries."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
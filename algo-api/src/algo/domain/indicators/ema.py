@@ -1,21 +1,49 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("ema")
-def indicator_ema(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate EMA value using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("ema")
+def indicator_ema_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full EMA series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in ema indicator")
     period = params.get("period", 20)
     price_col = params.get("price", "close")
 
     # TA-Lib expects a NumPy array
-    ema_series = talib.EMA(historical_data[price_col].astype(float).values, timeperiod=period)
+    return talib.EMA(np.asarray(historical_data.column(price_col), dtype=float), timeperiod=period)
 
+@register_indicator("ema", cost=2)
+def indicator_ema(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate EMA value using TA-Lib."""
+    ema_series = indicator_ema_series(historical_data, params)
     return float(ema_series[-1])  # last EMA value
+
+@register_incremental_indicator("ema")
+class IncrementalEma(IncrementalIndicator):
+    """EMA updated one candle at a time; seeded with the SMA of the first `period` prices like TA-Lib."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 20)
+        self.price_col = params.get("price", "close")
+        self._k = 2.0 / (self.period + 1)
+        self._count = 0
+        self._seed_sum = 0.0
+
+    def update(self, candle: Any) -> float:
+        price = candle_value(candle, self.price_col)
+        self._count += 1
+        if self._count < self.period:
+            self._seed_sum += price
+        elif self._count == self.period:
+            self._value = (self._seed_sum + price) / self.period
+        else:
+            self._value = self._value + self._k * (price - self._value)
+        return self._value
@@ -1,25 +1,47 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, WilderDirectionalMovement, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("minus_di")
-def indicator_minus_di(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate -DI (Negative Directional Indicator) value using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("minus_di")
+def indicator_minus_di_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full -DI (Negative Directional Indicator) series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in minus_di indicator")
     
     period = params.get("period", 14)  # Default = 14
 
-    plus_di_series = talib.MINUS_DI(
-        historical_data["high"].astype(float).values,
-        historical_data["low"].astype(float).values,
-        historical_data["close"].astype(float).values,
+    return talib.MINUS_DI(
+        np.asarray(historical_data.column("high"), dtype=float),
+        np.asarray(historical_data.column("low"), dtype=float),
+        np.asarray(historical_data.column("close"), dtype=float),
         timeperiod=period
     )
 
-    return float(plus_di_series[-1])  # last +DI value
+@register_indicator("minus_di", cost=4)
+def indicator_minus_di(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate -DI (Negative Directional Indicator) value using TA-Lib."""
+    minus_di_series = indicator_minus_di_series(historical_data, params)
+    return float(minus_di_series[-1])  # last -DI value
+
+@register_incremental_indicator("minus_di")
+class IncrementalMinusDi(IncrementalIndicator):
+    """-DI from Wilder-smoothed directional movement, updated one candle at a time."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 14)
+        self._movement = WilderDirectionalMovement(self.period)
+
+    def update(self, candle: Any) -> float:
+        ready = self._movement.update(
+            candle_value(candle, "high"), candle_value(candle, "low"), candle_value(candle, "close")
+        )
+        if ready:
+            self._value = self._movement.minus_di()
+        return self._value
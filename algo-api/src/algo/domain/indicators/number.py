@@ -1,9 +1,13 @@
+import numpy as np
 from typing import Dict, Any, List,Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.registry import register_indicator, register_series_indicator
 import pandas as pd
 
-@register_indicator("number")
-def indicator_number(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("number")
+def indicator_number_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    return np.full(len(historical_data), float(params.get("value", 0)))
+
+@register_indicator("number", cost=0)
+def indicator_number(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
     return float(params.get("value", 0))
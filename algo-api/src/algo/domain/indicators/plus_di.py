@@ -1,25 +1,47 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, WilderDirectionalMovement, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("plus_di")
-def indicator_plus_di(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate +DI (Positive Directional Indicator) value using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("plus_di")
+def indicator_plus_di_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full +DI (Positive Directional Indicator) series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in plus_di indicator")
     
     period = params.get("period", 14)  # Default = 14
 
-    plus_di_series = talib.PLUS_DI(
-        historical_data["high"].astype(float).values,
-        historical_data["low"].astype(float).values,
-        historical_data["close"].astype(float).values,
+    return talib.PLUS_DI(
+        np.asarray(historical_data.column("high"), dtype=float),
+        np.asarray(historical_data.column("low"), dtype=float),
+        np.asarray(historical_data.column("close"), dtype=float),
         timeperiod=period
     )
 
+@register_indicator("plus_di", cost=4)
+def indicator_plus_di(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate +DI (Positive Directional Indicator) value using TA-Lib."""
+    plus_di_series = indicator_plus_di_series(historical_data, params)
     return float(plus_di_series[-1])  # last +DI value
+
+@register_incremental_indicator("plus_di")
+class IncrementalPlusDi(IncrementalIndicator):
+    """+DI from Wilder-smoothed directional movement, updated one candle at a time."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 14)
+        self._movement = WilderDirectionalMovement(self.period)
+
+    def update(self, candle: Any) -> float:
+        ready = self._movement.update(
+            candle_value(candle, "high"), candle_value(candle, "low"), candle_value(candle, "close")
+        )
+        if ready:
+            self._value = self._movement.plus_di()
+        return self._value
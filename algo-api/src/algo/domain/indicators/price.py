@@ -1,19 +1,33 @@
 
+import numpy as np
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.registry import register_indicator, register_series_indicator
 from algo.domain.indicators.exceptions import InvalidStrategyConfiguration
 import pandas as pd
 
-@register_indicator("price")
-def indicator_price(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("price")
+def indicator_price_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in price indicator")
 
     if "price" not in params:
         raise InvalidStrategyConfiguration("price param missing in price indicator")
     
     price_col = params["price"]
-    return float(historical_data[price_col].iloc[-1])
+    return np.asarray(historical_data.column(price_col), dtype=float)
+
+@register_indicator("price", cost=1)
+def indicator_price(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    historical_data = HistoricalData.of(historical_data)
+
+    if len(historical_data) == 0:
+        raise RuntimeError("historical_data is empty in price indicator")
+
+    if "price" not in params:
+        raise InvalidStrategyConfiguration("price param missing in price indicator")
+    
+    price_col = params["price"]
+    return float(historical_data.column(price_col)[-1])
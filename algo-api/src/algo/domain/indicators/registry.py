@@ -1,30 +1,96 @@
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 class IndicatorRegistry:
     _registry: Dict[str, Callable] = {}
+    _series_registry: Dict[str, Callable] = {}
+    _incremental_registry: Dict[str, Callable] = {}
+    _costs: Dict[str, int] = {}
+    DEFAULT_COST = 3
 
     @classmethod
-    def register(cls, name: str, func: Callable):
+    def register(cls, name: str, func: Callable, cost: Optional[int] = None):
         cls._registry[name] = func
+        if cost is not None:
+            cls._costs[name] = cost
+
+    @classmethod
+    def get_cost(cls, name: str) -> int:
+        """Relative evaluation cost of an indicator, used to order rule conditions cheapest first."""
+        return cls._costs.get(name, cls.DEFAULT_COST)
 
     @classmethod
     def get(cls, name: str) -> Callable:
         if name not in cls._registry:
             raise ValueError(f"Indicator '{name}' not registered")
         return cls._registry[name]
+
+    @classmethod
+    def register_series(cls, name: str, func: Callable):
+        cls._series_registry[name] = func
+
+    @classmethod
+    def get_series(cls, name: str) -> Callable:
+        """Return the whole-series variant of an indicator (one value per candle)."""
+        if name not in cls._series_registry:
+            raise ValueError(f"Series indicator '{name}' not registered")
+        return cls._series_registry[name]
+
+    @classmethod
+    def has_series(cls, name: str) -> bool:
+        return name in cls._series_registry
     
+    @classmethod
+    def register_incremental(cls, name: str, factory: Callable):
+        cls._incremental_registry[name] = factory
+
+    @classmethod
+    def create_incremental(cls, name: str, params: Dict[str, Any]):
+        """Create a new stateful indicator instance that is updated one candle at a time."""
+        if name not in cls._incremental_registry:
+            raise ValueError(f"Incremental indicator '{name}' not registered")
+        return cls._incremental_registry[name](params)
+
+    @classmethod
+    def has_incremental(cls, name: str) -> bool:
+        return name in cls._incremental_registry
+
     @classmethod
     def list_indicators(cls) -> List[str]:
         """Return a list of all registered indicator names."""
         return list(cls._registry.keys())
 
-def register_indicator(name: str):
-    """Decorator for registering indicator functions."""
+def register_indicator(name: str, cost: Optional[int] = None):
+    """Decorator for registering indicator functions.
+
+    Args:
+        name: Indicator name used in strategy expressions
+        cost: Optional relative evaluation cost (0 for constants, higher for indicators that
+            do more work per call); unregistered costs default to IndicatorRegistry.DEFAULT_COST
+    """
     def decorator(func: Callable):
-        IndicatorRegistry.register(name, func)
+        IndicatorRegistry.register(name, func, cost)
         return func
     return decorator
 
+def register_series_indicator(name: str):
+    """Decorator for registering whole-series indicator functions.
+
+    A series indicator returns a NumPy array aligned with the input candles,
+    where element ``i`` is the value the scalar indicator would report for
+    the candles up to and including ``i``.
+    """
+    def decorator(func: Callable):
+        IndicatorRegistry.register_series(name, func)
+        return func
+    return decorator
+
+def register_incremental_indicator(name: str):
+    """Decorator for registering incremental indicator classes (see indicators.incremental)."""
+    def decorator(cls):
+        IndicatorRegistry.register_incremental(name, cls)
+        return cls
+    return decorator
+
 def get_indicator(name: str) -> Callable:
     """Get a registered indicator by name."""
     return IndicatorRegistry.get(name)
@@ -1,22 +1,66 @@
+import numpy as np
 import pandas as pd
 import talib
 from typing import Dict, Any, List, Union
-from algo.domain.indicators.registry import register_indicator
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.incremental import IncrementalIndicator, is_zero, candle_value
+from algo.domain.indicators.registry import register_indicator, register_series_indicator, register_incremental_indicator
 
-@register_indicator("rsi")
-def indicator_rsi(historical_data: Union[List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
-    """Calculate RSI value using TA-Lib."""
-    # Convert to DataFrame if needed
-    if not isinstance(historical_data, pd.DataFrame):
-        historical_data = pd.DataFrame(historical_data)
+@register_series_indicator("rsi")
+def indicator_rsi_series(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> np.ndarray:
+    """Calculate the full RSI series using TA-Lib."""
+    historical_data = HistoricalData.of(historical_data)
 
-    if historical_data.empty:
+    if len(historical_data) == 0:
         raise RuntimeError("historical_data is empty in rsi indicator")
     
     period = params.get("period", 14)  # Default RSI period = 14
     price_col = "close"
 
     # TA-Lib expects a NumPy array
-    rsi_series = talib.RSI(historical_data[price_col].astype(float).values, timeperiod=period)
+    return talib.RSI(np.asarray(historical_data.column(price_col), dtype=float), timeperiod=period)
 
+@register_indicator("rsi", cost=3)
+def indicator_rsi(historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame], params: Dict[str, Any]) -> float:
+    """Calculate RSI value using TA-Lib."""
+    rsi_series = indicator_rsi_series(historical_data, params)
     return float(rsi_series[-1])  # last RSI value
+
+@register_incremental_indicator("rsi")
+class IncrementalRsi(IncrementalIndicator):
+    """RSI with Wilder smoothing of average gain/loss, updated one candle at a time."""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.period = params.get("period", 14)
+        self._prev_close = None
+        self._changes = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, candle: Any) -> float:
+        close = candle_value(candle, "close")
+        if self._prev_close is None:
+            self._prev_close = close
+            return self._value
+
+        change = close - self._prev_close
+        self._prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._changes += 1
+
+        if self._changes < self.period:
+            self._avg_gain += gain
+            self._avg_loss += loss
+            return self._value
+        if self._changes == self.period:
+            self._avg_gain = (self._avg_gain + gain) / self.period
+            self._avg_loss = (self._avg_loss + loss) / self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        total = self._avg_gain + self._avg_loss
+        self._value = 100.0 * self._avg_gain / total if not is_zero(total) else 0.0
+        return self._value
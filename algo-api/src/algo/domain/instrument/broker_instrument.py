@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 from .instrument import Instrument, Type, Exchange, Expiry
@@ -97,3 +98,20 @@ class BrokerInstrumentService(ABC):
             if broker_instrument:
                 broker_instruments.append(broker_instrument)
         return broker_instruments
+
+    def get_option_instrument(self, instrument: Instrument, underlying_price: float,
+                              as_of: Optional[datetime] = None) -> Optional[BrokerInstrument]:
+        """
+        Resolve a CE or PE instrument to the contract instrument.atm strikes away from the
+        at-the-money strike for the underlying price.
+        This default implementation supports no options chain and can be overridden by subclasses.
+        
+        Args:
+            instrument: The option Instrument to resolve
+            underlying_price: Price of the underlying at as_of
+            as_of: Time of the resolution (default: now)
+            
+        Returns:
+            BrokerInstrument object of the contract, None if it cannot be resolved
+        """
+        return None
@@ -15,6 +15,9 @@ class ServiceRegistry:
     Thread-safe singleton service registry for dependency injection.
     
     This registry manages singleton instances of services throughout the application lifecycle.
+    Lookups happen on hot paths (every trade signal of every backtest thread), so reads take no
+    lock: the services are kept in a dict that is never mutated, and writers build a new dict
+    under the lock and swap it in with a single attribute assignment.
     """
     
     _instance: Optional['ServiceRegistry'] = None
@@ -45,7 +48,9 @@ class ServiceRegistry:
             instance: The singleton instance to register
         """
         with self._service_lock:
-            self._services[service_type] = instance
+            services = dict(self._services)
+            services[service_type] = instance
+            self._services = services
             logger.debug(f"Registered instance for service type: {service_type.__name__}")
     
     def get_service(self, service_type: Type[T]) -> T:
@@ -61,11 +66,12 @@ class ServiceRegistry:
         Raises:
             ValueError: If the service type is not registered
         """
-        with self._service_lock:
-            if service_type in self._services:
-                return self._services[service_type]
-            
-            raise ValueError(f"Service type {service_type.__name__} is not registered")
+        # The current snapshot; a concurrent write swaps in a new one instead of changing it
+        services = self._services
+        if service_type in services:
+            return services[service_type]
+        
+        raise ValueError(f"Service type {service_type.__name__} is not registered")
     
     def is_registered(self, service_type: Type[T]) -> bool:
         """
@@ -77,8 +83,7 @@ class ServiceRegistry:
         Returns:
             True if the service type is registered, False otherwise
         """
-        with self._service_lock:
-            return service_type in self._services
+        return service_type in self._services
     
     def clear_all(self) -> None:
         """
@@ -87,7 +92,7 @@ class ServiceRegistry:
         Warning: This method is primarily for testing purposes.
         """
         with self._service_lock:
-            self._services.clear()
+            self._services = {}
             logger.warning("All services cleared from registry")
 
 
@@ -3,6 +3,7 @@ Service accessor utilities for easy access to registered services.
 """
 from typing import TypeVar
 
+from algo.domain.backtest.historical_data_cache import HistoricalDataCache
 from algo.domain.service_registry import get_service
 from algo.domain.trading.trading_window_service import TradingWindowService
 
@@ -22,6 +23,19 @@ def get_trading_window_service() -> TradingWindowService:
     return get_service(TradingWindowService)
 
 
+def get_historical_data_cache() -> HistoricalDataCache:
+    """
+    Get the process-wide HistoricalDataCache instance.
+
+    Returns:
+        The registered HistoricalDataCache instance
+
+    Raises:
+        ValueError: If HistoricalDataCache is not registered
+    """
+    return get_service(HistoricalDataCache)
+
+
 # Example usage functions for other services can be added here
 # def get_market_data_service() -> MarketDataService:
 #     return get_service(MarketDataService)
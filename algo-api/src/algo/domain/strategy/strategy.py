@@ -2,7 +2,11 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Union, Literal, Dict, Any
 from datetime import date, datetime, timedelta
 import math
+import numpy as np
+import pandas as pd
+from algo.domain.backtest.historical_data import HistoricalData
 from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.indicators.cache import IndicatorCache
 from algo.domain.instrument.instrument import Instrument
 from algo.domain.market import Candle
 from enum import Enum
@@ -41,15 +45,43 @@ class Expression:
     def __repr__(self):
         return f"Expression(type={self.type}, params={self.params})"
 
-    def evaluate(self, historical_data:List[Dict[str, Any]]) -> float:
-        handler = IndicatorRegistry.get(self.type.lower())
-        return handler(historical_data, self.params)
+    def estimated_cost(self) -> int:
+        return IndicatorRegistry.get_cost(self.type.lower())
+
+    def evaluate(self, historical_data:List[Dict[str, Any]], cache: Optional[IndicatorCache] = None) -> float:
+        name = self.type.lower()
+        handler = IndicatorRegistry.get(name)
+        cache = cache if cache is not None else IndicatorCache.current()
+        if cache is None:
+            return handler(historical_data, self.params)
+        return cache.get_or_compute(name, self.params, historical_data, lambda: handler(historical_data, self.params))
+
+    def evaluate_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame],
+                        cache: Optional[IndicatorCache] = None) -> np.ndarray:
+        """
+        Evaluate the expression for every candle in a single pass.
+
+        Args:
+            historical_data: Candles (DataFrame or list of dicts) covering the whole range
+            cache: Indicator cache to use; defaults to the cache active for the current run
+
+        Returns:
+            np.ndarray: One value per candle, NaN where the indicator is still warming up
+        """
+        name = self.type.lower()
+        handler = IndicatorRegistry.get_series(name)
+        compute = lambda: np.asarray(handler(historical_data, self.params), dtype=float)
+        cache = cache if cache is not None else IndicatorCache.current()
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(name, self.params, historical_data, compute, kind="series")
 
 class Condition:
     def __init__(self, operator: str, left: Expression, right: Expression):
         self.operator = operator  # e.g., ">", "<", "=="
         self.left = left
         self.right = right
+        self.evaluation_count = 0  # number of is_satisfied calls, to measure short-circuiting
 
     def __repr__(self):
         return (
@@ -57,9 +89,13 @@ class Condition:
             f"left={self.left}, right={self.right})"
         )
 
-    def is_satisfied(self, historical_data:List[Dict[str, Any]]) -> bool:
-        left_value = self.left.evaluate(historical_data)
-        right_value = self.right.evaluate(historical_data)
+    def estimated_cost(self) -> int:
+        return self.left.estimated_cost() + self.right.estimated_cost()
+
+    def is_satisfied(self, historical_data:List[Dict[str, Any]], cache: Optional[IndicatorCache] = None) -> bool:
+        self.evaluation_count += 1
+        left_value = self.left.evaluate(historical_data, cache)
+        right_value = self.right.evaluate(historical_data, cache)
         import math
         if math.isnan(left_value) or math.isnan(right_value):
             return False
@@ -71,6 +107,25 @@ class Condition:
             return left_value == right_value
         else:
             raise ValueError(f"Unsupported operator: {self.operator}")
+
+    def is_satisfied_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame],
+                            cache: Optional[IndicatorCache] = None) -> np.ndarray:
+        """
+        Evaluate the condition for every candle, returning a boolean array.
+        Candles where either side is NaN are treated as not satisfied.
+        """
+        left_values = self.left.evaluate_series(historical_data, cache)
+        right_values = self.right.evaluate_series(historical_data, cache)
+        valid = ~(np.isnan(left_values) | np.isnan(right_values))
+        if self.operator == ">":
+            result = left_values > right_values
+        elif self.operator == "<":
+            result = left_values < right_values
+        elif self.operator == "==":
+            result = left_values == right_values
+        else:
+            raise ValueError(f"Unsupported operator: {self.operator}")
+        return result & valid
     
 class RuleSet:
     def get_maximum_period_value(self) -> int:
@@ -89,10 +144,46 @@ class RuleSet:
     def __repr__(self):
         return f"RuleSet(logic={self.logic}, conditions={self.conditions})"
 
-    def apply_on(self, historical_data:List[Dict[str, Any]]) -> bool:
+    def get_ordered_conditions(self) -> List[Condition]:
+        """Conditions sorted cheapest first (stable, so equal-cost conditions keep their order)."""
+        return sorted(self.conditions, key=lambda cond: cond.estimated_cost())
+
+    def apply_on(self, historical_data:List[Dict[str, Any]], cache: Optional[IndicatorCache] = None) -> bool:
+        """
+        Evaluate the conditions cheapest first, stopping at the first one that decides the result
+        (a False for AND, a True for OR).
+        """
         logic = self.logic.upper()
-        results = [cond.is_satisfied(historical_data) for cond in self.conditions]
+        results = (cond.is_satisfied(historical_data, cache) for cond in self.get_ordered_conditions())
         return all(results) if logic == "AND" else any(results)
+
+    def get_evaluation_counts(self) -> Dict[str, int]:
+        """Return how many times each condition has been evaluated, keyed by its repr."""
+        return {repr(cond): cond.evaluation_count for cond in self.conditions}
+
+    def reset_evaluation_counts(self) -> None:
+        for cond in self.conditions:
+            cond.evaluation_count = 0
+
+    def apply_on_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame],
+                        cache: Optional[IndicatorCache] = None) -> np.ndarray:
+        """
+        Apply the rule set to every candle at once.
+
+        Args:
+            historical_data: Candles (DataFrame or list of dicts) covering the whole range
+            cache: Indicator cache to use; defaults to the cache active for the current run
+
+        Returns:
+            np.ndarray: Boolean array, True where the rule set is satisfied
+        """
+        logic = self.logic.upper()
+        results = [cond.is_satisfied_series(historical_data, cache) for cond in self.conditions]
+        if not results:
+            # Mirror all([]) / any([]) of the per-candle path
+            return np.full(len(historical_data), logic == "AND")
+        combine = np.logical_and if logic == "AND" else np.logical_or
+        return combine.reduce(results)
     
 
 
@@ -182,6 +273,16 @@ class Strategy(ABC):
         exit_rules = self.get_exit_rules()
         return exit_rules.apply_on(historical_data)
 
+    def entry_signal_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        """Vectorized counterpart of should_enter_trade over a whole series."""
+        entry_rules = self.get_entry_rules()
+        return entry_rules.apply_on_series(historical_data)
+
+    def exit_signal_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        """Vectorized counterpart of should_exit_trade over a whole series."""
+        exit_rules = self.get_exit_rules()
+        return exit_rules.apply_on_series(historical_data)
+
     def calculate_stop_loss_for(self, price: float) -> Optional[float]:
         risk_management = self.get_risk_management()
         if not risk_management or not risk_management.stop_loss:
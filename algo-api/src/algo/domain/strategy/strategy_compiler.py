@@ -0,0 +1,217 @@
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from algo.domain.indicators.cache import IndicatorCache, normalize_params
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.strategy.strategy import Condition, RuleSet, Strategy
+
+# Integer operator codes resolved once at compile time
+OP_GT = 0
+OP_LT = 1
+OP_EQ = 2
+
+OPERATOR_CODES: Dict[str, int] = {">": OP_GT, "<": OP_LT, "==": OP_EQ}
+
+LOGIC_AND = 0
+LOGIC_OR = 1
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """A unique (indicator, params) pair of the plan with its handlers resolved up front."""
+    name: str
+    params: Mapping[str, Any]
+    handler: Callable
+    series_handler: Optional[Callable]
+    cost: int
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """Comparison between two indicator nodes, referenced by index."""
+    operator: int
+    left: int
+    right: int
+    cost: int
+    source: Condition
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """Conditions ordered cheapest first, referenced by index into the plan's conditions."""
+    logic: int
+    conditions: Tuple[int, ...]
+
+
+def _compare(operator: int, left: float, right: float) -> bool:
+    if math.isnan(left) or math.isnan(right):
+        return False
+    if operator == OP_GT:
+        return left > right
+    if operator == OP_LT:
+        return left < right
+    return left == right
+
+
+def _compare_series(operator: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    valid = ~(np.isnan(left) | np.isnan(right))
+    if operator == OP_GT:
+        result = left > right
+    elif operator == OP_LT:
+        result = left < right
+    else:
+        result = left == right
+    return result & valid
+
+
+@dataclass(frozen=True)
+class CompiledStrategyPlan:
+    """
+    Immutable, flattened form of a strategy's entry and exit rules.
+
+    Every distinct indicator expression appears once in ``nodes`` no matter how many conditions
+    (in either rule set) use it, handlers are looked up at compile time and operators are
+    integer codes, so evaluating a window is a single pass over the nodes it needs.
+    """
+    nodes: Tuple[IndicatorNode, ...]
+    conditions: Tuple[CompiledCondition, ...]
+    entry: CompiledRuleSet
+    exit: CompiledRuleSet
+
+    def should_enter(self, historical_data, cache: Optional[IndicatorCache] = None) -> bool:
+        return self._evaluate_rule_set(self.entry, historical_data, cache)
+
+    def should_exit(self, historical_data, cache: Optional[IndicatorCache] = None) -> bool:
+        return self._evaluate_rule_set(self.exit, historical_data, cache)
+
+    def entry_series(self, historical_data, cache: Optional[IndicatorCache] = None) -> np.ndarray:
+        return self._evaluate_rule_set_series(self.entry, historical_data, [None] * len(self.nodes), cache)
+
+    def exit_series(self, historical_data, cache: Optional[IndicatorCache] = None) -> np.ndarray:
+        return self._evaluate_rule_set_series(self.exit, historical_data, [None] * len(self.nodes), cache)
+
+    def evaluate_series(self, historical_data, cache: Optional[IndicatorCache] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the entry and exit signal arrays, sharing node values between both rule sets."""
+        values: List[Optional[np.ndarray]] = [None] * len(self.nodes)
+        entry = self._evaluate_rule_set_series(self.entry, historical_data, values, cache)
+        exit = self._evaluate_rule_set_series(self.exit, historical_data, values, cache)
+        return entry, exit
+
+    def _node_value(self, index: int, historical_data, values: List[Optional[float]], cache: Optional[IndicatorCache]) -> float:
+        value = values[index]
+        if value is None:
+            node = self.nodes[index]
+            compute = lambda: node.handler(historical_data, node.params)
+            value = cache.get_or_compute(node.name, node.params, historical_data, compute) if cache else compute()
+            values[index] = value
+        return value
+
+    def _node_series(self, index: int, historical_data, values: List[Optional[np.ndarray]], cache: Optional[IndicatorCache]) -> np.ndarray:
+        value = values[index]
+        if value is None:
+            node = self.nodes[index]
+            if node.series_handler is None:
+                raise ValueError(f"Series indicator '{node.name}' not registered")
+            compute = lambda: np.asarray(node.series_handler(historical_data, node.params), dtype=float)
+            value = cache.get_or_compute(node.name, node.params, historical_data, compute, kind="series") if cache else compute()
+            values[index] = value
+        return value
+
+    def _evaluate_rule_set(self, rule_set: CompiledRuleSet, historical_data, cache: Optional[IndicatorCache]) -> bool:
+        cache = cache if cache is not None else IndicatorCache.current()
+        values: List[Optional[float]] = [None] * len(self.nodes)
+        is_and = rule_set.logic == LOGIC_AND
+        for condition_index in rule_set.conditions:
+            condition = self.conditions[condition_index]
+            condition.source.evaluation_count += 1
+            satisfied = _compare(
+                condition.operator,
+                self._node_value(condition.left, historical_data, values, cache),
+                self._node_value(condition.right, historical_data, values, cache),
+            )
+            # Stop at the first condition that decides the result
+            if is_and and not satisfied:
+                return False
+            if not is_and and satisfied:
+                return True
+        return is_and
+
+    def _evaluate_rule_set_series(self, rule_set: CompiledRuleSet, historical_data,
+                                  values: List[Optional[np.ndarray]], cache: Optional[IndicatorCache]) -> np.ndarray:
+        cache = cache if cache is not None else IndicatorCache.current()
+        is_and = rule_set.logic == LOGIC_AND
+        result = np.full(len(historical_data), is_and)
+        for condition_index in rule_set.conditions:
+            condition = self.conditions[condition_index]
+            satisfied = _compare_series(
+                condition.operator,
+                self._node_series(condition.left, historical_data, values, cache),
+                self._node_series(condition.right, historical_data, values, cache),
+            )
+            result = result & satisfied if is_and else result | satisfied
+        return result
+
+
+class StrategyCompiler:
+    """Compiles a strategy's rule sets into a CompiledStrategyPlan."""
+
+    def compile(self, strategy: Strategy) -> CompiledStrategyPlan:
+        """
+        Compile the entry and exit rules of a strategy.
+
+        Args:
+            strategy: The strategy to compile
+
+        Returns:
+            CompiledStrategyPlan: The immutable plan
+
+        Raises:
+            ValueError: If a rule uses an unknown indicator, operator or logic
+        """
+        nodes: List[IndicatorNode] = []
+        node_index: Dict[tuple, int] = {}
+        conditions: List[CompiledCondition] = []
+
+        def add_node(expression) -> int:
+            name = expression.type.lower()
+            key = (name, normalize_params(expression.params))
+            if key not in node_index:
+                node_index[key] = len(nodes)
+                nodes.append(IndicatorNode(
+                    name=name,
+                    params=MappingProxyType(dict(expression.params)),
+                    handler=IndicatorRegistry.get(name),
+                    series_handler=IndicatorRegistry.get_series(name) if IndicatorRegistry.has_series(name) else None,
+                    cost=IndicatorRegistry.get_cost(name),
+                ))
+            return node_index[key]
+
+        def compile_rule_set(rule_set: Optional[RuleSet]) -> CompiledRuleSet:
+            if rule_set is None:
+                return CompiledRuleSet(LOGIC_AND, ())
+            logic = rule_set.logic.upper()
+            if logic not in ("AND", "OR"):
+                raise ValueError(f"Unsupported logic: {rule_set.logic}")
+            indices = []
+            for condition in rule_set.get_ordered_conditions():
+                if condition.operator not in OPERATOR_CODES:
+                    raise ValueError(f"Unsupported operator: {condition.operator}")
+                left = add_node(condition.left)
+                right = add_node(condition.right)
+                indices.append(len(conditions))
+                conditions.append(CompiledCondition(
+                    operator=OPERATOR_CODES[condition.operator],
+                    left=left,
+                    right=right,
+                    cost=nodes[left].cost + nodes[right].cost,
+                    source=condition,
+                ))
+            return CompiledRuleSet(LOGIC_AND if logic == "AND" else LOGIC_OR, tuple(indices))
+
+        entry = compile_rule_set(strategy.get_entry_rules())
+        exit = compile_rule_set(strategy.get_exit_rules())
+        return CompiledStrategyPlan(tuple(nodes), tuple(conditions), entry, exit)
@@ -10,6 +10,8 @@ from algo.domain.backtest.historical_data_repository import HistoricalDataReposi
 from .tradable_instrument_repository import TradableInstrumentRepository
 from algo.domain.timeframe import Timeframe
 from algo.domain import services
+from algo.domain.trading.trading_calendar import CANDLE_MINUTES, TradingCalendar
+from algo.domain.trading.trading_window_service import TradingWindowService
 
 
 class PositionAction(Enum):
@@ -31,10 +33,21 @@ class TradeSignal:
         return f"TradeSignal(instrument={self.instrument.instrument_key}, action={self.action}, quantity={self.quantity}, timestamp={self.timestamp}, timeframe={self.timeframe}, position_action={self.position_action}, trigger_type={self.trigger_type})"
 
 class StrategyEvaluator:
-    def __init__(self, strategy: Strategy, historical_data_repository: HistoricalDataRepository, tradable_instrument_repository: TradableInstrumentRepository):
+    def __init__(self, strategy: Strategy, historical_data_repository: HistoricalDataRepository, tradable_instrument_repository: TradableInstrumentRepository,
+                 trading_window_service: Optional[TradingWindowService] = None):
+        """
+        Args:
+            strategy: The strategy to evaluate
+            historical_data_repository: Repository serving the strategy's history
+            tradable_instrument_repository: Repository of the strategy's tradable instruments
+            trading_window_service: Trading windows for next-candle timestamps. If None, the
+                registered service is resolved once, on the first signal.
+        """
         self.strategy = strategy
         self.historical_data_repository = historical_data_repository
         self.tradable_instrument_repository = tradable_instrument_repository
+        self.trading_window_service = trading_window_service
+        self._trading_calendar: Optional[TradingCalendar] = None
 
     def evaluate(self, candle: Dict[str, Any]) -> List[TradeSignal]:
         """
@@ -52,31 +65,63 @@ class StrategyEvaluator:
         trade_signals = []
         
         for tradable in tradable_instruments:
-            should_enter_trade = self.strategy.should_enter_trade(historical_data)
-            should_exit_trade = self.strategy.should_exit_trade(historical_data)
-            enter = not tradable.is_any_position_open() and should_enter_trade
-            exit = tradable.is_any_position_open() and should_exit_trade
-            
-            # Check for stop loss hits on open positions
-            stop_loss_signals = self._evaluate_for_stop_loss(candle, strategy_timeframe, tradable)
-            if stop_loss_signals:
-                trade_signals.extend(stop_loss_signals)
-            elif enter:
-                # Create a trade signal for entering a position
-                position = self.strategy.get_position_instrument()
-                timestamp = self._get_next_candle_timestamp(candle['timestamp'], strategy_timeframe)
-                trade_signal = TradeSignal(tradable.instrument, position.action, 1, timestamp, strategy_timeframe, PositionAction.ADD, TriggerType.ENTRY_RULES)
-                trade_signals.append(trade_signal)
-                
-            elif exit:
-                # Create a trade signal for exiting a position
-                position = self.strategy.get_position_instrument()
-                timestamp = self._get_next_candle_timestamp(candle['timestamp'], strategy_timeframe)
-                trade_signal = TradeSignal(tradable.instrument, position.get_close_action(), 1, timestamp, strategy_timeframe, PositionAction.EXIT, TriggerType.EXIT_RULES)
-                trade_signals.append(trade_signal)
+            # Only the rule set that can produce a signal in the current position state is evaluated
+            should_enter_trade = False
+            should_exit_trade = False
+            if tradable.is_any_position_open():
+                should_exit_trade = self.strategy.should_exit_trade(historical_data)
+            else:
+                should_enter_trade = self.strategy.should_enter_trade(historical_data)
+            trade_signals.extend(self._generate_trade_signals(candle, strategy_timeframe, tradable, should_enter_trade, should_exit_trade))
                 
         return trade_signals
 
+    def evaluate_precomputed(self, candle: Dict[str, Any], should_enter_trade: bool, should_exit_trade: bool) -> List[TradeSignal]:
+        """
+        Generate trade signals for the given candle from entry/exit rule outcomes that were
+        already computed for the whole series (vectorized backtest mode).
+        
+        Args:
+            candle: The current candle data
+            should_enter_trade: Whether the entry rules are satisfied at this candle
+            should_exit_trade: Whether the exit rules are satisfied at this candle
+            
+        Returns:
+            List[TradeSignal]: List of trade signals generated, empty list if no signals
+        """
+        strategy_timeframe = Timeframe(self.strategy.get_timeframe())
+        tradable_instruments = self.tradable_instrument_repository.get_tradable_instruments(self.strategy.get_name())
+        trade_signals = []
+        for tradable in tradable_instruments:
+            trade_signals.extend(self._generate_trade_signals(candle, strategy_timeframe, tradable, should_enter_trade, should_exit_trade))
+        return trade_signals
+
+    def _generate_trade_signals(self, candle, strategy_timeframe, tradable: TradableInstrument,
+                                should_enter_trade: bool, should_exit_trade: bool) -> List[TradeSignal]:
+        trade_signals = []
+        enter = not tradable.is_any_position_open() and should_enter_trade
+        exit = tradable.is_any_position_open() and should_exit_trade
+        
+        # Check for stop loss hits on open positions
+        stop_loss_signals = self._evaluate_for_stop_loss(candle, strategy_timeframe, tradable)
+        if stop_loss_signals:
+            trade_signals.extend(stop_loss_signals)
+        elif enter:
+            # Create a trade signal for entering a position
+            position = self.strategy.get_position_instrument()
+            timestamp = self._get_next_candle_timestamp(candle['timestamp'], strategy_timeframe)
+            trade_signal = TradeSignal(tradable.instrument, position.action, 1, timestamp, strategy_timeframe, PositionAction.ADD, TriggerType.ENTRY_RULES)
+            trade_signals.append(trade_signal)
+            
+        elif exit:
+            # Create a trade signal for exiting a position
+            position = self.strategy.get_position_instrument()
+            timestamp = self._get_next_candle_timestamp(candle['timestamp'], strategy_timeframe)
+            trade_signal = TradeSignal(tradable.instrument, position.get_close_action(), 1, timestamp, strategy_timeframe, PositionAction.EXIT, TriggerType.EXIT_RULES)
+            trade_signals.append(trade_signal)
+            
+        return trade_signals
+
     def _evaluate_for_stop_loss(self, candle, strategy_timeframe, tradable: TradableInstrument) -> List[TradeSignal]:
         """
         Evaluate open positions for stop loss hits and return corresponding trade signals.
@@ -121,11 +166,28 @@ class StrategyEvaluator:
         historical_data = self.historical_data_repository.get_historical_data(instrument, start_date, end_date, timeframe)
         return historical_data.filter(start=required_start_datetime, end=end_datetime)
 
+    def _get_trading_calendar(self, exchange: Exchange, type: Type) -> TradingCalendar:
+        """
+        Get the compiled trading calendar of the strategy's instrument, resolved once per evaluator.
+        """
+        calendar = self._trading_calendar
+        if calendar is None or calendar.exchange != exchange or calendar.type != type:
+            if self.trading_window_service is None:
+                self.trading_window_service = services.get_trading_window_service()
+            trading_window_service = self.trading_window_service
+            if isinstance(trading_window_service, TradingWindowService):
+                calendar = trading_window_service.get_trading_calendar(exchange, type)
+            else:
+                calendar = TradingCalendar(trading_window_service, exchange, type)
+            self._trading_calendar = calendar
+        return calendar
+
     def _get_next_candle_timestamp(self, timestamp, timeframe: Timeframe):
         """
         Get the next candle timestamp based on the current timestamp and timeframe.
-        Uses TradingWindowService to check if the next timestamp falls within active trading window,
-        otherwise returns the first candle of the next trading day.
+        Looks the timestamp up in the compiled trading calendar: intraday candles are one
+        timeframe apart within a trading window, and the candle after the last one of a day is
+        the first candle of the next trading day.
         
         Args:
             timestamp: Current candle timestamp
@@ -134,48 +196,15 @@ class StrategyEvaluator:
         Returns:
             datetime: Next candle timestamp
         """
-        from datetime import timedelta
+        if timeframe not in CANDLE_MINUTES and timeframe not in (Timeframe.ONE_DAY, Timeframe.ONE_WEEK):
+            return timestamp
         
         # Get instrument details for trading window lookup
         instrument = self.strategy.get_instrument()
-        exchange = instrument.exchange
-        type = instrument.type
-        
-        # Calculate the next timestamp based on timeframe
-        if timeframe == Timeframe.ONE_MINUTE:
-            next_timestamp = timestamp + timedelta(minutes=1)
-        elif timeframe == Timeframe.FIVE_MINUTES:
-            next_timestamp = timestamp + timedelta(minutes=5)
-        elif timeframe == Timeframe.FIFTEEN_MINUTES:
-            next_timestamp = timestamp + timedelta(minutes=15)
-        elif timeframe == Timeframe.THIRTY_MINUTES:
-            next_timestamp = timestamp + timedelta(minutes=30)
-        elif timeframe == Timeframe.SIXTY_MINUTES:
-            next_timestamp = timestamp + timedelta(hours=1)
-        elif timeframe == Timeframe.ONE_DAY:
-            # For daily timeframe, move to next trading day
-            return self._get_next_trading_day_opening(timestamp, exchange, type)
-        elif timeframe == Timeframe.ONE_WEEK:
-            # For weekly timeframe, move to next week's first trading day
-            next_timestamp = timestamp + timedelta(weeks=1)
-        else:
-            return timestamp
-        
-        # For intraday timeframes, check if next timestamp is within trading window
-        trading_window_service = services.get_trading_window_service()
-        next_date = next_timestamp.date()
-        trading_window = trading_window_service.get_trading_window(next_date, exchange, type)
-        
-        # If no trading window found, move to next trading day
-        if trading_window is None:
-            return self._get_next_trading_day_opening(next_timestamp, exchange, type)
-        
-        # Use the TradingWindow.is_within_trading_window() method to check if next timestamp is valid
-        if trading_window.is_within_trading_window(next_timestamp):
-            return next_timestamp
-        else:
-            # Next timestamp is not within trading window, move to next trading day
-            return self._get_next_trading_day_opening(next_timestamp, exchange, type)
+        next_timestamp = self._get_trading_calendar(instrument.exchange, instrument.type).next_candle(timestamp, timeframe)
+        if next_timestamp is None:
+            return self._get_default_opening(timestamp.date() + datetime.timedelta(days=1), timestamp.tzinfo)
+        return next_timestamp
     
     def _get_next_trading_day_opening(self, timestamp, exchange: Exchange, type: Type):
         """
@@ -189,31 +218,14 @@ class StrategyEvaluator:
         Returns:
             datetime: Next trading day opening timestamp
         """
-        from datetime import timedelta
-        
-        # Start checking from the next day
-        next_day = timestamp.date() + timedelta(days=1)
-        max_attempts = 10  # Prevent infinite loop
-        attempts = 0
-        
-        while attempts < max_attempts:
-            trading_window_service = services.get_trading_window_service()
-            trading_window = trading_window_service.get_trading_window(next_day, exchange, type)
-            
-            if trading_window is not None and trading_window.get_trading_duration_minutes() > 0:
-                # Found a trading day, return opening time
-                opening_time = trading_window.open_time
-                return datetime.datetime.combine(next_day, opening_time, tzinfo=timestamp.tzinfo)
-            
-            # Move to next day if current day is holiday
-            next_day += timedelta(days=1)
-            attempts += 1
-        
-        # Fallback: if we can't find a trading day within max_attempts, 
-        # assume next weekday at 9:15 AM (default market opening)
-        while next_day.weekday() >= 5:  # Skip weekends
-            next_day += timedelta(days=1)
-        
-        from datetime import time
-        default_opening_time = time(9, 15)  # Default market opening
-        return datetime.datetime.combine(next_day, default_opening_time, tzinfo=timestamp.tzinfo)
+        opening = self._get_trading_calendar(exchange, type).next_session_open(timestamp)
+        if opening is None:
+            return self._get_default_opening(timestamp.date() + datetime.timedelta(days=1), timestamp.tzinfo)
+        return opening
+
+    @staticmethod
+    def _get_default_opening(day: datetime.date, tzinfo):
+        # Fallback when the calendar has no trading day: next weekday at 9:15 AM (default market opening)
+        while day.weekday() >= 5:  # Skip weekends
+            day += datetime.timedelta(days=1)
+        return datetime.datetime.combine(day, datetime.time(9, 15), tzinfo=tzinfo)
@@ -2,11 +2,13 @@
 Trading domain module for managing trading windows and schedules.
 """
 
+from .trading_calendar import TradingCalendar
 from .trading_window import TradingWindow, TradingWindowType
 from .trading_window_service import TradingWindowService
 
 __all__ = [
     'TradingWindow',
     'TradingWindowType', 
-    'TradingWindowService'
+    'TradingWindowService',
+    'TradingCalendar'
 ]
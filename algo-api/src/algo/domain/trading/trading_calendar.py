@@ -0,0 +1,194 @@
+"""
+Compiled trading calendar of one exchange and instrument type.
+
+Resolving the next candle used to walk day by day through TradingWindowService.get_trading_window,
+building TradingWindow objects for every call. The calendar asks the service for each day of a
+year once and keeps the sessions as sorted NumPy arrays of open and close times, so that "next
+candle" and "next session open" are single binary searches and session opens of many days are
+one vectorized lookup. Times are exchange wall-clock times: timestamps are looked up by their
+date and time of day, and results carry the timezone of the timestamp they were resolved from.
+"""
+import datetime
+import logging
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..instrument.instrument import Exchange, Type
+from ..timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+CANDLE_MINUTES: Dict[Timeframe, int] = {
+    Timeframe.ONE_MINUTE: 1,
+    Timeframe.FIVE_MINUTES: 5,
+    Timeframe.FIFTEEN_MINUTES: 15,
+    Timeframe.THIRTY_MINUTES: 30,
+    Timeframe.SIXTY_MINUTES: 60,
+}
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _wall_clock_ns(timestamp: datetime.datetime) -> int:
+    """Nanoseconds since the epoch of the timestamp's local date and time."""
+    naive = timestamp.replace(tzinfo=None)
+    return int(pd.Timestamp(naive).value)
+
+
+def _like(ns: int, timestamp: datetime.datetime) -> datetime.datetime:
+    """The wall-clock time ns, as the type and with the timezone of timestamp."""
+    if isinstance(timestamp, pd.Timestamp):
+        result = pd.Timestamp(ns)
+        return result.tz_localize(timestamp.tz) if timestamp.tz is not None else result
+    return (_EPOCH + datetime.timedelta(microseconds=ns // 1000)).replace(tzinfo=timestamp.tzinfo)
+
+
+class TradingCalendar:
+    """
+    Sessions of one exchange and instrument type as sorted arrays.
+
+    Years are compiled from the trading window service on first use; a lookup running past the
+    last compiled year compiles the next one. Years without trading window configuration raise
+    ValueError, like TradingWindowService.get_trading_window. Compiled years are always a
+    contiguous range. Instances are thread-safe.
+    """
+
+    def __init__(self, trading_window_service, exchange: Exchange, type: Type):
+        """
+        Args:
+            trading_window_service: Service providing get_trading_window(date, exchange, type)
+            exchange: Exchange of the sessions
+            type: Instrument type of the sessions
+        """
+        self.trading_window_service = trading_window_service
+        self.exchange = exchange
+        self.type = type
+        self._years: Set[int] = set()
+        self._sessions: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._opens = np.empty(0, dtype=np.int64)
+        self._closes = np.empty(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @property
+    def opens(self) -> np.ndarray:
+        """Session open times of the compiled years, as wall-clock nanoseconds, sorted."""
+        return self._opens
+
+    @property
+    def closes(self) -> np.ndarray:
+        """Session close times matching opens."""
+        return self._closes
+
+    def compile_years(self, first_year: int, last_year: int) -> None:
+        """
+        Compile the sessions of a range of years (inclusive) if not compiled yet.
+
+        The compiled years are kept contiguous: years between the range and those compiled
+        earlier are compiled too, so that searches over opens never skip a year.
+        """
+        with self._lock:
+            if self._years:
+                first_year = min(first_year, min(self._years))
+                last_year = max(last_year, max(self._years))
+            missing = [year for year in range(first_year, last_year + 1) if year not in self._years]
+            if not missing:
+                return
+            self._sessions.update({year: self._compile_year(year) for year in missing})
+            self._years.update(missing)
+            years = sorted(self._sessions)
+            self._opens = np.concatenate([self._sessions[year][0] for year in years])
+            self._closes = np.concatenate([self._sessions[year][1] for year in years])
+
+    def _compile_year(self, year: int) -> Tuple[np.ndarray, np.ndarray]:
+        opens = []
+        closes = []
+        day = datetime.date(year, 1, 1)
+        while day.year == year:
+            window = self.trading_window_service.get_trading_window(day, self.exchange, self.type)
+            if window is not None and window.get_trading_duration_minutes() > 0:
+                midnight = (day - _EPOCH.date()).days * _NS_PER_DAY
+                opens.append(midnight + (window.open_time.hour * 60 + window.open_time.minute) * _NS_PER_MINUTE)
+                closes.append(midnight + (window.close_time.hour * 60 + window.close_time.minute) * _NS_PER_MINUTE)
+            day += datetime.timedelta(days=1)
+        logger.debug(f"Compiled {len(opens)} sessions of {self.exchange.value}-{self.type.value} {year}")
+        return np.array(opens, dtype=np.int64), np.array(closes, dtype=np.int64)
+
+    def session_open_minutes(self, days: np.ndarray) -> np.ndarray:
+        """
+        Session open time of each day, in minutes after midnight.
+
+        Args:
+            days: Days since the epoch
+
+        Returns:
+            np.ndarray: Minutes after midnight, -1 for days without a session
+        """
+        days = np.asarray(days, dtype=np.int64)
+        minutes = np.full(len(days), -1, dtype=np.int64)
+        if len(days) == 0:
+            return minutes
+        first = (_EPOCH + datetime.timedelta(days=int(days.min()))).year
+        last = (_EPOCH + datetime.timedelta(days=int(days.max()))).year
+        self.compile_years(first, last)
+        opens = self._opens
+        session_days = opens // _NS_PER_DAY
+        index = np.searchsorted(session_days, days)
+        found = index < len(opens)
+        found[found] = session_days[index[found]] == days[found]
+        minutes[found] = (opens[index[found]] % _NS_PER_DAY) // _NS_PER_MINUTE
+        return minutes
+
+    def next_session_open(self, timestamp: datetime.datetime) -> Optional[datetime.datetime]:
+        """
+        Open of the first session on a day after the timestamp's date.
+
+        Returns:
+            datetime: The session open, or None if there is none up to the end of the next year
+        """
+        midnight = (_wall_clock_ns(timestamp) // _NS_PER_DAY + 1) * _NS_PER_DAY
+        ns = self._search(lambda: self._opens, midnight, timestamp.year, side="left")
+        return _like(ns, timestamp) if ns is not None else None
+
+    def next_candle(self, timestamp: datetime.datetime, timeframe: Timeframe) -> Optional[datetime.datetime]:
+        """
+        Start of the candle after the one starting at the timestamp.
+
+        Intraday and weekly candles start one timeframe later when that is within a session,
+        otherwise at the next session open; daily candles start at the next session open.
+
+        Returns:
+            datetime: The next candle start, or None if there is no session up to the end of the
+            next year
+        """
+        timeframe = Timeframe(timeframe)
+        if timeframe == Timeframe.ONE_DAY:
+            return self.next_session_open(timestamp)
+        if timeframe == Timeframe.ONE_WEEK:
+            candidate = timestamp + datetime.timedelta(weeks=1)
+        else:
+            candidate = timestamp + datetime.timedelta(minutes=CANDLE_MINUTES[timeframe])
+        if self.is_within_session(candidate):
+            return candidate
+        return self.next_session_open(candidate)
+
+    def is_within_session(self, timestamp: datetime.datetime) -> bool:
+        """Whether the timestamp is at or after a session's open and before its close."""
+        self.compile_years(timestamp.year, timestamp.year)
+        ns = _wall_clock_ns(timestamp)
+        index = np.searchsorted(self._opens, ns, side="right") - 1
+        return bool(index >= 0 and ns < self._closes[index])
+
+    def _search(self, values, ns: int, year: int, side: str) -> Optional[int]:
+        # The answer lies in the timestamp's year or, past its last session, in the next one
+        for last_year in (year, year + 1):
+            self.compile_years(year, last_year)
+            array = values()
+            index = np.searchsorted(array, ns, side=side)
+            if index < len(array):
+                return int(array[index])
+        return None
@@ -3,12 +3,16 @@ Trading window service for managing trading schedules across exchanges and instr
 """
 import json
 import logging
-from datetime import date, time, datetime
+import threading
+from datetime import date, time, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+import numpy as np
+
 from ..instrument.instrument import Type
 
+from .trading_calendar import TradingCalendar
 from .trading_window import TradingWindow, TradingWindowType
 from ..instrument.instrument import Exchange
 
@@ -20,6 +24,18 @@ TradingConfigData = Dict[str, Any]
 TradingWindowCache = Dict[ExchangeSegmentKey, Dict[int, Dict[date, TradingWindow]]]
 
 
+class _YearWindows:
+    """Every trading window of one year, indexed by day of the year."""
+
+    def __init__(self, year: int, windows: List[Optional[TradingWindow]]):
+        self.first_ordinal = date(year, 1, 1).toordinal()
+        self.windows = windows
+        # Whether each day has a session, for vectorized range queries
+        self.sessions = np.array(
+            [window is not None and window.get_trading_duration_minutes() > 0 for window in windows], dtype=bool
+        )
+
+
 class TradingWindowService:
     """
     Service class for managing trading windows across different exchanges and instrument types.
@@ -42,6 +58,13 @@ class TradingWindowService:
         
         # Cache structure: {exchange-type: {year: {date: TradingWindow}}}
         self._trading_windows: TradingWindowCache = {}
+
+        # Materialized years: {exchange-type: {year: _YearWindows}}
+        self._year_windows: Dict[ExchangeSegmentKey, Dict[int, _YearWindows]] = {}
+
+        # Compiled calendars, built on first use: {(exchange, type): TradingCalendar}
+        self._trading_calendars: Dict[Tuple[Exchange, Type], TradingCalendar] = {}
+        self._trading_calendars_lock = threading.Lock()
         
         # Load all configuration data
         self._load_configurations()
@@ -134,9 +157,32 @@ class TradingWindowService:
         # Store default and weekly holiday configuration for generating regular trading days
         self._store_default_configuration(segment_key, year, default_windows)
         self._store_weekly_holidays_configuration(segment_key, year, config_data)
+
+        self._materialize_year(segment_key, year, Exchange(exchange), Type(type))
         
         logger.info(f"Loaded {len(holidays)} holidays and {len(special_days)} special days for {segment_key} {year}")
     
+    def _materialize_year(self, segment_key: str, year: int, exchange: Exchange, type: Type) -> None:
+        """
+        Build the trading window of every day of a year once, so lookups need no construction.
+
+        Args:
+            segment_key: Segment key
+            year: Year of the configuration
+            exchange: Exchange enum
+            type: Instrument Type enum
+        """
+        year_cache = self._trading_windows[segment_key][year]
+        windows: List[Optional[TradingWindow]] = []
+        day = date(year, 1, 1)
+        while day.year == year:
+            window = year_cache.get(day)
+            if window is None:
+                window = self._generate_default_trading_window(day, exchange, type)
+            windows.append(window)
+            day += timedelta(days=1)
+        self._year_windows.setdefault(segment_key, {})[year] = _YearWindows(year, windows)
+    
     def _validate_configuration(self, config_data: TradingConfigData, config_index: int) -> None:
         """
         Validate the configuration data structure.
@@ -297,19 +343,26 @@ class TradingWindowService:
         segment_key = f"{exchange.value}-{type.value}"
         year = target_date.year
         
+        year_windows = self._get_year_windows(segment_key, year)
+        return year_windows.windows[target_date.toordinal() - year_windows.first_ordinal]
+
+    def _get_year_windows(self, segment_key: str, year: int) -> _YearWindows:
         # Check if we have configuration for this exchange-segment-year
-        if (segment_key not in self._trading_windows or 
-            year not in self._trading_windows[segment_key]):
+        year_windows = self._year_windows.get(segment_key, {}).get(year)
+        if year_windows is None:
             raise ValueError(f"No trading window configuration found for {segment_key} {year}")
-        
-        year_cache = self._trading_windows[segment_key][year]
-        
-        # Check if we have a specific entry for this date (holiday or special day)
-        if target_date in year_cache:
-            return year_cache[target_date]
-        
-        # If no specific entry, generate default trading window
-        return self._generate_default_trading_window(target_date, exchange, type)
+        return year_windows
+
+    def _get_session_mask(self, start_date: date, end_date: date, exchange: Exchange, type: Type) -> np.ndarray:
+        """Whether each day from start_date to end_date (inclusive) has a session."""
+        segment_key = f"{exchange.value}-{type.value}"
+        parts = []
+        for year in range(start_date.year, end_date.year + 1):
+            year_windows = self._get_year_windows(segment_key, year)
+            first = max(start_date, date(year, 1, 1)).toordinal() - year_windows.first_ordinal
+            last = min(end_date, date(year, 12, 31)).toordinal() - year_windows.first_ordinal
+            parts.append(year_windows.sessions[first:last + 1])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
     
     def _generate_default_trading_window(
         self, 
@@ -531,4 +584,63 @@ class TradingWindowService:
             return []
         
         return sorted(self._trading_windows[segment_key].keys())
-    
\ No newline at end of file
+    
+
+    def get_trading_days(self, start_date: date, end_date: date, exchange: Exchange, type: Type) -> List[date]:
+        """
+        Get the days with a trading session from start_date to end_date (inclusive).
+
+        Args:
+            start_date: First date
+            end_date: Last date
+            exchange: Exchange enum
+            type: Instrument Type enum
+
+        Returns:
+            List of trading days, in order
+
+        Raises:
+            ValueError: If no configuration found for a year of the range
+        """
+        first_ordinal = start_date.toordinal()
+        return [date.fromordinal(first_ordinal + int(offset))
+                for offset in np.flatnonzero(self._get_session_mask(start_date, end_date, exchange, type))]
+
+    def count_sessions(self, start_date: date, end_date: date, exchange: Exchange, type: Type) -> int:
+        """
+        Count the days with a trading session from start_date to end_date (inclusive).
+
+        Args:
+            start_date: First date
+            end_date: Last date
+            exchange: Exchange enum
+            type: Instrument Type enum
+
+        Returns:
+            Number of trading days
+
+        Raises:
+            ValueError: If no configuration found for a year of the range
+        """
+        return int(np.count_nonzero(self._get_session_mask(start_date, end_date, exchange, type)))
+
+    def get_trading_calendar(self, exchange: Exchange, type: Type) -> TradingCalendar:
+        """
+        Get the compiled trading calendar of an exchange and instrument type.
+
+        The calendar is created once per exchange and type and shared by all callers.
+
+        Args:
+            exchange: Exchange enum
+            type: Instrument Type enum
+
+        Returns:
+            TradingCalendar compiled from this service's trading windows
+        """
+        key = (exchange, type)
+        with self._trading_calendars_lock:
+            calendar = self._trading_calendars.get(key)
+            if calendar is None:
+                calendar = TradingCalendar(self, exchange, type)
+                self._trading_calendars[key] = calendar
+            return calendar
@@ -1,11 +1,24 @@
-from algo.application.run_backtest_usecase import RunBacktestUseCase
+import threading
+from algo.application.run_backtest_usecase import RunBacktestUseCase, parse_backtest_dates
+from algo.application.backtest_job_queue import BacktestJobQueue, BacktestJobStatus
+from algo.application.batch_backtest_usecase import RunBatchBacktestInput, RunBatchBacktestUseCase
+from algo.application.parameter_sweep_usecase import RunParameterSweepInput, RunParameterSweepUseCase
+from algo.application.walk_forward_usecase import RunWalkForwardInput, RunWalkForwardUseCase
 from algo.config_context import get_config
+from algo.domain.backtest.historical_data_cache import CachingHistoricalDataRepository
+from algo.domain.backtest.resampler import ResamplingHistoricalDataRepository
+from algo.domain.services import get_historical_data_cache, get_trading_window_service
 from algo.domain.config import HistoricalDataBackend
 from algo.infrastructure.upstox.cached_upstox_historical_data_repository import CachedUpstoxHistoricalDataRepository
 from algo.infrastructure.json_strategy_repository import JsonStrategyRepository
+from algo.infrastructure.jsonstrategy import JsonStrategy
+from algo.infrastructure.json_backtest_report_repository import JsonBacktestReportRepository
 from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+from algo.infrastructure.arrow_historical_data_repository import ArrowHistoricalDataRepository
 from algo.infrastructure.upstox.upstox_historical_data_repository import UpstoxHistoricalDataRepository
+from algo.infrastructure.upstox.persistent_upstox_historical_data_repository import PersistentUpstoxHistoricalDataRepository
 from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
+from algo.infrastructure.service_configuration import ensure_services_registered
 from flask import Blueprint, request, jsonify
 
 from algo.application.run_backtest_usecase import RunBacktestInput
@@ -13,20 +26,75 @@ from algo.application.run_backtest_usecase import RunBacktestInput
 
 backtest_bp = Blueprint('backtest', __name__)
 
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
 def get_historical_data_repository():
     config = get_config()
-    if config.backtest_engine.historical_data_backend == HistoricalDataBackend.UPSTOX_API:
-        historical_data_repository = CachedUpstoxHistoricalDataRepository(UpstoxHistoricalDataRepository())
+    backend = config.backtest_engine.historical_data_backend
+    if backend == HistoricalDataBackend.UPSTOX_API:
+        upstox_repository = UpstoxHistoricalDataRepository()
+        disk_cache_dir = config.backtest_engine.upstox_disk_cache_dir
+        if disk_cache_dir:
+            upstox_repository = PersistentUpstoxHistoricalDataRepository(disk_cache_dir, upstox_repository)
+        historical_data_repository = CachedUpstoxHistoricalDataRepository(upstox_repository)
+        source = backend.value
+    elif backend == HistoricalDataBackend.ARROW_FILES:
+        base_dir = config.backtest_engine.parquet_files_base_dir
+        historical_data_repository = ArrowHistoricalDataRepository(base_dir, ParquetHistoricalDataRepository(base_dir))
+        source = f"{backend.value}:{base_dir}"
     else:
-         historical_data_repository = ParquetHistoricalDataRepository(config.backtest_engine.parquet_files_base_dir)
+        base_dir = config.backtest_engine.parquet_files_base_dir
+        historical_data_repository = ParquetHistoricalDataRepository(base_dir)
+        source = f"{backend.value}:{base_dir}"
+    # Loaded data outlives the request in the process-wide cache
+    ensure_services_registered()
+    cache = get_historical_data_cache()
+    historical_data_repository = CachingHistoricalDataRepository(historical_data_repository, cache, source)
+    if config.backtest_engine.resample_from_one_minute:
+        historical_data_repository = ResamplingHistoricalDataRepository(
+            historical_data_repository, get_trading_window_service(), cache, source
+        )
     return historical_data_repository
 
+def get_max_workers(data: dict) -> int:
+    """
+    Number of worker processes for a batch, sweep or walk-forward request.
+
+    Raises:
+        ValueError: If max_workers is given and is not a positive integer
+    """
+    limit = get_config().backtest_engine.max_worker_processes
+    max_workers = data.get("max_workers")
+    if max_workers is None:
+        return limit
+    if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    return min(max_workers, limit)
+
 def get_strategy_repository():
     return JsonStrategyRepository()
 
 def get_tradable_instrument_repository():
     return InMemoryTradableInstrumentRepository()
 
+def get_backtest_job_queue() -> BacktestJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = BacktestJobQueue(get_config().backtest_engine.max_concurrent_jobs)
+    return _job_queue
+
+def _run_async_backtest(input_data, progress_callback, job_id):
+    use_case = RunBacktestUseCase(
+        get_historical_data_repository(),
+        get_tradable_instrument_repository(),
+        get_strategy_repository(),
+        JsonBacktestReportRepository()
+    )
+    return use_case.execute(input_data, progress_callback=progress_callback, report_id=job_id)
+
 @backtest_bp.route('/api/backtest', methods=['POST'])
 def run_backtest():
     try:
@@ -36,18 +104,159 @@ def run_backtest():
         if data is None:
             return jsonify({'error': 'Invalid or missing JSON payload'}), 400
 
+        input_data = RunBacktestInput(
+            strategy_name=data.get("strategy_name"),
+            start_date=data.get("start_date"),
+            end_date=data.get("end_date")
+        )
+        if data.get("async"):
+            # Validate up front so bad requests fail fast instead of as failed jobs
+            parse_backtest_dates(input_data)
+            get_strategy_repository().get_strategy(input_data.strategy_name)
+            job = get_backtest_job_queue().submit(input_data, _run_async_backtest)
+            return jsonify(job.to_dict()), 202
+
         use_case = RunBacktestUseCase(
             get_historical_data_repository(),
             get_tradable_instrument_repository(),
             get_strategy_repository()
         )
-        input_data = RunBacktestInput(
+        report = use_case.execute(input_data)
+        return jsonify(report), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@backtest_bp.route('/api/backtest/<job_id>', methods=['GET'])
+def get_backtest_job(job_id):
+    job = get_backtest_job_queue().get(job_id)
+    if job is not None:
+        return jsonify(job.to_dict()), 200
+    # Finished jobs evicted from memory, or run before a restart, are read from their saved report
+    report = JsonBacktestReportRepository().find(job_id)
+    # Reports saved without the job result cannot be served in the schema of a live job
+    if report is None or "result" not in report:
+        return jsonify({'error': f'Backtest job {job_id} not found'}), 404
+    summary = report.get("summary", {})
+    return jsonify({
+        "job_id": job_id,
+        "status": BacktestJobStatus.COMPLETED.value,
+        "strategy_name": summary.get("strategy"),
+        "start_date": summary.get("start_date"),
+        "end_date": summary.get("end_date"),
+        "result": report["result"],
+        "error": None,
+    }), 200
+
+@backtest_bp.route('/api/historical-data/cache', methods=['GET'])
+def get_historical_data_cache_stats():
+    ensure_services_registered()
+    cache = get_historical_data_cache()
+    return jsonify({"stats": cache.get_stats(), **cache.get_entries()}), 200
+
+@backtest_bp.route('/api/backtest/batch', methods=['POST'])
+def run_batch_backtest():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        data = request.get_json(silent=True)
+        if data is None:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+
+        strategy_repository = get_strategy_repository()
+        if data.get("jobs") is not None:
+            jobs = [
+                RunBacktestInput(
+                    strategy_name=job.get("strategy_name"),
+                    start_date=job.get("start_date"),
+                    end_date=job.get("end_date")
+                )
+                for job in data.get("jobs")
+            ]
+        else:
+            # Run the requested strategies (all strategies by default) over one date range
+            strategy_names = data.get("strategy_names") or [s.get_name() for s in strategy_repository.list_strategies()]
+            jobs = [
+                RunBacktestInput(strategy_name=name, start_date=data.get("start_date"), end_date=data.get("end_date"))
+                for name in strategy_names
+            ]
+
+        use_case = RunBatchBacktestUseCase(
+            strategy_repository,
+            get_historical_data_repository,
+            get_tradable_instrument_repository,
+            get_strategy_repository,
+            max_workers=get_max_workers(data),
+            worker_setup=ensure_services_registered
+        )
+        result = use_case.execute(RunBatchBacktestInput(jobs), vectorized=bool(data.get("vectorized", False)))
+        return jsonify(result), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@backtest_bp.route('/api/backtest/sweep', methods=['POST'])
+def run_parameter_sweep():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        data = request.get_json(silent=True)
+        if data is None:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+
+        use_case = RunParameterSweepUseCase(
+            get_strategy_repository(),
+            JsonStrategy,
+            get_historical_data_repository(),
+            get_tradable_instrument_repository,
+            historical_data_repository_factory=get_historical_data_repository,
+            max_workers=get_max_workers(data),
+            worker_setup=ensure_services_registered
+        )
+        input_data = RunParameterSweepInput(
             strategy_name=data.get("strategy_name"),
             start_date=data.get("start_date"),
-            end_date=data.get("end_date")
+            end_date=data.get("end_date"),
+            parameters=data.get("parameters") or [],
+            rank_by=data.get("rank_by", "total_pnl_points"),
+            top=data.get("top")
         )
-        report = use_case.execute(input_data)
-        return jsonify(report), 200
+        result = use_case.execute(input_data, vectorized=bool(data.get("vectorized", True)))
+        return jsonify(result), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@backtest_bp.route('/api/backtest/walk-forward', methods=['POST'])
+def run_walk_forward():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        data = request.get_json(silent=True)
+        if data is None:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+
+        use_case = RunWalkForwardUseCase(
+            get_strategy_repository(),
+            get_historical_data_repository(),
+            get_tradable_instrument_repository,
+            historical_data_repository_factory=get_historical_data_repository,
+            max_workers=get_max_workers(data),
+            worker_setup=ensure_services_registered
+        )
+        input_data = RunWalkForwardInput(
+            strategy_name=data.get("strategy_name"),
+            start_date=data.get("start_date"),
+            end_date=data.get("end_date"),
+            in_sample_days=data.get("in_sample_days", 0),
+            out_of_sample_days=data.get("out_of_sample_days"),
+            step_days=data.get("step_days")
+        )
+        result = use_case.execute(input_data, vectorized=bool(data.get("vectorized", True)))
+        return jsonify(result), 200
     except ValueError as ve:
         return jsonify({'error': str(ve)}), 400
     except Exception as e:
@@ -0,0 +1,111 @@
+"""
+Arrow IPC copies of the Parquet historical data tree.
+
+Year files are written next to the Parquet ones as ``{base}/{timeframe}/{instrument}/{yyyy}.arrow``:
+uncompressed Arrow IPC files holding a single record batch sorted by timestamp, so a memory
+mapped file can be handed out as contiguous zero-copy column arrays.
+
+Run ``python -m algo.infrastructure.arrow_dataset <base_dir>`` to (re)build them from the
+Parquet daily and year files.
+"""
+import argparse
+import glob
+import logging
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from algo.infrastructure.parquet_dataset import sanitize_instrument_key
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+
+logger = logging.getLogger(__name__)
+
+_YEAR_PATTERN = re.compile(r"^(\d{4})(\.parquet)?$")
+
+
+def get_arrow_file_path(base_dir: str, timeframe: str, instrument_key: str, year: int) -> str:
+    return f"{base_dir}/{timeframe}/{sanitize_instrument_key(instrument_key)}/{year}.arrow"
+
+
+def write_arrow_file(path: str, df: pd.DataFrame) -> int:
+    """
+    Write candles as an uncompressed Arrow IPC file with a single record batch.
+
+    Returns:
+        int: Number of rows written
+    """
+    df = df.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df = (df.drop_duplicates(subset="timestamp", keep="last")
+            .sort_values("timestamp")
+            .reset_index(drop=True))
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=max(len(table), 1)):
+                writer.write_batch(batch)
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def _list_parquet_years(instrument_dir: str) -> List[int]:
+    years = set()
+    for name in os.listdir(instrument_dir):
+        match = _YEAR_PATTERN.match(name)
+        if match and (match.group(2) or glob.glob(os.path.join(instrument_dir, name, "*", "*.parquet"))):
+            years.add(int(match.group(1)))
+    return sorted(years)
+
+
+def convert_parquet_dataset(base_dir: str, timeframes: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Build an Arrow year file from the Parquet files of every instrument, timeframe and year.
+
+    Args:
+        base_dir: Base directory of the historical data tree
+        timeframes: Timeframe directories to convert (defaults to all)
+
+    Returns:
+        dict: Number of rows written per Arrow file path
+    """
+    parquet_repository = ParquetHistoricalDataRepository(base_dir)
+    written = {}
+    for timeframe in timeframes or sorted(os.listdir(base_dir)):
+        timeframe_dir = os.path.join(base_dir, timeframe)
+        if not os.path.isdir(timeframe_dir):
+            continue
+        for instrument in sorted(os.listdir(timeframe_dir)):
+            instrument_dir = os.path.join(timeframe_dir, instrument)
+            if not os.path.isdir(instrument_dir):
+                continue
+            for year in _list_parquet_years(instrument_dir):
+                df = parquet_repository.get_dataframe(instrument, date(year, 1, 1), date(year, 12, 31), timeframe)
+                if df is None or df.empty:
+                    continue
+                path = get_arrow_file_path(base_dir, timeframe, instrument, year)
+                written[path] = write_arrow_file(path, df)
+                logger.info(f"Wrote {written[path]} candles to {path}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Arrow IPC year files from the Parquet files.")
+    parser.add_argument("base_dir", help="Base directory of the historical data tree")
+    parser.add_argument("--timeframe", action="append", dest="timeframes",
+                        help="Timeframe to convert, may be repeated (defaults to all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    written = convert_parquet_dataset(args.base_dir, args.timeframes)
+    print(f"Wrote {len(written)} Arrow files with {sum(written.values())} candles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.timeframe import Timeframe
+from algo.infrastructure.arrow_dataset import get_arrow_file_path
+
+logger = logging.getLogger(__name__)
+
+
+class _MappedYear:
+    """A memory mapped Arrow year file with its timestamps as int64 values in the file's unit."""
+
+    def __init__(self, path: str):
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        with pa.memory_map(path, "r") as source:
+            # The table references the mapping, which stays open while the table is alive
+            self.table = pa.ipc.open_file(source).read_all().combine_chunks()
+        timestamp_type = self.table.schema.field("timestamp").type
+        self.unit = timestamp_type.unit
+        self.tz = timestamp_type.tz
+        self.timestamps = self._column_values("timestamp", pa.int64())
+
+    def _column_values(self, name: str, view_type: Optional[pa.DataType] = None) -> np.ndarray:
+        column = self.table.column(name)
+        array = column.chunk(0) if column.num_chunks else pa.array([], type=column.type)
+        if view_type is not None:
+            array = array.view(view_type)
+        return array.to_numpy(zero_copy_only=array.null_count == 0 and pa.types.is_primitive(array.type))
+
+    def columns(self, start: int, stop: int) -> Dict[str, Any]:
+        """Zero-copy column views of rows [start, stop)."""
+        columns: Dict[str, Any] = {}
+        for name in self.table.column_names:
+            if name == "timestamp":
+                values = self.timestamps[start:stop].view(f"datetime64[{self.unit}]")
+                timestamps = pd.DatetimeIndex(values)
+                columns[name] = timestamps.tz_localize("UTC").tz_convert(self.tz) if self.tz else timestamps
+            else:
+                columns[name] = self._column_values(name)[start:stop]
+        return columns
+
+    def bounds(self, start_date: date, end_date: date) -> Tuple[int, int]:
+        lower = pd.Timestamp(start_date, tz=self.tz).as_unit(self.unit).value
+        upper = pd.Timestamp(end_date + timedelta(days=1), tz=self.tz).as_unit(self.unit).value
+        return (int(np.searchsorted(self.timestamps, lower, side="left")),
+                int(np.searchsorted(self.timestamps, upper, side="left")))
+
+    def last_date(self) -> Optional[date]:
+        if len(self.timestamps) == 0:
+            return None
+        timestamp = pd.Timestamp(int(self.timestamps[-1]), unit=self.unit, tz="UTC" if self.tz else None)
+        return (timestamp.tz_convert(self.tz) if self.tz else timestamp).date()
+
+
+class ArrowHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Reads candles from memory mapped Arrow IPC year files (see algo.infrastructure.arrow_dataset).
+
+    Mapped files are shared process-wide and re-opened only when the file changes, so repeated
+    backtests reuse them without reading or decompressing anything; worker processes mapping the
+    same files share the OS page cache. A range within one year is returned as zero-copy views of
+    the mapped columns. Years without an Arrow file, and days after the last candle of one, are
+    read from the optional fallback repository.
+    """
+
+    _mapped_years: Dict[str, _MappedYear] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, data_path: str, fallback: Optional[HistoricalDataRepository] = None):
+        """
+        Args:
+            data_path: Base directory of the historical data tree
+            fallback: Repository for the ranges not covered by Arrow files, e.g. a
+                ParquetHistoricalDataRepository over the same directory
+        """
+        self.data_path = data_path
+        self.fallback = fallback
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        parts: List[Dict[str, Any]] = []
+        for year in range(start_date.year, end_date.year + 1):
+            year_start = max(start_date, date(year, 1, 1))
+            year_end = min(end_date, date(year, 12, 31))
+            fallback_start = year_start
+            mapped = self._get_mapped_year(get_arrow_file_path(self.data_path, timeframe.value, instrument.instrument_key, year))
+            if mapped is not None:
+                start, stop = mapped.bounds(year_start, year_end)
+                if stop > start:
+                    parts.append(mapped.columns(start, stop))
+                last_date = mapped.last_date()
+                fallback_start = max(year_start, last_date + timedelta(days=1)) if last_date else year_start
+            if self.fallback is not None and fallback_start <= year_end:
+                data = self.fallback.get_historical_data(instrument, fallback_start, year_end, timeframe)
+                if len(data):
+                    parts.append({name: data.column(name) for name in data.column_names})
+
+        if not parts:
+            return HistoricalData([])
+        if len(parts) == 1:
+            return HistoricalData.from_columns(parts[0])
+        return HistoricalData.from_columns(self._concatenate(parts))
+
+    @staticmethod
+    def _concatenate(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        names = [name for name in parts[0] if all(name in part for part in parts)]
+        columns: Dict[str, Any] = {}
+        for name in names:
+            if name == "timestamp":
+                # Parts read by different libraries may carry equal offsets as different tz objects
+                tz = parts[0][name].tz
+                columns[name] = parts[0][name].append(
+                    [part[name].tz_convert(tz) if tz is not None else part[name] for part in parts[1:]]
+                )
+            else:
+                columns[name] = np.concatenate([part[name] for part in parts])
+        return columns
+
+    @classmethod
+    def _get_mapped_year(cls, path: str) -> Optional[_MappedYear]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        with cls._lock:
+            mapped = cls._mapped_years.get(path)
+            if mapped is None or mapped.signature != (stat.st_mtime_ns, stat.st_size):
+                logger.debug(f"Memory mapping {path}")
+                mapped = _MappedYear(path)
+                cls._mapped_years[path] = mapped
+            return mapped
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the mapped files held by this process."""
+        with cls._lock:
+            cls._mapped_years.clear()
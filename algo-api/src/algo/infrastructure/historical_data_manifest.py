@@ -0,0 +1,250 @@
+"""
+SQLite index of the days ingested into the Parquet historical data tree.
+
+The manifest lives at ``{base}/manifest.sqlite`` and holds one row per (instrument, timeframe,
+date) with the number of candles, a checksum of the daily file and whether the day was complete
+when it was fetched. Writers (the historical-data component's downloader and the Upstox disk
+tier) record every day of the ranges they fetch by one policy, ``day_completeness``: days
+without a session are complete with no rows, so they are neither downloaded again nor probed on
+disk, while trading days that came back without candles stay partial and are fetched again for
+a few days. Readers use it to decide what to download and which daily files exist without
+probing the filesystem.
+
+Instrument keys are stored as their directory names (see ``sanitize_instrument_key``). Run
+``python -m algo.infrastructure.historical_data_manifest <base_dir>`` to index a tree written
+before the manifest existed.
+"""
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow.parquet as pq
+
+from algo.infrastructure.parquet_dataset import sanitize_instrument_key
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "manifest.sqlite"
+
+COMPLETE = "complete"
+PARTIAL = "partial"
+
+# Trading days fetched without candles are fetched again until they are this many days old
+EMPTY_TRADING_DAY_RETRY_DAYS = 5
+
+# Stored as PRAGMA user_version. Bump it with any change to the table, in both copies of this
+# module (algo.infrastructure.historical_data_manifest in algo-api and
+# historical_data.infrastructure.manifest in the historical-data component); readers refuse
+# manifests written with a newer schema than theirs.
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_days (
+    instrument_key TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    date TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    checksum TEXT,
+    completeness TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (instrument_key, timeframe, date)
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    day: date
+    row_count: int
+    checksum: Optional[str]
+    completeness: str
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completeness == COMPLETE
+
+
+def day_completeness(day: date, row_count: int, trading_day: bool, today: date) -> str:
+    """
+    Completeness to record for a fetched day; the same policy is applied by every writer.
+
+    Today is partial. Days without a session are complete with no rows. A trading day that came
+    back without candles stays partial, so it is fetched again, until it is more than
+    EMPTY_TRADING_DAY_RETRY_DAYS old; after that the empty response is taken as final
+    (e.g. an instrument that was not listed yet).
+
+    Args:
+        day: The fetched day
+        row_count: Number of candles stored for the day
+        trading_day: Whether the exchange had a session on the day
+        today: Current date at the exchange
+    """
+    if day >= today:
+        return PARTIAL
+    if row_count > 0 or not trading_day:
+        return COMPLETE
+    return COMPLETE if (today - day).days > EMPTY_TRADING_DAY_RETRY_DAYS else PARTIAL
+
+
+def get_manifest_path(base_dir: str) -> str:
+    return os.path.join(base_dir, MANIFEST_FILE_NAME)
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HistoricalDataManifest:
+    """
+    Reads and writes the manifest of a historical data tree.
+
+    Every call opens its own connection, so one instance can be shared by threads and processes;
+    SQLite serializes the writers.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.path = get_manifest_path(base_dir)
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            connection.close()
+            raise ValueError(f"Manifest {self.path} has schema version {version}, newer than the supported {SCHEMA_VERSION}")
+        connection.execute(_SCHEMA)
+        if version < SCHEMA_VERSION:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return connection
+
+    def get_entries(self, instrument_key: str, timeframe: str, start_date: date, end_date: date) -> Dict[date, ManifestEntry]:
+        """
+        Return the recorded days of a series from start_date to end_date (inclusive).
+
+        Args:
+            instrument_key: Instrument key, e.g. 'NSE_INDEX|Nifty 50'
+            timeframe: Timeframe directory, e.g. '15min'
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+
+        Returns:
+            dict: Entry per recorded date; days never ingested are absent
+        """
+        if not self.exists():
+            return {}
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT date, row_count, checksum, completeness FROM ingested_days "
+                "WHERE instrument_key = ? AND timeframe = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (sanitize_instrument_key(instrument_key), timeframe, start_date.isoformat(), end_date.isoformat()),
+            ).fetchall()
+        return {
+            entry.day: entry
+            for entry in (ManifestEntry(date.fromisoformat(day), row_count, checksum, completeness)
+                          for day, row_count, checksum, completeness in rows)
+        }
+
+    def has_series(self, instrument_key: str, timeframe: str) -> bool:
+        """Whether any day of the series is recorded, i.e. the manifest is authoritative for it."""
+        if not self.exists():
+            return False
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT 1 FROM ingested_days WHERE instrument_key = ? AND timeframe = ? LIMIT 1",
+                (sanitize_instrument_key(instrument_key), timeframe),
+            ).fetchone()
+        return row is not None
+
+    def record(self, instrument_key: str, timeframe: str, entries: Iterable[ManifestEntry]) -> None:
+        """Insert or replace the entries of a series in one transaction."""
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (sanitize_instrument_key(instrument_key), timeframe, entry.day.isoformat(), entry.row_count,
+             entry.checksum, entry.completeness, updated_at)
+            for entry in entries
+        ]
+        if not rows:
+            return
+        os.makedirs(self.base_dir, exist_ok=True)
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO ingested_days "
+                    "(instrument_key, timeframe, date, row_count, checksum, completeness, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def index_series(self, instrument_key: str, timeframe: str) -> int:
+        """
+        Record the daily files of one series that the manifest does not know yet as complete days.
+
+        Writers call this before recording the first days of a series, so the manifest stays
+        authoritative for series that were partly downloaded before it existed.
+
+        Returns:
+            int: Number of days recorded
+        """
+        instrument_dir = os.path.join(self.base_dir, timeframe, sanitize_instrument_key(instrument_key))
+        paths = glob.glob(os.path.join(instrument_dir, "[0-9]*", "[0-9]*", "*.parquet"))
+        if not paths:
+            return 0
+        days = {date.fromisoformat(os.path.basename(path)[:-len(".parquet")]): path for path in paths}
+        known = self.get_entries(instrument_key, timeframe, min(days), max(days))
+        entries = [
+            ManifestEntry(day, pq.ParquetFile(path).metadata.num_rows, file_checksum(path), COMPLETE)
+            for day, path in sorted(days.items()) if day not in known
+        ]
+        self.record(instrument_key, timeframe, entries)
+        return len(entries)
+
+    def index_daily_files(self, timeframes: Optional[List[str]] = None) -> int:
+        """
+        Index the daily files of every series of the tree (see index_series).
+
+        Args:
+            timeframes: Timeframe directories to index (defaults to all)
+
+        Returns:
+            int: Number of days recorded
+        """
+        recorded = 0
+        for timeframe in timeframes or sorted(os.listdir(self.base_dir)):
+            timeframe_dir = os.path.join(self.base_dir, timeframe)
+            if not os.path.isdir(timeframe_dir):
+                continue
+            for instrument in sorted(os.listdir(timeframe_dir)):
+                if os.path.isdir(os.path.join(timeframe_dir, instrument)):
+                    recorded += self.index_series(instrument, timeframe)
+        return recorded
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the daily Parquet files of a historical data tree.")
+    parser.add_argument("base_dir", help="Base directory of the historical data tree")
+    parser.add_argument("--timeframe", action="append", dest="timeframes",
+                        help="Timeframe to index, may be repeated (defaults to all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    recorded = HistoricalDataManifest(args.base_dir).index_daily_files(args.timeframes)
+    print(f"Recorded {recorded} days in {get_manifest_path(args.base_dir)}")
+
+
+if __name__ == "__main__":
+    main()
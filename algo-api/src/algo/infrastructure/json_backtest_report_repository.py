@@ -1,6 +1,8 @@
+import glob
 import json
 import os
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Optional
 from datetime import date
 
 from algo.domain.backtest.report_repository import BacktestReportRepository
@@ -8,18 +10,39 @@ from algo.domain.backtest.report import BackTestReport
 from algo import config_context
 
 
+# Report ids are job ids (uuid hex); anything else cannot name a report file
+_REPORT_ID_PATTERN = re.compile(r"^[A-Za-z0-9-]+$")
+
+
 class JsonBacktestReportRepository(BacktestReportRepository):
     def __init__(self, report_directory: str = "report"):
         self.report_directory = config_context.get_config().backtest_engine.reports_dir
 
-    def save(self, report: BackTestReport) -> None:
+    def save(self, report: BackTestReport, report_id: Optional[str] = None,
+             result: Optional[Dict[str, Any]] = None) -> None:
         os.makedirs(self.report_directory, exist_ok=True)
         # The report object does not have start and end dates.
         # This is a temporary solution.
         # TODO: Add start and end dates to the report object.
-        report_filename = f"{report.strategy_name}_report.json"
+        # Reports of asynchronous jobs carry the job id so concurrent runs do not overwrite each other
+        if report_id:
+            report_filename = f"{report.strategy_name}_{report_id}_report.json"
+        else:
+            report_filename = f"{report.strategy_name}_report.json"
         report_filepath = os.path.join(self.report_directory, report_filename)
 
+        data = report.to_dict()
+        if result is not None:
+            data["result"] = result
         with open(report_filepath, "w") as f:
-            json.dump(report.to_dict(), f, indent=4, default=str)
+            json.dump(data, f, indent=4, default=str)
             print(f"Report saved to {report_filepath}")
+
+    def find(self, report_id: str) -> Optional[Dict[str, Any]]:
+        if not report_id or not _REPORT_ID_PATTERN.match(report_id):
+            return None
+        paths = glob.glob(os.path.join(self.report_directory, f"*_{report_id}_report.json"))
+        if not paths:
+            return None
+        with open(paths[0], "r") as f:
+            return json.load(f)
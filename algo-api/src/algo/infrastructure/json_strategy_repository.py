@@ -1,5 +1,8 @@
+import hashlib
 import json
 import os
+import threading
+from typing import Dict
 from algo.domain.strategy_repository import StrategyRepository
 from algo.domain.strategy.strategy import Strategy
 from algo.infrastructure.jsonstrategy import JsonStrategy
@@ -7,6 +10,11 @@ from algo.config_context import get_config
 
 
 class JsonStrategyRepository(StrategyRepository):
+    # Parsed and compiled strategies keyed by the sha256 of their JSON file, shared by all
+    # repository instances so unchanged files are never parsed or compiled twice
+    _strategy_cache: Dict[str, JsonStrategy] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self):
         config = get_config()
         self.base_dir = config.backtest_engine.strategy_json_config_dir
@@ -15,9 +23,8 @@ class JsonStrategyRepository(StrategyRepository):
         file_path = os.path.join(self.base_dir, f"{strategy_name}.json")
         if not os.path.exists(file_path):
             raise ValueError(f"{strategy_name} is not a valid strategy name.")
-        with open(file_path, 'r') as f:
-            strategy_data = json.load(f)
-        strategy = JsonStrategy(strategy_data)
+        strategy = self._load_strategy(file_path)
+        strategy.get_compiled_plan()
         return strategy
 
     def list_strategies(self) -> list[Strategy]:
@@ -26,8 +33,26 @@ class JsonStrategyRepository(StrategyRepository):
         for filename in os.listdir(self.base_dir):
             if filename.endswith('.json'):
                 file_path = os.path.join(self.base_dir, filename)
-                with open(file_path, 'r') as f:
-                    strategy_data = json.load(f)
-                strategy = JsonStrategy(strategy_data)
-                strategies.append(strategy)
-        return strategies
\ No newline at end of file
+                strategies.append(self._load_strategy(file_path))
+        return strategies
+
+    def _load_strategy(self, file_path: str) -> JsonStrategy:
+        """
+        Return the strategy defined in the file, reusing the cached instance while the file
+        content is unchanged.
+        """
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        file_hash = hashlib.sha256(content).hexdigest()
+        with self._cache_lock:
+            strategy = self._strategy_cache.get(file_hash)
+        if strategy is None:
+            strategy = JsonStrategy(json.loads(content))
+            with self._cache_lock:
+                strategy = self._strategy_cache.setdefault(file_hash, strategy)
+        return strategy
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._strategy_cache.clear()
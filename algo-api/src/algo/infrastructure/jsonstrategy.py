@@ -1,14 +1,21 @@
+import copy
 import json
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List, Optional, Union
+import numpy as np
+import pandas as pd
+from algo.domain.backtest.historical_data import HistoricalData
 from algo.domain.instrument.instrument import Instrument
 from algo.domain.strategy.strategy import PositionInstrument, Strategy
 from algo.domain.strategy.strategy import RuleSet,Condition,Expression
 from algo.domain.timeframe import Timeframe
 from algo.domain.strategy.strategy import RiskManagement, StopLoss, StopLossType
+from algo.domain.strategy.strategy_compiler import CompiledStrategyPlan, StrategyCompiler
 
 
 class JsonStrategy(Strategy):
     def __init__(self, json_data: Dict[str, Any]):
+        self._json_data = copy.deepcopy(json_data)
         self.name = json_data.get("name")
         self.display_name = json_data.get("display_name")
         self.description = json_data.get("description", "")
@@ -21,6 +28,8 @@ class JsonStrategy(Strategy):
         self.entry_rules = self._parse_rules(json_data.get("entry_rules", {}))
         self.exit_rules = self._parse_rules(json_data.get("exit_rules", {}))
         self.risk_management = self._parse_risk_management(json_data.get("risk_management"))
+        self._compiled_plan: Optional[CompiledStrategyPlan] = None
+        self._compile_lock = threading.Lock()
 
     def _parse_position(self, json_data):
         position_data = json_data.get("position", {})
@@ -100,3 +109,38 @@ class JsonStrategy(Strategy):
     
     def get_risk_management(self) -> RiskManagement:
         return self.risk_management
+
+    def __getstate__(self):
+        # The lock and the compiled plan are rebuilt after unpickling, e.g. in worker processes
+        state = self.__dict__.copy()
+        state["_compiled_plan"] = None
+        del state["_compile_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile_lock = threading.Lock()
+
+    def get_json_data(self) -> Dict[str, Any]:
+        """Return a copy of the JSON definition the strategy was built from."""
+        return copy.deepcopy(self._json_data)
+
+    def get_compiled_plan(self) -> CompiledStrategyPlan:
+        """Return the compiled rule plan, compiling it on first use."""
+        if self._compiled_plan is None:
+            with self._compile_lock:
+                if self._compiled_plan is None:
+                    self._compiled_plan = StrategyCompiler().compile(self)
+        return self._compiled_plan
+
+    def should_enter_trade(self, historical_data: List[Dict[str, Any]]) -> bool:
+        return self.get_compiled_plan().should_enter(historical_data)
+
+    def should_exit_trade(self, historical_data: List[Dict[str, Any]]) -> bool:
+        return self.get_compiled_plan().should_exit(historical_data)
+
+    def entry_signal_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        return self.get_compiled_plan().entry_series(historical_data)
+
+    def exit_signal_series(self, historical_data: Union[HistoricalData, List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        return self.get_compiled_plan().exit_series(historical_data)
@@ -0,0 +1,176 @@
+"""
+Layout of the Parquet historical data tree and migration to the year-partitioned layout.
+
+Two layouts live side by side under the same base directory:
+
+- daily files, as written by the historical-data component:
+  ``{base}/{timeframe}/{instrument}/{yyyy}/{mm}/{yyyy-mm-dd}.parquet``
+- year files, one per instrument, timeframe and year, sorted by timestamp with one row group
+  per month: ``{base}/{timeframe}/{instrument}/{yyyy}.parquet``
+
+Run ``python -m algo.infrastructure.parquet_dataset <base_dir>`` to consolidate the daily files
+into year files. Re-running it merges daily files downloaded since the last run.
+"""
+import argparse
+import glob
+import logging
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+def sanitize_instrument_key(instrument_key: str) -> str:
+    return instrument_key.replace("|", ".")
+
+
+def get_daily_file_path(base_dir: str, timeframe: str, instrument_key: str, day: date) -> str:
+    return (
+        f"{base_dir}/{timeframe}/{sanitize_instrument_key(instrument_key)}/"
+        f"{day.year}/{day.month:02d}/{day.strftime('%Y-%m-%d')}.parquet"
+    )
+
+
+def get_year_file_path(base_dir: str, timeframe: str, instrument_key: str, year: int) -> str:
+    return f"{base_dir}/{timeframe}/{sanitize_instrument_key(instrument_key)}/{year}.parquet"
+
+
+def get_last_date(year_file_path: str) -> Optional[date]:
+    """
+    Date of the last candle of a year file, read from the row group statistics only.
+
+    Returns:
+        The date in the timezone of the timestamp column, or None if the file has no statistics
+    """
+    metadata = pq.ParquetFile(year_file_path).metadata
+    schema = metadata.schema.to_arrow_schema()
+    column = schema.get_field_index("timestamp")
+    last = None
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+        if last is None or statistics.max > last:
+            last = statistics.max
+    if last is None:
+        return None
+    tz = schema.field("timestamp").type.tz
+    timestamp = pd.Timestamp(last)
+    if tz is not None:
+        timestamp = timestamp.tz_convert(tz)
+    return timestamp.date()
+
+
+def write_year_file(path: str, df: pd.DataFrame) -> int:
+    """
+    Write the candles of one year, sorted by timestamp and with one row group per month.
+
+    Rows sharing a timestamp are deduplicated, keeping the last one.
+
+    Returns:
+        int: Number of rows written
+    """
+    df = df.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df = (df.drop_duplicates(subset="timestamp", keep="last")
+            .sort_values("timestamp")
+            .reset_index(drop=True))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    month_starts = np.flatnonzero(np.diff(df["timestamp"].dt.month.to_numpy())) + 1
+    bounds = [0, *month_starts.tolist(), len(df)]
+    with pq.ParquetWriter(tmp_path, table.schema) as writer:
+        for start, end in zip(bounds, bounds[1:]):
+            writer.write_table(table.slice(start, end - start))
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def write_daily_file(path: str, df: pd.DataFrame) -> int:
+    """
+    Write the candles of one day, sorted by timestamp, replacing the file atomically.
+
+    Returns:
+        int: Number of rows written
+    """
+    df = df.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df = (df.drop_duplicates(subset="timestamp", keep="last")
+            .sort_values("timestamp")
+            .reset_index(drop=True))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def _list_daily_files(instrument_dir: str) -> Dict[int, List[str]]:
+    files_by_year: Dict[int, List[str]] = {}
+    for path in glob.glob(os.path.join(instrument_dir, "[0-9][0-9][0-9][0-9]", "[0-9][0-9]", "*.parquet")):
+        year = int(os.path.basename(os.path.dirname(os.path.dirname(path))))
+        files_by_year.setdefault(year, []).append(path)
+    return files_by_year
+
+
+def migrate_daily_files(base_dir: str, timeframes: Optional[List[str]] = None,
+                        remove_daily_files: bool = False) -> Dict[str, int]:
+    """
+    Consolidate the daily files under base_dir into year files.
+
+    Candles already in a year file are kept and merged with the daily files, so the migration
+    can be re-run after new days are downloaded.
+
+    Args:
+        base_dir: Base directory of the historical data tree
+        timeframes: Timeframe directories to migrate (defaults to all)
+        remove_daily_files: Delete the daily files once their year file is written
+
+    Returns:
+        dict: Number of rows written per year file path
+    """
+    written = {}
+    for timeframe in timeframes or sorted(os.listdir(base_dir)):
+        timeframe_dir = os.path.join(base_dir, timeframe)
+        if not os.path.isdir(timeframe_dir):
+            continue
+        for instrument in sorted(os.listdir(timeframe_dir)):
+            instrument_dir = os.path.join(timeframe_dir, instrument)
+            if not os.path.isdir(instrument_dir):
+                continue
+            for year, daily_files in sorted(_list_daily_files(instrument_dir).items()):
+                year_path = get_year_file_path(base_dir, timeframe, instrument, year)
+                frames = [pd.read_parquet(year_path)] if os.path.isfile(year_path) else []
+                frames.extend(pd.read_parquet(path) for path in sorted(daily_files))
+                written[year_path] = write_year_file(year_path, pd.concat(frames, ignore_index=True))
+                logger.info(f"Migrated {len(daily_files)} daily files into {year_path}")
+                if remove_daily_files:
+                    for path in daily_files:
+                        os.remove(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidate daily Parquet files into year files.")
+    parser.add_argument("base_dir", help="Base directory of the historical data tree")
+    parser.add_argument("--timeframe", action="append", dest="timeframes",
+                        help="Timeframe to migrate, may be repeated (defaults to all)")
+    parser.add_argument("--remove-daily-files", action="store_true",
+                        help="Delete the daily files after migrating them")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    written = migrate_daily_files(args.base_dir, args.timeframes, args.remove_daily_files)
+    print(f"Wrote {len(written)} year files with {sum(written.values())} candles")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,112 @@
+import logging
 import os
 from datetime import date, timedelta
 import pandas as pd
-from typing import List, Dict, Any
+import pyarrow.parquet as pq
+from typing import List, Dict, Any, Optional
 from algo.domain.backtest.historical_data import HistoricalData
 from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
 from algo.domain.instrument.instrument import Instrument
 from algo.domain.timeframe import Timeframe
+from algo.infrastructure.historical_data_manifest import HistoricalDataManifest
+from algo.infrastructure.parquet_dataset import get_daily_file_path, get_last_date, get_year_file_path
 from algo import config_context
 
+logger = logging.getLogger(__name__)
+
 class ParquetHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Reads candles from the Parquet historical data tree (see algo.infrastructure.parquet_dataset).
+
+    Years consolidated into a year file are read with one predicate-pushdown read on the
+    timestamp column, which skips the row groups (months) outside the range. Days after the
+    last candle of a year file, and years without one, are read from the daily files. For series
+    recorded in the manifest (see algo.infrastructure.historical_data_manifest) only the days
+    recorded with candles are read, without looking up any other day on disk; daily files written
+    by tools that do not update the manifest must be indexed with
+    ``python -m algo.infrastructure.historical_data_manifest <base_dir>``. Series without any
+    recorded day are looked up on disk day by day.
+    """
+
     def __init__(self, data_path: str):
         self.data_path = data_path
+        self.manifest = HistoricalDataManifest(data_path)
 
     def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        df = self.get_dataframe(instrument.instrument_key, start_date, end_date, timeframe.value)
+        if df is None:
+            return HistoricalData([])
+        return HistoricalData.from_dataframe(df)
+
+    def get_dataframe(self, instrument_key: str, start_date: date, end_date: date, timeframe: str) -> Optional[pd.DataFrame]:
+        """
+        Read the candles of a date range as a DataFrame.
+
+        Args:
+            instrument_key: Instrument key, e.g. 'NSE_INDEX|Nifty 50'
+            start_date: First date to read (inclusive)
+            end_date: Last date to read (inclusive)
+            timeframe: Timeframe directory, e.g. '15min'
+
+        Returns:
+            DataFrame of the candles sorted as stored, or None if there are no files for the range
+        """
+        dfs = []
+        for year in range(start_date.year, end_date.year + 1):
+            year_start = max(start_date, date(year, 1, 1))
+            year_end = min(end_date, date(year, 12, 31))
+            daily_start = year_start
+            year_file_path = get_year_file_path(self.data_path, timeframe, instrument_key, year)
+            if os.path.isfile(year_file_path):
+                dfs.append(self._read_year_file(year_file_path, year_start, year_end))
+                last_date = get_last_date(year_file_path)
+                # Days downloaded after the year file was written are still in daily files
+                daily_start = max(year_start, last_date + timedelta(days=1)) if last_date else year_end + timedelta(days=1)
+            dfs.extend(self._read_daily_files(instrument_key, daily_start, year_end, timeframe))
+
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            return None
+
+        df = pd.concat(dfs, ignore_index=True) if len(dfs) > 1 else dfs[0]
+
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        tz = df['timestamp'].dt.tz
+        df = df[(df['timestamp'] >= pd.Timestamp(start_date, tz=tz))
+                & (df['timestamp'] < pd.Timestamp(end_date + timedelta(days=1), tz=tz))]
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _read_year_file(path: str, start_date: date, end_date: date) -> pd.DataFrame:
+        tz = pq.read_schema(path).field("timestamp").type.tz
+        lower = pd.Timestamp(start_date, tz=tz)
+        upper = pd.Timestamp(end_date + timedelta(days=1), tz=tz)
+        table = pq.read_table(path, filters=[("timestamp", ">=", lower), ("timestamp", "<", upper)])
+        return table.to_pandas()
+
+    def _read_daily_files(self, instrument_key: str, start_date: date, end_date: date, timeframe: str) -> List[pd.DataFrame]:
+        if start_date > end_date:
+            return []
+        if self.manifest.has_series(instrument_key, timeframe):
+            return self._read_recorded_daily_files(instrument_key, start_date, end_date, timeframe)
+        # Series written before the manifest existed: look every day up on disk
         dfs = []
         current_date = start_date
         while current_date <= end_date:
-            sanitized_key = instrument.instrument_key.replace("|", ".")
-            file_path = (
-                f"{self.data_path}/{timeframe.value}/{sanitized_key}/"
-                f"{current_date.year}/{current_date.month:02d}/"
-                f"{current_date.strftime('%Y-%m-%d')}.parquet"
-            )
+            file_path = get_daily_file_path(self.data_path, timeframe, instrument_key, current_date)
             if os.path.exists(file_path):
                 dfs.append(pd.read_parquet(file_path))
             current_date += timedelta(days=1)
+        return dfs
 
-        if not dfs:
-            return HistoricalData([])
-
-        df = pd.concat(dfs, ignore_index=True)
-
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df[(df['timestamp'].dt.date >= start_date) & (df['timestamp'].dt.date <= end_date)]
-        return HistoricalData(df.to_dict('records'))
+    def _read_recorded_daily_files(self, instrument_key: str, start_date: date, end_date: date, timeframe: str) -> List[pd.DataFrame]:
+        dfs = []
+        for day, entry in self.manifest.get_entries(instrument_key, timeframe, start_date, end_date).items():
+            if entry.row_count == 0:
+                continue
+            file_path = get_daily_file_path(self.data_path, timeframe, instrument_key, day)
+            try:
+                dfs.append(pd.read_parquet(file_path))
+            except FileNotFoundError:
+                logger.warning(f"Daily file of {instrument_key} {timeframe} {day} is in the manifest but missing: {file_path}")
+        return dfs
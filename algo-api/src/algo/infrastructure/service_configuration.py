@@ -5,7 +5,8 @@ import logging
 from pathlib import Path
 import json
 
-from algo.domain.service_registry import register_service_instance
+from algo.domain.backtest.historical_data_cache import DEFAULT_MAX_BYTES, HistoricalDataCache
+from algo.domain.service_registry import register_service_instance, service_registry
 from algo.domain.trading.trading_window_service import TradingWindowService
 from algo.config_context import get_config
 
@@ -53,6 +54,23 @@ def _create_trading_window_service() -> TradingWindowService:
     return TradingWindowService(config_data_list)
 
 
+def _create_historical_data_cache() -> HistoricalDataCache:
+    """
+    Create the process-wide HistoricalDataCache with the configured memory budget.
+
+    Returns:
+        Configured HistoricalDataCache instance
+    """
+    config = get_config()
+
+    max_bytes = DEFAULT_MAX_BYTES
+    if config and hasattr(config, 'backtest_engine') and config.backtest_engine:
+        max_bytes = int(config.backtest_engine.historical_data_cache_max_mb) * 1024 * 1024
+
+    logger.info(f"Creating HistoricalDataCache with a budget of {max_bytes} bytes")
+    return HistoricalDataCache(max_bytes)
+
+
 def register_all_services() -> None:
     """
     Register all application services with the service registry.
@@ -66,9 +84,24 @@ def register_all_services() -> None:
     trading_window_service = _create_trading_window_service()
     register_service_instance(TradingWindowService, trading_window_service)
     logger.info("Registered TradingWindowService instance")
+
+    # Create and register the shared HistoricalDataCache instance
+    register_service_instance(HistoricalDataCache, _create_historical_data_cache())
+    logger.info("Registered HistoricalDataCache instance")
     
     # Add other service registrations here as needed
     # other_service = _create_other_service()
     # register_service_instance(OtherService, other_service)
     
     logger.info("Service registration completed")
+
+
+def ensure_services_registered() -> None:
+    """
+    Register all services unless they are already registered.
+
+    Used by worker processes, which inherit the registry when forked but start empty when spawned.
+    """
+    if not (service_registry.is_registered(TradingWindowService)
+            and service_registry.is_registered(HistoricalDataCache)):
+        register_all_services()
@@ -1,6 +1,8 @@
-from datetime import date, datetime
+import threading
+from datetime import date, timedelta
 from typing import Dict, Tuple, List, Optional
 from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_cache import subset
 from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
 from algo.domain.instrument.instrument import Instrument
 from algo.domain.timeframe import Timeframe
@@ -12,6 +14,11 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
     A cached wrapper around UpstoxHistoricalDataRepository that stores complete historical data
     in memory and returns subsets without making additional API calls when requested date ranges
     fall within the cached data range.
+
+    The cache tracks the set of date intervals covered per instrument and timeframe. A request
+    reaching outside them fetches only the uncovered gaps (the Upstox repository splits each gap
+    into API-sized segments), and the fetched candles are spliced between the cached ones by date
+    range, so the cached series stays sorted without re-sorting it.
     """
     
     def __init__(self, upstox_repository: UpstoxHistoricalDataRepository = None):
@@ -22,13 +29,15 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             upstox_repository: The underlying Upstox repository. If None, creates a new instance.
         """
         self._upstox_repository = upstox_repository or UpstoxHistoricalDataRepository()
-        # Cache structure: {(instrument_key, timeframe): (start_date, end_date, HistoricalData)}
-        self._cache: Dict[Tuple[str, str], Tuple[date, date, HistoricalData]] = {}
+        # Cache structure: {(instrument_key, timeframe): (sorted disjoint covered intervals, HistoricalData)}
+        self._cache: Dict[Tuple[str, str], Tuple[List[Tuple[date, date]], HistoricalData]] = {}
+        self._lock = threading.Lock()
     
     def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
         """
         Get historical data for an instrument. If a superset of the requested data is already cached,
-        returns the subset from memory. Otherwise, fetches from Upstox API and caches the result.
+        returns the subset from memory. Otherwise, fetches the days not cached yet from Upstox API
+        and merges them into the cache.
         
         Args:
             instrument: The trading instrument
@@ -40,34 +49,74 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             HistoricalData: The cached subset or freshly retrieved historical data
         """
         cache_key = self._generate_cache_key(instrument, timeframe)
-        
-        # Check if we have cached data for this instrument and timeframe
-        if cache_key in self._cache:
-            cached_start, cached_end, cached_data = self._cache[cache_key]
-            
-            # Check if requested range is within cached range
-            if start_date >= cached_start and end_date <= cached_end:
-                # Return subset from cached data
-                return self._extract_subset(cached_data, start_date, end_date)
-            
-            # Check if we need to extend the cached range
-            extended_start = min(start_date, cached_start)
-            extended_end = max(end_date, cached_end)
-            
-            # If the gap is significant, fetch the extended range
-            if (start_date < cached_start) or (end_date > cached_end):
-                # Fetch extended range and update cache
-                extended_data = self._upstox_repository.get_historical_data(
-                    instrument, extended_start, extended_end, timeframe
-                )
-                self._cache[cache_key] = (extended_start, extended_end, extended_data)
-                return self._extract_subset(extended_data, start_date, end_date)
-        
-        # No cached data or need fresh data - fetch from Upstox API
-        historical_data = self._upstox_repository.get_historical_data(instrument, start_date, end_date, timeframe)
-        self._cache[cache_key] = (start_date, end_date, historical_data)
-        
-        return historical_data
+        with self._lock:
+            cached = self._cache.get(cache_key)
+
+        if cached is None:
+            # No cached data - fetch from Upstox API
+            historical_data = self._upstox_repository.get_historical_data(instrument, start_date, end_date, timeframe)
+            with self._lock:
+                self._cache[cache_key] = ([(start_date, end_date)], historical_data)
+            return historical_data
+
+        intervals, cached_data = cached
+        gaps = self._find_gaps(intervals, start_date, end_date)
+        if not gaps:
+            return self._extract_subset(cached_data, start_date, end_date)
+
+        # Fetch only the missing gaps, clipped in case the API returns candles outside them
+        fetched = [
+            (gap_start, self._extract_subset(
+                self._upstox_repository.get_historical_data(instrument, gap_start, gap_end, timeframe),
+                gap_start, gap_end))
+            for gap_start, gap_end in gaps
+        ]
+        parts = [(interval_start, self._extract_subset(cached_data, interval_start, interval_end))
+                 for interval_start, interval_end in intervals]
+        # Intervals and gaps are disjoint date ranges: ordering them orders the candles
+        merged_data = HistoricalData.concat([part for _, part in sorted(parts + fetched, key=lambda item: item[0])])
+        merged_intervals = self._merge_intervals(intervals + gaps)
+        with self._lock:
+            self._cache[cache_key] = (merged_intervals, merged_data)
+        return self._extract_subset(merged_data, start_date, end_date)
+
+    @staticmethod
+    def _find_gaps(intervals: List[Tuple[date, date]], start_date: date, end_date: date) -> List[Tuple[date, date]]:
+        """
+        Find the parts of a date range not covered by the cached intervals.
+
+        Args:
+            intervals: Sorted, disjoint covered intervals
+            start_date: Start of the requested range
+            end_date: End of the requested range
+
+        Returns:
+            List[Tuple[date, date]]: The uncovered (start_date, end_date) ranges in order
+        """
+        gaps = []
+        cursor = start_date
+        for interval_start, interval_end in intervals:
+            if interval_end < cursor:
+                continue
+            if interval_start > end_date:
+                break
+            if interval_start > cursor:
+                gaps.append((cursor, interval_start - timedelta(days=1)))
+            cursor = max(cursor, interval_end + timedelta(days=1))
+        if cursor <= end_date:
+            gaps.append((cursor, end_date))
+        return gaps
+
+    @staticmethod
+    def _merge_intervals(intervals: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+        """Merge overlapping and adjacent date intervals into a sorted, disjoint list."""
+        merged: List[Tuple[date, date]] = []
+        for interval_start, interval_end in sorted(intervals):
+            if merged and interval_start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval_end))
+            else:
+                merged.append((interval_start, interval_end))
+        return merged
     
     def _generate_cache_key(self, instrument: Instrument, timeframe: Timeframe) -> Tuple[str, str]:
         """
@@ -95,26 +144,14 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
         Returns:
             HistoricalData: The filtered subset of data
         """
-        if not historical_data.data:
+        if len(historical_data) == 0:
             return HistoricalData([])
-        
-        filtered_data = []
-        for record in historical_data.data:
-            record_date = record["timestamp"]
-            # Handle both datetime and string timestamps
-            if isinstance(record_date, str):
-                record_date = datetime.fromisoformat(record_date).date()
-            elif isinstance(record_date, datetime):
-                record_date = record_date.date()
-            
-            if start_date <= record_date <= end_date:
-                filtered_data.append(record)
-        
-        return HistoricalData(filtered_data)
+        return subset(historical_data, start_date, end_date)
     
     def clear_cache(self) -> None:
         """Clear all cached historical data."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
     
     def remove_from_cache(self, instrument: Instrument, timeframe: Timeframe) -> bool:
         """
@@ -128,10 +165,8 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             bool: True if item was removed, False if it wasn't in cache
         """
         cache_key = self._generate_cache_key(instrument, timeframe)
-        if cache_key in self._cache:
-            del self._cache[cache_key]
-            return True
-        return False
+        with self._lock:
+            return self._cache.pop(cache_key, None) is not None
     
     def get_cache_size(self) -> int:
         """Get the number of cached instrument-timeframe combinations."""
@@ -160,13 +195,15 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             timeframe: The timeframe for the data
             
         Returns:
-            Optional[Tuple[date, date]]: The cached date range (start_date, end_date) or None if not cached
+            Optional[Tuple[date, date]]: The bounds (start_date, end_date) of the cached intervals,
+            which may have gaps, or None if not cached
         """
         cache_key = self._generate_cache_key(instrument, timeframe)
-        if cache_key in self._cache:
-            cached_start, cached_end, _ = self._cache[cache_key]
-            return (cached_start, cached_end)
-        return None
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return None
+        intervals, _ = cached
+        return (intervals[0][0], intervals[-1][1])
     
     def can_serve_from_cache(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> bool:
         """
@@ -182,10 +219,11 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             bool: True if request can be served from cache, False otherwise
         """
         cache_key = self._generate_cache_key(instrument, timeframe)
-        if cache_key in self._cache:
-            cached_start, cached_end, _ = self._cache[cache_key]
-            return start_date >= cached_start and end_date <= cached_end
-        return False
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return False
+        intervals, _ = cached
+        return not self._find_gaps(intervals, start_date, end_date)
     
     def get_cache_stats(self) -> Dict[str, int]:
         """
@@ -195,8 +233,8 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             Dict[str, int]: Dictionary containing cache statistics
         """
         total_records = 0
-        for _, _, historical_data in self._cache.values():
-            total_records += len(historical_data.data) if historical_data.data else 0
+        for _, historical_data in list(self._cache.values()):
+            total_records += len(historical_data)
             
         return {
             "cached_combinations": self.get_cache_size(),
@@ -223,13 +261,14 @@ class CachedUpstoxHistoricalDataRepository(HistoricalDataRepository):
             Dict containing detailed cache information
         """
         cache_info = []
-        for (instrument_key, timeframe_str), (start_date, end_date, historical_data) in self._cache.items():
+        for (instrument_key, timeframe_str), (intervals, historical_data) in list(self._cache.items()):
             cache_info.append({
                 "instrument_key": instrument_key,
                 "timeframe": timeframe_str,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "record_count": len(historical_data.data) if historical_data.data else 0
+                "start_date": intervals[0][0].isoformat(),
+                "end_date": intervals[-1][1].isoformat(),
+                "intervals": [(start.isoformat(), end.isoformat()) for start, end in intervals],
+                "record_count": len(historical_data)
             })
         
         return {"cached_data": cache_info}
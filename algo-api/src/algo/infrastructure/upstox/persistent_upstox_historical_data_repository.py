@@ -0,0 +1,156 @@
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+import pytz
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Instrument
+from algo.domain.services import get_trading_window_service
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.historical_data_manifest import (
+    HistoricalDataManifest, ManifestEntry, day_completeness, file_checksum
+)
+from algo.infrastructure.parquet_dataset import get_daily_file_path, get_last_date, get_year_file_path, write_daily_file
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+from algo.infrastructure.upstox.upstox_historical_data_repository import UpstoxHistoricalDataRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _today() -> date:
+    return datetime.now(pytz.timezone("Asia/Kolkata")).date()
+
+
+class PersistentUpstoxHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Write-through disk tier in front of UpstoxHistoricalDataRepository.
+
+    Candles fetched from the API are saved as daily Parquet files in the layout written by
+    ParquetStorage of the historical-data component (see algo.infrastructure.parquet_dataset),
+    so later requests, restarts and the PARQUET_FILES backend read them locally. Every fetched
+    day is recorded in the manifest of the tree (see algo.infrastructure.historical_data_manifest)
+    by the policy of day_completeness, shared with the bulk downloader: days without a session
+    are complete without candles, trading days fetched without candles stay partial for a few
+    days, and today is partial. Only days that are not complete are fetched again. Daily files
+    of a series written before the manifest existed are indexed on first use, and days inside a
+    year file are taken as complete.
+    """
+
+    def __init__(self, base_dir: str, upstox_repository: Optional[HistoricalDataRepository] = None,
+                 trading_window_service: Optional[TradingWindowService] = None):
+        """
+        Args:
+            base_dir: Base directory of the historical data tree
+            upstox_repository: Repository fetching from the broker API. If None, creates a new
+                UpstoxHistoricalDataRepository.
+            trading_window_service: Service telling which fetched days had a session. If None,
+                the registered TradingWindowService is used.
+        """
+        self.base_dir = base_dir
+        self._upstox_repository = upstox_repository or UpstoxHistoricalDataRepository()
+        self._trading_window_service = trading_window_service
+        self._parquet_repository = ParquetHistoricalDataRepository(base_dir)
+        self.manifest = self._parquet_repository.manifest
+
+    def get_historical_data(self, instrument: Instrument, start_date: date, end_date: date, timeframe: Timeframe) -> HistoricalData:
+        """
+        Get historical data, fetching from the API only the days not stored completely on disk.
+
+        Args:
+            instrument: The trading instrument
+            start_date: Start date for historical data
+            end_date: End date for historical data
+            timeframe: The timeframe for the data
+
+        Returns:
+            HistoricalData: The candles of the range, read from the Parquet files
+        """
+        today = _today()
+        fetch_end = min(end_date, today)
+        timeframe_str = timeframe.value
+        if not self.manifest.has_series(instrument.instrument_key, timeframe_str):
+            self.manifest.index_series(instrument.instrument_key, timeframe_str)
+        missing_ranges = self.get_missing_ranges(instrument.instrument_key, start_date, fetch_end, timeframe_str)
+
+        for range_start, range_end in missing_ranges:
+            logger.info(f"Fetching {instrument.instrument_key} {timeframe_str} from {range_start} to {range_end} from Upstox")
+            data = self._upstox_repository.get_historical_data(instrument, range_start, range_end, timeframe)
+            self._store(instrument, timeframe_str, range_start, range_end, data, today)
+
+        return self._parquet_repository.get_historical_data(instrument, start_date, end_date, timeframe)
+
+    def get_missing_ranges(self, instrument_key: str, start_date: date, end_date: date, timeframe: str) -> List[Tuple[date, date]]:
+        """
+        Find the consecutive days of a range that are not stored completely.
+
+        Args:
+            instrument_key: Instrument key, e.g. 'NSE_INDEX|Nifty 50'
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            timeframe: Timeframe directory, e.g. '15min'
+
+        Returns:
+            List[Tuple[date, date]]: The (start_date, end_date) ranges to fetch, in order
+        """
+        if start_date > end_date:
+            return []
+        entries = self.manifest.get_entries(instrument_key, timeframe, start_date, end_date)
+        year_last_dates: Dict[int, Optional[date]] = {}
+        ranges: List[Tuple[date, date]] = []
+        day = start_date
+        while day <= end_date:
+            if not self._is_complete(instrument_key, timeframe, day, entries, year_last_dates):
+                if ranges and ranges[-1][1] == day - timedelta(days=1):
+                    ranges[-1] = (ranges[-1][0], day)
+                else:
+                    ranges.append((day, day))
+            day += timedelta(days=1)
+        return ranges
+
+    def _is_complete(self, instrument_key: str, timeframe: str, day: date, entries: Dict[date, ManifestEntry],
+                     year_last_dates: Dict[int, Optional[date]]) -> bool:
+        entry = entries.get(day)
+        if entry is not None:
+            return entry.is_complete
+        if day.year not in year_last_dates:
+            year_file_path = get_year_file_path(self.base_dir, timeframe, instrument_key, day.year)
+            year_last_dates[day.year] = get_last_date(year_file_path) if os.path.isfile(year_file_path) else None
+        last_date = year_last_dates[day.year]
+        return last_date is not None and day <= last_date
+
+    def _get_trading_days(self, instrument: Instrument, start_date: date, end_date: date) -> Optional[Set[date]]:
+        """The days of the range with a session, or None if the trading calendar does not cover it."""
+        try:
+            service = self._trading_window_service or get_trading_window_service()
+            return set(service.get_trading_days(start_date, end_date, instrument.exchange, instrument.type))
+        except ValueError as e:
+            logger.warning(f"Taking every day from {start_date} to {end_date} as a trading day: {e}")
+            return None
+
+    def _store(self, instrument: Instrument, timeframe: str, start_date: date, end_date: date,
+               data: HistoricalData, today: date) -> None:
+        """Write the fetched candles as one file per day and record every day in the manifest."""
+        instrument_key = instrument.instrument_key
+        written: Dict[date, Tuple[int, str]] = {}
+        if len(data):
+            df = data.to_dataframe()
+            df["timestamp"] = pd.to_datetime(df["timestamp"])
+            for day, day_df in df.groupby(df["timestamp"].dt.date, sort=False):
+                if start_date <= day <= end_date:
+                    path = get_daily_file_path(self.base_dir, timeframe, instrument_key, day)
+                    written[day] = (write_daily_file(path, day_df), file_checksum(path))
+
+        trading_days = self._get_trading_days(instrument, start_date, end_date)
+        entries = []
+        day = start_date
+        while day <= end_date:
+            row_count, checksum = written.get(day, (0, None))
+            trading_day = trading_days is None or day in trading_days
+            entries.append(ManifestEntry(day, row_count, checksum, day_completeness(day, row_count, trading_day, today)))
+            day += timedelta(days=1)
+        self.manifest.record(instrument_key, timeframe, entries)
@@ -0,0 +1,94 @@
+"""
+Client-side throttling of Upstox API calls.
+
+A token bucket keeps the request rate under the broker limits, and an adaptive concurrency
+limiter bounds the number of requests in flight: it halves on throttling (HTTP 429) and server
+errors (5xx) and grows back by one after each run of successful requests.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until one is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bounds the requests in flight, adjusting the bound with additive increase and
+    multiplicative decrease between ``min_limit`` and ``max_limit``.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial_limit: Optional[int] = None):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = initial_limit if initial_limit is not None else max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the ``limit`` slots while the block runs."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify()
+
+    def on_throttled(self) -> None:
+        with self._condition:
+            limit = max(self.min_limit, self.limit // 2)
+            if limit != self.limit:
+                logger.info(f"Reducing concurrent Upstox requests from {self.limit} to {limit}")
+            self.limit = limit
+            self._successes = 0
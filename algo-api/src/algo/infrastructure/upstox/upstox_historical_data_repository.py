@@ -2,7 +2,7 @@ import datetime
 import os
 import logging
 from datetime import datetime, date, timedelta
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import threading
@@ -19,6 +19,7 @@ from upstox_client.rest import ApiException
 
 from algo.infrastructure.access_token import AccessToken
 from algo.infrastructure.upstox.upstox_instrument_service import UpstoxInstrumentService
+from algo.infrastructure.upstox.rate_limiter import AdaptiveConcurrencyLimiter, TokenBucket
 from algo.domain.instrument.broker_instrument import BrokerInstrument
 
 def parse_timeframe(timeframe: Timeframe) -> Tuple[str, str]:
@@ -37,7 +38,52 @@ def parse_timeframe(timeframe: Timeframe) -> Tuple[str, str]:
             return (tf, 'minutes')
         raise ValueError(f"Invalid timeframe format: {tf}")
 
+# Upstox allows 50 requests per second and 500 per minute per user
+RATE_LIMIT_PER_SECOND = 500 / 60
+RATE_LIMIT_BURST = 50
+MAX_CONCURRENT_REQUESTS = 10
+THROTTLED_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _is_throttled(exc: Exception) -> bool:
+    return isinstance(exc, ApiException) and exc.status in THROTTLED_STATUSES
+
+
+def _get_retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
 class UpstoxHistoricalDataRepository(HistoricalDataRepository):
+    """
+    Fetches candles from the Upstox historical candle API.
+
+    Ranges longer than the API allows per request are split into segments fetched in parallel,
+    earliest first. All instances share one token bucket keeping the request rate under the
+    broker limits, and one adaptive limit on requests in flight that halves when the API
+    throttles (429) or fails (5xx) and grows back as requests succeed. Segments run on one
+    long-lived thread pool shared by all instances, whose threads each keep their API client and
+    connection pool across segments and calls.
+    """
+
+    _rate_limiter = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    _concurrency = AdaptiveConcurrencyLimiter(MAX_CONCURRENT_REQUESTS)
+    _thread_local = threading.local()
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Return the shared segment fetch pool, creating it on first use."""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS,
+                                                       thread_name_prefix="upstox-segment")
+        return cls._executor
     
     def _get_max_days_for_timeframe(self, timeframe: Timeframe) -> int:
         """Get maximum allowed days for a given timeframe based on Upstox API limits."""
@@ -98,6 +144,9 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
         api_instance_elapsed = time.perf_counter() - api_instance_start
         logger.debug(f"[{thread_id}] Segment {date_str_from} to {date_str_to}: API instance created in {api_instance_elapsed:.3f}s")
         
+        waited = self._rate_limiter.acquire()
+        if waited:
+            logger.debug(f"[{thread_id}] Segment {date_str_from} to {date_str_to}: Rate limited for {waited:.3f}s")
         logger.debug(f"[{thread_id}] Segment {date_str_from} to {date_str_to}: Calling Upstox API...")
         api_call_start = time.perf_counter()
         response = api_instance.get_historical_candle_data1(
@@ -153,7 +202,9 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
         for attempt in range(max_retries):
             try:
                 logger.debug(f"[{thread_id}] Segment {start_date} to {end_date}: Attempt {attempt + 1}/{max_retries}")
-                data = self._fetch_historical_data_segment(broker_instrument, start_date, end_date, timeframe)
+                with self._concurrency.slot():
+                    data = self._fetch_historical_data_segment(broker_instrument, start_date, end_date, timeframe)
+                self._concurrency.on_success()
                 total_retry_time = time.perf_counter() - retry_start_time
                 if attempt > 0:
                     logger.info(f"[{thread_id}] Segment {start_date} to {end_date}: Succeeded on attempt {attempt + 1} after {total_retry_time:.3f}s total")
@@ -161,9 +212,11 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
             except Exception as exc:
                 last_exception = exc
                 logger.warning(f"[{thread_id}] Segment {start_date} to {end_date}: Attempt {attempt + 1} failed with error: {exc}")
+                if _is_throttled(exc):
+                    self._concurrency.on_throttled()
                 if attempt < max_retries - 1:  # Don't sleep on the last attempt
-                    # Exponential backoff: wait 1s, 2s, 4s between retries
-                    wait_time = 2 ** attempt
+                    # Wait as long as the API asks, otherwise back off exponentially: 1s, 2s, 4s
+                    wait_time = _get_retry_after(exc) or 2 ** attempt
                     logger.debug(f"[{thread_id}] Segment {start_date} to {end_date}: Waiting {wait_time}s before retry...")
                     time.sleep(wait_time)
                     continue
@@ -223,51 +276,52 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
                 for i, (seg_start, seg_end) in enumerate(segments):
                     logger.debug(f"get_historical_data: Segment {i+1}: {seg_start} to {seg_end}")
                 
-                # Prepare arguments for parallel execution
+                # Prepare arguments for parallel execution; the pool starts them in order, earliest first
                 segment_args = [(broker_instrument, segment_start, segment_end, timeframe) 
-                               for segment_start, segment_end in segments]
+                               for segment_start, segment_end in sorted(segments)]
                 
                 # Execute API calls in parallel with retry logic
                 all_segment_data = []
                 failed_segments = []
                 
-                num_workers = min(len(segments), 5)
+                # Requests in flight are further bounded by the adaptive concurrency limit
+                num_workers = min(len(segments), MAX_CONCURRENT_REQUESTS)
                 logger.info(f"get_historical_data: Starting parallel execution with {num_workers} workers for {len(segments)} segments")
+                executor = self._get_executor()
                 
                 parallel_start = time.perf_counter()
-                with ThreadPoolExecutor(max_workers=num_workers) as executor:
-                    # Submit all tasks
-                    submit_start = time.perf_counter()
-                    future_to_segment = {
-                        executor.submit(self._fetch_segment_with_retry, args): args 
-                        for args in segment_args
-                    }
-                    submit_elapsed = time.perf_counter() - submit_start
-                    logger.debug(f"get_historical_data: All {len(segments)} tasks submitted in {submit_elapsed:.3f}s")
-                    
-                    # Collect results as they complete
-                    results_start = time.perf_counter()
-                    completed_count = 0
-                    for future in as_completed(future_to_segment):
-                        args = future_to_segment[future]
-                        segment_start, segment_end = args[1], args[2]
-                        
-                        try:
-                            start_date_segment, segment_data = future.result()
-                            all_segment_data.append((start_date_segment, segment_data))
-                            completed_count += 1
-                            logger.debug(f"get_historical_data: Segment {segment_start} to {segment_end} completed "
-                                        f"({completed_count}/{len(segments)})")
-                        except Exception as exc:
-                            failed_segments.append({
-                                'start_date': segment_start,
-                                'end_date': segment_end,
-                                'error': str(exc)
-                            })
-                            logger.error(f"get_historical_data: Segment {segment_start} to {segment_end} failed: {exc}")
-                    
-                    results_elapsed = time.perf_counter() - results_start
-                    logger.debug(f"get_historical_data: All results collected in {results_elapsed:.3f}s")
+                # Submit all tasks
+                submit_start = time.perf_counter()
+                future_to_segment = {
+                    executor.submit(self._fetch_segment_with_retry, args): args 
+                    for args in segment_args
+                }
+                submit_elapsed = time.perf_counter() - submit_start
+                logger.debug(f"get_historical_data: All {len(segments)} tasks submitted in {submit_elapsed:.3f}s")
+
+                # Collect results as they complete
+                results_start = time.perf_counter()
+                completed_count = 0
+                for future in as_completed(future_to_segment):
+                    args = future_to_segment[future]
+                    segment_start, segment_end = args[1], args[2]
+
+                    try:
+                        start_date_segment, segment_data = future.result()
+                        all_segment_data.append((start_date_segment, segment_data))
+                        completed_count += 1
+                        logger.debug(f"get_historical_data: Segment {segment_start} to {segment_end} completed "
+                                    f"({completed_count}/{len(segments)})")
+                    except Exception as exc:
+                        failed_segments.append({
+                            'start_date': segment_start,
+                            'end_date': segment_end,
+                            'error': str(exc)
+                        })
+                        logger.error(f"get_historical_data: Segment {segment_start} to {segment_end} failed: {exc}")
+
+                results_elapsed = time.perf_counter() - results_start
+                logger.debug(f"get_historical_data: All results collected in {results_elapsed:.3f}s")
                 
                 parallel_elapsed = time.perf_counter() - parallel_start
                 logger.info(f"get_historical_data: Parallel execution completed in {parallel_elapsed:.3f}s "
@@ -314,20 +368,21 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
             raise RuntimeError(f"Failed to fetch historical data: {e}")
 
     def api_instance(self):
+        """Return the calling thread's API instance, creating it on first use or when the access token changes."""
         thread_id = threading.current_thread().name
+        token = AccessToken().get_token()
+        cached = getattr(self._thread_local, "api_instance", None)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
         logger.debug(f"[{thread_id}] api_instance: Creating configuration...")
-        
         config_start = time.perf_counter()
         configuration = upstox_client.Configuration(sandbox=False)
-        
-        token_start = time.perf_counter()
-        configuration.access_token = AccessToken().get_token()
-        token_elapsed = time.perf_counter() - token_start
-        logger.debug(f"[{thread_id}] api_instance: Access token retrieved in {token_elapsed:.3f}s")
-        
+        configuration.access_token = token
         configuration.verify_ssl = False
         api_instance = upstox_client.HistoryV3Api(upstox_client.ApiClient(configuration))
+        self._thread_local.api_instance = (token, api_instance)
         
         config_elapsed = time.perf_counter() - config_start
-        logger.debug(f"[{thread_id}] api_instance: Instance created in {config_elapsed:.3f}s (token: {token_elapsed:.3f}s)")
+        logger.debug(f"[{thread_id}] api_instance: Instance created in {config_elapsed:.3f}s")
         return api_instance
@@ -1,18 +1,159 @@
 import csv
+import logging
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import date, datetime
+import numpy as np
 from algo.domain.instrument.broker_instrument import BrokerInstrumentService, BrokerInstrument
 from algo.domain.instrument.instrument import Expiring, Instrument, Type, Exchange, Expiry
 from algo.config_context import get_config
 from algo.domain.trading import nse
 
+logger = logging.getLogger(__name__)
+
+
+_EXPIRING_OFFSETS = {
+    Expiring.CURRENT: 0,
+    Expiring.NEXT1: 1,
+    Expiring.NEXT2: 2,
+}
+
+
+class OptionsChain:
+    """
+    Option contracts of one type (CE or PE) sorted by (expiry, strike).
+
+    Expiries are kept as sorted day ordinals and the strikes of each expiry as a contiguous
+    sorted slice of one array, so selecting an expiry and the at-the-money strike for an
+    underlying price are binary searches over small arrays.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """
+        Args:
+            rows: CSV rows of one option type; rows without a valid expiry or strike are skipped
+        """
+        keyed = []
+        for row in rows:
+            expiry = _parse_expiry_day(row.get('expiry'))
+            try:
+                strike = float(row.get('strike_price'))
+            except (TypeError, ValueError):
+                continue
+            if expiry is not None:
+                keyed.append((expiry.toordinal(), strike, row))
+        keyed.sort(key=lambda item: (item[0], item[1]))
+
+        self.rows = [row for _, _, row in keyed]
+        self.strikes = np.array([strike for _, strike, _ in keyed], dtype=np.float64)
+        row_expiries = np.array([expiry for expiry, _, _ in keyed], dtype=np.int64)
+        self.expiries, self.starts = np.unique(row_expiries, return_index=True)
+        self.ends = np.r_[self.starts[1:], len(row_expiries)].astype(np.int64)
+        # Monthly contracts are flagged "weekly" false in the Upstox instrument master
+        monthly = [str(self.rows[start].get('weekly', '')).strip().lower() != 'true' for start in self.starts]
+        self.monthly_expiries = self.expiries[np.array(monthly, dtype=bool)] if len(monthly) else self.expiries
+
+    def select_expiry(self, as_of: date, expiry: Optional[Expiry], expiring: Optional[Expiring]) -> Optional[int]:
+        """
+        Index into expiries of the contract expiring as requested on a day.
+
+        Args:
+            as_of: Day the contract is traded on; contracts expiring that day are current
+            expiry: MONTHLY selects among monthly contracts, WEEKLY or None among all
+            expiring: CURRENT (or None), NEXT1 or NEXT2
+
+        Returns:
+            The expiry index, None if the chain has no such expiry
+        """
+        candidates = self.monthly_expiries if expiry == Expiry.MONTHLY else self.expiries
+        position = int(np.searchsorted(candidates, as_of.toordinal(), side='left'))
+        position += _EXPIRING_OFFSETS.get(expiring, 0)
+        if position >= len(candidates):
+            return None
+        return int(np.searchsorted(self.expiries, candidates[position]))
+
+    def find(self, expiry_index: int, underlying_price: float, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Row of the strike offset strikes away from the at-the-money strike of an expiry.
+
+        Args:
+            expiry_index: Index into expiries (see select_expiry)
+            underlying_price: Price of the underlying; the nearest strike is at the money,
+                the lower one on a tie
+            offset: Strikes above (positive) or below (negative) the at-the-money strike
+
+        Returns:
+            The row, None if the offset runs past the strikes of the expiry
+        """
+        start = int(self.starts[expiry_index])
+        end = int(self.ends[expiry_index])
+        strikes = self.strikes[start:end]
+        index = int(np.searchsorted(strikes, underlying_price, side='left'))
+        if index == len(strikes) or (index > 0 and underlying_price - strikes[index - 1] <= strikes[index] - underlying_price):
+            index -= 1
+        index += offset
+        if index < 0 or index >= len(strikes):
+            return None
+        return self.rows[start + index]
+
+
+class InstrumentMaster:
+    """
+    Rows of one instrument mapping CSV file, indexed for lookups.
+
+    Rows are indexed by instrument type (first row of each type, in file order), FUT rows
+    also by expiry date and CE and PE rows into an OptionsChain each, so resolving an
+    instrument needs no scan of the file.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], version: Tuple[int, int]):
+        """
+        Args:
+            rows: CSV rows in file order
+            version: (mtime_ns, size) of the file the rows were read from
+        """
+        self.rows = rows
+        self.version = version
+        self.first_by_type: Dict[str, Dict[str, Any]] = {}
+        self.fut_by_expiry: Dict[date, Dict[str, Any]] = {}
+        for row in rows:
+            row_type = (row.get('instrument_type') or '').upper()
+            self.first_by_type.setdefault(row_type, row)
+            if row_type == Type.FUT.value.upper():
+                expiry = _parse_expiry_day(row.get('expiry'))
+                if expiry is not None:
+                    self.fut_by_expiry.setdefault(expiry, row)
+        self.option_chains: Dict[Type, OptionsChain] = {
+            option_type: OptionsChain([row for row in rows
+                                       if (row.get('instrument_type') or '').upper() == option_type.value])
+            for option_type in (Type.CE, Type.PE)
+        }
+
+
+def _parse_expiry_day(expiry: Optional[str]) -> Optional[date]:
+    """Date of a milliseconds timestamp expiry, None if missing or not a timestamp."""
+    if not expiry or not expiry.strip():
+        return None
+    try:
+        return datetime.fromtimestamp(int(expiry.strip()) / 1000).date()
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
 
 class UpstoxInstrumentService(BrokerInstrumentService):
     """
     Upstox-specific implementation of BrokerInstrumentService.
     Maps Instrument objects to BrokerInstrument objects using CSV mapping files.
+
+    Each CSV file is parsed once into an InstrumentMaster shared by all instances, and parsed
+    again only when its modification time or size changes, so resolving an instrument costs a
+    stat call and dictionary lookups.
     """
+
+    # Read and written without a lock: single dict lookups and assignments are atomic, and a
+    # master is only used when its version matches the file, so threads racing on a changed file
+    # at worst parse it twice, and a stale master stored last is replaced on the next lookup.
+    _masters: Dict[str, InstrumentMaster] = {}
     
     def __init__(self):
         """Initialize the Upstox instrument service."""
@@ -33,6 +174,30 @@ class UpstoxInstrumentService(BrokerInstrumentService):
         """
         filename = f"{instrument.instrument_key}.csv"
         return os.path.join(self._mapping_dir, filename)
+
+    def _get_instrument_master(self, csv_file_path: str) -> Optional[InstrumentMaster]:
+        """
+        Get the indexed rows of a CSV file, parsing it if it is new or changed.
+
+        Args:
+            csv_file_path: Path of the CSV file
+
+        Returns:
+            InstrumentMaster of the file, None if the file does not exist
+        """
+        try:
+            stat = os.stat(csv_file_path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        master = self._masters.get(csv_file_path)
+        if master is not None and master.version == version:
+            return master
+
+        with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
+            master = InstrumentMaster(list(csv.DictReader(csvfile)), version)
+        self._masters[csv_file_path] = master
+        return master
     
     def _load_broker_instrument_from_csv(self, instrument: Instrument) -> Optional[BrokerInstrument]:
         """
@@ -45,43 +210,43 @@ class UpstoxInstrumentService(BrokerInstrumentService):
             BrokerInstrument object if found in CSV with matching criteria, None otherwise
         """
         csv_file_path = self._get_csv_file_path(instrument)
-        
-        if not os.path.exists(csv_file_path):
-            return None
             
         try:
-            with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                
-                # Apply matching logic based on instrument type
-                for row in reader:
-                    if self._matches_instrument(instrument, row):
-                        # Map CSV columns to BrokerInstrument fields
-                        broker_instrument = BrokerInstrument(
-                            instrument_key=row.get('instrument_key', instrument.instrument_key),
-                            trading_key=row.get('exchange_token', ''),
-                            instrument_type=Type(row.get('instrument_type', instrument.type.value)) if row.get('instrument_type') else instrument.type,
-                            exchange=Exchange(row.get('exchange', instrument.exchange.value)) if row.get('exchange') else instrument.exchange,
-                            trading_symbol=row.get('trading_symbol', ''),
-                            underlying_key=row.get('underlying_key') if row.get('underlying_key') else None,
-                            expiry= instrument.expiry,
-                            lot_size=int(row.get('lot_size')) if row.get('lot_size') and row.get('lot_size') != '' else None,
-                            tick_size=float(row.get('tick_size')) if row.get('tick_size') and row.get('tick_size') != '' else None,
-                            strike_price=float(row.get('strike_price')) if row.get('strike_price') and row.get('strike_price') != '' else None
-                        )
-                        return broker_instrument
+            master = self._get_instrument_master(csv_file_path)
+            if master is None:
+                return None
+            row = self._find_row(instrument, master)
+            if row is None:
+                return None
+            return self._to_broker_instrument(instrument, row)
                     
         except Exception as e:
             # Log error in production - for now, return None
             print(f"Error loading broker instrument from {csv_file_path}: {e}")
             return None
-            
-        return None
+
+    def _to_broker_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> BrokerInstrument:
+        """Map CSV columns to BrokerInstrument fields."""
+        return BrokerInstrument(
+            instrument_key=row.get('instrument_key', instrument.instrument_key),
+            trading_key=row.get('exchange_token', ''),
+            instrument_type=Type(row.get('instrument_type', instrument.type.value)) if row.get('instrument_type') else instrument.type,
+            exchange=Exchange(row.get('exchange', instrument.exchange.value)) if row.get('exchange') else instrument.exchange,
+            trading_symbol=row.get('trading_symbol', ''),
+            underlying_key=row.get('underlying_key') if row.get('underlying_key') else None,
+            expiry= instrument.expiry,
+            lot_size=int(row.get('lot_size')) if row.get('lot_size') and row.get('lot_size') != '' else None,
+            tick_size=float(row.get('tick_size')) if row.get('tick_size') and row.get('tick_size') != '' else None,
+            strike_price=float(row.get('strike_price')) if row.get('strike_price') and row.get('strike_price') != '' else None
+        )
     
     def get_broker_instrument(self, instrument: Instrument) -> Optional[BrokerInstrument]:
         """
         Convert an Instrument object to a BrokerInstrument object using Upstox mapping.
-        Always reads fresh data from CSV file.
+        The CSV file is parsed again only when it has changed.
+
+        CE and PE instruments resolve to the first contract of their type, since no underlying
+        price is given; use get_option_instrument to resolve the contract to trade.
         
         Args:
             instrument: The Instrument object to convert
@@ -89,26 +254,18 @@ class UpstoxInstrumentService(BrokerInstrumentService):
         Returns:
             BrokerInstrument object if mapping is successful, None otherwise
         """
-        # Always load from CSV file (no caching)
         return self._load_broker_instrument_from_csv(instrument)
     
-    def _parse_expiry_date(self, date_str: str) -> Optional[datetime]:
-        """Parse expiry date from milliseconds timestamp format."""
-        if not date_str or not date_str.strip():
-            return None
-        
-        date_str = date_str.strip()
-        
-        try:
-            expiry_ms = int(date_str)
-            return datetime.fromtimestamp(expiry_ms / 1000)
-        except (ValueError, TypeError) as e:
-            raise ValueError(f"Unable to parse expiry timestamp: {date_str}") from e
-    
-    def _matches_fut_expiry(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
-        """Check if FUT instrument expiry matches CSV row expiry."""
+    def _get_expected_fut_expiry(self, instrument: Instrument) -> Optional[date]:
+        """
+        Get the expiry date a FUT instrument must match.
+
+        Returns:
+            The expiry date, or None if any FUT row matches (no MONTHLY expiry requirement or
+            an unknown expiring)
+        """
         if not instrument.expiry or instrument.expiry != Expiry.MONTHLY:
-            return True  # No specific expiry requirement
+            return None  # No specific expiry requirement
         
         if not instrument.expiring:
             raise ValueError(f"Expiring is required for FUT instruments with MONTHLY expiry. Instrument: {instrument.instrument_key}")
@@ -122,81 +279,99 @@ class UpstoxInstrumentService(BrokerInstrumentService):
         
         expiry_func = expiry_functions.get(instrument.expiring)
         if not expiry_func:
-            return True  # Unknown expiring type, fallback to type matching
+            return None  # Unknown expiring type, fallback to type matching
         
-        try:
-            # Get expected expiry date
-            expected_expiry = expiry_func(
-                exchange=instrument.exchange,
-                instrument_type=instrument.type
-            )
-            
-            # Parse row expiry date from milliseconds timestamp
-            expiry_str = row.get('expiry', '')
-            if not expiry_str:
-                return False
-            
-            row_expiry = self._parse_expiry_date(expiry_str)
-            
-            # Compare dates
-            return expected_expiry.date() == row_expiry.date()
-            
-        except Exception as e:
-            # Propagate NSE function exceptions to caller
-            raise e
-    
-    def _matches_index_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
-        """Match INDEX instrument by type only."""
-        row_type = row.get('instrument_type', '').upper()
-        return row_type == Type.INDEX.value.upper()
+        return expiry_func(
+            exchange=instrument.exchange,
+            instrument_type=instrument.type
+        ).date()
 
-    def _matches_fut_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
+    def _find_fut_row(self, instrument: Instrument, master: InstrumentMaster) -> Optional[Dict[str, Any]]:
         """Match FUT instrument by type and expiry."""
-        row_type = row.get('instrument_type', '').upper()
-        
-        # First check type match
-        if row_type != Type.FUT.value.upper():
-            return False
-        
-        # Then check expiry match
-        return self._matches_fut_expiry(instrument, row)
+        if Type.FUT.value.upper() not in master.first_by_type:
+            return None
+        expected_expiry = self._get_expected_fut_expiry(instrument)
+        if expected_expiry is None:
+            return master.first_by_type[Type.FUT.value.upper()]
+        return master.fut_by_expiry.get(expected_expiry)
 
-    def _matches_option_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
-        """Match option instruments (CE/PE) - can be extended later."""
-        row_type = row.get('instrument_type', '').upper()
-        target_type = instrument.type.value.upper()
-        
-        if row_type != target_type:
-            return False
-        
-        # TODO: Add strike price, expiry matching for options
-        return True
-
-    def _matches_default_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
-        """Default matching by instrument type only."""
-        row_type = row.get('instrument_type', '').upper()
-        target_type = instrument.type.value.upper()
-        return row_type == target_type
-    
-    def _matches_instrument(self, instrument: Instrument, row: Dict[str, Any]) -> bool:
+    def _find_row(self, instrument: Instrument, master: InstrumentMaster) -> Optional[Dict[str, Any]]:
         """
-        Check if a CSV row matches the given instrument based on instrument type-specific criteria.
+        Find the CSV row matching the given instrument based on instrument type-specific criteria.
         
         Args:
             instrument: The Instrument object to match
-            row: CSV row data as dictionary
+            master: Indexed rows of the instrument's CSV file
             
         Returns:
-            True if the row matches the instrument, False otherwise
-        """
-        # Dispatch to type-specific matchers
-        matchers = {
-            Type.INDEX: self._matches_index_instrument,
-            Type.FUT: self._matches_fut_instrument,
-            Type.CE: self._matches_option_instrument,
-            Type.PE: self._matches_option_instrument,
-            # Add more types as needed
-        }
+            The first matching row, None if no row matches
+        """
+        if instrument.type == Type.FUT:
+            return self._find_fut_row(instrument, master)
+        # INDEX, options and other types match on type only: without the underlying price an
+        # option cannot be resolved to a strike (see get_option_instrument)
+        return master.first_by_type.get(instrument.type.value.upper())
+
+    def get_broker_instruments_for_instruments(self, instruments: List[Instrument]) -> List[BrokerInstrument]:
+        """
+        Convert multiple Instrument objects to BrokerInstrument objects.
+
+        Each CSV file involved is checked for changes once for the whole batch.
         
-        matcher = matchers.get(instrument.type, self._matches_default_instrument)
-        return matcher(instrument, row)
+        Args:
+            instruments: List of Instrument objects to convert
+            
+        Returns:
+            List of BrokerInstrument objects (excludes failed conversions)
+        """
+        masters: Dict[str, Optional[InstrumentMaster]] = {}
+        broker_instruments = []
+        for instrument in instruments:
+            csv_file_path = self._get_csv_file_path(instrument)
+            try:
+                if csv_file_path not in masters:
+                    masters[csv_file_path] = self._get_instrument_master(csv_file_path)
+                master = masters[csv_file_path]
+                row = self._find_row(instrument, master) if master is not None else None
+                if row is not None:
+                    broker_instruments.append(self._to_broker_instrument(instrument, row))
+            except Exception as e:
+                logger.error(f"Error loading broker instrument from {csv_file_path}: {e}")
+        return broker_instruments
+
+    def get_option_instrument(self, instrument: Instrument, underlying_price: float,
+                              as_of: Optional[datetime] = None) -> Optional[BrokerInstrument]:
+        """
+        Resolve a CE or PE instrument to the contract at its strike relative to the money.
+
+        The expiry is selected by instrument.expiry and instrument.expiring from the contracts
+        expiring on or after as_of; the strike is instrument.atm strikes away from the strike
+        nearest to the underlying price (at the money when atm is None).
+
+        Args:
+            instrument: The option Instrument to resolve
+            underlying_price: Price of the underlying at as_of
+            as_of: Time of the resolution, e.g. the candle timestamp (default: now)
+
+        Returns:
+            BrokerInstrument of the contract, None if there is no such contract
+        """
+        if instrument.type not in (Type.CE, Type.PE):
+            return None
+        csv_file_path = self._get_csv_file_path(instrument)
+        try:
+            master = self._get_instrument_master(csv_file_path)
+            if master is None:
+                return None
+            chain = master.option_chains[instrument.type]
+            as_of_day = (as_of or datetime.now()).date()
+            expiry_index = chain.select_expiry(as_of_day, instrument.expiry, instrument.expiring)
+            if expiry_index is None:
+                return None
+            row = chain.find(expiry_index, underlying_price, instrument.atm or 0)
+            if row is None:
+                return None
+            return self._to_broker_instrument(instrument, row)
+        except Exception as e:
+            logger.error(f"Error loading broker instrument from {csv_file_path}: {e}")
+            return None
@@ -9,12 +9,14 @@ from algo.infrastructure.upstox.cached_upstox_historical_data_repository import
 from algo.infrastructure.json_backtest_report_repository import JsonBacktestReportRepository
 from algo.infrastructure.jsonstrategy import JsonStrategy
 from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+from algo.infrastructure.arrow_historical_data_repository import ArrowHistoricalDataRepository
 from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
 from algo.domain.indicators.exceptions import InvalidStrategyConfiguration
 
 from algo.config_context import get_config
 from algo.domain.config import HistoricalDataBackend
 from algo.infrastructure.upstox.upstox_historical_data_repository import UpstoxHistoricalDataRepository
+from algo.infrastructure.upstox.persistent_upstox_historical_data_repository import PersistentUpstoxHistoricalDataRepository
 
 from algo.infrastructure.json_strategy_repository import JsonStrategyRepository
 
@@ -37,8 +39,14 @@ def main():
         # Initialize historical data repository
         if config.backtest_engine.historical_data_backend == HistoricalDataBackend.PARQUET_FILES:
             historical_data_repository = ParquetHistoricalDataRepository(config.backtest_engine.parquet_files_base_dir)
+        elif config.backtest_engine.historical_data_backend == HistoricalDataBackend.ARROW_FILES:
+            base_dir = config.backtest_engine.parquet_files_base_dir
+            historical_data_repository = ArrowHistoricalDataRepository(base_dir, ParquetHistoricalDataRepository(base_dir))
         elif config.backtest_engine.historical_data_backend == HistoricalDataBackend.UPSTOX_API:
-            historical_data_repository = CachedUpstoxHistoricalDataRepository(UpstoxHistoricalDataRepository())
+            upstox_repository = UpstoxHistoricalDataRepository()
+            if config.backtest_engine.upstox_disk_cache_dir:
+                upstox_repository = PersistentUpstoxHistoricalDataRepository(config.backtest_engine.upstox_disk_cache_dir, upstox_repository)
+            historical_data_repository = CachedUpstoxHistoricalDataRepository(upstox_repository)
         else:
             raise ValueError("Unsupported historical data backend")
 
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from algo.application.backtest_job_queue import BacktestJobQueue, BacktestJobStatus
+from algo.application.run_backtest_usecase import RunBacktestInput
+
+
+def wait_for(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.is_finished() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.is_finished()
+
+
+@pytest.fixture
+def queue():
+    queue = BacktestJobQueue(max_concurrent_jobs=1)
+    yield queue
+    queue.shutdown()
+
+
+def test_submit_runs_job_and_records_progress_and_result(queue):
+    def run(input_data, progress_callback, job_id):
+        progress_callback(5, 10)
+        progress_callback(10, 10)
+        return {"strategy_name": input_data.strategy_name, "job_id": job_id}
+
+    job = queue.submit(RunBacktestInput("bullish_nifty", "2023-01-01", "2023-01-31"), run)
+    wait_for(job)
+
+    assert queue.get(job.job_id) is job
+    result = job.to_dict()
+    assert result["status"] == "COMPLETED"
+    assert result["progress"] == {"candles_processed": 10, "total_candles": 10, "percentage": 100.0}
+    assert result["result"] == {"strategy_name": "bullish_nifty", "job_id": job.job_id}
+    assert result["error"] is None
+
+
+def test_failed_job_reports_error(queue):
+    def run(input_data, progress_callback, job_id):
+        raise RuntimeError("no data")
+
+    job = queue.submit(RunBacktestInput("bullish_nifty", "2023-01-01", "2023-01-31"), run)
+    wait_for(job)
+
+    assert job.status == BacktestJobStatus.FAILED
+    assert job.to_dict()["error"] == "no data"
+
+
+def test_jobs_beyond_concurrency_limit_wait_in_queue(queue):
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_run(input_data, progress_callback, job_id):
+        started.set()
+        release.wait(5)
+        return {}
+
+    first = queue.submit(RunBacktestInput("a", "2023-01-01", "2023-01-31"), blocking_run)
+    second = queue.submit(RunBacktestInput("b", "2023-01-01", "2023-01-31"), blocking_run)
+    assert started.wait(5)
+
+    assert first.status == BacktestJobStatus.RUNNING
+    assert second.status == BacktestJobStatus.QUEUED
+
+    release.set()
+    wait_for(first)
+    wait_for(second)
+    assert second.status == BacktestJobStatus.COMPLETED
+
+
+def test_get_unknown_job_returns_none(queue):
+    assert queue.get("missing") is None
+
+
+def test_finished_jobs_are_evicted_beyond_retention_limit():
+    queue = BacktestJobQueue(max_concurrent_jobs=1, max_retained_jobs=1)
+    try:
+        first = queue.submit(RunBacktestInput("a", "2023-01-01", "2023-01-31"), lambda i, p, j: {})
+        wait_for(first)
+        second = queue.submit(RunBacktestInput("b", "2023-01-01", "2023-01-31"), lambda i, p, j: {})
+        wait_for(second)
+        queue.submit(RunBacktestInput("c", "2023-01-01", "2023-01-31"), lambda i, p, j: {})
+
+        assert queue.get(first.job_id) is None
+        assert queue.get(second.job_id) is second
+    finally:
+        queue.shutdown()
+
+
+def test_max_concurrent_jobs_must_be_positive():
+    with pytest.raises(ValueError):
+        BacktestJobQueue(max_concurrent_jobs=0)
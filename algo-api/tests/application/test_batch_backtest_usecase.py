@@ -0,0 +1,177 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from algo.application import batch_backtest_usecase
+from algo.application.batch_backtest_usecase import (
+    BatchBacktestJob,
+    RunBatchBacktestInput,
+    RunBatchBacktestUseCase,
+    _init_worker,
+    _run_batch_job,
+)
+from algo.application.run_backtest_usecase import RunBacktestInput
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.strategy_repository import StrategyRepository
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
+from algo.infrastructure.jsonstrategy import JsonStrategy
+
+
+def _strategy_json(name, instrument_key="NSE_INDEX|Nifty 50"):
+    instrument = {"type": "FUT", "exchange": "NSE", "instrument_key": instrument_key}
+    return {
+        "name": name,
+        "display_name": name,
+        "timeframe": "15min",
+        "capital": 100000,
+        "instrument": instrument,
+        "position": {"action": "BUY", "instrument": instrument},
+        "entry_rules": {"logic": "AND", "conditions": [{
+            "operator": ">",
+            "left": {"type": "number", "params": {"value": 2}},
+            "right": {"type": "number", "params": {"value": 1}},
+        }]},
+        "exit_rules": {"logic": "OR", "conditions": [{
+            "operator": ">",
+            "left": {"type": "number", "params": {"value": 1}},
+            "right": {"type": "number", "params": {"value": 2}},
+        }]},
+    }
+
+
+class FakeStrategyRepository(StrategyRepository):
+    def __init__(self):
+        self.strategies = {
+            name: JsonStrategy(_strategy_json(name))
+            for name in ("bullish_nifty", "bearish_nifty")
+        }
+
+    def get_strategy(self, strategy_name):
+        if strategy_name not in self.strategies:
+            raise ValueError(f"{strategy_name} is not a valid strategy name.")
+        return self.strategies[strategy_name]
+
+    def list_strategies(self):
+        return list(self.strategies.values())
+
+
+class CountingHistoricalDataRepository(HistoricalDataRepository):
+    def __init__(self):
+        self.calls = []
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls.append((instrument.instrument_key, start_date, end_date))
+        candles = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5:
+                ts = datetime(day.year, day.month, day.day, 9, 15)
+                for i in range(25):
+                    close = 100.0 + i
+                    candles.append({"timestamp": ts, "open": close, "high": close + 1,
+                                    "low": close - 1, "close": close, "volume": 100})
+                    ts += timedelta(minutes=15)
+            day += timedelta(days=1)
+        return HistoricalData(candles)
+
+
+def create_strategy_repository():
+    return FakeStrategyRepository()
+
+
+def create_historical_data_repository():
+    return CountingHistoricalDataRepository()
+
+
+def create_tradable_instrument_repository():
+    return InMemoryTradableInstrumentRepository()
+
+
+@pytest.fixture
+def trading_window_service():
+    service = TradingWindowService([{
+        "exchange": "NSE",
+        "type": "FUT",
+        "year": 2023,
+        "default_trading_windows": [
+            {"effective_from": None, "effective_to": None, "open_time": "09:15", "close_time": "15:30"}
+        ],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "special_days": [],
+        "holidays": [],
+    }])
+    with patch('algo.domain.services.get_trading_window_service', return_value=service):
+        yield service
+
+
+def make_usecase(max_workers=2):
+    return RunBatchBacktestUseCase(
+        FakeStrategyRepository(),
+        create_historical_data_repository,
+        create_tradable_instrument_repository,
+        create_strategy_repository,
+        max_workers=max_workers,
+    )
+
+
+def test_execute_runs_all_jobs_and_aggregates_results(trading_window_service):
+    jobs = [
+        RunBacktestInput("bullish_nifty", "2023-01-09", "2023-01-13"),
+        RunBacktestInput("bearish_nifty", "2023-01-16", "2023-01-20"),
+        RunBacktestInput("unknown", "2023-01-16", "2023-01-20"),
+    ]
+
+    with pytest.raises(ValueError, match="unknown is not a valid strategy name"):
+        make_usecase().execute(RunBatchBacktestInput(jobs))
+
+    result = make_usecase().execute(RunBatchBacktestInput(jobs[:2]))
+
+    assert result["summary"] == {"total_jobs": 2, "succeeded": 2, "failed": 0}
+    assert [r["strategy_name"] for r in result["results"]] == ["bullish_nifty", "bearish_nifty"]
+    assert result["results"][0]["report"]["summary"]["start_date"] == "09-Jan-2023"
+    assert result["results"][1]["report"]["summary"]["end_date"] == "20-Jan-2023"
+    assert len(result["results"][0]["report"]["tradable"]["positions"]) == 1
+
+
+def test_execute_requires_jobs():
+    with pytest.raises(ValueError, match="At least one backtest job is required"):
+        make_usecase().execute(RunBatchBacktestInput([]))
+
+
+def test_plan_jobs_share_data_range_per_instrument():
+    usecase = make_usecase()
+    jobs = usecase._plan_jobs([
+        RunBacktestInput("bullish_nifty", "2023-01-09", "2023-01-13"),
+        RunBacktestInput("bearish_nifty", "2023-02-01", "2023-02-10"),
+    ])
+
+    assert jobs[0].data_start_date == jobs[1].data_start_date == date(2023, 1, 9)
+    assert jobs[0].data_end_date == jobs[1].data_end_date == date(2023, 2, 10)
+
+
+def test_worker_loads_historical_data_once_for_jobs_on_same_instrument(trading_window_service):
+    _init_worker(create_historical_data_repository, create_tradable_instrument_repository, create_strategy_repository)
+    jobs = [
+        BatchBacktestJob(0, "bullish_nifty", date(2023, 1, 9), date(2023, 1, 13), date(2023, 1, 9), date(2023, 1, 20)),
+        BatchBacktestJob(1, "bearish_nifty", date(2023, 1, 16), date(2023, 1, 20), date(2023, 1, 9), date(2023, 1, 20)),
+    ]
+
+    results = [_run_batch_job(job, False) for job in jobs]
+
+    assert [index for index, _ in results] == [0, 1]
+    assert all("report" in result for _, result in results)
+    repository = batch_backtest_usecase._worker_state["historical_data_repository"]
+    assert repository.calls == [("NSE_INDEX|Nifty 50", date(2023, 1, 9), date(2023, 1, 20))]
+
+
+def test_worker_reports_job_errors(trading_window_service):
+    _init_worker(create_historical_data_repository, create_tradable_instrument_repository, create_strategy_repository)
+    job = BatchBacktestJob(0, "missing", date(2023, 1, 9), date(2023, 1, 13), date(2023, 1, 9), date(2023, 1, 13))
+
+    index, result = _run_batch_job(job, False)
+
+    assert index == 0
+    assert result == {"error": "missing is not a valid strategy name."}
@@ -0,0 +1,211 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from algo.application import parameter_sweep_usecase
+from algo.application.parameter_sweep_usecase import (
+    ParameterRange,
+    RunParameterSweepInput,
+    RunParameterSweepUseCase,
+    _init_sweep_worker,
+    _run_variant,
+    expand_parameters,
+    expand_variants,
+    set_parameter,
+)
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.strategy_repository import StrategyRepository
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
+from algo.infrastructure.jsonstrategy import JsonStrategy
+
+
+def _price_threshold_strategy_json():
+    instrument = {"type": "FUT", "exchange": "NSE", "instrument_key": "NSE_INDEX|Nifty 50"}
+    return {
+        "name": "threshold",
+        "display_name": "Threshold",
+        "timeframe": "15min",
+        "capital": 100000,
+        "instrument": instrument,
+        "position": {"action": "BUY", "instrument": instrument},
+        "entry_rules": {"logic": "AND", "conditions": [{
+            "operator": ">",
+            "left": {"type": "price", "params": {"price": "close"}},
+            "right": {"type": "number", "params": {"value": 102}},
+        }]},
+        "exit_rules": {"logic": "OR", "conditions": [{
+            "operator": "<",
+            "left": {"type": "price", "params": {"price": "close"}},
+            "right": {"type": "number", "params": {"value": 98}},
+        }]},
+    }
+
+
+def _generate_candles(start_date, end_date):
+    candles = []
+    day = start_date
+    i = 0
+    while day <= end_date:
+        if day.weekday() < 5:
+            ts = datetime(day.year, day.month, day.day, 9, 15)
+            for _ in range(25):
+                close = 100 + 5 * math.sin(i / 7.0)
+                candles.append({"timestamp": ts, "open": close, "high": close + 0.5,
+                                "low": close - 0.5, "close": close, "volume": 100})
+                ts += timedelta(minutes=15)
+                i += 1
+        day += timedelta(days=1)
+    return candles
+
+
+class FakeStrategyRepository(StrategyRepository):
+    def get_strategy(self, strategy_name):
+        if strategy_name != "threshold":
+            raise ValueError(f"{strategy_name} is not a valid strategy name.")
+        return JsonStrategy(_price_threshold_strategy_json())
+
+    def list_strategies(self):
+        return [self.get_strategy("threshold")]
+
+
+class CountingHistoricalDataRepository(HistoricalDataRepository):
+    def __init__(self):
+        self.calls = 0
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls += 1
+        return HistoricalData(_generate_candles(start_date, end_date))
+
+
+def create_tradable_instrument_repository():
+    return InMemoryTradableInstrumentRepository()
+
+
+@pytest.fixture
+def trading_window_service():
+    service = TradingWindowService([{
+        "exchange": "NSE",
+        "type": "FUT",
+        "year": 2023,
+        "default_trading_windows": [
+            {"effective_from": None, "effective_to": None, "open_time": "09:15", "close_time": "15:30"}
+        ],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "special_days": [],
+        "holidays": [],
+    }])
+    with patch('algo.domain.services.get_trading_window_service', return_value=service):
+        yield service
+
+
+ENTRY_PATH = "entry_rules.conditions.0.right.params.value"
+EXIT_PATH = "exit_rules.conditions.0.right.params.value"
+
+
+def test_parameter_range_from_values_and_from_bounds():
+    assert ParameterRange.from_dict({"path": "a", "values": [1, 3]}).values == [1, 3]
+    assert ParameterRange.from_dict({"path": "a", "start": 10, "stop": 20, "step": 5}).values == [10, 15, 20]
+    with pytest.raises(ValueError):
+        ParameterRange.from_dict({"path": "a"})
+    with pytest.raises(ValueError):
+        ParameterRange.from_dict({"path": "a", "start": 1, "stop": 2, "step": 0})
+
+
+def test_parameter_range_float_steps_reach_the_upper_bound():
+    assert ParameterRange.from_dict({"path": "a", "start": 0.1, "stop": 0.5, "step": 0.1}).values == [
+        0.1, 0.2, 0.3, 0.4, 0.5
+    ]
+    assert ParameterRange.from_dict({"path": "a", "start": 0, "stop": 1, "step": 0.1}).values[-1] == 1.0
+    assert len(ParameterRange.from_dict({"path": "a", "start": 0, "stop": 1, "step": 0.3}).values) == 4
+    with pytest.raises(ValueError, match="maximum"):
+        ParameterRange.from_dict({"path": "a", "start": 0, "stop": 1, "step": 1e-9})
+
+
+def test_set_parameter_rejects_unknown_path():
+    json_data = _price_threshold_strategy_json()
+    set_parameter(json_data, ENTRY_PATH, 101)
+    assert json_data["entry_rules"]["conditions"][0]["right"]["params"]["value"] == 101
+
+    with pytest.raises(ValueError, match="Invalid parameter path"):
+        set_parameter(json_data, "entry_rules.conditions.5.right.params.value", 1)
+    with pytest.raises(ValueError, match="Invalid parameter path"):
+        set_parameter(json_data, "entry_rules.conditions.0.right.params.period", 1)
+
+
+def test_expand_variants_builds_full_grid_without_touching_source():
+    json_data = _price_threshold_strategy_json()
+    variants = expand_variants(json_data, [
+        ParameterRange(ENTRY_PATH, [101, 102, 103]),
+        ParameterRange(EXIT_PATH, [97, 98]),
+    ])
+
+    assert len(variants) == 6
+    assert variants[1][0] == {ENTRY_PATH: 101, EXIT_PATH: 98}
+    assert variants[1][1]["exit_rules"]["conditions"][0]["right"]["params"]["value"] == 98
+    assert json_data == _price_threshold_strategy_json()
+
+
+def test_variants_on_one_worker_share_indicator_cache(trading_window_service):
+    historical_data = HistoricalData(_generate_candles(date(2023, 1, 2), date(2023, 1, 31)))
+    _init_sweep_worker(JsonStrategy, _price_threshold_strategy_json(), historical_data, date(2023, 1, 9),
+                       date(2023, 1, 27), True, None, create_tradable_instrument_repository)
+    variants = expand_parameters([ParameterRange(EXIT_PATH, [97, 98])])
+
+    results = [_run_variant((index, parameters)) for index, parameters in enumerate(variants)]
+
+    assert all("metrics" in result for _, result in results)
+    # Only the exit thresholds differ: price(close) and the entry threshold are computed once
+    stats = parameter_sweep_usecase._sweep_state["indicator_cache"].get_stats()
+    assert stats["misses"] == 4
+    assert stats["hits"] == 4
+
+
+def test_execute_ranks_variants(trading_window_service):
+    historical_data_repository = CountingHistoricalDataRepository()
+    use_case = RunParameterSweepUseCase(
+        FakeStrategyRepository(),
+        JsonStrategy,
+        historical_data_repository,
+        create_tradable_instrument_repository,
+        max_workers=2,
+    )
+    input_data = RunParameterSweepInput(
+        strategy_name="threshold",
+        start_date="2023-01-09",
+        end_date="2023-01-27",
+        parameters=[{"path": ENTRY_PATH, "values": [101, 103]}, {"path": EXIT_PATH, "start": 96, "stop": 98, "step": 2}],
+    )
+
+    with patch("algo.application.parameter_sweep_usecase.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pools:
+        result = use_case.execute(input_data)
+
+    assert pools.call_count == 1
+    assert historical_data_repository.calls == 1
+    assert result["total_variants"] == 4
+    assert result["failed_variants"] == 0
+    pnl = [row["total_pnl_points"] for row in result["results"]]
+    assert pnl == sorted(pnl, reverse=True)
+    assert [row["rank"] for row in result["results"]] == [1, 2, 3, 4]
+    assert {tuple(row["parameters"].values()) for row in result["results"]} == {
+        (101, 96), (101, 98), (103, 96), (103, 98)
+    }
+
+
+def test_execute_validates_input():
+    use_case = RunParameterSweepUseCase(
+        FakeStrategyRepository(), JsonStrategy, CountingHistoricalDataRepository(), create_tradable_instrument_repository
+    )
+    with pytest.raises(ValueError, match="At least one parameter range is required"):
+        use_case.execute(RunParameterSweepInput("threshold", "2023-01-09", "2023-01-27", []))
+    with pytest.raises(ValueError, match="rank_by must be one of"):
+        use_case.execute(RunParameterSweepInput("threshold", "2023-01-09", "2023-01-27",
+                                                [{"path": ENTRY_PATH, "values": [1]}], rank_by="sharpe"))
+    for top in (0, -1, 1.5, True):
+        with pytest.raises(ValueError, match="top must be a positive integer"):
+            use_case.execute(RunParameterSweepInput("threshold", "2023-01-09", "2023-01-27",
+                                                    [{"path": ENTRY_PATH, "values": [1]}], top=top))
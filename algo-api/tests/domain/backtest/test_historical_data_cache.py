@@ -0,0 +1,175 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from unittest.mock import patch
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_cache import CachingHistoricalDataRepository, HistoricalDataCache
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+
+NIFTY = Instrument(Exchange.NSE, Type.INDEX, "NSE_INDEX|Nifty 50")
+BANKNIFTY = Instrument(Exchange.NSE, Type.INDEX, "NSE_INDEX|Nifty Bank")
+# Five float64 columns and the timestamps: 48 bytes per candle
+CANDLE_BYTES = 48
+
+
+class CountingRepository(HistoricalDataRepository):
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls.append((instrument.instrument_key, start_date, end_date))
+        time.sleep(self.delay)
+        candles = []
+        day = start_date
+        while day <= end_date:
+            candles.append({"timestamp": datetime(day.year, day.month, day.day, 9, 15).isoformat(),
+                            "open": 1.0, "high": 1.0, "low": 1.0, "close": float(day.day), "volume": 1.0})
+            day += timedelta(days=1)
+        return HistoricalData(candles)
+
+
+def test_sub_range_of_cached_range_is_served_as_view():
+    delegate = CountingRepository()
+    repository = CachingHistoricalDataRepository(delegate, HistoricalDataCache())
+
+    full = repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 31), Timeframe.ONE_DAY)
+    part = repository.get_historical_data(NIFTY, date(2023, 1, 10), date(2023, 1, 12), Timeframe.ONE_DAY)
+
+    assert len(delegate.calls) == 1
+    assert len(full) == 31
+    assert list(part.column("close")) == [10.0, 11.0, 12.0]
+    assert part.identity[0] == full.identity[0]
+    assert repository.cache.get_stats()["hits"] == 1
+
+
+def test_overlapping_request_extends_entry_and_disjoint_request_replaces_it():
+    delegate = CountingRepository()
+    cache = HistoricalDataCache()
+    repository = CachingHistoricalDataRepository(delegate, cache)
+
+    repository.get_historical_data(NIFTY, date(2023, 1, 10), date(2023, 1, 20), Timeframe.ONE_DAY)
+    repository.get_historical_data(NIFTY, date(2023, 1, 15), date(2023, 1, 25), Timeframe.ONE_DAY)
+    extended = repository.get_historical_data(NIFTY, date(2023, 1, 10), date(2023, 1, 25), Timeframe.ONE_DAY)
+    repository.get_historical_data(NIFTY, date(2023, 6, 1), date(2023, 6, 5), Timeframe.ONE_DAY)
+
+    # Only the days missing after the cached range are loaded
+    assert delegate.calls[1] == ("NSE_INDEX|Nifty 50", date(2023, 1, 21), date(2023, 1, 25))
+    assert list(extended.column("close")) == [float(day) for day in range(10, 26)]
+    assert delegate.calls[2] == ("NSE_INDEX|Nifty 50", date(2023, 6, 1), date(2023, 6, 5))
+    assert [(e["start_date"], e["end_date"]) for e in cache.get_entries()["cached_data"]] == [("2023-06-01", "2023-06-05")]
+
+
+def test_least_recently_used_entries_are_evicted_over_byte_budget():
+    delegate = CountingRepository()
+    cache = HistoricalDataCache(max_bytes=25 * CANDLE_BYTES)
+    repository = CachingHistoricalDataRepository(delegate, cache)
+
+    repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 10), Timeframe.ONE_DAY)
+    repository.get_historical_data(BANKNIFTY, date(2023, 1, 1), date(2023, 1, 10), Timeframe.ONE_DAY)
+    repository.get_historical_data(NIFTY, date(2023, 1, 2), date(2023, 1, 3), Timeframe.ONE_DAY)
+    repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 10), Timeframe.FIVE_MINUTES)
+
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 20 * CANDLE_BYTES
+    assert {e["instrument_key"] for e in cache.get_entries()["cached_data"]} == {"NSE_INDEX|Nifty 50"}
+
+
+def test_data_larger_than_budget_is_returned_without_caching():
+    cache = HistoricalDataCache(max_bytes=CANDLE_BYTES)
+    repository = CachingHistoricalDataRepository(CountingRepository(), cache)
+
+    data = repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 10), Timeframe.ONE_DAY)
+
+    assert len(data) == 10
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get_stats()["uncacheable"] == 1
+
+
+def test_concurrent_misses_share_one_load():
+    delegate = CountingRepository(delay=0.2)
+    cache = HistoricalDataCache()
+    repository = CachingHistoricalDataRepository(delegate, cache)
+    results = []
+
+    def load():
+        results.append(len(repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 31), Timeframe.ONE_DAY)))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [31] * 4
+    assert len(delegate.calls) == 1
+    assert cache.get_stats()["in_flight_waits"] == 3
+
+
+def test_failed_load_is_not_cached():
+    class FailingRepository(HistoricalDataRepository):
+        def get_historical_data(self, instrument, start_date, end_date, timeframe):
+            raise RuntimeError("broker unavailable")
+
+    cache = HistoricalDataCache()
+    repository = CachingHistoricalDataRepository(FailingRepository(), cache)
+
+    with pytest.raises(RuntimeError):
+        repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 31), Timeframe.ONE_DAY)
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get_stats()["loads_in_flight"] == 0
+
+
+def test_sources_are_cached_separately():
+    cache = HistoricalDataCache()
+    first, second = CountingRepository(), CountingRepository()
+
+    CachingHistoricalDataRepository(first, cache, "PARQUET_FILES:/a").get_historical_data(
+        NIFTY, date(2023, 1, 1), date(2023, 1, 2), Timeframe.ONE_DAY)
+    CachingHistoricalDataRepository(second, cache, "PARQUET_FILES:/b").get_historical_data(
+        NIFTY, date(2023, 1, 1), date(2023, 1, 2), Timeframe.ONE_DAY)
+
+    assert len(first.calls) == len(second.calls) == 1
+
+
+class EmptyRepository(HistoricalDataRepository):
+    def __init__(self):
+        self.calls = 0
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls += 1
+        return HistoricalData([])
+
+
+def test_empty_load_is_not_cached():
+    delegate = EmptyRepository()
+    repository = CachingHistoricalDataRepository(delegate, HistoricalDataCache())
+
+    repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 31), Timeframe.ONE_DAY)
+    repository.get_historical_data(NIFTY, date(2023, 1, 1), date(2023, 1, 31), Timeframe.ONE_DAY)
+
+    assert delegate.calls == 2
+    assert repository.cache.get_stats()["entries"] == 0
+
+
+def test_current_day_is_loaded_again():
+    delegate = CountingRepository()
+    repository = CachingHistoricalDataRepository(delegate, HistoricalDataCache())
+
+    with patch("algo.domain.backtest.historical_data_cache._today", return_value=date(2023, 1, 20)):
+        first = repository.get_historical_data(NIFTY, date(2023, 1, 10), date(2023, 1, 20), Timeframe.ONE_DAY)
+        second = repository.get_historical_data(NIFTY, date(2023, 1, 10), date(2023, 1, 20), Timeframe.ONE_DAY)
+        repository.get_historical_data(NIFTY, date(2023, 1, 20), date(2023, 1, 20), Timeframe.ONE_DAY)
+
+    # Only the days before today are kept; today is loaded on every request
+    assert len(first) == len(second) == 11
+    assert delegate.calls == [(NIFTY.instrument_key, date(2023, 1, 10), date(2023, 1, 20)),
+                              (NIFTY.instrument_key, date(2023, 1, 20), date(2023, 1, 20)),
+                              (NIFTY.instrument_key, date(2023, 1, 20), date(2023, 1, 20))]
+    assert repository.cache.get_entries()["cached_data"][0]["end_date"] == "2023-01-19"
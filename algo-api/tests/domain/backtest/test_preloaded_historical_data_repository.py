@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.preloaded_historical_data_repository import PreloadedHistoricalDataRepository
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+
+
+@pytest.fixture
+def instrument():
+    return Instrument(type=Type.FUT, exchange=Exchange.NSE, instrument_key="NSE_FUT|TEST")
+
+
+@pytest.fixture
+def loaded_data():
+    timestamps = pd.date_range("2023-01-02 09:15", periods=4 * 375, freq="1min", tz="Asia/Kolkata")
+    timestamps = timestamps[timestamps.indexer_between_time("09:15", "15:29")]
+    return HistoricalData.from_columns({
+        "timestamp": timestamps,
+        "close": np.arange(len(timestamps), dtype=float),
+    })
+
+
+@pytest.fixture
+def delegate():
+    return Mock(spec=HistoricalDataRepository)
+
+
+@pytest.fixture
+def repository(delegate, instrument, loaded_data):
+    return PreloadedHistoricalDataRepository(
+        delegate, instrument, Timeframe.ONE_MINUTE, loaded_data, date(2023, 1, 2), date(2023, 1, 5)
+    )
+
+
+def test_serves_covered_range_from_loaded_data(repository, delegate, instrument, loaded_data):
+    result = repository.get_historical_data(instrument, date(2023, 1, 3), date(2023, 1, 3), Timeframe.ONE_MINUTE)
+
+    delegate.get_historical_data.assert_not_called()
+    assert {ts.date() for ts in result.timestamps} == {date(2023, 1, 3)}
+    assert np.shares_memory(result.column("close"), loaded_data.column("close"))
+
+
+def test_accepts_datetime_bounds_and_string_timeframe(repository, delegate, instrument):
+    result = repository.get_historical_data(instrument, datetime(2023, 1, 2, 12, 0), date(2023, 1, 2), "1min")
+
+    delegate.get_historical_data.assert_not_called()
+    assert len(result) > 0
+
+
+def test_delegates_outside_loaded_range(repository, delegate, instrument):
+    repository.get_historical_data(instrument, date(2023, 1, 6), date(2023, 1, 6), Timeframe.ONE_MINUTE)
+    delegate.get_historical_data.assert_called_once_with(instrument, date(2023, 1, 6), date(2023, 1, 6), Timeframe.ONE_MINUTE)
+
+
+def test_delegates_other_instrument_or_timeframe(repository, delegate, instrument):
+    other = Instrument(type=Type.FUT, exchange=Exchange.NSE, instrument_key="NSE_FUT|OTHER")
+    repository.get_historical_data(other, date(2023, 1, 3), date(2023, 1, 3), Timeframe.ONE_MINUTE)
+    repository.get_historical_data(instrument, date(2023, 1, 3), date(2023, 1, 3), Timeframe.FIVE_MINUTES)
+    assert delegate.get_historical_data.call_count == 2
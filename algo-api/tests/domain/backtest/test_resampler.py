@@ -0,0 +1,115 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_cache import HistoricalDataCache
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.resampler import ResamplingHistoricalDataRepository, resample
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_window_service import TradingWindowService
+
+NIFTY = Instrument(Exchange.NSE, Type.INDEX, "NSE_INDEX|Nifty 50")
+TRADING_WINDOWS = TradingWindowService([{
+    "exchange": "NSE", "type": "INDEX", "year": 2025,
+    "default_trading_windows": [{"open_time": "09:15", "close_time": "15:30"}],
+    "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+    # Muhurat trading: a one hour evening session
+    "special_days": [{"date": "2025-10-21", "open_time": "18:00", "close_time": "19:00"}],
+}])
+
+
+def minute_candles(day: date, open_time: time, count: int) -> dict:
+    start = pd.Timestamp(datetime.combine(day, open_time), tz="Asia/Kolkata")
+    values = np.arange(count, dtype=float)
+    return {
+        "timestamp": pd.date_range(start, periods=count, freq="1min"),
+        "open": values, "high": values + 0.5, "low": values - 0.5, "close": values + 0.25,
+        "volume": np.ones(count), "oi": np.full(count, None, dtype=object),
+    }
+
+
+def join(*parts: dict) -> HistoricalData:
+    return HistoricalData.concat([HistoricalData.from_columns(part) for part in parts])
+
+
+class MinuteRepository(HistoricalDataRepository):
+    def __init__(self):
+        self.calls = []
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls.append((start_date, end_date, timeframe))
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        return join(*[minute_candles(day, time(9, 15), 375) for day in days if day.weekday() < 5])
+
+
+CALENDAR = TRADING_WINDOWS.get_trading_calendar(Exchange.NSE, Type.INDEX)
+
+
+def test_intraday_buckets_start_at_session_open_and_aggregate_ohlcv():
+    data = join(minute_candles(date(2025, 1, 2), time(9, 15), 375))
+
+    result = resample(data, Timeframe.SIXTY_MINUTES, CALENDAR)
+
+    # 09:15 to 15:29 makes six full hours and a 15 minute candle at 15:15
+    assert [ts.strftime("%H:%M") for ts in result.timestamps] == ["09:15", "10:15", "11:15", "12:15", "13:15", "14:15", "15:15"]
+    assert str(result.timestamps.tz) == "Asia/Kolkata"
+    assert list(result.column("open"))[:2] == [0.0, 60.0]
+    assert list(result.column("high"))[:2] == [59.5, 119.5]
+    assert list(result.column("low"))[:2] == [-0.5, 59.5]
+    assert list(result.column("close"))[:2] == [59.25, 119.25]
+    assert list(result.column("volume")) == [60.0] * 6 + [15.0]
+    assert list(result.column("oi")) == [None] * 7
+
+
+def test_special_session_and_daily_candles():
+    data = join(
+        minute_candles(date(2025, 10, 20), time(9, 15), 375),
+        minute_candles(date(2025, 10, 21), time(18, 0), 60),
+    )
+
+    fifteen = resample(data, Timeframe.FIFTEEN_MINUTES, CALENDAR)
+    daily = resample(data, Timeframe.ONE_DAY, CALENDAR)
+
+    special = fifteen.filter(pd.Timestamp("2025-10-21", tz="Asia/Kolkata"))
+    assert [ts.strftime("%H:%M") for ts in special.timestamps] == ["18:00", "18:15", "18:30", "18:45"]
+    assert len(fifteen) == 25 + 4
+    assert [ts.isoformat() for ts in daily.timestamps] == ["2025-10-20T00:00:00+05:30", "2025-10-21T00:00:00+05:30"]
+    assert list(daily.column("high")) == [374.5, 59.5]
+    assert list(daily.column("volume")) == [375.0, 60.0]
+
+
+def test_buckets_start_at_first_candle_without_session_times():
+    data = join(minute_candles(date(2025, 1, 2), time(9, 20), 12))
+
+    result = resample(data, Timeframe.FIVE_MINUTES)
+
+    assert [ts.strftime("%H:%M") for ts in result.timestamps] == ["09:20", "09:25", "09:30"]
+
+
+def test_unsupported_timeframe_is_rejected():
+    with pytest.raises(ValueError):
+        resample(join(minute_candles(date(2025, 1, 2), time(9, 15), 5)), Timeframe.ONE_WEEK)
+
+
+def test_repository_loads_one_minute_candles_and_caches_derived_series():
+    delegate = MinuteRepository()
+    cache = HistoricalDataCache()
+    repository = ResamplingHistoricalDataRepository(delegate, TRADING_WINDOWS, cache, "test")
+
+    first = repository.get_historical_data(NIFTY, date(2025, 1, 6), date(2025, 1, 10), Timeframe.THIRTY_MINUTES)
+    part = repository.get_historical_data(NIFTY, date(2025, 1, 7), date(2025, 1, 8), Timeframe.THIRTY_MINUTES)
+    repository.get_historical_data(NIFTY, date(2025, 1, 6), date(2025, 1, 6), Timeframe.ONE_WEEK)
+
+    assert delegate.calls == [
+        (date(2025, 1, 6), date(2025, 1, 10), Timeframe.ONE_MINUTE),
+        (date(2025, 1, 6), date(2025, 1, 6), Timeframe.ONE_WEEK),
+    ]
+    # 375 minutes make 12 half hours and a 15 minute candle at 15:15 per day
+    assert len(first) == 5 * 13
+    assert len(part) == 2 * 13
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_entries()["cached_data"][0]["source"] == "test:resampled"
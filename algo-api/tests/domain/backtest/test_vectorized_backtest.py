@@ -0,0 +1,159 @@
+import math
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from algo.domain.backtest.backtest import BackTest
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.indicators.ema import indicator_ema
+from algo.domain.indicators.rsi import indicator_rsi
+from algo.domain.indicators.price import indicator_price
+from algo.domain.indicators.number import indicator_number
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.strategy.strategy import (
+    Strategy, RuleSet, Condition, Expression, PositionInstrument, TradeAction,
+    RiskManagement, StopLoss, StopLossType,
+)
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
+
+
+class EmaCrossStrategy(Strategy):
+    def __init__(self):
+        self._instrument = Instrument(type=Type.FUT, exchange=Exchange.NSE, instrument_key="NSE_FUT|TEST")
+        price = Expression("price", {"price": "close"})
+        ema = Expression("ema", {"period": 10, "price": "close"})
+        self._entry_rules = RuleSet("AND", [
+            Condition(">", price, ema),
+            Condition(">", Expression("rsi", {"period": 14}), Expression("number", {"value": 50})),
+        ])
+        self._exit_rules = RuleSet("OR", [Condition("<", price, ema)])
+
+    def get_name(self): return "ema_cross"
+    def get_display_name(self): return "EMA Cross"
+    def get_description(self): return "EMA Cross"
+    def get_instrument(self): return self._instrument
+    def get_timeframe(self): return Timeframe.FIFTEEN_MINUTES
+    def get_capital(self): return 100000
+    def get_entry_rules(self): return self._entry_rules
+    def get_exit_rules(self): return self._exit_rules
+    def get_position_instrument(self): return PositionInstrument(TradeAction.BUY, self._instrument)
+    def get_risk_management(self): return RiskManagement(StopLoss(3, StopLossType.POINTS))
+
+
+def _generate_candles():
+    candles = []
+    day = date(2023, 1, 2)
+    i = 0
+    while day <= date(2023, 1, 31):
+        if day.weekday() < 5:
+            ts = datetime(day.year, day.month, day.day, 9, 15)
+            for _ in range(25):
+                close = 100 + 8 * math.sin(i / 9.0) + 3 * math.sin(i / 2.3)
+                candles.append({
+                    "timestamp": ts, "open": close - 0.4, "high": close + 1.1,
+                    "low": close - 1.3, "close": close, "volume": 100,
+                })
+                ts += timedelta(minutes=15)
+                i += 1
+        day += timedelta(days=1)
+    return candles
+
+
+@pytest.fixture
+def real_indicators(monkeypatch):
+    # Other test modules register stub indicators under the same names
+    for name, func in [("ema", indicator_ema), ("rsi", indicator_rsi),
+                       ("price", indicator_price), ("number", indicator_number)]:
+        monkeypatch.setitem(IndicatorRegistry._registry, name, func)
+
+
+@pytest.fixture
+def trading_window_service():
+    return TradingWindowService([{
+        "exchange": "NSE",
+        "type": "FUT",
+        "year": 2023,
+        "default_trading_windows": [
+            {"effective_from": None, "effective_to": None, "open_time": "09:15", "close_time": "15:30"}
+        ],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "special_days": [],
+        "holidays": [],
+    }])
+
+
+def _run(vectorized: bool, trading_window_service):
+    repository = Mock(spec=HistoricalDataRepository)
+    repository.get_historical_data.return_value = HistoricalData(_generate_candles())
+    backtest = BackTest(
+        strategy=EmaCrossStrategy(),
+        historical_data_repository=repository,
+        tradable_instrument_repository=InMemoryTradableInstrumentRepository(),
+        start_date=date(2023, 1, 9),
+        end_date=date(2023, 1, 27),
+    )
+    with patch('algo.domain.services.get_trading_window_service', return_value=trading_window_service):
+        return backtest.run(vectorized=vectorized)
+
+
+def test_vectorized_run_produces_same_report_as_per_candle_run(real_indicators, trading_window_service):
+    per_candle = _run(False, trading_window_service)
+    vectorized = _run(True, trading_window_service)
+
+    assert len(per_candle.tradable.positions) > 0
+    assert [repr(p.transactions) for p in vectorized.tradable.positions] == \
+        [repr(p.transactions) for p in per_candle.tradable.positions]
+    assert vectorized.to_dict()["summary"] == per_candle.to_dict()["summary"]
+
+
+def test_vectorized_run_does_not_evaluate_rules_per_candle(real_indicators, trading_window_service):
+    with patch.object(EmaCrossStrategy, 'should_enter_trade') as should_enter, \
+         patch.object(EmaCrossStrategy, 'should_exit_trade') as should_exit:
+        _run(True, trading_window_service)
+
+    should_enter.assert_not_called()
+    should_exit.assert_not_called()
+
+
+def test_vectorized_run_shares_indicator_series_between_entry_and_exit_rules(real_indicators, trading_window_service):
+    repository = Mock(spec=HistoricalDataRepository)
+    repository.get_historical_data.return_value = HistoricalData(_generate_candles())
+    backtest = BackTest(
+        strategy=EmaCrossStrategy(),
+        historical_data_repository=repository,
+        tradable_instrument_repository=InMemoryTradableInstrumentRepository(),
+        start_date=date(2023, 1, 9),
+        end_date=date(2023, 1, 13),
+    )
+    with patch('algo.domain.services.get_trading_window_service', return_value=trading_window_service):
+        backtest.run(vectorized=True)
+
+    stats = backtest.indicator_cache.get_stats()
+    # price(close) and ema(10) appear in both rule sets and are computed once
+    assert stats["misses"] == 4
+    assert stats["hits"] == 2
+
+
+def test_run_reports_progress(real_indicators, trading_window_service):
+    repository = Mock(spec=HistoricalDataRepository)
+    repository.get_historical_data.return_value = HistoricalData(_generate_candles())
+    backtest = BackTest(
+        strategy=EmaCrossStrategy(),
+        historical_data_repository=repository,
+        tradable_instrument_repository=InMemoryTradableInstrumentRepository(),
+        start_date=date(2023, 1, 9),
+        end_date=date(2023, 1, 27),
+    )
+    progress = []
+    with patch('algo.domain.services.get_trading_window_service', return_value=trading_window_service):
+        backtest.run(progress_callback=lambda processed, total: progress.append((processed, total)))
+
+    # 15 weekdays of 25 candles between the start and end dates
+    assert progress[0] == (0, 375)
+    assert progress[-1] == (375, 375)
+    assert [p for p, _ in progress] == sorted(p for p, _ in progress)
@@ -0,0 +1,154 @@
+import math
+import pickle
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from algo.domain.backtest import walk_forward
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.backtest.walk_forward import WalkForwardRunner, _init_fold_worker, _run_fold, build_folds
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.in_memory_tradable_instrument_repository import InMemoryTradableInstrumentRepository
+from algo.infrastructure.jsonstrategy import JsonStrategy
+
+
+def _strategy():
+    instrument = {"type": "FUT", "exchange": "NSE", "instrument_key": "NSE_INDEX|Nifty 50"}
+    return JsonStrategy({
+        "name": "threshold",
+        "display_name": "Threshold",
+        "timeframe": "15min",
+        "capital": 100000,
+        "instrument": instrument,
+        "position": {"action": "BUY", "instrument": instrument},
+        "entry_rules": {"logic": "AND", "conditions": [{
+            "operator": ">",
+            "left": {"type": "price", "params": {"price": "close"}},
+            "right": {"type": "number", "params": {"value": 102}},
+        }]},
+        "exit_rules": {"logic": "OR", "conditions": [{
+            "operator": "<",
+            "left": {"type": "price", "params": {"price": "close"}},
+            "right": {"type": "number", "params": {"value": 98}},
+        }]},
+    })
+
+
+class CountingHistoricalDataRepository(HistoricalDataRepository):
+    def __init__(self):
+        self.calls = []
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls.append((start_date, end_date))
+        candles = []
+        day = start_date
+        i = 0
+        while day <= end_date:
+            if day.weekday() < 5:
+                ts = datetime(day.year, day.month, day.day, 9, 15)
+                for _ in range(25):
+                    close = 100 + 5 * math.sin(i / 7.0)
+                    candles.append({"timestamp": ts, "open": close, "high": close + 0.5,
+                                    "low": close - 0.5, "close": close, "volume": 100})
+                    ts += timedelta(minutes=15)
+                    i += 1
+            day += timedelta(days=1)
+        return HistoricalData(candles)
+
+
+def create_tradable_instrument_repository():
+    return InMemoryTradableInstrumentRepository()
+
+
+@pytest.fixture
+def trading_window_service():
+    service = TradingWindowService([{
+        "exchange": "NSE",
+        "type": "FUT",
+        "year": 2023,
+        "default_trading_windows": [
+            {"effective_from": None, "effective_to": None, "open_time": "09:15", "close_time": "15:30"}
+        ],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "special_days": [],
+        "holidays": [],
+    }])
+    with patch('algo.domain.services.get_trading_window_service', return_value=service):
+        yield service
+
+
+def test_build_folds_rolls_in_and_out_of_sample_periods():
+    folds = build_folds(date(2023, 1, 1), date(2023, 1, 31), in_sample_days=14, out_of_sample_days=7)
+
+    assert [(f.in_sample_start, f.in_sample_end, f.out_of_sample_start, f.out_of_sample_end) for f in folds] == [
+        (date(2023, 1, 1), date(2023, 1, 14), date(2023, 1, 15), date(2023, 1, 21)),
+        (date(2023, 1, 8), date(2023, 1, 21), date(2023, 1, 22), date(2023, 1, 28)),
+        (date(2023, 1, 15), date(2023, 1, 28), date(2023, 1, 29), date(2023, 1, 31)),
+    ]
+
+
+def test_build_folds_without_in_sample_period():
+    folds = build_folds(date(2023, 1, 1), date(2023, 1, 10), in_sample_days=0, out_of_sample_days=5, step_days=5)
+
+    assert [(f.in_sample_start, f.out_of_sample_start, f.out_of_sample_end) for f in folds] == [
+        (None, date(2023, 1, 1), date(2023, 1, 5)),
+        (None, date(2023, 1, 6), date(2023, 1, 10)),
+    ]
+
+
+def test_build_folds_rejects_invalid_lengths():
+    with pytest.raises(ValueError):
+        build_folds(date(2023, 1, 1), date(2023, 1, 31), in_sample_days=10, out_of_sample_days=0)
+    with pytest.raises(ValueError, match="too short"):
+        build_folds(date(2023, 1, 1), date(2023, 1, 5), in_sample_days=10, out_of_sample_days=5)
+
+
+def test_json_strategy_survives_pickling():
+    strategy = _strategy()
+    strategy.get_compiled_plan()
+
+    restored = pickle.loads(pickle.dumps(strategy))
+
+    assert restored.get_name() == "threshold"
+    assert restored.get_compiled_plan() is not None
+
+
+def test_folds_in_one_worker_reuse_indicator_series(trading_window_service):
+    historical_data = CountingHistoricalDataRepository().get_historical_data(None, date(2023, 1, 2), date(2023, 1, 31), None)
+    _init_fold_worker(_strategy(), historical_data, True, None, create_tradable_instrument_repository)
+    folds = build_folds(date(2023, 1, 2), date(2023, 1, 31), in_sample_days=0, out_of_sample_days=10)
+
+    results = [_run_fold(fold) for fold in folds]
+
+    assert all("out_of_sample" in result for _, result in results)
+    # price(close) and the two thresholds are computed once over the shared dataset
+    assert walk_forward._fold_state["indicator_cache"].get_stats()["misses"] == 3
+
+
+def test_run_loads_data_once_and_aggregates_out_of_sample_metrics(trading_window_service):
+    repository = CountingHistoricalDataRepository()
+    runner = WalkForwardRunner(repository, create_tradable_instrument_repository, max_workers=2)
+    folds = build_folds(date(2023, 1, 2), date(2023, 2, 26), in_sample_days=14, out_of_sample_days=14)
+
+    result = runner.run(_strategy(), folds)
+
+    assert len(repository.calls) == 1
+    assert repository.calls[0][1] == date(2023, 2, 26)
+    assert [row["fold"] for row in result["folds"]] == list(range(len(folds)))
+    aggregate = result["aggregate"]
+    assert aggregate["total_folds"] == len(folds)
+    assert aggregate["failed_folds"] == 0
+    assert aggregate["out_of_sample_total_pnl_points"] == pytest.approx(
+        sum(row["out_of_sample"]["total_pnl_points"] for row in result["folds"])
+    )
+    assert aggregate["in_sample_total_pnl_points"] == pytest.approx(
+        sum(row["in_sample"]["total_pnl_points"] for row in result["folds"])
+    )
+
+
+def test_run_requires_folds():
+    runner = WalkForwardRunner(CountingHistoricalDataRepository(), create_tradable_instrument_repository)
+    with pytest.raises(ValueError):
+        runner.run(_strategy(), [])
@@ -42,3 +42,11 @@ def test_indicator_ema_with_default_params():
     # No params provided, should use defaults
     result = indicator_ema(df, {})
     assert isinstance(result, float)
+
+def test_indicator_ema_with_columnar_historical_data():
+    import numpy as np
+    from algo.domain.backtest.historical_data import HistoricalData
+    closes = np.array([10.0, 12.0, 14.0, 16.0, 18.0, 20.0])
+    hd = HistoricalData.from_columns({"close": closes})
+    params = {"period": 3, "price": "close"}
+    assert indicator_ema(hd, params) == pytest.approx(indicator_ema([{"close": c} for c in closes], params))
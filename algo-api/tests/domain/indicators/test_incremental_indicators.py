@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+import talib
+
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.indicators.ema import IncrementalEma
+from algo.domain.market import Candle
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    high = close + np.abs(rng.normal(0, 1, 400))
+    low = close - np.abs(rng.normal(0, 1, 400))
+    return high, low, close
+
+
+@pytest.fixture
+def candles(prices):
+    high, low, close = prices
+    return [{"high": h, "low": l, "close": c} for h, l, c in zip(high, low, close)]
+
+
+REFERENCES = {
+    "ema": lambda h, l, c, p: talib.EMA(c, timeperiod=p),
+    "rsi": lambda h, l, c, p: talib.RSI(c, timeperiod=p),
+    "atr": lambda h, l, c, p: talib.ATR(h, l, c, timeperiod=p),
+    "plus_di": lambda h, l, c, p: talib.PLUS_DI(h, l, c, timeperiod=p),
+    "minus_di": lambda h, l, c, p: talib.MINUS_DI(h, l, c, timeperiod=p),
+    "adx": lambda h, l, c, p: talib.ADX(h, l, c, timeperiod=p),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REFERENCES))
+@pytest.mark.parametrize("period", [2, 14, 50])
+def test_incremental_matches_talib(name, period, prices, candles):
+    indicator = IndicatorRegistry.create_incremental(name, {"period": period})
+    values = np.array(indicator.update_all(candles))
+    expected = REFERENCES[name](*prices, period)
+
+    # Same warm-up: NaN exactly where TA-Lib has no output yet
+    assert np.array_equal(np.isnan(values), np.isnan(expected))
+    ready = ~np.isnan(expected)
+    np.testing.assert_allclose(values[ready], expected[ready], rtol=1e-9, atol=1e-9)
+
+
+def test_incremental_indicator_reports_readiness(candles):
+    ema = IncrementalEma({"period": 3})
+    ema.update(candles[0])
+    ema.update(candles[1])
+    assert not ema.is_ready
+    assert math.isnan(ema.value)
+    ema.update(candles[2])
+    assert ema.is_ready
+    assert ema.value == pytest.approx(sum(c["close"] for c in candles[:3]) / 3)
+
+
+def test_incremental_ema_uses_price_param_and_candle_objects():
+    ema = IndicatorRegistry.create_incremental("ema", {"period": 2, "price": "open"})
+    ema.update(Candle(open=10.0, high=11.0, low=9.0, close=10.5, volume=0))
+    value = ema.update(Candle(open=12.0, high=13.0, low=11.0, close=12.5, volume=0))
+    assert value == pytest.approx(11.0)
+
+
+def test_create_incremental_unknown_indicator_raises():
+    with pytest.raises(ValueError, match="Incremental indicator 'unknown' not registered"):
+        IndicatorRegistry.create_incremental("unknown", {})
@@ -0,0 +1,121 @@
+import pickle
+from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.cache import IndicatorCache, normalize_params
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.strategy.strategy import Condition, Expression, RuleSet
+
+
+@pytest.fixture
+def historical_data():
+    return HistoricalData.from_columns({
+        "timestamp": pd.date_range("2023-01-02 09:15", periods=10, freq="1min"),
+        "close": np.arange(10, dtype=float),
+    })
+
+
+@pytest.fixture
+def counting_indicator(monkeypatch):
+    calls = []
+
+    def indicator(historical_data, params):
+        calls.append(params)
+        return float(len(historical_data) * params.get("period", 1))
+
+    monkeypatch.setitem(IndicatorRegistry._registry, "counting", indicator)
+    return calls
+
+
+def test_get_or_compute_hits_on_same_series(historical_data):
+    cache = IndicatorCache()
+    computed = []
+    compute = lambda: computed.append(1) or 42.0
+
+    assert cache.get_or_compute("ema", {"period": 20}, historical_data, compute) == 42.0
+    assert cache.get_or_compute("EMA", {"period": 20}, historical_data, compute) == 42.0
+
+    assert len(computed) == 1
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_views_of_same_window_share_entries(historical_data):
+    cache = IndicatorCache()
+    end = datetime(2023, 1, 2, 9, 20)
+    first = historical_data.filter(end=end)
+    second = historical_data.filter(end=end)
+    later = historical_data.filter(end=datetime(2023, 1, 2, 9, 21))
+
+    cache.get_or_compute("rsi", {}, first, lambda: 1.0)
+    cache.get_or_compute("rsi", {}, second, lambda: 2.0)
+    assert cache.get_or_compute("rsi", {}, later, lambda: 3.0) == 3.0
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_pickled_dataset_keeps_identity_distinct_from_new_datasets(historical_data):
+    shipped = pickle.loads(pickle.dumps(historical_data))
+    cache = IndicatorCache()
+    cache.get_or_compute("ema", {"period": 20}, shipped, lambda: 1.0)
+
+    # A dataset created in the receiving process never takes the shipped one's identity
+    created = HistoricalData.from_columns({
+        "timestamp": pd.date_range("2023-01-02 09:15", periods=10, freq="1min"),
+        "close": np.zeros(10),
+    })
+
+    assert shipped.identity == historical_data.identity
+    assert created.identity != shipped.identity
+    assert cache.get_or_compute("ema", {"period": 20}, created, lambda: 2.0) == 2.0
+
+
+def test_plain_lists_are_not_cached():
+    cache = IndicatorCache()
+    assert cache.get_or_compute("price", {}, [{"close": 1}], lambda: 1.0) == 1.0
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_lru_eviction(historical_data):
+    cache = IndicatorCache(max_entries=2)
+    for period in (1, 2, 3):
+        cache.get_or_compute("ema", {"period": period}, historical_data, lambda: period)
+    assert cache.get_stats()["entries"] == 2
+    assert cache.get_or_compute("ema", {"period": 1}, historical_data, lambda: "recomputed") == "recomputed"
+
+
+def test_normalize_params_ignores_key_order():
+    assert normalize_params({"period": 14, "price": "close"}) == normalize_params({"price": "close", "period": 14})
+    assert normalize_params({"levels": [1, 2]}) == (("levels", (1, 2)),)
+    assert normalize_params(MappingProxyType({"a": 1, "b": 2})) == normalize_params({"b": 2, "a": 1})
+
+
+def test_duplicate_expressions_across_rulesets_computed_once(historical_data, counting_indicator):
+    entry = RuleSet("AND", [
+        Condition(">", Expression("counting", {"period": 14}), Expression("number", {"value": 0})),
+        Condition(">", Expression("counting", {"period": 20}), Expression("number", {"value": 0})),
+    ])
+    exit = RuleSet("OR", [
+        Condition("<", Expression("counting", {"period": 20}), Expression("number", {"value": 0})),
+    ])
+    cache = IndicatorCache()
+
+    with cache.activate():
+        entry.apply_on(historical_data)
+        exit.apply_on(historical_data)
+
+    assert counting_indicator == [{"period": 14}, {"period": 20}]
+    assert cache.get_stats()["hits"] >= 1
+    assert IndicatorCache.current() is None
+
+
+def test_explicit_cache_argument(historical_data, counting_indicator):
+    cache = IndicatorCache()
+    expression = Expression("counting", {"period": 3})
+    expression.evaluate(historical_data, cache)
+    expression.evaluate(historical_data, cache)
+    assert len(counting_indicator) == 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.indicators.ema import indicator_ema, indicator_ema_series
+from algo.domain.indicators.rsi import indicator_rsi, indicator_rsi_series
+from algo.domain.indicators.adx import indicator_adx, indicator_adx_series
+from algo.domain.indicators.atr import indicator_atr, indicator_atr_series
+from algo.domain.indicators.plus_di import indicator_plus_di, indicator_plus_di_series
+from algo.domain.indicators.minus_di import indicator_minus_di, indicator_minus_di_series
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 120))
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 0.3, 120),
+        "high": close + np.abs(rng.normal(0, 1, 120)),
+        "low": close - np.abs(rng.normal(0, 1, 120)),
+        "close": close,
+    })
+
+
+@pytest.mark.parametrize("scalar, series, params", [
+    (indicator_ema, indicator_ema_series, {"period": 10}),
+    (indicator_rsi, indicator_rsi_series, {"period": 14}),
+    (indicator_adx, indicator_adx_series, {"period": 14}),
+    (indicator_atr, indicator_atr_series, {"period": 14}),
+    (indicator_plus_di, indicator_plus_di_series, {"period": 14}),
+    (indicator_minus_di, indicator_minus_di_series, {"period": 14}),
+])
+def test_series_matches_scalar_on_each_prefix(candles, scalar, series, params):
+    values = series(candles, params)
+    assert len(values) == len(candles)
+    for end in (40, 80, len(candles)):
+        assert values[end - 1] == pytest.approx(scalar(candles.iloc[:end], params))
+
+
+@pytest.mark.parametrize("name", ["ema", "rsi", "adx", "atr", "plus_di", "minus_di", "price", "number"])
+def test_series_indicators_are_registered(name):
+    assert IndicatorRegistry.has_series(name)
+
+
+def test_get_series_unknown_indicator_raises():
+    with pytest.raises(ValueError, match="Series indicator 'unknown' not registered"):
+        IndicatorRegistry.get_series("unknown")
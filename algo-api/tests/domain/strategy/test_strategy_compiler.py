@@ -0,0 +1,189 @@
+import numpy as np
+import pytest
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.indicators.cache import IndicatorCache
+from algo.domain.indicators.registry import IndicatorRegistry
+from algo.domain.strategy.strategy_compiler import (
+    LOGIC_AND,
+    LOGIC_OR,
+    OP_EQ,
+    OP_GT,
+    OP_LT,
+    StrategyCompiler,
+)
+from algo.infrastructure.jsonstrategy import JsonStrategy
+
+
+@pytest.fixture
+def counted_indicators(monkeypatch):
+    calls = []
+
+    def value(data, params):
+        calls.append(params["value"])
+        return float(params["value"])
+
+    monkeypatch.setitem(IndicatorRegistry._registry, "value", value)
+    monkeypatch.setitem(IndicatorRegistry._series_registry, "value",
+                        lambda data, params: np.full(len(data), float(params["value"])))
+    monkeypatch.setitem(IndicatorRegistry._costs, "value", 1)
+    return calls
+
+
+def value_expression(value):
+    return {"type": "value", "params": {"value": value}}
+
+
+def make_strategy(entry_conditions, exit_conditions, entry_logic="AND", exit_logic="OR"):
+    return JsonStrategy(strategy_json(
+        {"logic": entry_logic, "conditions": entry_conditions},
+        {"logic": exit_logic, "conditions": exit_conditions},
+    ))
+
+
+def strategy_json(entry_rules, exit_rules):
+    return {
+        "name": "compiled",
+        "display_name": "Compiled",
+        "timeframe": "5min",
+        "capital": 100000,
+        "instrument": {"type": "FUT", "exchange": "NSE", "instrument_key": "NIFTY"},
+        "position": {"action": "BUY", "instrument": {"type": "FUT", "exchange": "NSE", "instrument_key": "NIFTY"}},
+        "entry_rules": entry_rules,
+        "exit_rules": exit_rules,
+    }
+
+
+def condition(operator, left, right):
+    return {"operator": operator, "left": value_expression(left), "right": value_expression(right)}
+
+
+def test_compile_deduplicates_indicator_nodes(counted_indicators):
+    strategy = make_strategy(
+        [condition(">", 2, 1), condition("<", 1, 3)],
+        [condition("==", 2, 3)],
+    )
+
+    plan = StrategyCompiler().compile(strategy)
+
+    assert [node.params["value"] for node in plan.nodes] == [2, 1, 3]
+    assert [c.operator for c in plan.conditions] == [OP_GT, OP_LT, OP_EQ]
+    assert plan.entry.logic == LOGIC_AND
+    assert plan.exit.logic == LOGIC_OR
+    assert plan.nodes[0].handler is IndicatorRegistry.get("value")
+
+
+def test_compiled_plan_is_immutable(counted_indicators):
+    plan = StrategyCompiler().compile(make_strategy([condition(">", 2, 1)], []))
+
+    with pytest.raises(AttributeError):
+        plan.nodes = ()
+    with pytest.raises(TypeError):
+        plan.nodes[0].params["value"] = 5
+
+
+def test_should_enter_evaluates_each_node_once(counted_indicators):
+    strategy = make_strategy([condition(">", 2, 1), condition("<", 1, 2)], [])
+
+    assert strategy.should_enter_trade([{"close": 1}]) is True
+    assert sorted(counted_indicators) == [1, 2]
+
+
+def test_should_exit_short_circuits_or(counted_indicators):
+    strategy = make_strategy([], [condition("<", 1, 2), condition("==", 5, 6)])
+
+    assert strategy.should_exit_trade([{"close": 1}]) is True
+    assert counted_indicators == [1, 2]
+    assert strategy.get_exit_rules().get_evaluation_counts() == {
+        repr(strategy.get_exit_rules().conditions[0]): 1,
+        repr(strategy.get_exit_rules().conditions[1]): 0,
+    }
+
+
+def test_empty_rule_sets_match_rule_set_semantics(counted_indicators):
+    strategy = make_strategy([], [])
+
+    assert strategy.should_enter_trade([{"close": 1}]) is True
+    assert strategy.should_exit_trade([{"close": 1}]) is False
+
+
+def test_compile_rejects_unsupported_operator(counted_indicators):
+    strategy = make_strategy([condition(">=", 1, 2)], [])
+
+    with pytest.raises(ValueError, match="Unsupported operator: >="):
+        StrategyCompiler().compile(strategy)
+
+
+def test_compile_rejects_unknown_indicator():
+    strategy = make_strategy([{"operator": ">", "left": {"type": "unknown_indicator", "params": {}},
+                               "right": {"type": "number", "params": {"value": 1}}}], [])
+
+    with pytest.raises(ValueError):
+        StrategyCompiler().compile(strategy)
+
+
+def test_compiled_series_match_rule_set_series(monkeypatch):
+    from algo.domain.indicators import ema, number, price
+    monkeypatch.setitem(IndicatorRegistry._registry, "ema", ema.indicator_ema)
+    monkeypatch.setitem(IndicatorRegistry._registry, "price", price.indicator_price)
+    monkeypatch.setitem(IndicatorRegistry._registry, "number", number.indicator_number)
+
+    closes = 100 + np.cumsum(np.sin(np.arange(120) / 5.0))
+    historical_data = HistoricalData.from_columns({
+        "timestamp": np.arange(120).astype("datetime64[m]"),
+        "close": closes,
+    })
+    strategy = JsonStrategy(strategy_json(
+        {"logic": "AND", "conditions": [
+            {"operator": ">", "left": {"type": "ema", "params": {"period": 5, "price": "close"}},
+             "right": {"type": "ema", "params": {"period": 20, "price": "close"}}},
+            {"operator": ">", "left": {"type": "price", "params": {"price": "close"}},
+             "right": {"type": "number", "params": {"value": 100}}},
+        ]},
+        {"logic": "OR", "conditions": [
+            {"operator": "<", "left": {"type": "ema", "params": {"period": 5, "price": "close"}},
+             "right": {"type": "ema", "params": {"period": 20, "price": "close"}}},
+        ]},
+    ))
+
+    plan = strategy.get_compiled_plan()
+    entry, exit = plan.evaluate_series(historical_data)
+
+    np.testing.assert_array_equal(entry, strategy.get_entry_rules().apply_on_series(historical_data))
+    np.testing.assert_array_equal(exit, strategy.get_exit_rules().apply_on_series(historical_data))
+    for end in (30, 60, 120):
+        window = historical_data[:end]
+        assert plan.should_enter(window) == strategy.get_entry_rules().apply_on(window)
+        assert plan.should_exit(window) == strategy.get_exit_rules().apply_on(window)
+
+
+def test_compiled_plan_uses_active_indicator_cache(counted_indicators):
+    strategy = make_strategy([condition(">", 2, 1)], [condition("<", 1, 2)])
+    historical_data = HistoricalData([{"close": 1}])
+    cache = IndicatorCache()
+
+    with cache.activate():
+        strategy.should_enter_trade(historical_data)
+        strategy.should_exit_trade(historical_data)
+
+    assert sorted(counted_indicators) == [1, 2]
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_compiled_and_interpreted_evaluation_share_cache_entries(counted_indicators):
+    strategy = make_strategy([condition(">", 2, 1)], [])
+    historical_data = HistoricalData([{"close": 1}])
+    cache = IndicatorCache()
+
+    StrategyCompiler().compile(strategy).should_enter(historical_data, cache)
+    strategy.get_entry_rules().apply_on(historical_data, cache)
+
+    assert sorted(counted_indicators) == [1, 2]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_get_compiled_plan_is_built_once(counted_indicators):
+    strategy = make_strategy([condition(">", 2, 1)], [])
+
+    assert strategy.get_compiled_plan() is strategy.get_compiled_plan()
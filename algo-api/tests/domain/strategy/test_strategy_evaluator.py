@@ -822,6 +822,21 @@ def test_get_next_candle_timestamp_after_trading_hours(mock_get_service):
 
 
 
+def test_injected_trading_window_service_is_used_without_the_registry(mock_trading_window_service):
+    """Test that a service passed to the evaluator is used instead of resolving the registered one"""
+    mock_strategy = Mock()
+    mock_strategy.get_instrument.return_value = Instrument(type=Type.FUT, exchange=Exchange.NSE, instrument_key="TEST")
+    evaluator = StrategyEvaluator(mock_strategy, Mock(), Mock(), mock_trading_window_service)
+
+    with patch('algo.domain.services.get_trading_window_service') as mock_get_service:
+        first = evaluator._get_next_candle_timestamp(datetime(2025, 10, 3, 15, 25, tzinfo=timezone.utc), Timeframe.FIVE_MINUTES)
+        second = evaluator._get_next_candle_timestamp(datetime(2025, 10, 6, 10, 0, tzinfo=timezone.utc), Timeframe.FIVE_MINUTES)
+
+    mock_get_service.assert_not_called()
+    assert first == datetime(2025, 10, 6, 9, 15, tzinfo=timezone.utc)
+    assert second == datetime(2025, 10, 6, 10, 5, tzinfo=timezone.utc)
+
+
 def test_get_next_candle_timestamp_friday_to_monday(patched_trading_window_service):
     """Test that Friday's last candle moves to Monday 9:15 AM (skipping weekend) and preserves timezone"""
     mock_strategy = Mock()
@@ -1048,3 +1063,33 @@ def test_get_next_candle_timestamp_weekend_after_hours(patched_trading_window_se
 
 
 # Remove the separate timezone tests since they are now integrated into existing tests
+
+
+def test_evaluate_skips_exit_rules_when_no_position_open(evaluator, sample_candle, sample_historical_data,
+                                                         sample_tradable_instrument, mock_strategy,
+                                                         mock_tradable_instrument_repository, mock_historical_data_repository):
+    """Only the entry rule set is evaluated while flat."""
+    mock_tradable_instrument_repository.get_tradable_instruments.return_value = [sample_tradable_instrument]
+    mock_historical_data_repository.get_historical_data.return_value = sample_historical_data
+    sample_tradable_instrument.is_any_position_open.return_value = False
+    sample_tradable_instrument.positions = []
+
+    evaluator.evaluate(sample_candle)
+
+    mock_strategy.should_enter_trade.assert_called_once()
+    mock_strategy.should_exit_trade.assert_not_called()
+
+
+def test_evaluate_skips_entry_rules_when_position_open(evaluator, sample_candle, sample_historical_data,
+                                                       sample_tradable_instrument, mock_strategy,
+                                                       mock_tradable_instrument_repository, mock_historical_data_repository):
+    """Only the exit rule set is evaluated while a position is open."""
+    mock_tradable_instrument_repository.get_tradable_instruments.return_value = [sample_tradable_instrument]
+    mock_historical_data_repository.get_historical_data.return_value = sample_historical_data
+    sample_tradable_instrument.is_any_position_open.return_value = True
+    sample_tradable_instrument.positions = []
+
+    evaluator.evaluate(sample_candle)
+
+    mock_strategy.should_enter_trade.assert_not_called()
+    mock_strategy.should_exit_trade.assert_called_once()
@@ -556,4 +556,91 @@ def test_get_required_history_start_date_zero_period_with_datetime():
     
     # No period-based indicators, should return same datetime
     result = strategy.get_required_history_start_date(end_datetime)
-    assert result == end_datetime
\ No newline at end of file
+    assert result == end_datetime
+
+def test_condition_is_satisfied_series():
+    data = [{"close": 1.0}, {"close": 5.0}, {"close": 10.0}]
+    cond = Condition(
+        operator=">",
+        left=Expression("price", {"price": "close"}),
+        right=Expression("number", {"value": 4})
+    )
+    assert cond.is_satisfied_series(data).tolist() == [False, True, True]
+
+
+def test_condition_is_satisfied_series_nan_is_false():
+    data = [{"close": float("nan")}, {"close": 5.0}]
+    cond = Condition(
+        operator="<",
+        left=Expression("price", {"price": "close"}),
+        right=Expression("number", {"value": 10})
+    )
+    assert cond.is_satisfied_series(data).tolist() == [False, True]
+
+
+def test_ruleset_apply_on_series_and_or():
+    data = [{"close": 1.0}, {"close": 5.0}, {"close": 10.0}]
+    above_two = Condition(">", Expression("price", {"price": "close"}), Expression("number", {"value": 2}))
+    below_eight = Condition("<", Expression("price", {"price": "close"}), Expression("number", {"value": 8}))
+
+    assert RuleSet("AND", [above_two, below_eight]).apply_on_series(data).tolist() == [False, True, False]
+    assert RuleSet("OR", [above_two, below_eight]).apply_on_series(data).tolist() == [True, True, True]
+
+
+def test_ruleset_apply_on_series_without_conditions():
+    data = [{"close": 1.0}, {"close": 2.0}]
+    assert RuleSet("AND", []).apply_on_series(data).tolist() == [True, True]
+    assert RuleSet("OR", []).apply_on_series(data).tolist() == [False, False]
+
+
+@pytest.fixture
+def costed_indicators(monkeypatch):
+    monkeypatch.setitem(IndicatorRegistry._registry, "cheap", lambda data, params: float(params["value"]))
+    monkeypatch.setitem(IndicatorRegistry._registry, "costly", lambda data, params: float(params["value"]))
+    monkeypatch.setitem(IndicatorRegistry._costs, "cheap", 0)
+    monkeypatch.setitem(IndicatorRegistry._costs, "costly", 10)
+
+
+def make_costed_condition(kind, satisfied):
+    return Condition(
+        operator="==",
+        left=Expression(kind, {"value": 1}),
+        right=Expression(kind, {"value": 1 if satisfied else 2})
+    )
+
+
+def test_apply_on_and_stops_at_first_false(costed_indicators):
+    costly = make_costed_condition("costly", True)
+    cheap_false = make_costed_condition("cheap", False)
+    ruleset = RuleSet(logic="AND", conditions=[costly, cheap_false])
+
+    assert ruleset.apply_on([{"close": 1}]) is False
+    # The cheap condition is evaluated first and decides the result
+    assert cheap_false.evaluation_count == 1
+    assert costly.evaluation_count == 0
+
+
+def test_apply_on_or_stops_at_first_true(costed_indicators):
+    cheap_true = make_costed_condition("cheap", True)
+    costly = make_costed_condition("costly", False)
+    ruleset = RuleSet(logic="OR", conditions=[costly, cheap_true])
+
+    assert ruleset.apply_on([{"close": 1}]) is True
+    assert ruleset.get_evaluation_counts() == {repr(costly): 0, repr(cheap_true): 1}
+
+
+def test_get_ordered_conditions_is_stable_for_equal_costs(costed_indicators):
+    first = make_costed_condition("costly", True)
+    second = make_costed_condition("costly", False)
+    cheap = make_costed_condition("cheap", True)
+    ruleset = RuleSet(logic="AND", conditions=[first, second, cheap])
+
+    assert ruleset.get_ordered_conditions() == [cheap, first, second]
+
+
+def test_reset_evaluation_counts(costed_indicators):
+    cond = make_costed_condition("cheap", True)
+    ruleset = RuleSet(logic="AND", conditions=[cond])
+    ruleset.apply_on([{"close": 1}])
+    ruleset.reset_evaluation_counts()
+    assert cond.evaluation_count == 0
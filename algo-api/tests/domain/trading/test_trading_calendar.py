@@ -0,0 +1,86 @@
+"""
+Tests for the compiled TradingCalendar.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.instrument.instrument import Exchange, Type
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_window_service import TradingWindowService
+
+
+def config(year, holidays=(), special_days=()):
+    return {
+        "exchange": "NSE",
+        "type": "FUT",
+        "year": year,
+        "default_trading_windows": [{"open_time": "09:15", "close_time": "15:30"}],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "holidays": [{"date": day, "description": "Holiday"} for day in holidays],
+        "special_days": [{"date": day, "open_time": "18:00", "close_time": "19:00"} for day in special_days],
+    }
+
+
+@pytest.fixture
+def service():
+    return TradingWindowService([
+        config(2024, holidays=["2024-12-25"]),
+        config(2025, holidays=["2025-01-01", "2025-10-02"], special_days=["2025-10-21"]),
+    ])
+
+
+@pytest.fixture
+def calendar(service):
+    return service.get_trading_calendar(Exchange.NSE, Type.FUT)
+
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def test_calendar_is_shared_per_exchange_and_type(service, calendar):
+    assert service.get_trading_calendar(Exchange.NSE, Type.FUT) is calendar
+    assert service.get_trading_calendar(Exchange.NSE, Type.EQ) is not calendar
+
+
+def test_next_candle_within_session_and_across_holidays(calendar):
+    assert calendar.next_candle(datetime(2025, 10, 1, 10, 30, tzinfo=IST), Timeframe.FIVE_MINUTES) == \
+        datetime(2025, 10, 1, 10, 35, tzinfo=IST)
+    # 2 October is a holiday: the last candle of the 1st is followed by the open of the 3rd
+    assert calendar.next_candle(datetime(2025, 10, 1, 15, 25, tzinfo=IST), Timeframe.FIVE_MINUTES) == \
+        datetime(2025, 10, 3, 9, 15, tzinfo=IST)
+    assert calendar.next_candle(datetime(2025, 10, 20, 15, 15, tzinfo=IST), Timeframe.FIFTEEN_MINUTES) == \
+        datetime(2025, 10, 21, 18, 0, tzinfo=IST)
+    assert calendar.next_candle(datetime(2025, 10, 3, 0, 0, tzinfo=IST), Timeframe.ONE_DAY) == \
+        datetime(2025, 10, 6, 9, 15, tzinfo=IST)
+
+
+def test_lookup_past_the_last_session_of_a_year_compiles_the_next_year(calendar):
+    next_open = calendar.next_session_open(pd.Timestamp("2024-12-31 15:29", tz="Asia/Kolkata"))
+
+    # 1 January is a holiday; the result keeps the pandas type and timezone of the input
+    assert next_open == pd.Timestamp("2025-01-02 09:15", tz="Asia/Kolkata")
+    assert isinstance(next_open, pd.Timestamp)
+    assert calendar.opens[0] == pd.Timestamp("2024-01-01 09:15").value
+
+
+def test_years_compiled_out_of_order_leave_no_gap():
+    calendar = TradingWindowService([config(2024), config(2025), config(2026)]).get_trading_calendar(Exchange.NSE, Type.FUT)
+    calendar.compile_years(2026, 2026)
+
+    assert calendar.next_session_open(datetime(2024, 12, 31, 15, 25)) == datetime(2025, 1, 1, 9, 15)
+    assert calendar.opens[0] == pd.Timestamp("2024-01-01 09:15").value
+
+
+def test_year_without_configuration_raises(calendar):
+    with pytest.raises(ValueError):
+        calendar.next_session_open(datetime(2023, 6, 1, 10, 0))
+
+
+def test_session_open_minutes_of_many_days(calendar):
+    days = np.array([(day - date(1970, 1, 1)).days for day in
+                     [date(2025, 10, 20), date(2025, 10, 21), date(2025, 10, 2), date(2025, 10, 4)]])
+
+    assert list(calendar.session_open_minutes(days)) == [555, 1080, -1, -1]
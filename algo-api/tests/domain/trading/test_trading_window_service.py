@@ -842,6 +842,32 @@ class TestTradingWindowService:
         with pytest.raises(ValueError, match="No trading window configuration found for NSE-EQ 2024"):
             service.get_trading_window(date(2024, 11, 5), Exchange.NSE, Type.EQ)
 
+    def test_trading_windows_are_materialized_once(self, config_data_list):
+        """Test that repeated lookups return the window built at load time."""
+        service = TradingWindowService(config_data_list)
+
+        first = service.get_trading_window(date(2024, 11, 5), Exchange.NSE, Type.FUT)
+        second = service.get_trading_window(date(2024, 11, 5), Exchange.NSE, Type.FUT)
+
+        assert first is second
+        assert first.is_regular_trading_day
+
+    def test_get_trading_days_and_count_sessions(self, config_data_list):
+        """Test range queries skip weekly holidays and holidays and keep special sessions."""
+        service = TradingWindowService(config_data_list)
+
+        # 2024-10-28 (Monday) to 2024-11-03 (Sunday); 2024-11-01 is Muhurat Trading
+        trading_days = service.get_trading_days(date(2024, 10, 28), date(2024, 11, 3), Exchange.NSE, Type.FUT)
+        assert trading_days == [date(2024, 10, 28), date(2024, 10, 29), date(2024, 10, 30),
+                                date(2024, 10, 31), date(2024, 11, 1)]
+
+        # 2024 has 262 weekdays, two of which are holidays
+        assert service.count_sessions(date(2024, 1, 1), date(2024, 12, 31), Exchange.NSE, Type.FUT) == 260
+        assert service.count_sessions(date(2024, 12, 25), date(2024, 12, 25), Exchange.NSE, Type.FUT) == 0
+
+        with pytest.raises(ValueError, match="No trading window configuration found for NSE-FUT 2025"):
+            service.count_sessions(date(2024, 12, 1), date(2025, 1, 31), Exchange.NSE, Type.FUT)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
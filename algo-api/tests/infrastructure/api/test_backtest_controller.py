@@ -1,7 +1,15 @@
 import pytest
+from datetime import date, datetime
 from unittest.mock import patch, MagicMock
 from flask import Flask, json
+from algo.application.backtest_job_queue import BacktestJobQueue
+from algo.domain.backtest.report import BackTestReport
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.strategy.strategy import TradeAction
+from algo.domain.strategy.tradable_instrument import TradableInstrument
 from algo.infrastructure.api.backtest_controller import backtest_bp
+from algo.domain.backtest.historical_data_cache import HistoricalDataCache
+from algo.config_context import get_config
 
 @pytest.fixture
 def app():
@@ -13,6 +21,12 @@ def app():
 def client(app):
     return app.test_client()
 
+@pytest.fixture(autouse=True)
+def max_worker_processes(monkeypatch):
+    # Independent of the number of CPUs of the machine running the tests
+    monkeypatch.setattr(get_config().backtest_engine, 'max_worker_processes', 8)
+    return 8
+
 def test_run_backtest_success(client):
     mock_report = {'result': 'success'}
     with patch('algo.infrastructure.api.backtest_controller.RunBacktestUseCase') as MockUseCase:
@@ -76,3 +90,215 @@ def test_run_backtest_rejects_non_json_content_type(client):
     assert response.status_code == 400
     data = response.get_json()
     assert 'error' in data
+
+def test_run_batch_backtest_success(client):
+    mock_result = {'summary': {'total_jobs': 1, 'succeeded': 1, 'failed': 0}, 'results': []}
+    with patch('algo.infrastructure.api.backtest_controller.RunBatchBacktestUseCase') as MockUseCase:
+        with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'):
+            instance = MockUseCase.return_value
+            instance.execute.return_value = mock_result
+            payload = {
+                'jobs': [{'strategy_name': 'test_strategy', 'start_date': '2023-01-01', 'end_date': '2023-01-31'}],
+                'max_workers': 2
+            }
+            response = client.post('/api/backtest/batch', data=json.dumps(payload), content_type='application/json')
+
+            assert response.status_code == 200
+            assert response.get_json() == mock_result
+            batch_input = instance.execute.call_args[0][0]
+            assert [job.strategy_name for job in batch_input.jobs] == ['test_strategy']
+            assert MockUseCase.call_args.kwargs['max_workers'] == 2
+
+@pytest.mark.parametrize('max_workers', ['4', -1, 0, 2.5, True])
+def test_invalid_max_workers_is_rejected(client, max_workers):
+    with patch('algo.infrastructure.api.backtest_controller.RunBatchBacktestUseCase') as MockUseCase, \
+         patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'):
+        payload = {'jobs': [{'strategy_name': 'test_strategy', 'start_date': '2023-01-01', 'end_date': '2023-01-31'}],
+                   'max_workers': max_workers}
+        response = client.post('/api/backtest/batch', data=json.dumps(payload), content_type='application/json')
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'max_workers must be a positive integer'
+        MockUseCase.assert_not_called()
+
+def test_max_workers_is_clamped_to_configured_limit(client, max_worker_processes):
+    with patch('algo.infrastructure.api.backtest_controller.RunParameterSweepUseCase') as MockUseCase, \
+         patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'), \
+         patch('algo.infrastructure.api.backtest_controller.get_historical_data_repository'):
+        MockUseCase.return_value.execute.return_value = {'results': []}
+        payload = {'strategy_name': 'bullish_nifty', 'start_date': '2023-01-01', 'end_date': '2023-01-31',
+                   'parameters': [], 'max_workers': 1000}
+        client.post('/api/backtest/sweep', data=json.dumps(payload), content_type='application/json')
+        client.post('/api/backtest/sweep', data=json.dumps({k: v for k, v in payload.items() if k != 'max_workers'}),
+                    content_type='application/json')
+
+        assert [call.kwargs['max_workers'] for call in MockUseCase.call_args_list] == [max_worker_processes] * 2
+
+def test_run_batch_backtest_defaults_to_all_strategies(client):
+    with patch('algo.infrastructure.api.backtest_controller.RunBatchBacktestUseCase') as MockUseCase:
+        with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository') as mock_strategy_repo:
+            strategy_a, strategy_b = MagicMock(), MagicMock()
+            strategy_a.get_name.return_value = 'bullish_nifty'
+            strategy_b.get_name.return_value = 'bearish_nifty'
+            mock_strategy_repo.return_value.list_strategies.return_value = [strategy_a, strategy_b]
+            MockUseCase.return_value.execute.return_value = {}
+            payload = {'start_date': '2023-01-01', 'end_date': '2023-01-31'}
+            response = client.post('/api/backtest/batch', data=json.dumps(payload), content_type='application/json')
+
+            assert response.status_code == 200
+            batch_input = MockUseCase.return_value.execute.call_args[0][0]
+            assert [job.strategy_name for job in batch_input.jobs] == ['bullish_nifty', 'bearish_nifty']
+
+def test_run_batch_backtest_value_error(client):
+    with patch('algo.infrastructure.api.backtest_controller.RunBatchBacktestUseCase') as MockUseCase:
+        with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'):
+            MockUseCase.return_value.execute.side_effect = ValueError('At least one backtest job is required')
+            response = client.post('/api/backtest/batch', data=json.dumps({'jobs': []}), content_type='application/json')
+            assert response.status_code == 400
+            assert response.get_json()['error'] == 'At least one backtest job is required'
+
+def test_run_backtest_async_enqueues_job(client):
+    with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'):
+        with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue') as mock_queue:
+            job = MagicMock()
+            job.to_dict.return_value = {'job_id': 'job-1', 'status': 'QUEUED'}
+            mock_queue.return_value.submit.return_value = job
+            payload = {
+                'strategy_name': 'test_strategy',
+                'start_date': '2023-01-01',
+                'end_date': '2023-01-31',
+                'async': True
+            }
+            response = client.post('/api/backtest', data=json.dumps(payload), content_type='application/json')
+
+            assert response.status_code == 202
+            assert response.get_json() == {'job_id': 'job-1', 'status': 'QUEUED'}
+            submitted_input = mock_queue.return_value.submit.call_args[0][0]
+            assert submitted_input.strategy_name == 'test_strategy'
+
+def test_run_backtest_async_rejects_invalid_dates(client):
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue') as mock_queue:
+        payload = {'strategy_name': 'test_strategy', 'start_date': '2023-02-01', 'end_date': '2023-01-01', 'async': True}
+        response = client.post('/api/backtest', data=json.dumps(payload), content_type='application/json')
+
+        assert response.status_code == 400
+        mock_queue.return_value.submit.assert_not_called()
+
+def test_get_backtest_job(client):
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue') as mock_queue:
+        job = MagicMock()
+        job.to_dict.return_value = {'job_id': 'job-1', 'status': 'RUNNING'}
+        mock_queue.return_value.get.return_value = job
+        response = client.get('/api/backtest/job-1')
+
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'RUNNING'
+        mock_queue.return_value.get.assert_called_once_with('job-1')
+
+def test_get_backtest_job_not_found(client):
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue') as mock_queue, \
+         patch('algo.infrastructure.api.backtest_controller.JsonBacktestReportRepository') as MockReports:
+        mock_queue.return_value.get.return_value = None
+        MockReports.return_value.find.return_value = None
+        response = client.get('/api/backtest/missing')
+
+        assert response.status_code == 404
+        MockReports.return_value.find.assert_called_once_with('missing')
+
+def test_get_backtest_job_falls_back_to_saved_report(client, tmp_path):
+    report = {'summary': {'strategy': 'bullish_nifty', 'start_date': '2023-01-01', 'end_date': '2023-01-31'},
+              'result': {'summary': {'strategy_name': 'bullish_nifty'}, 'tradable': {}}}
+    (tmp_path / 'bullish_nifty_abc123_report.json').write_text(json.dumps(report))
+    (tmp_path / 'bullish_nifty_old_report.json').write_text(json.dumps({'summary': report['summary']}))
+    config = MagicMock()
+    config.backtest_engine.reports_dir = str(tmp_path)
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue') as mock_queue, \
+         patch('algo.infrastructure.json_backtest_report_repository.config_context.get_config', return_value=config):
+        mock_queue.return_value.get.return_value = None
+        response = client.get('/api/backtest/abc123')
+        traversal = client.get('/api/backtest/..%2Fabc123')
+        without_result = client.get('/api/backtest/old')
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'COMPLETED'
+    assert response.get_json()['strategy_name'] == 'bullish_nifty'
+    assert response.get_json()['result'] == report['result']
+    assert traversal.status_code == 404
+    assert without_result.status_code == 404
+
+def test_evicted_backtest_job_has_the_result_of_the_live_job(client, tmp_path, monkeypatch):
+    instrument = Instrument(type=Type.EQ, exchange=Exchange.NSE, instrument_key="TCS")
+    tradable = TradableInstrument(instrument)
+    tradable.add_position(datetime(2023, 1, 2, 9, 15), 100, TradeAction.BUY, 1)
+    tradable.exit_position(datetime(2023, 1, 2, 10, 0), 110, TradeAction.SELL, 1)
+    report = BackTestReport('bullish_nifty', tradable, date(2023, 1, 2), date(2023, 1, 31))
+    monkeypatch.setattr(get_config().backtest_engine, 'reports_dir', str(tmp_path))
+    queue = BacktestJobQueue(1)
+    payload = {'strategy_name': 'bullish_nifty', 'start_date': '2023-01-02', 'end_date': '2023-01-31', 'async': True}
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue', return_value=queue), \
+         patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'), \
+         patch('algo.infrastructure.api.backtest_controller.get_historical_data_repository'), \
+         patch('algo.application.run_backtest_usecase.BacktestEngine') as MockEngine:
+        MockEngine.return_value.start.return_value = report
+        job_id = client.post('/api/backtest', data=json.dumps(payload), content_type='application/json').get_json()['job_id']
+        queue.shutdown()
+        live = client.get(f'/api/backtest/{job_id}').get_json()
+    # A new queue no longer holds the job, as after an eviction or a restart
+    with patch('algo.infrastructure.api.backtest_controller.get_backtest_job_queue', return_value=BacktestJobQueue(1)):
+        evicted = client.get(f'/api/backtest/{job_id}').get_json()
+
+    assert live['status'] == evicted['status'] == 'COMPLETED'
+    assert evicted['result'] == live['result']
+    assert {key: evicted[key] for key in ('job_id', 'strategy_name', 'start_date', 'end_date')} == \
+        {key: live[key] for key in ('job_id', 'strategy_name', 'start_date', 'end_date')}
+
+def test_run_parameter_sweep_success(client):
+    with patch('algo.infrastructure.api.backtest_controller.RunParameterSweepUseCase') as MockUseCase:
+        with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'), \
+             patch('algo.infrastructure.api.backtest_controller.get_historical_data_repository'):
+            MockUseCase.return_value.execute.return_value = {'results': []}
+            payload = {
+                'strategy_name': 'bullish_nifty',
+                'start_date': '2023-01-01',
+                'end_date': '2023-01-31',
+                'parameters': [{'path': 'entry_rules.conditions.0.left.params.period', 'values': [10, 20]}],
+                'rank_by': 'win_rate',
+                'top': 5
+            }
+            response = client.post('/api/backtest/sweep', data=json.dumps(payload), content_type='application/json')
+
+            assert response.status_code == 200
+            sweep_input = MockUseCase.return_value.execute.call_args[0][0]
+            assert sweep_input.parameters == payload['parameters']
+            assert sweep_input.rank_by == 'win_rate'
+            assert sweep_input.top == 5
+
+def test_run_walk_forward_success(client):
+    with patch('algo.infrastructure.api.backtest_controller.RunWalkForwardUseCase') as MockUseCase:
+        with patch('algo.infrastructure.api.backtest_controller.get_strategy_repository'), \
+             patch('algo.infrastructure.api.backtest_controller.get_historical_data_repository'):
+            MockUseCase.return_value.execute.return_value = {'folds': [], 'aggregate': {}}
+            payload = {
+                'strategy_name': 'bullish_nifty',
+                'start_date': '2023-01-01',
+                'end_date': '2023-06-30',
+                'in_sample_days': 60,
+                'out_of_sample_days': 30
+            }
+            response = client.post('/api/backtest/walk-forward', data=json.dumps(payload), content_type='application/json')
+
+            assert response.status_code == 200
+            walk_forward_input = MockUseCase.return_value.execute.call_args[0][0]
+            assert walk_forward_input.in_sample_days == 60
+            assert walk_forward_input.out_of_sample_days == 30
+            assert walk_forward_input.step_days is None
+
+def test_get_historical_data_cache_stats(client):
+    cache = HistoricalDataCache(max_bytes=1024)
+    with patch('algo.infrastructure.api.backtest_controller.ensure_services_registered'), \
+         patch('algo.infrastructure.api.backtest_controller.get_historical_data_cache', return_value=cache):
+        response = client.get('/api/historical-data/cache')
+
+        assert response.status_code == 200
+        assert response.get_json()['stats']['max_bytes'] == 1024
+        assert response.get_json()['cached_data'] == []
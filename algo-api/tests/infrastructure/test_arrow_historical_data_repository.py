@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.infrastructure.arrow_dataset import convert_parquet_dataset, get_arrow_file_path, write_arrow_file
+from algo.infrastructure.arrow_historical_data_repository import ArrowHistoricalDataRepository
+from algo.infrastructure.parquet_dataset import get_daily_file_path
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+
+INSTRUMENT_KEY = "NSE_INDEX|Nifty 50"
+
+
+@pytest.fixture
+def temp_data_dir():
+    temp_dir = tempfile.mkdtemp()
+    ArrowHistoricalDataRepository.clear_cache()
+    yield temp_dir
+    ArrowHistoricalDataRepository.clear_cache()
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def instrument():
+    return Instrument(Exchange.NSE, Type.INDEX, INSTRUMENT_KEY)
+
+
+def candles(day, count=3):
+    return pd.DataFrame({
+        "timestamp": pd.date_range(datetime(day.year, day.month, day.day, 9, 15), periods=count,
+                                   freq="15min", tz="+05:30"),
+        "open": np.arange(count, dtype=float),
+        "high": np.arange(count, dtype=float),
+        "low": np.arange(count, dtype=float),
+        "close": np.full(count, float(day.day)),
+        "volume": np.arange(count, dtype=np.int64),
+    })
+
+
+def write_daily_file(base_dir, day):
+    path = get_daily_file_path(base_dir, "15min", INSTRUMENT_KEY, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    candles(day).to_parquet(path)
+
+
+def test_returns_zero_copy_views_of_the_mapped_file(temp_data_dir, instrument):
+    write_arrow_file(get_arrow_file_path(temp_data_dir, "15min", INSTRUMENT_KEY, 2023),
+                     pd.concat([candles(date(2023, 1, d)) for d in (2, 3, 4)]))
+    repository = ArrowHistoricalDataRepository(temp_data_dir)
+
+    data = repository.get_historical_data(instrument, date(2023, 1, 3), date(2023, 1, 3), Timeframe.FIFTEEN_MINUTES)
+
+    assert len(data) == 3
+    assert list(data.column("close")) == [3.0, 3.0, 3.0]
+    assert not data.column("close").flags["OWNDATA"]
+    assert data.column("timestamp")[0] == pd.Timestamp("2023-01-03 09:15", tz="+05:30")
+
+
+def test_mapped_file_is_shared_and_reopened_when_changed(temp_data_dir, instrument):
+    path = get_arrow_file_path(temp_data_dir, "15min", INSTRUMENT_KEY, 2023)
+    write_arrow_file(path, candles(date(2023, 1, 2)))
+    first = ArrowHistoricalDataRepository(temp_data_dir).get_historical_data(
+        instrument, date(2023, 1, 1), date(2023, 1, 31), Timeframe.FIFTEEN_MINUTES)
+    second = ArrowHistoricalDataRepository(temp_data_dir).get_historical_data(
+        instrument, date(2023, 1, 1), date(2023, 1, 31), Timeframe.FIFTEEN_MINUTES)
+    assert np.shares_memory(first.column("close"), second.column("close"))
+
+    write_arrow_file(path, pd.concat([candles(date(2023, 1, 2)), candles(date(2023, 1, 3))]))
+    os.utime(path, ns=(1, os.stat(path).st_mtime_ns + 1))
+    third = ArrowHistoricalDataRepository(temp_data_dir).get_historical_data(
+        instrument, date(2023, 1, 1), date(2023, 1, 31), Timeframe.FIFTEEN_MINUTES)
+    assert len(third) == 6
+
+
+def test_uncovered_ranges_are_read_from_fallback(temp_data_dir, instrument):
+    for day in (date(2022, 12, 30), date(2023, 1, 2), date(2023, 1, 3)):
+        write_daily_file(temp_data_dir, day)
+    convert_parquet_dataset(temp_data_dir)
+    os.remove(get_arrow_file_path(temp_data_dir, "15min", INSTRUMENT_KEY, 2022))
+    write_daily_file(temp_data_dir, date(2023, 1, 4))
+    repository = ArrowHistoricalDataRepository(temp_data_dir, ParquetHistoricalDataRepository(temp_data_dir))
+
+    data = repository.get_historical_data(instrument, date(2022, 12, 1), date(2023, 1, 31), Timeframe.FIFTEEN_MINUTES)
+
+    assert len(data) == 12
+    assert list(data.column("close")[::3]) == [30.0, 2.0, 3.0, 4.0]
+    assert data.column("timestamp").is_monotonic_increasing
+
+
+def test_missing_files_without_fallback_return_no_data(temp_data_dir, instrument):
+    data = ArrowHistoricalDataRepository(temp_data_dir).get_historical_data(
+        instrument, date(2023, 1, 1), date(2023, 1, 31), Timeframe.FIFTEEN_MINUTES)
+    assert len(data) == 0
@@ -179,13 +179,33 @@ class TestCachedUpstoxHistoricalDataRepository:
         
         result = cached_repository.get_historical_data(sample_instrument, extended_start_date, extended_end_date, timeframe)
         
-        # Verify the upstox repository was called twice (initial + extension)
-        assert mock_upstox_repository.get_historical_data.call_count == 2
-        
-        # Verify the second call was made with extended range
-        second_call_args = mock_upstox_repository.get_historical_data.call_args_list[1]
-        assert second_call_args[0][1] == extended_start_date  # start_date
-        assert second_call_args[0][2] == extended_end_date    # end_date
+        # Verify only the gaps before and after the cached range were fetched
+        assert mock_upstox_repository.get_historical_data.call_count == 3
+        fetched_ranges = [(call[0][1], call[0][2]) for call in mock_upstox_repository.get_historical_data.call_args_list[1:]]
+        assert fetched_ranges == [(date(2023, 12, 15), date(2023, 12, 31)), (date(2024, 2, 1), extended_end_date)]
+
+        # Verify the merged result is sorted and spans the extended range
+        result_dates = [record["timestamp"].date() for record in result.data]
+        assert result_dates == sorted(result_dates)
+        assert result_dates[0] == date(2023, 12, 15)
+        assert result_dates[-1] <= extended_end_date
+        assert cached_repository.get_cached_date_range(sample_instrument, timeframe) == (extended_start_date, extended_end_date)
+
+    def test_get_historical_data_fetches_only_gap_between_cached_intervals(self, cached_repository, mock_upstox_repository,
+                                                                         sample_instrument, extended_historical_data):
+        """Test that a request spanning two cached intervals fetches only the gap between them."""
+        timeframe = Timeframe.FIFTEEN_MINUTES
+        mock_upstox_repository.get_historical_data.return_value = extended_historical_data
+
+        cached_repository.get_historical_data(sample_instrument, date(2023, 12, 1), date(2023, 12, 31), timeframe)
+        cached_repository.get_historical_data(sample_instrument, date(2024, 2, 1), date(2024, 2, 29), timeframe)
+        result = cached_repository.get_historical_data(sample_instrument, date(2023, 12, 20), date(2024, 2, 10), timeframe)
+
+        assert mock_upstox_repository.get_historical_data.call_count == 3
+        assert mock_upstox_repository.get_historical_data.call_args_list[2][0][1:3] == (date(2024, 1, 1), date(2024, 1, 31))
+        assert result.data == [record for record in extended_historical_data.data
+                               if date(2023, 12, 20) <= record["timestamp"].date() <= date(2024, 2, 10)]
+        assert cached_repository.can_serve_from_cache(sample_instrument, date(2023, 12, 1), date(2024, 2, 29), timeframe)
 
     def test_can_serve_from_cache(self, cached_repository, mock_upstox_repository,
                                  sample_instrument, sample_historical_data):
@@ -79,6 +79,76 @@ class TestConfigFromDict:
         assert isinstance(config.trading_window_config, TradingWindowConfig)
         assert config.trading_window_config.config_dir == "./config/trading_window/"  # Default value
 
+    def test_config_from_dict_max_concurrent_jobs(self):
+        """Test the asynchronous backtest concurrency limit and its default."""
+        backtest_engine = {
+            "historical_data_backend": "PARQUET_FILES",
+            "reports_dir": "./reports",
+            "parquet_files_base_dir": "./data",
+            "strategy_json_config_dir": "./strategies"
+        }
+
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.max_concurrent_jobs == 2
+
+        backtest_engine["max_concurrent_jobs"] = 4
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.max_concurrent_jobs == 4
+
+    def test_config_from_dict_historical_data_cache_max_mb(self):
+        """Test the historical data cache budget and its default."""
+        backtest_engine = {
+            "historical_data_backend": "PARQUET_FILES",
+            "reports_dir": "./reports",
+            "parquet_files_base_dir": "./data",
+            "strategy_json_config_dir": "./strategies"
+        }
+
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.historical_data_cache_max_mb == 512
+
+        backtest_engine["historical_data_cache_max_mb"] = 64
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.historical_data_cache_max_mb == 64
+
+    def test_config_from_dict_upstox_disk_cache_dir(self):
+        """Test the Upstox disk cache directory, disabled by default."""
+        backtest_engine = {
+            "historical_data_backend": "UPSTOX_API",
+            "reports_dir": "./reports",
+            "parquet_files_base_dir": "./data",
+            "strategy_json_config_dir": "./strategies"
+        }
+
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.upstox_disk_cache_dir == ""
+
+        backtest_engine["upstox_disk_cache_dir"] = "./data"
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.upstox_disk_cache_dir == "./data"
+
+    def test_config_from_dict_resample_from_one_minute(self):
+        """Test resampling from 1-minute data, disabled by default."""
+        backtest_engine = {
+            "historical_data_backend": "PARQUET_FILES",
+            "reports_dir": "./reports",
+            "parquet_files_base_dir": "./data",
+            "strategy_json_config_dir": "./strategies"
+        }
+
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.resample_from_one_minute is False
+
+        backtest_engine["resample_from_one_minute"] = True
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.resample_from_one_minute is True
+
+    def test_config_from_dict_max_worker_processes(self):
+        """Test the worker process limit, the number of CPUs by default."""
+        backtest_engine = {
+            "historical_data_backend": "PARQUET_FILES",
+            "reports_dir": "./reports",
+            "parquet_files_base_dir": "./data",
+            "strategy_json_config_dir": "./strategies"
+        }
+
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.max_worker_processes == (os.cpu_count() or 1)
+
+        backtest_engine["max_worker_processes"] = 3
+        assert Config.from_dict({"backtest_engine": backtest_engine}).backtest_engine.max_worker_processes == 3
+
 
 class TestConfigContext:
     """Test cases for config_context integration."""
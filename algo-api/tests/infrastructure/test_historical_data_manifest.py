@@ -0,0 +1,125 @@
+import importlib.util
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.infrastructure.historical_data_manifest import (
+    COMPLETE, PARTIAL, SCHEMA_VERSION, HistoricalDataManifest, ManifestEntry, file_checksum
+)
+from algo.infrastructure.parquet_dataset import get_daily_file_path
+from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+
+NIFTY_KEY = "NSE_INDEX|Nifty 50"
+
+COMPONENT_MANIFEST = os.path.join(os.path.dirname(__file__), "..", "..", "..", "components", "historical_data",
+                                  "src", "historical_data", "infrastructure", "manifest.py")
+
+
+def load_component_manifest():
+    """The historical-data component's copy of the manifest module, which shares the SQLite file."""
+    if not os.path.isfile(COMPONENT_MANIFEST):
+        pytest.skip("historical-data component is not checked out next to algo-api")
+    spec = importlib.util.spec_from_file_location("component_manifest", COMPONENT_MANIFEST)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_daily_file(base_dir, day, close=100.0):
+    path = get_daily_file_path(base_dir, "15min", NIFTY_KEY, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({
+        "timestamp": pd.to_datetime([datetime(day.year, day.month, day.day, 15, 15)]).tz_localize("+05:30"),
+        "open": [close], "high": [close], "low": [close], "close": [close], "volume": [1], "oi": [0],
+    }).to_parquet(path)
+    return path
+
+
+def test_record_replaces_entries_and_index_adds_only_unknown_files(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    write_daily_file(str(tmp_path), date(2024, 1, 2))
+    write_daily_file(str(tmp_path), date(2024, 1, 3))
+
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 3), 1, None, PARTIAL),
+                                         ManifestEntry(date(2024, 1, 4), 0, None, COMPLETE)])
+    recorded = manifest.index_daily_files()
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 3), 1, "abc", COMPLETE)])
+
+    entries = manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 31))
+    assert recorded == 1
+    assert list(entries) == [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)]
+    assert entries[date(2024, 1, 2)].row_count == 1 and entries[date(2024, 1, 2)].checksum
+    assert entries[date(2024, 1, 3)] == ManifestEntry(date(2024, 1, 3), 1, "abc", COMPLETE)
+    assert manifest.has_series(NIFTY_KEY, "15min")
+    assert not manifest.has_series(NIFTY_KEY, "5min")
+
+
+def test_parquet_repository_reads_daily_files_listed_in_manifest_without_probing(tmp_path):
+    for day in (date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 5)):
+        write_daily_file(str(tmp_path), day, close=float(day.day))
+    HistoricalDataManifest(str(tmp_path)).index_daily_files()
+    repository = ParquetHistoricalDataRepository(str(tmp_path))
+
+    with patch("algo.infrastructure.parquet_historical_data_repository.os.path.exists",
+               wraps=os.path.exists) as mock_exists:
+        data = repository.get_historical_data(Instrument(Exchange.NSE, Type.INDEX, NIFTY_KEY),
+                                              date(2024, 1, 1), date(2024, 1, 31), Timeframe.FIFTEEN_MINUTES)
+
+    mock_exists.assert_not_called()
+    assert list(data.column("close")) == [2.0, 3.0, 5.0]
+
+
+def test_parquet_repository_reads_daily_files_missing_from_manifest_once_indexed(tmp_path):
+    write_daily_file(str(tmp_path), date(2024, 1, 2), close=2.0)
+    manifest = HistoricalDataManifest(str(tmp_path))
+    manifest.index_daily_files()
+    # Written later by a tool that does not update the manifest
+    write_daily_file(str(tmp_path), date(2024, 1, 3), close=3.0)
+    repository = ParquetHistoricalDataRepository(str(tmp_path))
+    instrument = Instrument(Exchange.NSE, Type.INDEX, NIFTY_KEY)
+
+    before = repository.get_historical_data(instrument, date(2024, 1, 1), date(2024, 1, 31), Timeframe.FIFTEEN_MINUTES)
+    manifest.index_daily_files()
+    after = repository.get_historical_data(instrument, date(2024, 1, 1), date(2024, 1, 31), Timeframe.FIFTEEN_MINUTES)
+
+    assert list(before.column("close")) == [2.0]
+    assert list(after.column("close")) == [2.0, 3.0]
+
+
+def test_manifest_copies_share_schema(tmp_path):
+    component_manifest = load_component_manifest()
+    from algo.infrastructure import historical_data_manifest
+
+    for name in ("SCHEMA_VERSION", "_SCHEMA", "MANIFEST_FILE_NAME", "COMPLETE", "PARTIAL", "EMPTY_TRADING_DAY_RETRY_DAYS"):
+        assert getattr(component_manifest, name) == getattr(historical_data_manifest, name), name
+    # Both writers apply the same completeness policy
+    today = date(2024, 1, 20)
+    for offset in range(10):
+        for row_count, trading_day in ((0, True), (0, False), (5, True)):
+            day = today - timedelta(days=offset)
+            assert component_manifest.day_completeness(day, row_count, trading_day, today) == \
+                historical_data_manifest.day_completeness(day, row_count, trading_day, today)
+
+    # Days recorded by the component's downloader are read back by algo-api
+    path = write_daily_file(str(tmp_path), date(2024, 1, 2))
+    component_manifest.HistoricalDataManifest(str(tmp_path)).record(NIFTY_KEY, "15min", [
+        component_manifest.ManifestEntry(date(2024, 1, 2), 1, component_manifest.file_checksum(path), COMPLETE)])
+    entries = HistoricalDataManifest(str(tmp_path)).get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 31))
+    assert entries == {date(2024, 1, 2): ManifestEntry(date(2024, 1, 2), 1, file_checksum(path), COMPLETE)}
+
+
+def test_manifest_with_newer_schema_is_refused(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 2), 0, None, COMPLETE)])
+    with closing(sqlite3.connect(manifest.path)) as connection:
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    with pytest.raises(ValueError):
+        manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 31))
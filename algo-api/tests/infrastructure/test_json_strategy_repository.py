@@ -133,3 +133,33 @@ def test_list_strategies_returns_all_strategies(patch_config, tmp_path):
     assert "bullish_nifty" in names
     assert "bearish_banknifty" in names
     assert len(strategies) == 2
+
+
+@pytest.fixture
+def clear_strategy_cache():
+    JsonStrategyRepository.clear_cache()
+    yield
+    JsonStrategyRepository.clear_cache()
+
+
+def test_get_strategy_reuses_compiled_strategy_for_unchanged_file(patch_config, tmp_path, clear_strategy_cache):
+    make_strategy_json(tmp_path, "bullish_nifty", _get_strategy_data())
+    repo = JsonStrategyRepository()
+
+    first = repo.get_strategy("bullish_nifty")
+    second = JsonStrategyRepository().get_strategy("bullish_nifty")
+
+    assert first is second
+    assert first.get_compiled_plan() is second.get_compiled_plan()
+
+
+def test_get_strategy_reloads_changed_file(patch_config, tmp_path, clear_strategy_cache):
+    make_strategy_json(tmp_path, "bullish_nifty", _get_strategy_data(capital=100000))
+    repo = JsonStrategyRepository()
+    first = repo.get_strategy("bullish_nifty")
+
+    make_strategy_json(tmp_path, "bullish_nifty", _get_strategy_data(capital=200000))
+    second = repo.get_strategy("bullish_nifty")
+
+    assert first is not second
+    assert second.get_capital() == 200000
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from algo.infrastructure.parquet_dataset import (
+    get_daily_file_path,
+    get_last_date,
+    get_year_file_path,
+    migrate_daily_files,
+)
+
+
+@pytest.fixture
+def temp_data_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def write_daily_file(base_dir, day, close=100.0):
+    path = get_daily_file_path(base_dir, "15min", "NSE_INDEX|Nifty 50", day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({
+        "timestamp": pd.to_datetime([datetime(day.year, day.month, day.day, 15, 15)]).tz_localize("+05:30"),
+        "open": [close], "high": [close], "low": [close], "close": [close], "volume": [1], "oi": [0],
+    }).to_parquet(path)
+    return path
+
+
+def test_migrate_writes_one_sorted_file_per_year_with_a_row_group_per_month(temp_data_dir):
+    days = [date(2023, 2, 1), date(2023, 1, 3), date(2023, 1, 2), date(2024, 1, 1)]
+    daily_files = [write_daily_file(temp_data_dir, day) for day in days]
+
+    written = migrate_daily_files(temp_data_dir, remove_daily_files=True)
+
+    path_2023 = get_year_file_path(temp_data_dir, "15min", "NSE_INDEX|Nifty 50", 2023)
+    assert written == {path_2023: 3, get_year_file_path(temp_data_dir, "15min", "NSE_INDEX|Nifty 50", 2024): 1}
+    assert not any(os.path.exists(path) for path in daily_files)
+    table = pq.read_table(path_2023)
+    timestamps = table.column("timestamp").to_pylist()
+    assert timestamps == sorted(timestamps)
+    assert pq.ParquetFile(path_2023).metadata.num_row_groups == 2
+    # Statistics are in UTC; the last date is taken in the column's timezone
+    assert get_last_date(path_2023) == date(2023, 2, 1)
+
+
+def test_migrate_merges_new_daily_files_into_existing_year_file(temp_data_dir):
+    write_daily_file(temp_data_dir, date(2023, 1, 2))
+    migrate_daily_files(temp_data_dir, remove_daily_files=True)
+    write_daily_file(temp_data_dir, date(2023, 1, 3))
+    write_daily_file(temp_data_dir, date(2023, 1, 2), close=101.0)
+
+    migrate_daily_files(temp_data_dir)
+
+    df = pd.read_parquet(get_year_file_path(temp_data_dir, "15min", "NSE_INDEX|Nifty 50", 2023))
+    assert list(df["close"]) == [101.0, 100.0]
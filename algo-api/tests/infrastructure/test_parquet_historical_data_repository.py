@@ -10,6 +10,7 @@ from algo.domain.instrument.instrument import Exchange, Type
 from algo.domain.instrument.instrument import Instrument
 from algo.domain.timeframe import Timeframe
 from algo.infrastructure.parquet_historical_data_repository import ParquetHistoricalDataRepository
+from algo.infrastructure.parquet_dataset import migrate_daily_files
 from algo.domain.config import HistoricalDataBackend
 from algo.domain.backtest.historical_data import HistoricalData
 
@@ -125,3 +126,41 @@ def test_get_historical_data_not_found(mock_exists, repository, instrument, time
 #     assert isinstance(result, HistoricalData)
 #     assert len(result.data) == 1
 #     assert result.data[0]["open"] == 100
+
+
+def create_daily_files(base_path, instrument, timeframe, days):
+    for d in days:
+        dir_path = f"{base_path}/{timeframe.value}/{instrument.instrument_key}/{d.year}/{d.month:02d}"
+        os.makedirs(dir_path, exist_ok=True)
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime([datetime(d.year, d.month, d.day, 9, 15),
+                                         datetime(d.year, d.month, d.day, 9, 16)]).tz_localize("+05:30"),
+            "open": [100.0, 101.0],
+            "high": [102.0, 102.0],
+            "low": [99.0, 100.0],
+            "close": [101.0, float(d.day)],
+            "volume": [1000, 1200]
+        })
+        df.to_parquet(f"{dir_path}/{d.strftime('%Y-%m-%d')}.parquet")
+
+def test_reads_year_files_across_years(repository, instrument, timeframe, temp_data_dir):
+    create_daily_files(temp_data_dir, instrument, timeframe,
+                       [date(2022, 12, 30), date(2023, 1, 2), date(2023, 2, 1), date(2023, 3, 1)])
+    migrate_daily_files(temp_data_dir, remove_daily_files=True)
+
+    hd = repository.get_historical_data(instrument, date(2022, 12, 30), date(2023, 2, 1), timeframe)
+
+    timestamps = list(hd.column("timestamp"))
+    assert len(hd) == 6
+    assert timestamps == sorted(timestamps)
+    assert {ts.date() for ts in timestamps} == {date(2022, 12, 30), date(2023, 1, 2), date(2023, 2, 1)}
+
+def test_reads_days_after_year_file_from_daily_files(repository, instrument, timeframe, temp_data_dir):
+    create_daily_files(temp_data_dir, instrument, timeframe, [date(2023, 1, 2), date(2023, 1, 3)])
+    migrate_daily_files(temp_data_dir, remove_daily_files=True)
+    create_daily_files(temp_data_dir, instrument, timeframe, [date(2023, 1, 4)])
+
+    hd = repository.get_historical_data(instrument, date(2023, 1, 1), date(2023, 1, 31), timeframe)
+
+    assert len(hd) == 6
+    assert hd.column("close")[-1] == 4.0
@@ -0,0 +1,137 @@
+import glob
+import os
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytz
+
+from algo.domain.backtest.historical_data import HistoricalData
+from algo.domain.backtest.historical_data_repository import HistoricalDataRepository
+from algo.domain.instrument.instrument import Exchange, Instrument, Type
+from algo.domain.timeframe import Timeframe
+from algo.domain.trading.trading_window_service import TradingWindowService
+from algo.infrastructure.parquet_dataset import get_daily_file_path
+from algo.infrastructure.upstox.persistent_upstox_historical_data_repository import PersistentUpstoxHistoricalDataRepository
+
+NIFTY = Instrument(Exchange.NSE, Type.INDEX, "NSE_INDEX|Nifty 50")
+IST = pytz.timezone("Asia/Kolkata")
+
+
+@pytest.fixture
+def trading_window_service():
+    return TradingWindowService([{
+        "exchange": "NSE",
+        "type": "INDEX",
+        "year": 2024,
+        "default_trading_windows": [
+            {"effective_from": None, "effective_to": None, "open_time": "09:15", "close_time": "15:30"}
+        ],
+        "weekly_holidays": [{"day_of_week": "SATURDAY"}, {"day_of_week": "SUNDAY"}],
+        "special_days": [],
+        "holidays": [],
+    }])
+
+
+class FakeUpstoxRepository(HistoricalDataRepository):
+    """Returns two candles per weekday, like the API, which has none on weekends, except on the empty days."""
+
+    def __init__(self, empty_days=()):
+        self.empty_days = set(empty_days)
+        self.calls = []
+
+    def get_historical_data(self, instrument, start_date, end_date, timeframe):
+        self.calls.append((start_date, end_date))
+        candles = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5 and day not in self.empty_days:
+                for minute in (15, 30):
+                    candles.append({"timestamp": IST.localize(datetime(day.year, day.month, day.day, 9, minute)),
+                                    "open": 1.0, "high": 2.0, "low": 0.5, "close": float(day.day), "volume": 10,
+                                    "oi": None})
+            day += timedelta(days=1)
+        return HistoricalData(candles)
+
+
+def test_fetched_days_are_written_and_served_from_disk(tmp_path, trading_window_service):
+    upstox = FakeUpstoxRepository()
+    with patch("algo.infrastructure.upstox.persistent_upstox_historical_data_repository._today", return_value=date(2024, 2, 1)):
+        first = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, trading_window_service).get_historical_data(
+            NIFTY, date(2024, 1, 1), date(2024, 1, 7), Timeframe.FIFTEEN_MINUTES)
+        # A new instance, as after a restart, serves the range without the API
+        second = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, trading_window_service).get_historical_data(
+            NIFTY, date(2024, 1, 2), date(2024, 1, 7), Timeframe.FIFTEEN_MINUTES)
+
+    assert upstox.calls == [(date(2024, 1, 1), date(2024, 1, 7))]
+    assert len(first) == 10
+    assert list(second.column("close")) == [2.0, 2.0, 3.0, 3.0, 4.0, 4.0, 5.0, 5.0]
+    assert os.path.isfile(get_daily_file_path(str(tmp_path), "15min", NIFTY.instrument_key, date(2024, 1, 5)))
+    # The weekend has no candles but is recorded as complete
+    assert not os.path.exists(get_daily_file_path(str(tmp_path), "15min", NIFTY.instrument_key, date(2024, 1, 6)))
+
+
+def test_only_missing_days_and_today_are_fetched_again(tmp_path, trading_window_service):
+    upstox = FakeUpstoxRepository()
+    repository = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, trading_window_service)
+    target = "algo.infrastructure.upstox.persistent_upstox_historical_data_repository._today"
+
+    with patch(target, return_value=date(2024, 1, 10)):
+        repository.get_historical_data(NIFTY, date(2024, 1, 8), date(2024, 1, 12), Timeframe.FIFTEEN_MINUTES)
+        repository.get_historical_data(NIFTY, date(2024, 1, 3), date(2024, 1, 10), Timeframe.FIFTEEN_MINUTES)
+    with patch(target, return_value=date(2024, 1, 11)):
+        result = repository.get_historical_data(NIFTY, date(2024, 1, 3), date(2024, 1, 10), Timeframe.FIFTEEN_MINUTES)
+
+    assert upstox.calls == [
+        (date(2024, 1, 8), date(2024, 1, 10)),
+        (date(2024, 1, 3), date(2024, 1, 7)),
+        (date(2024, 1, 10), date(2024, 1, 10)),
+        (date(2024, 1, 10), date(2024, 1, 10)),
+    ]
+    assert len(result) == 12
+
+
+def test_days_downloaded_before_the_manifest_are_indexed_and_not_fetched(tmp_path, trading_window_service):
+    upstox = FakeUpstoxRepository()
+    repository = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, trading_window_service)
+    with patch("algo.infrastructure.upstox.persistent_upstox_historical_data_repository._today", return_value=date(2024, 2, 1)):
+        repository.get_historical_data(NIFTY, date(2024, 1, 1), date(2024, 1, 5), Timeframe.FIFTEEN_MINUTES)
+        for path in glob.glob(os.path.join(str(tmp_path), "manifest.sqlite*")):
+            os.remove(path)
+
+        result = repository.get_historical_data(NIFTY, date(2024, 1, 1), date(2024, 1, 9), Timeframe.FIFTEEN_MINUTES)
+
+    assert upstox.calls[1:] == [(date(2024, 1, 6), date(2024, 1, 9))]
+    assert len(result) == 14
+    entries = repository.manifest.get_entries(NIFTY.instrument_key, "15min", date(2024, 1, 1), date(2024, 1, 9))
+    assert [entry.row_count for entry in entries.values()] == [2, 2, 2, 2, 2, 0, 0, 2, 2]
+    assert all(entry.is_complete for entry in entries.values())
+
+
+def test_empty_trading_days_are_fetched_again_and_empty_weekends_are_not(tmp_path, trading_window_service):
+    # The API returned no candles for a trading day, e.g. a transient failure
+    upstox = FakeUpstoxRepository(empty_days=[date(2024, 1, 5)])
+    repository = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, trading_window_service)
+    target = "algo.infrastructure.upstox.persistent_upstox_historical_data_repository._today"
+
+    with patch(target, return_value=date(2024, 1, 9)):
+        repository.get_historical_data(NIFTY, date(2024, 1, 4), date(2024, 1, 8), Timeframe.FIFTEEN_MINUTES)
+        upstox.empty_days.clear()
+        result = repository.get_historical_data(NIFTY, date(2024, 1, 4), date(2024, 1, 8), Timeframe.FIFTEEN_MINUTES)
+
+    assert upstox.calls == [(date(2024, 1, 4), date(2024, 1, 8)), (date(2024, 1, 5), date(2024, 1, 5))]
+    assert len(result) == 6
+    entries = repository.manifest.get_entries(NIFTY.instrument_key, "15min", date(2024, 1, 4), date(2024, 1, 8))
+    assert all(entry.is_complete for entry in entries.values())
+
+
+def test_every_day_is_a_trading_day_without_calendar(tmp_path):
+    upstox = FakeUpstoxRepository()
+    repository = PersistentUpstoxHistoricalDataRepository(str(tmp_path), upstox, TradingWindowService([]))
+
+    with patch("algo.infrastructure.upstox.persistent_upstox_historical_data_repository._today", return_value=date(2024, 1, 9)):
+        repository.get_historical_data(NIFTY, date(2024, 1, 5), date(2024, 1, 8), Timeframe.FIFTEEN_MINUTES)
+
+    entries = repository.manifest.get_entries(NIFTY.instrument_key, "15min", date(2024, 1, 5), date(2024, 1, 8))
+    # The weekend came back empty and is fetched again while it is recent
+    assert [entry.is_complete for entry in entries.values()] == [True, False, False, True]
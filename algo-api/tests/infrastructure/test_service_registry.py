@@ -1,6 +1,8 @@
 """
 Tests for the service registry and service configuration.
 """
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -85,6 +87,37 @@ class TestServiceRegistry:
         assert service_registry.is_registered(Service1)
         assert service_registry.is_registered(Service2)
 
+    def test_readers_see_consistent_snapshots_while_services_are_registered(self):
+        """Test that lock-free reads never fail while other threads register services."""
+        
+        class StableService:
+            pass
+        
+        stable = StableService()
+        register_service_instance(StableService, stable)
+        stop = threading.Event()
+        errors = []
+        
+        def read():
+            while not stop.is_set():
+                try:
+                    assert get_service(StableService) is stable
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+                    return
+        
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(500):
+            register_service_instance(type(f"Service{i}", (), {}), object())
+        stop.set()
+        for reader in readers:
+            reader.join()
+        
+        assert errors == []
+        assert service_registry.is_registered(StableService)
+
 
 class TestServiceConfiguration:
     """Test cases for service configuration."""
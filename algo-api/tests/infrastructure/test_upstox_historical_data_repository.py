@@ -575,3 +575,76 @@ def test_get_historical_data_broker_instrument_not_found(mock_broker_service_cla
     # Verify the broker service was called correctly
     mock_broker_service.get_broker_instrument.assert_called_once_with(instrument)
 
+
+@patch('algo.infrastructure.upstox.upstox_historical_data_repository.time.sleep')
+@patch('algo.infrastructure.upstox.upstox_historical_data_repository.UpstoxHistoricalDataRepository.api_instance')
+def test_fetch_segment_with_retry_throttled_waits_retry_after_and_reduces_concurrency(mock_api_instance, mock_sleep, repo, instrument):
+    """Test a 429 response halves the concurrency limit and waits for the Retry-After header."""
+    from upstox_client.rest import ApiException
+    from algo.infrastructure.upstox.rate_limiter import AdaptiveConcurrencyLimiter
+
+    throttled = ApiException(status=429, reason="Too Many Requests")
+    throttled.headers = {"Retry-After": "3"}
+    mock_response = MagicMock()
+    mock_response.data.candles = [["2023-01-02T09:15:00", 100, 105, 95, 102, 1000, 50]]
+    mock_api = MagicMock()
+    mock_api.get_historical_candle_data1.side_effect = [throttled, mock_response]
+    mock_api_instance.return_value = mock_api
+
+    with patch.object(UpstoxHistoricalDataRepository, "_concurrency", AdaptiveConcurrencyLimiter(8)) as concurrency:
+        _, data = repo._fetch_segment_with_retry((instrument, date(2023, 1, 1), date(2023, 1, 15), Timeframe.FIVE_MINUTES))
+
+    assert len(data) == 1
+    mock_sleep.assert_called_once_with(3.0)
+    assert concurrency.limit == 4
+
+@patch("algo.infrastructure.upstox.upstox_historical_data_repository.AccessToken")
+@patch("algo.infrastructure.upstox.upstox_historical_data_repository.upstox_client")
+def test_api_instance_is_reused_within_a_thread(mock_upstox_client, mock_access_token, repo):
+    """Test each thread creates its API client once and re-creates it when the token changes."""
+    import threading
+
+    mock_upstox_client.HistoryV3Api.side_effect = lambda client: MagicMock()
+    mock_access_token.return_value.get_token.return_value = "token-1"
+
+    with patch.object(UpstoxHistoricalDataRepository, "_thread_local", threading.local()):
+        first = repo.api_instance()
+        assert UpstoxHistoricalDataRepository().api_instance() is first
+
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(repo.api_instance()))
+        thread.start()
+        thread.join()
+        assert other_thread[0] is not first
+
+        mock_access_token.return_value.get_token.return_value = "token-2"
+        assert repo.api_instance() is not first
+
+    assert mock_upstox_client.ApiClient.call_count == 3
+
+@patch("algo.infrastructure.upstox.upstox_historical_data_repository.UpstoxInstrumentService")
+@patch('algo.infrastructure.upstox.upstox_historical_data_repository.UpstoxHistoricalDataRepository.api_instance')
+def test_segments_of_every_call_run_on_the_shared_pool(mock_api_instance, mock_broker_service_class, instrument):
+    """Test segment fetches of separate calls and instances run on one long-lived pool."""
+    import threading
+
+    mock_broker_service_class.return_value.get_broker_instrument.return_value = MagicMock(instrument_key=instrument.instrument_key)
+    threads = []
+
+    def api_instance():
+        threads.append(threading.current_thread())
+        response = MagicMock()
+        response.data.candles = []
+        api = MagicMock()
+        api.get_historical_candle_data1.return_value = response
+        return api
+
+    mock_api_instance.side_effect = api_instance
+    executor = UpstoxHistoricalDataRepository._get_executor()
+
+    for _ in range(2):
+        UpstoxHistoricalDataRepository().get_historical_data(instrument, date(2023, 1, 1), date(2023, 2, 15), Timeframe.FIVE_MINUTES)
+
+    assert UpstoxHistoricalDataRepository._get_executor() is executor
+    assert len(threads) == 4
+    assert all(thread.name.startswith("upstox-segment") and thread.is_alive() for thread in threads)
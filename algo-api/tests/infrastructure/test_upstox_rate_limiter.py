@@ -0,0 +1,56 @@
+import threading
+import time
+
+from algo.infrastructure.upstox.rate_limiter import AdaptiveConcurrencyLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_paces_requests():
+    bucket = TokenBucket(rate=100, capacity=3)
+
+    waits = [bucket.acquire() for _ in range(3)]
+    start = time.monotonic()
+    waited = bucket.acquire()
+
+    assert waits == [0.0, 0.0, 0.0]
+    assert waited > 0
+    assert time.monotonic() - start >= 0.009
+
+
+def test_concurrency_limit_halves_on_throttling_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8)
+
+    limiter.on_throttled()
+    limiter.on_throttled()
+    limiter.on_throttled()
+    limiter.on_throttled()
+    assert limiter.limit == 1
+
+    limiter.on_success()
+    assert limiter.limit == 2
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 3
+
+
+def test_slots_bound_requests_in_flight():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=2)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot():
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
@@ -265,8 +265,8 @@ class TestUpstoxInstrumentService:
             assert "Error loading broker instrument" in mock_print.call_args[0][0]
 
     @patch('algo.domain.trading.nse.get_current_monthly_expiry')
-    def test_multiple_calls_always_read_fresh_data(self, mock_nse_expiry, mock_config):
-        """Test that multiple calls always read fresh data (no caching)"""
+    def test_changed_csv_file_is_read_again(self, mock_nse_expiry, mock_config):
+        """Test that a call after the CSV file changed reads the new data"""
         temp_dir, upstox_dir = mock_config
         
         # Create initial CSV file
@@ -320,17 +320,59 @@ class TestUpstoxInstrumentService:
         }]
         
         self.create_csv_file(upstox_dir, "NSE_NIFTY.csv", updated_csv_data)
+        # The rewrite has the same size; make sure its modification time differs as well
+        stat = os.stat(csv_path)
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
         
         # Mock NSE expiry function to return expected date
         # The CSV has timestamp 1764095399000 which corresponds to November 25, 2025
         expected_expiry_date = datetime(2025, 11, 25, 15, 29)  # November 25, 2025 15:29
         mock_nse_expiry.return_value = expected_expiry_date
         
-        # Second call should read fresh data
+        # Second call should read the changed file
         broker_instrument2 = service.get_broker_instrument(instrument)
         assert broker_instrument2.trading_key == '37054'
         assert broker_instrument2.trading_symbol == 'NIFTY FUT 25 NOV 25'
 
+    def test_unchanged_csv_file_is_read_once(self, mock_config, sample_instrument):
+        """Test that the CSV file is parsed once while it is unchanged"""
+        temp_dir, upstox_dir = mock_config
+        csv_data = [{
+            'instrument_key': 'NSE_INDEX|Nifty 50',
+            'exchange_token': '26000',
+            'instrument_type': 'INDEX',
+            'exchange': 'NSE',
+            'trading_symbol': 'NIFTY'
+        }]
+        self.create_csv_file(upstox_dir, "NSE_NIFTY.csv", csv_data)
+
+        with patch('algo.infrastructure.upstox.upstox_instrument_service.csv.DictReader',
+                   wraps=csv.DictReader) as mock_reader:
+            first = UpstoxInstrumentService().get_broker_instrument(sample_instrument)
+            second = UpstoxInstrumentService().get_broker_instrument(sample_instrument)
+
+        assert first == second
+        assert first.trading_key == '26000'
+        assert mock_reader.call_count == 1
+
+    def test_get_broker_instruments_for_instruments(self, mock_config, sample_instrument):
+        """Test resolving several instruments, skipping those without a mapping"""
+        temp_dir, upstox_dir = mock_config
+        csv_data = [
+            {'instrument_key': 'NSE_INDEX|Nifty 50', 'exchange_token': '26000',
+             'instrument_type': 'INDEX', 'exchange': 'NSE', 'trading_symbol': 'NIFTY'},
+            {'instrument_key': 'NSE_FO|52168', 'exchange_token': '52168',
+             'instrument_type': 'FUT', 'exchange': 'NSE', 'trading_symbol': 'NIFTY FUT 28 OCT 25'},
+        ]
+        self.create_csv_file(upstox_dir, "NSE_NIFTY.csv", csv_data)
+        future = Instrument(exchange=Exchange.NSE, type=Type.FUT, instrument_key="NSE_NIFTY")
+        unknown = Instrument(exchange=Exchange.NSE, type=Type.INDEX, instrument_key="NSE_UNKNOWN")
+
+        broker_instruments = UpstoxInstrumentService().get_broker_instruments_for_instruments(
+            [sample_instrument, unknown, future])
+
+        assert [b.trading_key for b in broker_instruments] == ['26000', '52168']
+
     @patch('algo.domain.trading.nse.get_next1_monthly_expiry')
     def test_get_broker_instrument_fut_next1_expiry(self, mock_nse_expiry, mock_config):
         """Test FUT instrument matching with NEXT1 expiry"""
@@ -513,3 +555,92 @@ class TestUpstoxInstrumentService:
         broker_instrument = service.get_broker_instrument(instrument)
         assert broker_instrument is None
 
+
+    def create_options_chain_csv(self, upstox_dir):
+        """Create a CE/PE chain with two weekly expiries and one monthly expiry"""
+        expiries = [
+            ('true', '1760466599000'),   # Tuesday, October 14, 2025 (weekly)
+            ('true', '1759861799000'),   # Tuesday, October 7, 2025 (weekly)
+            ('false', '1761676199000'),  # Tuesday, October 28, 2025 (monthly)
+        ]
+        csv_data = []
+        for weekly, expiry in expiries:
+            for option_type in ('CE', 'PE'):
+                for strike in (25200, 24900, 25000, 25100):
+                    csv_data.append({
+                        'weekly': weekly,
+                        'instrument_key': f'NSE_FO|{option_type}{strike}-{expiry}',
+                        'exchange_token': f'{option_type}{strike}-{expiry}',
+                        'instrument_type': option_type,
+                        'exchange': 'NSE',
+                        'trading_symbol': f'NIFTY {strike} {option_type}',
+                        'expiry': expiry,
+                        'lot_size': '75',
+                        'strike_price': f'{strike}.0'
+                    })
+        self.create_csv_file(upstox_dir, "NSE_NIFTY.csv", csv_data)
+
+    def test_get_option_instrument_at_the_money(self, mock_config):
+        """Test resolving the at-the-money strike of the current weekly expiry"""
+        temp_dir, upstox_dir = mock_config
+        self.create_options_chain_csv(upstox_dir)
+        service = UpstoxInstrumentService()
+        call = Instrument(exchange=Exchange.NSE, type=Type.CE, instrument_key="NSE_NIFTY",
+                          expiry=Expiry.WEEKLY, expiring=Expiring.CURRENT)
+
+        broker_instrument = service.get_option_instrument(call, 25040.0, datetime(2025, 10, 6, 10, 0))
+
+        assert broker_instrument.trading_key == 'CE25000-1759861799000'
+        assert broker_instrument.strike_price == 25000.0
+        assert broker_instrument.instrument_type == Type.CE
+        # On expiry day the expiring contract is still current; a tie resolves to the lower strike
+        assert service.get_option_instrument(call, 25050.0, datetime(2025, 10, 7, 10, 0)).trading_key == \
+            'CE25000-1759861799000'
+        assert service.get_option_instrument(call, 30000.0, datetime(2025, 10, 8, 10, 0)).trading_key == \
+            'CE25200-1760466599000'
+
+    def test_get_option_instrument_strike_offset_and_expiry_selection(self, mock_config):
+        """Test ATM+offset strikes, next expiries and monthly expiries"""
+        temp_dir, upstox_dir = mock_config
+        self.create_options_chain_csv(upstox_dir)
+        service = UpstoxInstrumentService()
+        as_of = datetime(2025, 10, 6, 10, 0)
+
+        def put(atm, expiry=Expiry.WEEKLY, expiring=Expiring.CURRENT):
+            return Instrument(exchange=Exchange.NSE, type=Type.PE, instrument_key="NSE_NIFTY",
+                              expiry=expiry, expiring=expiring, atm=atm)
+
+        assert service.get_option_instrument(put(-1), 25090.0, as_of).trading_key == 'PE25000-1759861799000'
+        assert service.get_option_instrument(put(2, expiring=Expiring.NEXT1), 24890.0, as_of).trading_key == \
+            'PE25100-1760466599000'
+        assert service.get_option_instrument(put(0, expiring=Expiring.NEXT2), 25000.0, as_of).trading_key == \
+            'PE25000-1761676199000'
+        assert service.get_option_instrument(put(0, Expiry.MONTHLY), 25000.0, as_of).trading_key == \
+            'PE25000-1761676199000'
+        # Past the strikes or expiries of the chain
+        assert service.get_option_instrument(put(-1), 24900.0, as_of) is None
+        assert service.get_option_instrument(put(0, Expiry.MONTHLY, Expiring.NEXT1), 25000.0, as_of) is None
+        assert service.get_option_instrument(put(0), 25000.0, datetime(2025, 10, 29, 10, 0)) is None
+
+    def test_get_option_instrument_requires_option_type(self, mock_config, sample_instrument):
+        """Test that non-option instruments and missing files resolve to None"""
+        temp_dir, upstox_dir = mock_config
+        self.create_options_chain_csv(upstox_dir)
+        service = UpstoxInstrumentService()
+        missing = Instrument(exchange=Exchange.NSE, type=Type.CE, instrument_key="NSE_UNKNOWN")
+
+        assert service.get_option_instrument(sample_instrument, 25000.0) is None
+        assert service.get_option_instrument(missing, 25000.0) is None
+
+    def test_get_option_instrument_logs_errors(self, mock_config, caplog):
+        """Test that a failure to read the chain is logged and resolves to None"""
+        temp_dir, upstox_dir = mock_config
+        self.create_options_chain_csv(upstox_dir)
+        service = UpstoxInstrumentService()
+        call = Instrument(exchange=Exchange.NSE, type=Type.CE, instrument_key="NSE_NIFTY",
+                          expiry=Expiry.WEEKLY, expiring=Expiring.CURRENT)
+
+        with patch.object(UpstoxInstrumentService, '_get_instrument_master', side_effect=PermissionError("Access denied")):
+            assert service.get_option_instrument(call, 25000.0, datetime(2025, 10, 6, 10, 0)) is None
+
+        assert "Error loading broker instrument" in caplog.text
@@ -130,9 +130,10 @@ def test_run_enters_and_exits_trade(backtest_engine: BacktestEngine, mock_strate
     ]
     mock_historical_data_repository.get_historical_data.return_value = HistoricalData(historical_data)
     
-    # Enter on the second candle, exit on the fourth
-    mock_strategy.should_enter_trade.side_effect = [False, True, False, False, False]
-    mock_strategy.should_exit_trade.side_effect = [False, False, False, True, False]
+    # Enter on the second candle, exit on the fourth. Entry rules are only evaluated while
+    # no position is open and exit rules only while one is.
+    mock_strategy.should_enter_trade.side_effect = [False, True, False]
+    mock_strategy.should_exit_trade.side_effect = [False, True]
     mock_strategy.calculate_stop_loss_for.return_value = None
 
     report = backtest_engine.start(mock_strategy, start_date, end_date)
@@ -169,8 +170,9 @@ def test_run_respects_start_date(patched_trading_window_service: Mock):
     strategy.get_position_instrument.return_value = position
     
     # Trading signal behavior
-    strategy.should_enter_trade.side_effect = [True, False, False]  # Entry signal on 3rd candle
-    strategy.should_exit_trade.side_effect = [False, True, False]          # Exit signal on 4th candle
+    # Entry rules are only evaluated while flat, exit rules only while a position is open
+    strategy.should_enter_trade.side_effect = [True, False]  # Entry signal on 3rd candle
+    strategy.should_exit_trade.side_effect = [True]          # Exit signal on 4th candle
     strategy.calculate_stop_loss_for.return_value = None
     
     # Create real historical data repository
@@ -188,3 +188,117 @@ def test_filter_inverted_range_returns_empty():
     
     assert result == []
     assert len(result) == 0
+
+
+# Tests for the columnar representation
+
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def columnar_data():
+    timestamps = pd.date_range("2023-01-01 09:15", periods=5, freq="15min")
+    return HistoricalData.from_columns({
+        "timestamp": timestamps,
+        "open": np.array([98.0, 105.0, 108.0, 107.0, 115.0]),
+        "close": np.array([100.0, 110.0, 105.0, 115.0, 120.0]),
+    })
+
+
+def test_from_columns_exposes_columns_without_copy():
+    close = np.array([1.0, 2.0, 3.0])
+    hd = HistoricalData.from_columns({"close": close})
+    assert len(hd) == 3
+    assert hd.column("close") is close
+
+
+def test_from_columns_rejects_mismatched_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        HistoricalData.from_columns({"open": [1.0, 2.0], "close": [1.0]})
+
+
+def test_columnar_iteration_yields_candle_dicts(columnar_data):
+    candles = list(columnar_data)
+    assert len(candles) == 5
+    assert candles[1]["timestamp"] == datetime(2023, 1, 1, 9, 30)
+    assert candles[1]["close"] == 110.0
+    assert columnar_data[-1]["open"] == 115.0
+    assert columnar_data.data == candles
+
+
+def test_columnar_filter_returns_view_sharing_memory(columnar_data):
+    result = columnar_data.filter(start=datetime(2023, 1, 1, 9, 30), end=datetime(2023, 1, 1, 10, 0))
+    assert isinstance(result, HistoricalData)
+    assert [c["close"] for c in result] == [110.0, 105.0, 115.0]
+    assert np.shares_memory(result.column("close"), columnar_data.column("close"))
+
+
+def test_slice_returns_view(columnar_data):
+    view = columnar_data[1:3]
+    assert len(view) == 2
+    assert view.column("close").tolist() == [110.0, 105.0]
+    assert np.shares_memory(view.column("open"), columnar_data.column("open"))
+
+
+def test_legacy_records_build_columns_once(sample_data):
+    hd = HistoricalData(sample_data)
+    assert hd.column("close").tolist() == [100, 110, 105, 115, 120]
+    assert hd.column("close") is hd.column("close")
+    assert hd[0] is sample_data[0]
+
+
+def test_from_dataframe_round_trip():
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime(["2023-01-01 09:15:00+05:30", "2023-01-01 09:16:00+05:30"]),
+        "close": [1.5, 2.5],
+    })
+    hd = HistoricalData.from_dataframe(df)
+    assert str(hd.timestamps.tz) == "UTC+05:30"
+    assert hd.to_dataframe().equals(df)
+
+
+# Tests for the sorted timestamp index
+
+def test_filter_on_sorted_data_uses_views(sample_data):
+    hd = HistoricalData(sample_data)
+    result = hd.filter(start=datetime(2023, 1, 1, 9, 20), end=datetime(2023, 1, 1, 10, 5))
+    assert [c["close"] for c in result] == [110, 105, 115]
+    assert np.shares_memory(result.column("close"), hd.column("close"))
+
+
+def test_filter_of_filter_keeps_positions(sample_data):
+    hd = HistoricalData(sample_data)
+    window = hd.filter(start=datetime(2023, 1, 1, 9, 30))
+    narrowed = window.filter(end=datetime(2023, 1, 1, 9, 45))
+    assert narrowed == sample_data[1:3]
+
+
+def test_filter_unsorted_data_falls_back_to_scan():
+    data = [
+        {"timestamp": datetime(2023, 1, 1, 9, 45), "close": 105},
+        {"timestamp": datetime(2023, 1, 1, 9, 15), "close": 100},
+        {"timestamp": datetime(2023, 1, 1, 9, 30), "close": 110},
+    ]
+    hd = HistoricalData(data)
+    result = hd.filter(start=datetime(2023, 1, 1, 9, 20))
+    assert result == [data[0], data[2]]
+
+
+def test_getCandleBy_on_view_uses_shared_index(sample_data):
+    hd = HistoricalData(sample_data)
+    view = hd.filter(start=datetime(2023, 1, 1, 9, 30), end=datetime(2023, 1, 1, 9, 45))
+    assert view.getCandleBy("2023-01-01T09:45:00") is sample_data[2]
+    # Candles outside the view are not returned even though the shared index knows them
+    assert view.getCandleBy("2023-01-01T10:15:00") is None
+    assert view._root is hd
+    assert hd._get_timestamp_index() is hd._get_timestamp_index()
+
+
+def test_getCandleBy_with_timezone_aware_columns():
+    timestamps = pd.date_range("2023-01-01 09:15", periods=3, freq="1min", tz="Asia/Kolkata")
+    hd = HistoricalData.from_columns({"timestamp": timestamps, "open": np.array([1.0, 2.0, 3.0])})
+    candle = hd.getCandleBy("2023-01-01T09:16:00+05:30")
+    assert candle["open"] == 2.0
+    assert hd.getCandleBy("2023-01-01T09:16:00") is None
+    assert hd.getCandleBy("not a timestamp") is None
@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+import pytz
+from historical_data.infrastructure.manifest import (
+    HistoricalDataManifest, ManifestEntry, day_completeness, file_checksum
+)
+from historical_data.infrastructure.parquet_storage import ParquetStorage
+from historical_data.infrastructure.trading_calendar import TradingCalendar
+from historical_data.infrastructure.upstox_historical_data_repository import UpstoxHistoricalDataRepository
+
+
+def exchange_today() -> date:
+    """Current date at the exchange (NSE, Asia/Kolkata)."""
+    return datetime.now(pytz.timezone("Asia/Kolkata")).date()
+
+
+def plan_segments(days: List[date], max_days: int) -> List[Tuple[date, List[date]]]:
+    """
+    Groups sorted days into request segments spanning at most max_days calendar days.
+
+    Returns:
+        (end date, days) per segment, earliest first; the segment starts at its first day.
+    """
+    segments: List[Tuple[date, List[date]]] = []
+    current: List[date] = []
+    for day in days:
+        if current and (day - current[0]).days >= max_days:
+            segments.append((current[-1], current))
+            current = []
+        current.append(day)
+    if current:
+        segments.append((current[-1], current))
+    return segments
+
+
+class BulkDownloadUseCase:
+    """
+    Use case for backfilling historical data of many instruments and timeframes.
+
+    Each (instrument, timeframe) runs on a bounded thread pool. Only trading days that the
+    manifest does not record as complete are requested, in multi-day segments up to the API
+    limit, and every response is split into per-day files in one pass. The days of a segment
+    are recorded in the manifest as soon as it is stored, with their candle count and checksum,
+    so a re-run resumes with the days still missing. Days without a session are recorded as
+    complete without being requested. Today, and trading days that returned no candles (data not
+    published yet, or a transient empty response), stay partial and are requested again, empty
+    days only until they are a few days old (see day_completeness). Files downloaded before the
+    manifest existed are indexed on first use.
+    """
+
+    def __init__(
+        self,
+        historical_data_repository: UpstoxHistoricalDataRepository,
+        data_storage: ParquetStorage,
+        trading_calendar: TradingCalendar,
+        manifest: HistoricalDataManifest,
+        max_workers: int = 4
+    ):
+        self.historical_data_repository = historical_data_repository
+        self.data_storage = data_storage
+        self.trading_calendar = trading_calendar
+        self.manifest = manifest
+        self.max_workers = max_workers
+
+    def execute(
+        self,
+        instruments: List[str],
+        timeframes: List[str],
+        from_date: date,
+        to_date: date
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Executes the use case.
+
+        Returns:
+            The number of candles written per (instrument, timeframe); failed pairs are left out.
+        """
+        tasks = [(instrument, timeframe) for instrument in instruments for timeframe in timeframes]
+        written: Dict[Tuple[str, str], int] = {}
+        if not tasks:
+            return written
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            futures = {
+                executor.submit(self._download, instrument, timeframe, from_date, to_date): (instrument, timeframe)
+                for instrument, timeframe in tasks
+            }
+            for future in as_completed(futures):
+                instrument, timeframe = futures[future]
+                try:
+                    written[(instrument, timeframe)] = future.result()
+                except Exception as e:
+                    print(f"[FAILED] {instrument} {timeframe}: {e}")
+        return written
+
+    def _download(self, instrument_key: str, timeframe: str, from_date: date, to_date: date) -> int:
+        if not self.manifest.has_series(instrument_key, timeframe):
+            indexed = self.manifest.index_series(instrument_key, timeframe)
+            if indexed:
+                print(f"[INDEXED] {instrument_key} {timeframe}: {indexed} existing files")
+        today = exchange_today()
+
+        entries = self.manifest.get_entries(instrument_key, timeframe, from_date, to_date)
+        trading_days = self.trading_calendar.get_trading_days(instrument_key, from_date, to_date)
+        # Closed days without a session are recorded without a request, so readers do not look for their files
+        sessions = set(trading_days)
+        closed_days = (from_date + timedelta(days=offset) for offset in range((min(to_date, today) - from_date).days))
+        self.manifest.record(instrument_key, timeframe, [
+            ManifestEntry(day, 0, None, day_completeness(day, 0, False, today))
+            for day in closed_days if day not in sessions and day not in entries
+        ])
+        missing_days = [day for day in trading_days if day not in entries or not entries[day].is_complete]
+        segments = plan_segments(missing_days, self.historical_data_repository.get_max_days_per_request(timeframe))
+        print(f"[PLANNED] {instrument_key} {timeframe}: {len(missing_days)} days in {len(segments)} requests")
+
+        total = 0
+        for segment_end, days in segments:
+            candles = self.historical_data_repository.fetch_candles(instrument_key, days[0], segment_end, timeframe)
+            written = self.data_storage.store_candles_by_day(instrument_key, timeframe, candles, days)
+            self.manifest.record(instrument_key, timeframe, [
+                ManifestEntry(
+                    day,
+                    written.get(day, 0),
+                    file_checksum(self.data_storage.get_file_path(instrument_key, timeframe, day)) if day in written else None,
+                    day_completeness(day, written.get(day, 0), True, today)
+                )
+                for day in days
+            ])
+            total += sum(written.values())
+            print(f"[FETCHED] {instrument_key} {timeframe} {days[0]} to {segment_end}: "
+                  f"{sum(written.values())} candles in {len(written)} files")
+        return total
@@ -0,0 +1,175 @@
+import glob
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+import pyarrow.parquet as pq
+
+MANIFEST_FILE_NAME = "manifest.sqlite"
+
+COMPLETE = "complete"
+PARTIAL = "partial"
+
+# Trading days fetched without candles are fetched again until they are this many days old
+EMPTY_TRADING_DAY_RETRY_DAYS = 5
+
+# Stored as PRAGMA user_version. Bump it with any change to the table, in both copies of this
+# module (algo.infrastructure.historical_data_manifest in algo-api and
+# historical_data.infrastructure.manifest in the historical-data component); readers refuse
+# manifests written with a newer schema than theirs.
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_days (
+    instrument_key TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    date TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    checksum TEXT,
+    completeness TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (instrument_key, timeframe, date)
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """An ingested day: its candle count, the checksum of its file and whether it was complete."""
+    day: date
+    row_count: int
+    checksum: Optional[str]
+    completeness: str
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completeness == COMPLETE
+
+
+def day_completeness(day: date, row_count: int, trading_day: bool, today: date) -> str:
+    """
+    Completeness to record for a fetched day; the same policy is applied by every writer.
+
+    Today is partial. Days without a session are complete with no rows. A trading day that came
+    back without candles stays partial, so it is fetched again, until it is more than
+    EMPTY_TRADING_DAY_RETRY_DAYS old; after that the empty response is taken as final
+    (e.g. an instrument that was not listed yet).
+
+    Args:
+        day: The fetched day
+        row_count: Number of candles stored for the day
+        trading_day: Whether the exchange had a session on the day
+        today: Current date at the exchange
+    """
+    if day >= today:
+        return PARTIAL
+    if row_count > 0 or not trading_day:
+        return COMPLETE
+    return COMPLETE if (today - day).days > EMPTY_TRADING_DAY_RETRY_DAYS else PARTIAL
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HistoricalDataManifest:
+    """
+    SQLite index of the days ingested into the storage directory, kept at
+    {base_directory}/manifest.sqlite. Days without a session are recorded as complete with no
+    rows, so they are not requested again; trading days that came back without candles stay
+    partial for a few days (see day_completeness).
+    """
+
+    def __init__(self, base_directory: str):
+        self.base_directory = base_directory
+        self.path = os.path.join(base_directory, MANIFEST_FILE_NAME)
+
+    @staticmethod
+    def _instrument_dir(instrument_key: str) -> str:
+        return instrument_key.replace("|", ".")
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.base_directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            connection.close()
+            raise ValueError(f"Manifest {self.path} has schema version {version}, newer than the supported {SCHEMA_VERSION}")
+        connection.execute(_SCHEMA)
+        if version < SCHEMA_VERSION:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return connection
+
+    def get_entries(self, instrument_key: str, timeframe: str, from_date: date, to_date: date) -> Dict[date, ManifestEntry]:
+        """
+        Returns the recorded days of an instrument and timeframe in the date range.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT date, row_count, checksum, completeness FROM ingested_days "
+                "WHERE instrument_key = ? AND timeframe = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (self._instrument_dir(instrument_key), timeframe, from_date.isoformat(), to_date.isoformat())
+            ).fetchall()
+        return {
+            date.fromisoformat(day): ManifestEntry(date.fromisoformat(day), row_count, checksum, completeness)
+            for day, row_count, checksum, completeness in rows
+        }
+
+    def has_series(self, instrument_key: str, timeframe: str) -> bool:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT 1 FROM ingested_days WHERE instrument_key = ? AND timeframe = ? LIMIT 1",
+                (self._instrument_dir(instrument_key), timeframe)
+            ).fetchone()
+        return row is not None
+
+    def record(self, instrument_key: str, timeframe: str, entries: Iterable[ManifestEntry]):
+        """
+        Inserts or replaces the entries of an instrument and timeframe in one transaction.
+        """
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (self._instrument_dir(instrument_key), timeframe, entry.day.isoformat(), entry.row_count,
+             entry.checksum, entry.completeness, updated_at)
+            for entry in entries
+        ]
+        if not rows:
+            return
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO ingested_days "
+                    "(instrument_key, timeframe, date, row_count, checksum, completeness, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def index_series(self, instrument_key: str, timeframe: str) -> int:
+        """
+        Records the daily files of an instrument and timeframe written before the manifest
+        existed as complete days, with one directory scan.
+
+        Returns:
+            The number of days recorded.
+        """
+        instrument_dir = os.path.join(self.base_directory, timeframe, self._instrument_dir(instrument_key))
+        paths = glob.glob(os.path.join(instrument_dir, "[0-9]*", "[0-9]*", "*.parquet"))
+        if not paths:
+            return 0
+        days = {date.fromisoformat(os.path.basename(path)[:-len(".parquet")]): path for path in paths}
+        known = self.get_entries(instrument_key, timeframe, min(days), max(days))
+        entries = [
+            ManifestEntry(day, pq.ParquetFile(path).metadata.num_rows, file_checksum(path), COMPLETE)
+            for day, path in sorted(days.items()) if day not in known
+        ]
+        self.record(instrument_key, timeframe, entries)
+        return len(entries)
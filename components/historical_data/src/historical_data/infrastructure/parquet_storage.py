@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-from typing import List
+from typing import Dict, Iterable, List, Optional
 from historical_data.domain.historical_data import Candle
 from datetime import date
 
@@ -61,3 +61,37 @@ class ParquetStorage:
 
         except Exception as e:
             print(f"❌ Error storing data: {e}")
+
+    def store_candles_by_day(
+        self,
+        instrument_key: str,
+        timeframe: str,
+        data: List[Candle],
+        days: Optional[Iterable[date]] = None
+    ) -> Dict[date, int]:
+        """
+        Splits candles spanning several days into one Parquet file per day in a single pass.
+        When days is given, candles of other days are not written.
+
+        Returns:
+            The number of candles written per day.
+        """
+        if not data:
+            return {}
+
+        df = pd.DataFrame([candle.__dict__ for candle in data])
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = df.sort_values(by='timestamp', ascending=True).reset_index(drop=True)
+
+        wanted = set(days) if days is not None else None
+        written = {}
+        for day, day_df in df.groupby(df['timestamp'].dt.date, sort=False):
+            if wanted is not None and day not in wanted:
+                continue
+            output_file = self.get_file_path(instrument_key, timeframe, day)
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            tmp_file = f"{output_file}.tmp"
+            day_df.to_parquet(tmp_file, index=False)
+            os.replace(tmp_file, output_file)
+            written[day] = len(day_df)
+        return written
@@ -0,0 +1,74 @@
+import glob
+import json
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+
+# Instrument key segment -> trading window type
+SEGMENT_TYPES = {
+    "INDEX": "INDEX",
+    "EQ": "EQ",
+    "FO": "FUT",
+}
+
+
+class TradingCalendar:
+    """
+    Trading days read from the trading-window config files of algo-api
+    (``{exchange}_{type}_{year}.json`` with weekly holidays, holidays and special days).
+
+    Years without a config file for the exchange and type fall back to another type of the same
+    exchange and year, and otherwise to Monday to Friday.
+    """
+
+    def __init__(self, config_dir: Optional[str] = None):
+        self._configs: Dict[Tuple[str, str, int], dict] = {}
+        if config_dir and os.path.isdir(config_dir):
+            for path in glob.glob(os.path.join(config_dir, "*.json")):
+                with open(path, "r") as f:
+                    config = json.load(f)
+                key = (config["exchange"].upper(), config["type"].upper(), int(config["year"]))
+                self._configs[key] = config
+        self._non_trading: Dict[Tuple[str, str, int], Tuple[Set[int], Set[date], Set[date]]] = {}
+
+    @staticmethod
+    def exchange_and_type(instrument_key: str) -> Tuple[str, str]:
+        """Derive (exchange, type) from an instrument key, e.g. 'NSE_INDEX|Nifty 50' -> ('NSE', 'INDEX')."""
+        segment = instrument_key.split("|", 1)[0]
+        exchange, _, segment_type = segment.partition("_")
+        return exchange.upper(), SEGMENT_TYPES.get(segment_type.upper(), "EQ")
+
+    def is_trading_day(self, exchange: str, instrument_type: str, day: date) -> bool:
+        weekly_holidays, holidays, special_days = self._get_year(exchange, instrument_type, day.year)
+        if day in special_days:
+            return True
+        return day.weekday() not in weekly_holidays and day not in holidays
+
+    def get_trading_days(self, instrument_key: str, start_date: date, end_date: date) -> List[date]:
+        """Trading days of the instrument's exchange and type from start_date to end_date (inclusive)."""
+        exchange, instrument_type = self.exchange_and_type(instrument_key)
+        days = []
+        day = start_date
+        while day <= end_date:
+            if self.is_trading_day(exchange, instrument_type, day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def _get_year(self, exchange: str, instrument_type: str, year: int) -> Tuple[Set[int], Set[date], Set[date]]:
+        key = (exchange, instrument_type, year)
+        if key not in self._non_trading:
+            config = self._configs.get(key) or next(
+                (c for (e, _, y), c in sorted(self._configs.items()) if e == exchange and y == year), None
+            )
+            if config is None:
+                self._non_trading[key] = ({5, 6}, set(), set())
+            else:
+                self._non_trading[key] = (
+                    {WEEKDAYS.index(h["day_of_week"].upper()) for h in config.get("weekly_holidays", [])},
+                    {date.fromisoformat(h["date"]) for h in config.get("holidays", [])},
+                    {date.fromisoformat(s["date"]) for s in config.get("special_days", [])},
+                )
+        return self._non_trading[key]
@@ -6,6 +6,10 @@ from upstox_client.rest import ApiException
 from historical_data.domain.historical_data import Candle
 from historical_data.domain.historical_data_repository import HistoricalDataRepository
 
+# Most days the Upstox API returns per request for minute and hour intervals
+MAX_DAYS_PER_REQUEST = 28
+
+
 class UpstoxHistoricalDataRepository(HistoricalDataRepository):
     """
     A repository for fetching historical data from the Upstox API.
@@ -40,39 +44,55 @@ class UpstoxHistoricalDataRepository(HistoricalDataRepository):
         Fetches historical candle data from the Upstox API.
         """
         try:
-            date_str_from = from_date.strftime("%Y-%m-%d")
-            date_str_to = to_date.strftime("%Y-%m-%d")
-            
-            interval, unit = self._parse_timeframe(timeframe)
-
-            response = self.api_instance.get_historical_candle_data1(
-                instrument_key=instrument_key,
-                interval=interval,
-                unit=unit,
-                from_date=date_str_from,
-                to_date=date_str_to
-            )
-
-            candles = response.data.candles
-            if not candles:
-                return []
-
-            return [
-                Candle(
-                    timestamp=candle[0],
-                    open=candle[1],
-                    high=candle[2],
-                    low=candle[3],
-                    close=candle[4],
-                    volume=candle[5],
-                    oi=candle[6]
-                )
-                for candle in candles
-            ]
-
+            return self.fetch_candles(instrument_key, from_date, to_date, timeframe)
         except ApiException as e:
             print(f"❌ API Error: {e}")
             return []
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
             return []
+
+    def get_max_days_per_request(self, timeframe: str) -> int:
+        """Returns the longest date range, in days, that one request may cover for the timeframe."""
+        return MAX_DAYS_PER_REQUEST
+
+    def fetch_candles(
+        self,
+        instrument_key: str,
+        from_date: date,
+        to_date: date,
+        timeframe: str
+    ) -> List[Candle]:
+        """
+        Fetches historical candle data from the Upstox API, raising on errors so callers
+        can tell a failed request from a range without candles.
+        """
+        date_str_from = from_date.strftime("%Y-%m-%d")
+        date_str_to = to_date.strftime("%Y-%m-%d")
+
+        interval, unit = self._parse_timeframe(timeframe)
+
+        response = self.api_instance.get_historical_candle_data1(
+            instrument_key=instrument_key,
+            interval=interval,
+            unit=unit,
+            from_date=date_str_from,
+            to_date=date_str_to
+        )
+
+        candles = response.data.candles
+        if not candles:
+            return []
+
+        return [
+            Candle(
+                timestamp=candle[0],
+                open=candle[1],
+                high=candle[2],
+                low=candle[3],
+                close=candle[4],
+                volume=candle[5],
+                oi=candle[6]
+            )
+            for candle in candles
+        ]
@@ -0,0 +1,77 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+from historical_data.application.bulk_download_use_case import BulkDownloadUseCase, plan_segments
+from historical_data.domain.historical_data import Candle
+from historical_data.infrastructure.manifest import COMPLETE, PARTIAL, HistoricalDataManifest
+from historical_data.infrastructure.parquet_storage import ParquetStorage
+from historical_data.infrastructure.trading_calendar import TradingCalendar
+
+NIFTY_KEY = "NSE_INDEX|Nifty 50"
+
+
+class FakeRepository:
+    """Returns one candle per requested day, except on the days listed as empty."""
+
+    def __init__(self, empty_days=()):
+        self.empty_days = set(empty_days)
+        self.requests = []
+
+    def get_max_days_per_request(self, timeframe):
+        return 7
+
+    def fetch_candles(self, instrument_key, from_date, to_date, timeframe):
+        self.requests.append((from_date, to_date))
+        return [
+            Candle(datetime(day.year, day.month, day.day, 9, 15), 1.0, 1.0, 1.0, 1.0, 1, 0)
+            for day in TradingCalendar().get_trading_days(instrument_key, from_date, to_date)
+            if day not in self.empty_days
+        ]
+
+
+def test_plan_segments_limits_calendar_span():
+    days = [date(2024, 1, day) for day in (1, 2, 5, 8, 9, 20)]
+
+    assert plan_segments(days, 7) == [
+        (date(2024, 1, 5), [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 5)]),
+        (date(2024, 1, 9), [date(2024, 1, 8), date(2024, 1, 9)]),
+        (date(2024, 1, 20), [date(2024, 1, 20)]),
+    ]
+    assert plan_segments([], 7) == []
+
+
+def test_days_without_candles_and_today_stay_partial_and_are_fetched_again(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    repository = FakeRepository(empty_days=[date(2024, 1, 3)])
+    use_case = BulkDownloadUseCase(repository, ParquetStorage(str(tmp_path)), TradingCalendar(), manifest)
+
+    with patch("historical_data.application.bulk_download_use_case.exchange_today", return_value=date(2024, 1, 5)):
+        written = use_case.execute([NIFTY_KEY], ["15min"], date(2024, 1, 1), date(2024, 1, 5))
+        repository.requests.clear()
+        use_case.execute([NIFTY_KEY], ["15min"], date(2024, 1, 1), date(2024, 1, 5))
+
+    entries = manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 5))
+    assert written == {(NIFTY_KEY, "15min"): 4}
+    assert {day.day: entry.completeness for day, entry in entries.items()} == {
+        1: COMPLETE, 2: COMPLETE, 3: PARTIAL, 4: COMPLETE, 5: PARTIAL
+    }
+    # The resumed run asks for the empty day and today only
+    assert repository.requests == [(date(2024, 1, 3), date(2024, 1, 5))]
+
+
+def test_days_without_session_are_recorded_without_request_and_old_empty_days_are_final(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    repository = FakeRepository(empty_days=[date(2024, 1, 2)])
+    use_case = BulkDownloadUseCase(repository, ParquetStorage(str(tmp_path)), TradingCalendar(), manifest)
+
+    with patch("historical_data.application.bulk_download_use_case.exchange_today", return_value=date(2024, 1, 20)):
+        use_case.execute([NIFTY_KEY], ["15min"], date(2024, 1, 1), date(2024, 1, 8))
+        repository.requests.clear()
+        use_case.execute([NIFTY_KEY], ["15min"], date(2024, 1, 1), date(2024, 1, 8))
+
+    entries = manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 8))
+    assert len(entries) == 8 and all(entry.is_complete for entry in entries.values())
+    assert entries[date(2024, 1, 6)].row_count == entries[date(2024, 1, 7)].row_count == 0
+    # The empty trading day is older than the retry window: its empty response is final
+    assert entries[date(2024, 1, 2)].row_count == 0
+    assert repository.requests == []
@@ -0,0 +1,73 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from historical_data.infrastructure.manifest import (
+    COMPLETE, EMPTY_TRADING_DAY_RETRY_DAYS, PARTIAL, SCHEMA_VERSION, HistoricalDataManifest, ManifestEntry,
+    day_completeness
+)
+from historical_data.infrastructure.parquet_storage import ParquetStorage
+
+NIFTY_KEY = "NSE_INDEX|Nifty 50"
+
+
+def write_daily_file(base_dir, day):
+    path = ParquetStorage(base_dir).get_file_path(NIFTY_KEY, "15min", day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({"timestamp": [datetime(day.year, day.month, day.day, 9, 15)] * 2, "close": [1.0, 2.0]}).to_parquet(path)
+    return path
+
+
+def test_record_replaces_entries_of_a_series(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    assert not manifest.has_series(NIFTY_KEY, "15min")
+
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 2), 0, None, PARTIAL),
+                                         ManifestEntry(date(2024, 1, 3), 10, "abc", COMPLETE)])
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 2), 5, "def", COMPLETE)])
+
+    assert manifest.has_series(NIFTY_KEY, "15min")
+    assert not manifest.has_series(NIFTY_KEY, "1min")
+    assert manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 2)) == {
+        date(2024, 1, 2): ManifestEntry(date(2024, 1, 2), 5, "def", COMPLETE)
+    }
+
+
+def test_index_series_records_only_unknown_files(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    write_daily_file(str(tmp_path), date(2024, 1, 2))
+    write_daily_file(str(tmp_path), date(2024, 1, 3))
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 3), 2, None, PARTIAL)])
+
+    assert manifest.index_series(NIFTY_KEY, "15min") == 1
+
+    entries = manifest.get_entries(NIFTY_KEY, "15min", date(2024, 1, 1), date(2024, 1, 31))
+    assert entries[date(2024, 1, 2)].row_count == 2 and entries[date(2024, 1, 2)].is_complete
+    assert entries[date(2024, 1, 2)].checksum
+    assert not entries[date(2024, 1, 3)].is_complete
+
+
+def test_manifest_with_newer_schema_is_refused(tmp_path):
+    manifest = HistoricalDataManifest(str(tmp_path))
+    manifest.record(NIFTY_KEY, "15min", [ManifestEntry(date(2024, 1, 2), 0, None, COMPLETE)])
+    with closing(sqlite3.connect(manifest.path)) as connection:
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    with pytest.raises(ValueError):
+        manifest.has_series(NIFTY_KEY, "15min")
+
+
+def test_day_completeness():
+    today = date(2024, 1, 20)
+    retry_limit = today - timedelta(days=EMPTY_TRADING_DAY_RETRY_DAYS)
+
+    assert day_completeness(today, 10, True, today) == PARTIAL
+    assert day_completeness(date(2024, 1, 19), 10, True, today) == COMPLETE
+    assert day_completeness(date(2024, 1, 14), 0, False, today) == COMPLETE
+    assert day_completeness(retry_limit, 0, True, today) == PARTIAL
+    assert day_completeness(retry_limit - timedelta(days=1), 0, True, today) == COMPLETE
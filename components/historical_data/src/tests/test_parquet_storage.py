@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+import pandas as pd
+
+from historical_data.domain.historical_data import Candle
+from historical_data.infrastructure.parquet_storage import ParquetStorage
+
+NIFTY_KEY = "NSE_INDEX|Nifty 50"
+
+
+def candle(timestamp, close):
+    return Candle(timestamp=timestamp, open=close, high=close, low=close, close=close, volume=1, oi=0)
+
+
+def test_store_candles_by_day_writes_one_sorted_file_per_wanted_day(tmp_path):
+    storage = ParquetStorage(str(tmp_path))
+    candles = [
+        candle(datetime(2024, 1, 3, 9, 30), 4.0),
+        candle(datetime(2024, 1, 2, 9, 30), 2.0),
+        candle(datetime(2024, 1, 2, 9, 15), 1.0),
+        candle(datetime(2024, 1, 4, 9, 15), 5.0),
+        candle(datetime(2024, 1, 3, 9, 15), 3.0),
+    ]
+
+    written = storage.store_candles_by_day(NIFTY_KEY, "15min", candles, [date(2024, 1, 2), date(2024, 1, 3)])
+
+    assert written == {date(2024, 1, 2): 2, date(2024, 1, 3): 2}
+    path = storage.get_file_path(NIFTY_KEY, "15min", date(2024, 1, 2))
+    assert path == str(tmp_path / "15min" / "NSE_INDEX.Nifty 50" / "2024" / "01" / "2024-01-02.parquet")
+    assert list(pd.read_parquet(path)["close"]) == [1.0, 2.0]
+    assert not (tmp_path / "15min" / "NSE_INDEX.Nifty 50" / "2024" / "01" / "2024-01-04.parquet").exists()
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_store_candles_by_day_without_candles_writes_nothing(tmp_path):
+    assert ParquetStorage(str(tmp_path)).store_candles_by_day(NIFTY_KEY, "15min", []) == {}
+    assert not list(tmp_path.iterdir())